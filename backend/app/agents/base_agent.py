@@ -7,11 +7,20 @@ from app.orchestrator.types import AgentAction, AgentContext, AgentExecutionResu
 
 class BaseAgent(ABC):
     name: str
+    # Agents whose ``aexecute`` never blocks the event loop set this, and the
+    # orchestrator awaits them directly instead of using the agent executor.
+    async_native: bool = False
+    # Actions that are async-native on an otherwise sync agent.
+    native_actions: frozenset[str] = frozenset()
 
     @abstractmethod
     def execute(self, action: AgentAction, context: AgentContext) -> AgentExecutionResult:
         raise NotImplementedError
 
+    async def aexecute(self, action: AgentAction, context: AgentContext) -> AgentExecutionResult:
+        """Async entry point; the default runs :meth:`execute` on a worker thread."""
+        return await asyncio.to_thread(self.execute, action, context)
+
     async def execute_stream(self, action: AgentAction, context: AgentContext) -> AsyncIterator[str]:
         """Default implementation that yields the final message at once."""
         result = await asyncio.to_thread(self.execute, action, context)
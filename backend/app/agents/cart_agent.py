@@ -25,6 +25,7 @@ class _AddResolution:
 
 class CartAgent(BaseAgent):
     name = "cart"
+    native_actions = frozenset({"get_cart"})
 
     def __init__(self, cart_service: CartService, product_service: ProductService) -> None:
         self.cart_service = cart_service
@@ -36,13 +37,7 @@ class CartAgent(BaseAgent):
         params = action.params
 
         if action.name == "get_cart":
-            cart = self.cart_service.get_cart(user_id=user_id, session_id=session_id)
-            return AgentExecutionResult(
-                success=True,
-                message=f"Your cart has {cart['itemCount']} item(s), total ${cart['total']:.2f}.",
-                data={"cart": cart},
-                next_actions=self._cart_next_actions(cart),
-            )
+            return self._cart_summary(self.cart_service.get_cart(user_id=user_id, session_id=session_id))
 
         if action.name == "add_item":
             resolution = self._resolve_variant_for_add(params=params, context=context)
@@ -96,13 +91,17 @@ class CartAgent(BaseAgent):
                     data={},
                 )
 
-            added: list[str] = []
+            # One batched lookup for every product referenced by id, instead of one per line.
+            prefetched = self.product_service.get_products(
+                str(raw_item.get("productId", "")).strip() for raw_item in raw_items if isinstance(raw_item, dict)
+            )
+            added_lines: list[tuple[str, int]] = []
             unresolved: list[str] = []
             clarifications: list[str] = []
             for raw_item in raw_items:
                 if not isinstance(raw_item, dict):
                     continue
-                resolution = self._resolve_variant_for_add(params=raw_item, context=context)
+                resolution = self._resolve_variant_for_add(params=raw_item, context=context, prefetched=prefetched)
                 if resolution.clarification:
                     unresolved.append(str(raw_item.get("query", "item")).strip())
                     clarifications.append(resolution.clarification)
@@ -120,8 +119,10 @@ class CartAgent(BaseAgent):
                     variant_id=variant_id,
                     quantity=quantity,
                 )
-                added.append(f"{self._product_name(product_id)} x{quantity}")
+                added_lines.append((product_id, quantity))
 
+            names = self._product_names([product_id for product_id, _ in added_lines], prefetched=prefetched)
+            added = [f"{names.get(product_id, 'item')} x{quantity}" for product_id, quantity in added_lines]
             cart = self.cart_service.get_cart(user_id=user_id, session_id=session_id)
             if not added:
                 fallback = "I couldn't match those items. Try product names like running shoes or hoodie."
@@ -282,6 +283,20 @@ class CartAgent(BaseAgent):
 
         raise HTTPException(status_code=400, detail=f"Unsupported cart action: {action.name}")
 
+    async def aexecute(self, action: AgentAction, context: AgentContext) -> AgentExecutionResult:
+        if action.name == "get_cart":
+            cart = await self.cart_service.aget_cart(user_id=context.user_id, session_id=context.session_id)
+            return self._cart_summary(cart)
+        return await super().aexecute(action, context)
+
+    def _cart_summary(self, cart: dict[str, Any]) -> AgentExecutionResult:
+        return AgentExecutionResult(
+            success=True,
+            message=f"Your cart has {cart['itemCount']} item(s), total ${cart['total']:.2f}.",
+            data={"cart": cart},
+            next_actions=self._cart_next_actions(cart),
+        )
+
     def _safe_quantity(self, value: Any) -> int:
         try:
             parsed = int(value)
@@ -294,6 +309,7 @@ class CartAgent(BaseAgent):
         *,
         params: dict[str, Any],
         context: AgentContext,
+        prefetched: dict[str, dict[str, Any]] | None = None,
     ) -> _AddResolution:
         product_id = str(params.get("productId", "")).strip()
         variant_id = str(params.get("variantId", "")).strip()
@@ -305,10 +321,13 @@ class CartAgent(BaseAgent):
             return _AddResolution(product_id=product_id, variant_id=variant_id)
 
         if product_id and not variant_id:
-            try:
-                product = self.product_service.get_product(product_id)
-            except HTTPException:
-                product = None
+            if prefetched is not None:
+                product = prefetched.get(product_id)
+            else:
+                try:
+                    product = self.product_service.get_product(product_id)
+                except HTTPException:
+                    product = None
             if isinstance(product, dict):
                 variants = self._matching_in_stock_variants(product=product, color=color, size=size)
                 if len(variants) == 1:
@@ -504,6 +523,22 @@ class CartAgent(BaseAgent):
             pass
         return "item"
 
+    def _product_names(
+        self,
+        product_ids: list[str],
+        *,
+        prefetched: dict[str, dict[str, Any]] | None = None,
+    ) -> dict[str, str]:
+        known = dict(prefetched or {})
+        missing = [product_id for product_id in product_ids if product_id not in known]
+        if missing:
+            known.update(self.product_service.get_products(missing))
+        names: dict[str, str] = {}
+        for product_id in product_ids:
+            name = str(known.get(product_id, {}).get("name", "")).strip()
+            names[product_id] = name or "item"
+        return names
+
     def _infer_from_recent(self, recent: list[dict[str, Any]]) -> dict[str, Any]:
         for record in reversed(recent):
             data = record.get("response", {}).get("data", {})
@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+import asyncio
+from concurrent.futures import Future, ThreadPoolExecutor
+from threading import Lock
+from time import perf_counter
+
+from app.agents.base_agent import BaseAgent
+from app.infrastructure.observability import MetricsCollector
+from app.orchestrator.types import AgentAction, AgentContext, AgentExecutionResult
+
+
+class AgentExecutor:
+    """Runs agent actions: async-native ones on the loop, legacy sync ones on a bounded pool.
+
+    The pool is separate from the default executor, so agent work cannot starve
+    other ``to_thread`` users (and vice versa), and its queue depth is visible
+    in metrics.
+    """
+
+    def __init__(self, *, max_workers: int = 16, metrics_collector: MetricsCollector | None = None) -> None:
+        self.max_workers = max(1, int(max_workers))
+        self.metrics_collector = metrics_collector
+        self._pool: ThreadPoolExecutor | None = None
+        self._lock = Lock()
+        self._queued = 0
+        self._running = 0
+        self._publish()
+
+    async def run(self, agent: BaseAgent, action: AgentAction, context: AgentContext) -> AgentExecutionResult:
+        started = perf_counter()
+        if getattr(agent, "async_native", False) or action.name in getattr(agent, "native_actions", ()):
+            try:
+                return await agent.aexecute(action, context)
+            finally:
+                self._record(agent.name, context, mode="native", duration_ms=(perf_counter() - started) * 1000)
+
+        with self._lock:
+            self._queued += 1
+        self._publish()
+
+        def work() -> AgentExecutionResult:
+            with self._lock:
+                self._queued -= 1
+                self._running += 1
+            self._publish()
+            try:
+                return agent.execute(action, context)
+            finally:
+                with self._lock:
+                    self._running -= 1
+                self._publish()
+
+        future = self._executor().submit(work)
+        future.add_done_callback(self._forget_if_cancelled)
+        try:
+            return await asyncio.wrap_future(future)
+        finally:
+            self._record(agent.name, context, mode="executor", duration_ms=(perf_counter() - started) * 1000)
+
+    def _forget_if_cancelled(self, future: Future[AgentExecutionResult]) -> None:
+        # A cancelled caller withdraws work that never reached a worker.
+        if future.cancelled():
+            with self._lock:
+                self._queued -= 1
+            self._publish()
+
+    def shutdown(self, *, wait: bool = True) -> None:
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=wait)
+
+    def _executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="agent")
+            return self._pool
+
+    def _record(self, agent_name: str, context: AgentContext, *, mode: str, duration_ms: float) -> None:
+        trace = getattr(context, "trace", None)
+        if trace is not None:
+            trace.add("agent", duration_ms, agent=agent_name)
+        if self.metrics_collector is None:
+            return
+        self.metrics_collector.record_agent_execution(agent=agent_name, mode=mode, duration_ms=duration_ms)
+
+    def _publish(self) -> None:
+        if self.metrics_collector is None:
+            return
+        with self._lock:
+            queued, running = self._queued, self._running
+        self.metrics_collector.set_agent_executor_state(queued=queued, running=running, workers=self.max_workers)
@@ -6,6 +6,7 @@ from app.infrastructure.llm_client import LLMClient
 
 class GeneralAgent(BaseAgent):
     name = "general"
+    async_native = True
 
     def __init__(self, llm_client: LLMClient) -> None:
         self.llm_client = llm_client
@@ -18,6 +19,9 @@ class GeneralAgent(BaseAgent):
             data={},
         )
 
+    async def aexecute(self, action: AgentAction, context: AgentContext) -> AgentExecutionResult:
+        return self.execute(action, context)
+
     async def execute_stream(self, action: AgentAction, context: AgentContext) -> AsyncIterator[str]:
         query = str(action.params.get("query", context.initial_intent.get("message", "Internal error"))).strip()
         system_prompt = (
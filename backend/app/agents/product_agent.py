@@ -10,12 +10,20 @@ from app.services.product_service import ProductService
 
 class ProductAgent(BaseAgent):
     name = "product"
+    async_native = True
 
     def __init__(self, product_service: ProductService) -> None:
         self.product_service = product_service
 
     def execute(self, action: AgentAction, context: AgentContext) -> AgentExecutionResult:
-        params = action.params
+        filters, reasons = self._search_filters(action.params, context=context)
+        return self._respond(self.product_service.list_products(**filters), context=context, reasons=reasons)
+
+    async def aexecute(self, action: AgentAction, context: AgentContext) -> AgentExecutionResult:
+        filters, reasons = self._search_filters(action.params, context=context)
+        return self._respond(await self.product_service.alist_products(**filters), context=context, reasons=reasons)
+
+    def _search_filters(self, params: dict[str, Any], *, context: AgentContext) -> tuple[dict[str, Any], list[str]]:
         raw_query = str(params.get("query", "")).strip()
         query = self._normalize_query(raw_query)
         if self._should_browse_without_query(raw_query=raw_query, normalized_query=query):
@@ -24,36 +32,26 @@ class ProductAgent(BaseAgent):
         inferred_brand = self._infer_brand(query=query)
         preferred_category, preference_reason = self._preferred_category(context=context, query=query)
         preferred_brand, brand_reason = self._preferred_brand(context=context, query=query)
-        category = inferred_category or preferred_category
-        brand = inferred_brand or preferred_brand
-        results = self.product_service.list_products(
-            query=query or None,
-            category=category,
-            brand=brand,
-            min_price=params.get("minPrice"),
-            max_price=params.get("maxPrice"),
-            page=1,
-            limit=8,
-        )
+        color = str(params.get("color") or self._preferred_color(context=context) or "").strip().lower()
+        size = str(params.get("size") or "").strip().lower()
+        filters = {
+            "query": query or None,
+            "category": inferred_category or preferred_category,
+            "brand": inferred_brand or preferred_brand,
+            "min_price": params.get("minPrice"),
+            "max_price": params.get("maxPrice"),
+            "page": 1,
+            "limit": 8,
+            "color": color or None,
+            "size": size or None,
+            "affinities": self._affinities(context=context),
+        }
+        return filters, [reason for reason in (preference_reason, brand_reason) if reason]
 
-        preferred_color = self._preferred_color(context=context)
-        if "color" in params or preferred_color:
-            color = str(params.get("color") or preferred_color).lower()
-            filtered_products: list[dict[str, Any]] = []
-            for product in results["products"]:
-                if any(v["color"].lower() == color for v in product["variants"]):
-                    filtered_products.append(product)
-            results["products"] = filtered_products
-            results["pagination"]["total"] = len(filtered_products)
-            results["pagination"]["pages"] = 1
-
-        products = self._sort_with_affinity(results["products"], context=context)
-        results["products"] = products
-        reasons: list[str] = []
-        if preference_reason:
-            reasons.append(preference_reason)
-        if brand_reason:
-            reasons.append(brand_reason)
+    def _respond(
+        self, results: dict[str, Any], *, context: AgentContext, reasons: list[str]
+    ) -> AgentExecutionResult:
+        products = results["products"]
         reason_snippet = ""
         if reasons:
             reason_snippet = " Based on your saved preference for " + " and ".join(reasons) + "."
@@ -179,28 +177,8 @@ class ProductAgent(BaseAgent):
                 return candidate, f"your past interest in {candidate}"
         return None, ""
 
-    def _sort_with_affinity(
-        self, products: list[dict[str, Any]], *, context: AgentContext
-    ) -> list[dict[str, Any]]:
+    def _affinities(self, *, context: AgentContext) -> dict[str, Any] | None:
+        # Ranked by the product service over every match, before pagination.
         memory = context.memory or {}
         affinities = memory.get("productAffinities") if isinstance(memory, dict) else None
-        if not isinstance(affinities, dict):
-            return products
-
-        product_scores = affinities.get("products", {})
-        category_scores = affinities.get("categories", {})
-        brand_scores = affinities.get("brands", {})
-        if not isinstance(product_scores, dict) or not isinstance(category_scores, dict):
-            return products
-
-        def rank(item: dict[str, Any]) -> tuple[int, int, int, float]:
-            product_id = str(item.get("id", ""))
-            category = str(item.get("category", "")).strip().lower()
-            brand = str(item.get("brand", "")).strip().lower()
-            direct = int(product_scores.get(product_id, 0))
-            by_category = int(category_scores.get(category, 0))
-            by_brand = int(brand_scores.get(brand, 0)) if isinstance(brand_scores, dict) else 0
-            rating = float(item.get("rating", 0.0))
-            return (direct, by_category, by_brand, rating)
-
-        return sorted(products, key=rank, reverse=True)
+        return affinities if isinstance(affinities, dict) else None
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from copy import deepcopy
 from typing import Any
 
 from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
@@ -51,8 +52,8 @@ def list_products(
     _: dict[str, object] = Depends(require_admin),
 ) -> dict[str, Any]:
     """Return all products for the admin dashboard."""
-    products = list(product_repository.list_all().values()) if hasattr(product_repository.list_all(), 'values') else product_repository.list_all()
-    return {"products": products[:limit]}
+    products = product_repository.snapshot().products[:limit]
+    return {"products": deepcopy(list(products))}
 
 
 @router.get("/users")
@@ -14,6 +14,8 @@ def list_products(
     brand: str | None = Query(default=None),
     minPrice: float | None = Query(default=None),
     maxPrice: float | None = Query(default=None),
+    color: str | None = Query(default=None),
+    size: str | None = Query(default=None),
     page: int = Query(default=1, ge=1),
     limit: int = Query(default=20, ge=1, le=100),
 ) -> dict[str, object]:
@@ -25,9 +27,19 @@ def list_products(
         max_price=maxPrice,
         page=page,
         limit=limit,
+        color=color,
+        size=size,
     )
 
 
+@router.get("/suggest")
+def suggest_products(
+    query: str = Query(default="", max_length=100),
+    limit: int = Query(default=8, ge=1, le=10),
+) -> dict[str, object]:
+    return product_service.suggest(query, limit=limit)
+
+
 @router.get("/{product_id}")
 def get_product(product_id: str) -> dict[str, object]:
     return product_service.get_product(product_id=product_id)
@@ -1,7 +1,10 @@
 from __future__ import annotations
 
+import asyncio
+
 from app.core.config import Settings
 from app.agents.cart_agent import CartAgent
+from app.agents.executor import AgentExecutor
 from app.agents.memory_agent import MemoryAgent
 from app.agents.order_agent import OrderAgent
 from app.agents.product_agent import ProductAgent
@@ -10,15 +13,20 @@ from app.agents.general_agent import GeneralAgent
 from app.orchestrator.action_extractor import ActionExtractor
 from app.orchestrator.agent_router import AgentRouter
 from app.orchestrator.context_builder import ContextBuilder
+from app.orchestrator.intent_cache import IntentCache
 from app.orchestrator.intent_classifier import IntentClassifier
+from app.orchestrator.intent_model import IntentModel
 from app.orchestrator.orchestrator_core import Orchestrator
 from app.orchestrator.response_formatter import ResponseFormatter
 from app.infrastructure.superu_client import SuperUClient
 from app.infrastructure.persistence_clients import MongoClientManager, RedisClientManager
 from app.infrastructure.observability import MetricsCollector
+from app.infrastructure.concurrency_limiter import AdaptiveConcurrencyLimiter
 from app.infrastructure.llm_client import LLMClient
+from app.infrastructure.llm_response_cache import LLMResponseCache
 from app.infrastructure.rate_limiter import SlidingWindowRateLimiter
 from app.infrastructure.state_persistence import StatePersistence
+from app.infrastructure.write_behind import WriteBehindQueue
 from app.repositories.admin_activity_repository import AdminActivityRepository
 from app.repositories.auth_repository import AuthRepository
 from app.repositories.cart_repository import CartRepository
@@ -44,6 +52,8 @@ from app.services.notification_service import NotificationService
 from app.services.order_service import OrderService
 from app.services.payment_service import PaymentService
 from app.services.product_service import ProductService
+from app.services.catalog.search_index import ProductSearchIndex
+from app.services.catalog.result_cache import SearchResultCache
 from app.services.session_service import SessionService
 from app.services.support_service import SupportService
 from app.services.voice_recovery_service import VoiceRecoveryService
@@ -63,7 +73,33 @@ class Container:
         )
         self.rate_limiter = SlidingWindowRateLimiter()
         self.metrics_collector = MetricsCollector()
-        self.llm_client = LLMClient(settings=self.settings)
+        self.write_behind = WriteBehindQueue(
+            name="bookkeeping",
+            max_pending=self.settings.write_behind_max_pending,
+            batch_size=self.settings.write_behind_batch_size,
+            flush_interval_seconds=self.settings.write_behind_flush_interval_ms / 1000,
+            max_attempts=self.settings.write_behind_max_attempts,
+            metrics_collector=self.metrics_collector,
+        )
+        self.llm_response_cache = LLMResponseCache(
+            redis_manager=self.redis_manager,
+            metrics_collector=self.metrics_collector,
+            max_entries=self.settings.llm_cache_max_entries,
+            ttl_seconds=self.settings.llm_cache_ttl_seconds,
+        )
+        self.llm_limiter = AdaptiveConcurrencyLimiter(
+            name="llm",
+            initial_limit=self.settings.llm_concurrency_initial_limit,
+            min_limit=self.settings.llm_concurrency_min_limit,
+            max_limit=self.settings.llm_concurrency_max_limit,
+            latency_target_ms=self.settings.llm_concurrency_latency_target_ms,
+            metrics_collector=self.metrics_collector,
+        )
+        self.llm_client = LLMClient(
+            settings=self.settings,
+            response_cache=self.llm_response_cache,
+            limiter=self.llm_limiter,
+        )
         self.state_persistence = StatePersistence(
             mongo_manager=self.mongo_manager,
             redis_manager=self.redis_manager,
@@ -80,6 +116,7 @@ class Container:
         self.product_repository = ProductRepository(
             mongo_manager=self.mongo_manager,
             redis_manager=self.redis_manager,
+            version_check_interval_seconds=self.settings.catalog_version_check_interval_seconds,
         )
         self.category_repository = CategoryRepository(
             mongo_manager=self.mongo_manager,
@@ -92,10 +129,21 @@ class Container:
         self.notification_repository = NotificationRepository(
             mongo_manager=self.mongo_manager,
         )
+        self.product_search_index = ProductSearchIndex(
+            metrics_collector=self.metrics_collector,
+        )
+        self.search_result_cache = SearchResultCache(
+            redis_manager=self.redis_manager,
+            metrics_collector=self.metrics_collector,
+            max_entries=self.settings.search_cache_max_entries,
+            ttl_seconds=self.settings.search_cache_ttl_seconds,
+        )
         self.product_service = ProductService(
             product_repository=self.product_repository,
             category_repository=self.category_repository,
             inventory_repository=self.inventory_repository,
+            search_index=self.product_search_index,
+            result_cache=self.search_result_cache,
         )
         self.category_service = CategoryService(
             category_repository=self.category_repository,
@@ -106,7 +154,8 @@ class Container:
             redis_manager=self.redis_manager,
         )
         self.session_service = SessionService(
-            session_repository=self.session_repository
+            session_repository=self.session_repository,
+            write_behind=self.write_behind,
         )
         self.cart_repository = CartRepository(
             mongo_manager=self.mongo_manager,
@@ -155,10 +204,12 @@ class Container:
             order_repository=self.order_repository,
         )
         self.memory_service = MemoryService(
-            memory_repository=self.memory_repository
+            memory_repository=self.memory_repository,
+            write_behind=self.write_behind,
         )
         self.interaction_service = InteractionService(
             interaction_repository=self.interaction_repository,
+            write_behind=self.write_behind,
         )
         self.support_service = SupportService(
             support_repository=self.support_repository,
@@ -184,6 +235,7 @@ class Container:
             support_repository=self.support_repository,
             product_repository=self.product_repository,
             voice_recovery_service=self.voice_recovery_service,
+            write_behind=self.write_behind,
         )
 
         self.product_agent = ProductAgent(product_service=self.product_service)
@@ -196,8 +248,24 @@ class Container:
         self.general_agent = GeneralAgent(llm_client=self.llm_client)
         self.memory_agent = MemoryAgent(memory_service=self.memory_service)
 
+        self.intent_cache = IntentCache(
+            max_entries=self.settings.intent_cache_max_entries,
+            metrics_collector=self.metrics_collector,
+        )
+        self.intent_model = (
+            IntentModel.load(self.settings.intent_model_path) if self.settings.intent_model_path else None
+        )
+        self.agent_executor = AgentExecutor(
+            max_workers=self.settings.agent_executor_max_workers,
+            metrics_collector=self.metrics_collector,
+        )
         self.orchestrator = Orchestrator(
-            intent_classifier=IntentClassifier(llm_client=self.llm_client),
+            intent_classifier=IntentClassifier(
+                llm_client=self.llm_client,
+                cache=self.intent_cache,
+                model=self.intent_model,
+                model_min_confidence=self.settings.intent_model_min_confidence,
+            ),
             context_builder=ContextBuilder(
                 session_service=self.session_service,
                 cart_service=self.cart_service,
@@ -217,13 +285,26 @@ class Container:
                 self.general_agent.name: self.general_agent,
                 self.memory_agent.name: self.memory_agent,
             },
+            agent_executor=self.agent_executor,
+            metrics_collector=self.metrics_collector,
         )
 
     async def start(self) -> None:
         self.mongo_manager.connect()
         self.redis_manager.connect()
+        await self.mongo_manager.aconnect()
+        await self.redis_manager.aconnect()
+        self.product_service.warm_search_index()
 
     async def stop(self) -> None:
+        await self.llm_client.aclose()
+        self.agent_executor.shutdown(wait=False)
+        await asyncio.to_thread(
+            self.write_behind.close,
+            timeout=self.settings.write_behind_drain_timeout_seconds,
+        )
+        await self.mongo_manager.adisconnect()
+        await self.redis_manager.adisconnect()
         self.mongo_manager.disconnect()
         self.redis_manager.disconnect()
 
@@ -236,7 +317,9 @@ mongo_manager = container.mongo_manager
 redis_manager = container.redis_manager
 rate_limiter = container.rate_limiter
 metrics_collector = container.metrics_collector
+write_behind = container.write_behind
 llm_client = container.llm_client
+llm_response_cache = container.llm_response_cache
 state_persistence = container.state_persistence
 auth_repository = container.auth_repository
 auth_service = container.auth_service
@@ -244,6 +327,9 @@ product_repository = container.product_repository
 category_repository = container.category_repository
 inventory_repository = container.inventory_repository
 notification_repository = container.notification_repository
+product_search_index = container.product_search_index
+search_result_cache = container.search_result_cache
+intent_cache = container.intent_cache
 product_service = container.product_service
 category_service = container.category_service
 session_repository = container.session_repository
@@ -17,6 +17,9 @@ class Settings:
     mongodb_uri: str = "mongodb://localhost:27017/commerce"
     redis_url: str = "redis://localhost:6379/0"
     enable_external_services: bool = True
+    catalog_version_check_interval_seconds: float = 1.0
+    search_cache_max_entries: int = 512
+    search_cache_ttl_seconds: int = 300
     rate_limit_anonymous_per_minute: int = 120
     rate_limit_authenticated_per_minute: int = 600
     rate_limit_admin_per_minute: int = 2000
@@ -31,11 +34,24 @@ class Settings:
     llm_provider: str = "openrouter"
     llm_model: str = "meta-llama/llama-3.1-8b-instruct:free"
     llm_timeout_seconds: float = 8.0
+    llm_connect_timeout_seconds: float = 3.0
+    llm_http_max_connections: int = 20
+    llm_http_max_keepalive_connections: int = 10
+    llm_http_keepalive_expiry_seconds: float = 30.0
+    llm_cache_max_entries: int = 1024
+    llm_cache_ttl_seconds: int = 900
+    llm_concurrency_initial_limit: int = 8
+    llm_concurrency_min_limit: int = 1
+    llm_concurrency_max_limit: int = 32
+    llm_concurrency_latency_target_ms: float = 3000.0
     llm_max_tokens: int = 200
     llm_temperature: float = 0.0
     llm_circuit_breaker_failure_threshold: int = 5
     llm_circuit_breaker_timeout_seconds: float = 60.0
     llm_intent_classifier_enabled: bool = False
+    intent_cache_max_entries: int = 2048
+    intent_model_path: str = ""
+    intent_model_min_confidence: float = 0.8
     llm_planner_enabled: bool = True
     llm_decision_policy: str = "planner_first"
     planner_feature_enabled: bool = True
@@ -43,7 +59,17 @@ class Settings:
     llm_planner_max_actions: int = 5
     llm_planner_min_confidence: float = 0.55
     llm_planner_execution_mode: str = "partial"
+    llm_planner_latency_budget_ms: int = 2500
+    llm_planner_speculation_enabled: bool = True
     orchestrator_max_actions_per_request: int = 5
+    orchestrator_request_deadline_ms: int = 8000
+    orchestrator_debug_timings: bool = False
+    agent_executor_max_workers: int = 16
+    write_behind_max_pending: int = 10000
+    write_behind_batch_size: int = 256
+    write_behind_flush_interval_ms: int = 50
+    write_behind_max_attempts: int = 3
+    write_behind_drain_timeout_seconds: float = 5.0
     ws_heartbeat_interval_seconds: float = 25.0
     ws_heartbeat_timeout_seconds: float = 70.0
     ws_max_message_chars: int = 2000
@@ -103,6 +129,18 @@ class Settings:
             redis_url=os.getenv("REDIS_URL", cls.redis_url),
             enable_external_services=os.getenv("ENABLE_EXTERNAL_SERVICES", "false").lower()
             in {"1", "true", "yes"},
+            catalog_version_check_interval_seconds=float(
+                os.getenv(
+                    "CATALOG_VERSION_CHECK_INTERVAL_SECONDS",
+                    str(cls.catalog_version_check_interval_seconds),
+                )
+            ),
+            search_cache_max_entries=int(
+                os.getenv("SEARCH_CACHE_MAX_ENTRIES", str(cls.search_cache_max_entries))
+            ),
+            search_cache_ttl_seconds=int(
+                os.getenv("SEARCH_CACHE_TTL_SECONDS", str(cls.search_cache_ttl_seconds))
+            ),
             rate_limit_anonymous_per_minute=int(
                 os.getenv(
                     "RATE_LIMIT_ANONYMOUS_PER_MINUTE",
@@ -136,6 +174,61 @@ class Settings:
             llm_provider=os.getenv("LLM_PROVIDER", cls.llm_provider),
             llm_model=os.getenv("LLM_MODEL", cls.llm_model),
             llm_timeout_seconds=float(os.getenv("LLM_TIMEOUT_SECONDS", str(cls.llm_timeout_seconds))),
+            llm_connect_timeout_seconds=max(
+                0.1,
+                float(os.getenv("LLM_CONNECT_TIMEOUT_SECONDS", str(cls.llm_connect_timeout_seconds))),
+            ),
+            llm_http_max_connections=max(
+                1,
+                int(os.getenv("LLM_HTTP_MAX_CONNECTIONS", str(cls.llm_http_max_connections))),
+            ),
+            llm_http_max_keepalive_connections=max(
+                0,
+                int(
+                    os.getenv(
+                        "LLM_HTTP_MAX_KEEPALIVE_CONNECTIONS",
+                        str(cls.llm_http_max_keepalive_connections),
+                    )
+                ),
+            ),
+            llm_http_keepalive_expiry_seconds=max(
+                0.0,
+                float(
+                    os.getenv(
+                        "LLM_HTTP_KEEPALIVE_EXPIRY_SECONDS",
+                        str(cls.llm_http_keepalive_expiry_seconds),
+                    )
+                ),
+            ),
+            llm_cache_max_entries=max(
+                0,
+                int(os.getenv("LLM_CACHE_MAX_ENTRIES", str(cls.llm_cache_max_entries))),
+            ),
+            llm_cache_ttl_seconds=max(
+                1,
+                int(os.getenv("LLM_CACHE_TTL_SECONDS", str(cls.llm_cache_ttl_seconds))),
+            ),
+            llm_concurrency_initial_limit=max(
+                1,
+                int(os.getenv("LLM_CONCURRENCY_INITIAL_LIMIT", str(cls.llm_concurrency_initial_limit))),
+            ),
+            llm_concurrency_min_limit=max(
+                1,
+                int(os.getenv("LLM_CONCURRENCY_MIN_LIMIT", str(cls.llm_concurrency_min_limit))),
+            ),
+            llm_concurrency_max_limit=max(
+                1,
+                int(os.getenv("LLM_CONCURRENCY_MAX_LIMIT", str(cls.llm_concurrency_max_limit))),
+            ),
+            llm_concurrency_latency_target_ms=max(
+                1.0,
+                float(
+                    os.getenv(
+                        "LLM_CONCURRENCY_LATENCY_TARGET_MS",
+                        str(cls.llm_concurrency_latency_target_ms),
+                    )
+                ),
+            ),
             llm_max_tokens=int(os.getenv("LLM_MAX_TOKENS", str(cls.llm_max_tokens))),
             llm_temperature=float(os.getenv("LLM_TEMPERATURE", str(cls.llm_temperature))),
             llm_circuit_breaker_failure_threshold=int(
@@ -154,6 +247,22 @@ class Settings:
                 "LLM_INTENT_CLASSIFIER_ENABLED", str(cls.llm_intent_classifier_enabled)
             ).lower()
             in {"1", "true", "yes"},
+            intent_cache_max_entries=int(
+                os.getenv("INTENT_CACHE_MAX_ENTRIES", str(cls.intent_cache_max_entries))
+            ),
+            intent_model_path=os.getenv("INTENT_MODEL_PATH", cls.intent_model_path).strip(),
+            intent_model_min_confidence=max(
+                0.0,
+                min(
+                    1.0,
+                    float(
+                        os.getenv(
+                            "INTENT_MODEL_MIN_CONFIDENCE",
+                            str(cls.intent_model_min_confidence),
+                        )
+                    ),
+                ),
+            ),
             llm_planner_enabled=os.getenv(
                 "LLM_PLANNER_ENABLED", str(cls.llm_planner_enabled)
             ).lower()
@@ -213,6 +322,14 @@ class Settings:
             .strip()
             .lower()
             or cls.llm_planner_execution_mode,
+            llm_planner_latency_budget_ms=max(
+                0,
+                int(os.getenv("LLM_PLANNER_LATENCY_BUDGET_MS", str(cls.llm_planner_latency_budget_ms))),
+            ),
+            llm_planner_speculation_enabled=os.getenv(
+                "LLM_PLANNER_SPECULATION_ENABLED", str(cls.llm_planner_speculation_enabled)
+            ).lower()
+            in {"1", "true", "yes"},
             orchestrator_max_actions_per_request=max(
                 1,
                 min(
@@ -225,6 +342,43 @@ class Settings:
                     ),
                 ),
             ),
+            orchestrator_request_deadline_ms=max(
+                0,
+                int(os.getenv("ORCHESTRATOR_REQUEST_DEADLINE_MS", str(cls.orchestrator_request_deadline_ms))),
+            ),
+            orchestrator_debug_timings=os.getenv(
+                "ORCHESTRATOR_DEBUG_TIMINGS", str(cls.orchestrator_debug_timings)
+            ).lower()
+            in {"1", "true", "yes"},
+            agent_executor_max_workers=max(
+                1,
+                int(os.getenv("AGENT_EXECUTOR_MAX_WORKERS", str(cls.agent_executor_max_workers))),
+            ),
+            write_behind_max_pending=max(
+                0,
+                int(os.getenv("WRITE_BEHIND_MAX_PENDING", str(cls.write_behind_max_pending))),
+            ),
+            write_behind_batch_size=max(
+                1,
+                int(os.getenv("WRITE_BEHIND_BATCH_SIZE", str(cls.write_behind_batch_size))),
+            ),
+            write_behind_flush_interval_ms=max(
+                0,
+                int(os.getenv("WRITE_BEHIND_FLUSH_INTERVAL_MS", str(cls.write_behind_flush_interval_ms))),
+            ),
+            write_behind_max_attempts=max(
+                1,
+                int(os.getenv("WRITE_BEHIND_MAX_ATTEMPTS", str(cls.write_behind_max_attempts))),
+            ),
+            write_behind_drain_timeout_seconds=max(
+                0.0,
+                float(
+                    os.getenv(
+                        "WRITE_BEHIND_DRAIN_TIMEOUT_SECONDS",
+                        str(cls.write_behind_drain_timeout_seconds),
+                    )
+                ),
+            ),
             ws_heartbeat_interval_seconds=float(
                 os.getenv(
                     "WS_HEARTBEAT_INTERVAL_SECONDS",
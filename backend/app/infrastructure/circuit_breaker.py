@@ -3,7 +3,7 @@ from __future__ import annotations
 from dataclasses import dataclass
 from threading import RLock
 from time import monotonic
-from typing import Any, Callable, TypeVar
+from typing import Any, Awaitable, Callable, TypeVar
 
 T = TypeVar("T")
 
@@ -54,12 +54,30 @@ class CircuitBreaker:
                 self._on_failure()
             raise
 
+        self._on_success(in_half_open)
+        return value
+
+    async def acall(self, fn: Callable[[], Awaitable[T]]) -> T:
+        with self._lock:
+            self._pre_call_gate()
+            in_half_open = self._state == "half_open"
+
+        try:
+            value = await fn()
+        except Exception:
+            with self._lock:
+                self._on_failure()
+            raise
+
+        self._on_success(in_half_open)
+        return value
+
+    def _on_success(self, in_half_open: bool) -> None:
         with self._lock:
             if in_half_open:
                 self._state = "closed"
             self._failure_count = 0
             self._opened_at_monotonic = None
-        return value
 
     def _pre_call_gate(self) -> None:
         if self._state == "open":
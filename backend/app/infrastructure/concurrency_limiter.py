@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from threading import Lock
+
+from app.infrastructure.observability import MetricsCollector
+
+
+class ConcurrencyLimitExceededError(RuntimeError):
+    """Raised when a limiter has no free slot and the caller should fall back."""
+
+
+@dataclass(frozen=True)
+class ConcurrencyLimiterSnapshot:
+    limit: int
+    in_flight: int
+    rejected: int
+
+
+class AdaptiveConcurrencyLimiter:
+    """AIMD limit on in-flight calls, capped by a fixed bulkhead size.
+
+    Each call that finishes within ``latency_target_ms`` while the limit was
+    actually in use grows the limit by ``1 / limit`` (about one slot per round of
+    calls). A failure or a slow call multiplies it by ``backoff``, at most once
+    per window: the calls already in flight when the limit drops saw the same
+    congestion, so their releases do not move the limit again. Callers that
+    find no free slot are rejected at once instead of queueing, so a slow
+    provider turns into fast fallbacks rather than piled-up requests.
+    """
+
+    def __init__(
+        self,
+        *,
+        name: str = "llm",
+        initial_limit: int = 8,
+        min_limit: int = 1,
+        max_limit: int = 32,
+        latency_target_ms: float = 3000.0,
+        backoff: float = 0.75,
+        metrics_collector: MetricsCollector | None = None,
+    ) -> None:
+        self.name = name
+        self.min_limit = max(1, int(min_limit))
+        self.max_limit = max(self.min_limit, int(max_limit))
+        self.latency_target_ms = max(1.0, float(latency_target_ms))
+        self.backoff = min(0.99, max(0.1, float(backoff)))
+        self.metrics_collector = metrics_collector
+        self._limit = float(min(self.max_limit, max(self.min_limit, int(initial_limit))))
+        self._in_flight = 0
+        self._rejected = 0
+        self._draining = 0
+        self._lock = Lock()
+        self._publish()
+
+    @property
+    def snapshot(self) -> ConcurrencyLimiterSnapshot:
+        with self._lock:
+            return ConcurrencyLimiterSnapshot(limit=int(self._limit), in_flight=self._in_flight, rejected=self._rejected)
+
+    def try_acquire(self) -> bool:
+        with self._lock:
+            admitted = self._in_flight < int(self._limit)
+            if admitted:
+                self._in_flight += 1
+            else:
+                self._rejected += 1
+        if not admitted and self.metrics_collector is not None:
+            self.metrics_collector.record_concurrency_rejection(limiter=self.name)
+        self._publish()
+        return admitted
+
+    def acquire(self) -> None:
+        if not self.try_acquire():
+            raise ConcurrencyLimitExceededError(f"{self.name} concurrency limit reached")
+
+    def release(self, *, latency_ms: float | None = None, success: bool = True) -> None:
+        """Free a slot; ``latency_ms=None`` frees it without adjusting the limit."""
+        with self._lock:
+            saturated = self._in_flight * 2 >= self._limit
+            self._in_flight = max(0, self._in_flight - 1)
+            if self._draining:
+                # Admitted before the last backoff; its signal is already counted.
+                self._draining -= 1
+            elif latency_ms is not None:
+                if not success or latency_ms > self.latency_target_ms:
+                    self._limit = max(float(self.min_limit), self._limit * self.backoff)
+                    self._draining = self._in_flight
+                elif saturated:
+                    self._limit = min(float(self.max_limit), self._limit + 1.0 / self._limit)
+        self._publish()
+
+    def _publish(self) -> None:
+        if self.metrics_collector is None:
+            return
+        with self._lock:
+            limit, in_flight = int(self._limit), self._in_flight
+        self.metrics_collector.set_concurrency_state(limiter=self.name, limit=limit, in_flight=in_flight)
@@ -1,15 +1,32 @@
 from __future__ import annotations
 
+import asyncio
 import json
 import re
-from dataclasses import dataclass
-from typing import Any
+from concurrent.futures import Future
+from contextlib import suppress
+from copy import deepcopy
+from dataclasses import asdict, dataclass
+from time import perf_counter
+from typing import Any, Awaitable, Callable, TypeVar
 
 import httpx
 
 from app.core.config import Settings
 from app.infrastructure.circuit_breaker import CircuitBreaker, CircuitBreakerOpenError
+from app.infrastructure.concurrency_limiter import AdaptiveConcurrencyLimiter, ConcurrencyLimitExceededError
+from app.infrastructure.llm_response_cache import LLMResponseCache
 from app.infrastructure.prompts import ACTION_PLANNING_PROMPT, INTENT_CLASSIFICATION_PROMPT
+from app.infrastructure.single_flight import SingleFlight
+
+T = TypeVar("T")
+
+
+async def _close_http_client(client: httpx.AsyncClient) -> None:
+    # Connections opened on a loop that has since closed raise while shutting
+    # down, after their sockets are already released.
+    with suppress(RuntimeError):
+        await client.aclose()
 
 
 @dataclass
@@ -17,6 +34,7 @@ class LLMIntentPrediction:
     intent: str
     confidence: float
     entities: dict[str, Any]
+    cached: bool = False
 
 
 @dataclass
@@ -32,6 +50,7 @@ class LLMActionPlan:
     confidence: float
     needs_clarification: bool
     clarification_question: str
+    cached: bool = False
 
 
 class LLMClient:
@@ -153,12 +172,31 @@ class LLMClient:
     }
 
 
-    def __init__(self, settings: Settings) -> None:
+    def __init__(
+        self,
+        settings: Settings,
+        *,
+        transport: httpx.AsyncBaseTransport | None = None,
+        response_cache: LLMResponseCache | None = None,
+        limiter: AdaptiveConcurrencyLimiter | None = None,
+    ) -> None:
         self.settings = settings
+        self.response_cache = response_cache if response_cache is not None else LLMResponseCache(max_entries=0)
+        self.limiter = limiter if limiter is not None else AdaptiveConcurrencyLimiter(
+            initial_limit=settings.llm_concurrency_initial_limit,
+            min_limit=settings.llm_concurrency_min_limit,
+            max_limit=settings.llm_concurrency_max_limit,
+            latency_target_ms=settings.llm_concurrency_latency_target_ms,
+        )
         self.circuit_breaker = CircuitBreaker(
             failure_threshold=settings.llm_circuit_breaker_failure_threshold,
             recovery_timeout_seconds=settings.llm_circuit_breaker_timeout_seconds,
         )
+        self.flights = SingleFlight()
+        self._transport = transport
+        self._http: httpx.AsyncClient | None = None
+        self._http_loop: asyncio.AbstractEventLoop | None = None
+        self._retiring: set[asyncio.Future[None] | Future[None]] = set()
 
     @property
     def enabled(self) -> bool:
@@ -184,31 +222,69 @@ class LLMClient:
         if not self.intent_classification_enabled:
             return None
         user_prompt = self._build_classification_prompt(message=message, recent_messages=recent_messages or [])
+        cache_key = self._cache_key("intent", system_prompt=INTENT_CLASSIFICATION_PROMPT, user_prompt=user_prompt)
+        cached = self._prediction_from_cache(self.response_cache.get(cache_key))
+        if cached is not None:
+            return cached
         try:
-            raw = self.circuit_breaker.call(lambda: self._call_llm(user_prompt=user_prompt, system_prompt=INTENT_CLASSIFICATION_PROMPT))
-        except CircuitBreakerOpenError:
+            prediction = self.flights.do(
+                cache_key, lambda: self._request_intent(user_prompt=user_prompt, cache_key=cache_key)
+            )
+        except (CircuitBreakerOpenError, ConcurrencyLimitExceededError):
             return None
         except Exception:
             return None
+        return deepcopy(prediction)
 
-        payload = self._try_parse_json(raw)
-        if payload is None:
+    async def aclassify_intent(
+        self, *, message: str, recent_messages: list[dict[str, Any]] | None = None
+    ) -> LLMIntentPrediction | None:
+        if not self.intent_classification_enabled:
+            return None
+        user_prompt = self._build_classification_prompt(message=message, recent_messages=recent_messages or [])
+        cache_key = self._cache_key("intent", system_prompt=INTENT_CLASSIFICATION_PROMPT, user_prompt=user_prompt)
+        cached = self._prediction_from_cache(await self.response_cache.aget(cache_key))
+        if cached is not None:
+            return cached
+        try:
+            prediction = await self.flights.ado(
+                cache_key, lambda: self._arequest_intent(user_prompt=user_prompt, cache_key=cache_key)
+            )
+        except (CircuitBreakerOpenError, ConcurrencyLimitExceededError):
             return None
+        except Exception:
+            return None
+        return deepcopy(prediction)
 
-        intent = str(payload.get("intent", "")).strip()
-        if intent not in self.SUPPORTED_INTENTS:
+    def plan_actions(
+        self,
+        *,
+        message: str,
+        recent_messages: list[dict[str, Any]] | None = None,
+        inferred_intent: str | None = None,
+    ) -> LLMActionPlan | None:
+        if not self.planner_enabled:
             return None
-        confidence = self._normalize_confidence(payload.get("confidence", 0.0))
-        entities = payload.get("entities", {})
-        if not isinstance(entities, dict):
-            entities = {}
-        return LLMIntentPrediction(
-            intent=intent,
-            confidence=confidence,
-            entities=entities,
+
+        user_prompt = self._build_action_plan_prompt(
+            message=message,
+            recent_messages=recent_messages or [],
+            inferred_intent=inferred_intent,
+            allowed_actions=sorted(self.SUPPORTED_PLANNER_ACTIONS.keys()),
         )
+        cache_key = self._cache_key("plan", system_prompt=ACTION_PLANNING_PROMPT, user_prompt=user_prompt)
+        cached = self._plan_from_cache(self.response_cache.get(cache_key))
+        if cached is not None:
+            return cached
+        try:
+            plan = self.flights.do(cache_key, lambda: self._request_plan(user_prompt=user_prompt, cache_key=cache_key))
+        except (CircuitBreakerOpenError, ConcurrencyLimitExceededError):
+            return None
+        except Exception:
+            return None
+        return deepcopy(plan)
 
-    def plan_actions(
+    async def aplan_actions(
         self,
         *,
         message: str,
@@ -224,13 +300,167 @@ class LLMClient:
             inferred_intent=inferred_intent,
             allowed_actions=sorted(self.SUPPORTED_PLANNER_ACTIONS.keys()),
         )
+        cache_key = self._cache_key("plan", system_prompt=ACTION_PLANNING_PROMPT, user_prompt=user_prompt)
+        cached = self._plan_from_cache(await self.response_cache.aget(cache_key))
+        if cached is not None:
+            return cached
         try:
-            raw = self.circuit_breaker.call(lambda: self._call_llm(user_prompt=user_prompt, system_prompt=ACTION_PLANNING_PROMPT))
-        except CircuitBreakerOpenError:
+            plan = await self.flights.ado(
+                cache_key, lambda: self._arequest_plan(user_prompt=user_prompt, cache_key=cache_key)
+            )
+        except (CircuitBreakerOpenError, ConcurrencyLimitExceededError):
             return None
         except Exception:
             return None
+        return deepcopy(plan)
+
+    async def aclose(self) -> None:
+        client, self._http, self._http_loop = self._http, None, None
+        if client is not None and not client.is_closed:
+            await client.aclose()
+        loop = asyncio.get_running_loop()
+        retiring, self._retiring = self._retiring, set()
+        # Tasks left on other (finished) loops cannot be awaited from here.
+        waits = [
+            asyncio.wrap_future(future)
+            for future in retiring
+            if not isinstance(future, asyncio.Future) or future.get_loop() is loop
+        ]
+        if waits:
+            await asyncio.gather(*waits, return_exceptions=True)
+
+    # One request per distinct prompt: concurrent callers with the same cache key
+    # share these through ``self.flights`` and get the leader's result or error.
+
+    def _request_intent(self, *, user_prompt: str, cache_key: str) -> LLMIntentPrediction | None:
+        raw = self._guarded_call(lambda: self._call_llm(user_prompt=user_prompt, system_prompt=INTENT_CLASSIFICATION_PROMPT))
+        prediction = self._parse_intent_prediction(raw)
+        if prediction is not None:
+            self.response_cache.put(cache_key, asdict(prediction))
+        return prediction
+
+    async def _arequest_intent(self, *, user_prompt: str, cache_key: str) -> LLMIntentPrediction | None:
+        raw = await self._aguarded_call(
+            lambda: self._acall_llm(user_prompt=user_prompt, system_prompt=INTENT_CLASSIFICATION_PROMPT)
+        )
+        prediction = self._parse_intent_prediction(raw)
+        if prediction is not None:
+            await self.response_cache.aput(cache_key, asdict(prediction))
+        return prediction
+
+    def _request_plan(self, *, user_prompt: str, cache_key: str) -> LLMActionPlan | None:
+        raw = self._guarded_call(lambda: self._call_llm(user_prompt=user_prompt, system_prompt=ACTION_PLANNING_PROMPT))
+        plan = self._parse_action_plan(raw)
+        if plan is not None:
+            self.response_cache.put(cache_key, asdict(plan))
+        return plan
+
+    async def _arequest_plan(self, *, user_prompt: str, cache_key: str) -> LLMActionPlan | None:
+        raw = await self._aguarded_call(
+            lambda: self._acall_llm(user_prompt=user_prompt, system_prompt=ACTION_PLANNING_PROMPT)
+        )
+        plan = self._parse_action_plan(raw)
+        if plan is not None:
+            await self.response_cache.aput(cache_key, asdict(plan))
+        return plan
+
+    def _guarded_call(self, fn: Callable[[], T]) -> T:
+        """Run ``fn`` in a limiter slot and through the circuit breaker.
+
+        A full limiter raises :class:`ConcurrencyLimitExceededError` straight away;
+        callers treat it like any other LLM failure and fall back to the rules.
+        """
+        self.limiter.acquire()
+        started = perf_counter()
+        try:
+            value = self.circuit_breaker.call(fn)
+        except CircuitBreakerOpenError:
+            self.limiter.release()
+            raise
+        except Exception:
+            self.limiter.release(latency_ms=(perf_counter() - started) * 1000, success=False)
+            raise
+        self.limiter.release(latency_ms=(perf_counter() - started) * 1000)
+        return value
+
+    async def _aguarded_call(self, fn: Callable[[], Awaitable[T]]) -> T:
+        self.limiter.acquire()
+        started = perf_counter()
+        try:
+            value = await self.circuit_breaker.acall(fn)
+        except (CircuitBreakerOpenError, asyncio.CancelledError):
+            self.limiter.release()
+            raise
+        except Exception:
+            self.limiter.release(latency_ms=(perf_counter() - started) * 1000, success=False)
+            raise
+        self.limiter.release(latency_ms=(perf_counter() - started) * 1000)
+        return value
+
+    def _cache_key(self, kind: str, *, system_prompt: str, user_prompt: str) -> str:
+        return LLMResponseCache.key(
+            kind=kind,
+            model=self.settings.llm_model,
+            temperature=self.settings.llm_temperature,
+            system_prompt=system_prompt,
+            user_prompt=user_prompt,
+        )
+
+    @staticmethod
+    def _prediction_from_cache(payload: dict[str, Any] | None) -> LLMIntentPrediction | None:
+        if payload is None:
+            return None
+        try:
+            return LLMIntentPrediction(
+                intent=str(payload["intent"]),
+                confidence=float(payload["confidence"]),
+                entities=dict(payload.get("entities") or {}),
+                cached=True,
+            )
+        except (KeyError, TypeError, ValueError):
+            return None
+
+    @staticmethod
+    def _plan_from_cache(payload: dict[str, Any] | None) -> LLMActionPlan | None:
+        if payload is None:
+            return None
+        try:
+            return LLMActionPlan(
+                actions=[
+                    LLMPlannedAction(
+                        name=str(row["name"]),
+                        target_agent=row.get("target_agent"),
+                        params=dict(row.get("params") or {}),
+                    )
+                    for row in payload["actions"]
+                ],
+                confidence=float(payload["confidence"]),
+                needs_clarification=bool(payload["needs_clarification"]),
+                clarification_question=str(payload.get("clarification_question", "")),
+                cached=True,
+            )
+        except (KeyError, TypeError, ValueError, AttributeError):
+            return None
+
+    def _parse_intent_prediction(self, raw: str) -> LLMIntentPrediction | None:
+        payload = self._try_parse_json(raw)
+        if payload is None:
+            return None
+
+        intent = str(payload.get("intent", "")).strip()
+        if intent not in self.SUPPORTED_INTENTS:
+            return None
+        confidence = self._normalize_confidence(payload.get("confidence", 0.0))
+        entities = payload.get("entities", {})
+        if not isinstance(entities, dict):
+            entities = {}
+        return LLMIntentPrediction(
+            intent=intent,
+            confidence=confidence,
+            entities=entities,
+        )
 
+    def _parse_action_plan(self, raw: str) -> LLMActionPlan | None:
         payload = self._try_parse_json(raw)
         if payload is None:
             return None
@@ -334,32 +564,119 @@ class LLMClient:
         return None
 
     def _call_llm(self, *, user_prompt: str, system_prompt: str) -> str:
-        api_key = self.settings.openrouter_api_key
-        if not api_key:
-            raise ValueError("OPENROUTER_API_KEY is not configured")
-
         response = httpx.post(
-            f"{self.settings.openrouter_base_url.rstrip('/')}/chat/completions",
-            headers={
-                "Authorization": f"Bearer {api_key}",
-                "Content-Type": "application/json",
-                "HTTP-Referer": "http://localhost:5173",
-                "X-Title": "Omnichannel Agentic Commerce",
-            },
-            json={
-                "model": self.settings.llm_model,
-                "messages": [
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": user_prompt},
-                ],
-                "temperature": self.settings.llm_temperature,
-                "max_tokens": self.settings.llm_max_tokens,
-                "response_format": {"type": "json_object"},
-            },
+            self._completions_url(),
+            headers=self._request_headers(),
+            json=self._completion_body(user_prompt=user_prompt, system_prompt=system_prompt),
             timeout=self.settings.llm_timeout_seconds,
         )
         response.raise_for_status()
-        payload = response.json()
+        return self._completion_content(response.json())
+
+    async def _acall_llm(self, *, user_prompt: str, system_prompt: str) -> str:
+        headers = self._request_headers()
+        response = await self._http_client().post(
+            self._completions_url(),
+            headers=headers,
+            json=self._completion_body(user_prompt=user_prompt, system_prompt=system_prompt),
+        )
+        response.raise_for_status()
+        return self._completion_content(response.json())
+
+    async def stream_response(self, *, user_prompt: str, system_prompt: str):
+        headers = self._request_headers()
+        body = self._completion_body(user_prompt=user_prompt, system_prompt=system_prompt, stream=True)
+        async with self._http_client().stream("POST", self._completions_url(), headers=headers, json=body) as response:
+            response.raise_for_status()
+            async for line in response.aiter_lines():
+                if not line.strip():
+                    continue
+                if line.startswith("data: "):
+                    data_str = line[6:].strip()
+                    if data_str == "[DONE]":
+                        break
+                    try:
+                        data = json.loads(data_str)
+                        delta = data.get("choices", [{}])[0].get("delta", {}).get("content", "")
+                        if delta:
+                            yield delta
+                    except json.JSONDecodeError:
+                        continue
+
+    def _http_client(self) -> httpx.AsyncClient:
+        """The shared keep-alive pool, created on first use inside the running event loop.
+
+        Pooled connections belong to the loop that opened them, so a caller on a
+        different loop (test clients spin one up per request) gets a fresh pool
+        and the previous one is closed.
+        """
+        loop = asyncio.get_running_loop()
+        if self._http is None or self._http.is_closed or self._http_loop is not loop:
+            if self._http is not None and not self._http.is_closed:
+                self._retire_http_client(self._http, self._http_loop, loop)
+            self._http = httpx.AsyncClient(
+                transport=self._transport,
+                limits=httpx.Limits(
+                    max_connections=self.settings.llm_http_max_connections,
+                    max_keepalive_connections=self.settings.llm_http_max_keepalive_connections,
+                    keepalive_expiry=self.settings.llm_http_keepalive_expiry_seconds,
+                ),
+                timeout=httpx.Timeout(
+                    self.settings.llm_timeout_seconds,
+                    connect=self.settings.llm_connect_timeout_seconds,
+                ),
+            )
+            self._http_loop = loop
+        return self._http
+
+    def _retire_http_client(
+        self,
+        client: httpx.AsyncClient,
+        owner: asyncio.AbstractEventLoop | None,
+        loop: asyncio.AbstractEventLoop,
+    ) -> None:
+        future: asyncio.Future[None] | Future[None]
+        if owner is not None and owner.is_running() and not owner.is_closed():
+            # Still serving another thread: close the pool on the loop that owns it.
+            future = asyncio.run_coroutine_threadsafe(_close_http_client(client), owner)
+        else:
+            # The owning loop is gone; closing from here still releases the sockets.
+            future = loop.create_task(_close_http_client(client))
+        self._retiring.add(future)
+        future.add_done_callback(self._retiring.discard)
+
+    def _completions_url(self) -> str:
+        return f"{self.settings.openrouter_base_url.rstrip('/')}/chat/completions"
+
+    def _request_headers(self) -> dict[str, str]:
+        api_key = self.settings.openrouter_api_key
+        if not api_key:
+            raise ValueError("OPENROUTER_API_KEY is not configured")
+        return {
+            "Authorization": f"Bearer {api_key}",
+            "Content-Type": "application/json",
+            "HTTP-Referer": "http://localhost:5173",
+            "X-Title": "Omnichannel Agentic Commerce",
+        }
+
+    def _completion_body(self, *, user_prompt: str, system_prompt: str, stream: bool = False) -> dict[str, Any]:
+        body: dict[str, Any] = {
+            "model": self.settings.llm_model,
+            "messages": [
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": user_prompt},
+            ],
+            "temperature": self.settings.llm_temperature,
+            "max_tokens": self.settings.llm_max_tokens,
+        }
+        if stream:
+            body["stream"] = True
+        else:
+            body["response_format"] = {"type": "json_object"}
+        return body
+
+    @staticmethod
+    def _completion_content(payload: dict[str, Any]) -> str:
         choices = payload.get("choices", [])
         if not choices:
             raise ValueError("No choices returned from OpenRouter")
@@ -368,49 +685,6 @@ class LLMClient:
             raise ValueError("Invalid OpenRouter response content")
         return content
 
-    async def stream_response(self, *, user_prompt: str, system_prompt: str):
-        api_key = self.settings.openrouter_api_key
-        if not api_key:
-            raise ValueError("OPENROUTER_API_KEY is not configured")
-
-        async with httpx.AsyncClient() as client:
-            async with client.stream(
-                "POST",
-                f"{self.settings.openrouter_base_url.rstrip('/')}/chat/completions",
-                headers={
-                    "Authorization": f"Bearer {api_key}",
-                    "Content-Type": "application/json",
-                    "HTTP-Referer": "http://localhost:5173",
-                    "X-Title": "Omnichannel Agentic Commerce",
-                },
-                json={
-                    "model": self.settings.llm_model,
-                    "messages": [
-                        {"role": "system", "content": system_prompt},
-                        {"role": "user", "content": user_prompt},
-                    ],
-                    "temperature": self.settings.llm_temperature,
-                    "max_tokens": self.settings.llm_max_tokens,
-                    "stream": True,
-                },
-                timeout=self.settings.llm_timeout_seconds,
-            ) as response:
-                response.raise_for_status()
-                async for line in response.aiter_lines():
-                    if not line.strip():
-                        continue
-                    if line.startswith("data: "):
-                        data_str = line[6:].strip()
-                        if data_str == "[DONE]":
-                            break
-                        try:
-                            data = json.loads(data_str)
-                            delta = data.get("choices", [{}])[0].get("delta", {}).get("content", "")
-                            if delta:
-                                yield delta
-                        except json.JSONDecodeError:
-                            continue
-
     def _build_classification_prompt(self, *, message: str, recent_messages: list[dict[str, Any]]) -> str:
         recent_snippets = []
         for row in recent_messages[-6:]:
@@ -0,0 +1,164 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+from collections import OrderedDict
+from copy import deepcopy
+from threading import Lock
+from time import monotonic
+from typing import Any
+
+from app.infrastructure.observability import MetricsCollector
+from app.infrastructure.persistence_clients import RedisClientManager
+
+
+class LLMResponseCache:
+    """TTL-bounded LRU of parsed LLM results with an optional Redis second tier.
+
+    Keys are content addresses: a hash of the model, temperature, system prompt
+    and canonical user prompt. Identical prompts therefore share one entry
+    across sessions and, through Redis, across processes.
+    """
+
+    def __init__(
+        self,
+        *,
+        redis_manager: RedisClientManager | None = None,
+        metrics_collector: MetricsCollector | None = None,
+        max_entries: int = 1024,
+        ttl_seconds: int = 900,
+    ) -> None:
+        self.redis_manager = redis_manager
+        self.metrics_collector = metrics_collector
+        self.max_entries = max(0, int(max_entries))
+        self.ttl_seconds = max(1, int(ttl_seconds))
+        self._lock = Lock()
+        self._entries: OrderedDict[str, tuple[float, dict[str, Any]]] = OrderedDict()
+
+    @staticmethod
+    def key(*, kind: str, model: str, temperature: float, system_prompt: str, user_prompt: str) -> str:
+        payload = json.dumps(
+            [model, float(temperature), system_prompt, _canonical_prompt(user_prompt)],
+            ensure_ascii=True,
+            separators=(",", ":"),
+        )
+        digest = hashlib.sha256(payload.encode("utf-8")).hexdigest()
+        return f"llm:{kind}:{digest}"
+
+    def get(self, key: str) -> dict[str, Any] | None:
+        if self.max_entries == 0:
+            return None
+        cached = self._lookup(key)
+        if cached is not None:
+            return cached
+        return self._remember_l2(key, self._redis_get(key))
+
+    async def aget(self, key: str) -> dict[str, Any] | None:
+        """:meth:`get` for the event loop; only the Redis round trip leaves the loop."""
+        if self.max_entries == 0:
+            return None
+        cached = self._lookup(key)
+        if cached is not None:
+            return cached
+        if self._redis_client() is None:
+            return None
+        return self._remember_l2(key, await asyncio.to_thread(self._redis_get, key))
+
+    def put(self, key: str, value: dict[str, Any]) -> None:
+        if self.max_entries == 0:
+            return
+        stored = deepcopy(value)
+        self._remember(key, stored)
+        self._redis_set(key, stored)
+
+    async def aput(self, key: str, value: dict[str, Any]) -> None:
+        if self.max_entries == 0:
+            return
+        stored = deepcopy(value)
+        self._remember(key, stored)
+        if self._redis_client() is not None:
+            await asyncio.to_thread(self._redis_set, key, stored)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _lookup(self, key: str) -> dict[str, Any] | None:
+        now = monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] <= now:
+                del self._entries[key]
+                entry = None
+            if entry is not None:
+                self._entries.move_to_end(key)
+        self._record(key, tier="l1", hit=entry is not None)
+        return deepcopy(entry[1]) if entry is not None else None
+
+    def _remember_l2(self, key: str, decoded: dict[str, Any] | None) -> dict[str, Any] | None:
+        if self._redis_client() is None:
+            return None
+        self._record(key, tier="l2", hit=decoded is not None)
+        if decoded is None:
+            return None
+        self._remember(key, decoded)
+        return deepcopy(decoded)
+
+    def _remember(self, key: str, value: dict[str, Any]) -> None:
+        expires_at = monotonic() + self.ttl_seconds
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def _redis_get(self, key: str) -> dict[str, Any] | None:
+        client = self._redis_client()
+        if client is None:
+            return None
+        try:
+            payload = client.get(key)
+        except Exception:
+            return None
+        if isinstance(payload, bytes):
+            payload = payload.decode("utf-8")
+        if not payload:
+            return None
+        try:
+            decoded = json.loads(payload)
+        except json.JSONDecodeError:
+            return None
+        return decoded if isinstance(decoded, dict) else None
+
+    def _redis_set(self, key: str, value: dict[str, Any]) -> None:
+        client = self._redis_client()
+        if client is None:
+            return
+        try:
+            client.set(key, json.dumps(value), ex=self.ttl_seconds)
+        except Exception:
+            return
+
+    def _redis_client(self) -> Any | None:
+        if self.redis_manager is None:
+            return None
+        return self.redis_manager.client
+
+    def _record(self, key: str, *, tier: str, hit: bool) -> None:
+        if self.metrics_collector is None:
+            return
+        kind = key.split(":", 2)[1] if key.count(":") >= 2 else "unknown"
+        self.metrics_collector.record_llm_cache(kind=kind, tier=tier, hit=hit)
+
+
+def _canonical_prompt(user_prompt: str) -> str:
+    """Re-serialize JSON prompts so key order and whitespace never split the cache."""
+    try:
+        parsed = json.loads(user_prompt)
+    except (TypeError, ValueError):
+        return str(user_prompt).strip()
+    return json.dumps(parsed, sort_keys=True, ensure_ascii=True, separators=(",", ":"))
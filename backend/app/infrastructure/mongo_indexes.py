@@ -55,6 +55,19 @@ MONGO_INDEX_SPECS: dict[str, list[IndexSpec]] = {
     "products": [
         ([("productId", ASCENDING)], {"name": "products_product_id_unique", "unique": True}),
         ([("name", ASCENDING)], {"name": "products_name_asc"}),
+        ([("facetKeys.status", ASCENDING), ("name", ASCENDING)], {"name": "products_facet_status_name_asc"}),
+        (
+            [("facetKeys.status", ASCENDING), ("facetKeys.category", ASCENDING), ("name", ASCENDING)],
+            {"name": "products_facet_status_category_name_asc"},
+        ),
+        (
+            [("facetKeys.status", ASCENDING), ("facetKeys.brand", ASCENDING), ("name", ASCENDING)],
+            {"name": "products_facet_status_brand_name_asc"},
+        ),
+        (
+            [("facetKeys.variants.color", ASCENDING), ("facetKeys.variants.size", ASCENDING)],
+            {"name": "products_facet_variant_color_size"},
+        ),
         ([("category", ASCENDING), ("price", ASCENDING)], {"name": "products_category_price_asc"}),
         ([("brand", ASCENDING), ("price", ASCENDING)], {"name": "products_brand_price_asc"}),
         ([("status", ASCENDING), ("updatedAt", DESCENDING)], {"name": "products_status_updated_desc"}),
@@ -1,12 +1,16 @@
 from __future__ import annotations
 
+from collections.abc import Iterator
+from contextlib import contextmanager
 from dataclasses import dataclass
 from threading import Lock
 from time import perf_counter
-from typing import Iterable
+from typing import Any, Iterable
 
 
 _LATENCY_BUCKETS_MS = (50, 100, 250, 500, 1000, 2500, 5000)
+# Pipeline stages are mostly well under an HTTP request's latency.
+_STAGE_BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
 
 
 @dataclass(frozen=True)
@@ -21,6 +25,37 @@ class RequestTimer:
         return max(0.0, (perf_counter() - self.started_at) * 1000.0)
 
 
+@dataclass(frozen=True)
+class StageSpan:
+    stage: str
+    duration_ms: float
+    agent: str | None = None
+
+
+class StageTrace:
+    """Timings of the stages of one request, in the order they finished."""
+
+    def __init__(self) -> None:
+        self.spans: list[StageSpan] = []
+
+    @contextmanager
+    def span(self, stage: str, *, agent: str | None = None) -> Iterator[None]:
+        started = perf_counter()
+        try:
+            yield
+        finally:
+            self.add(stage, (perf_counter() - started) * 1000.0, agent=agent)
+
+    def add(self, stage: str, duration_ms: float, *, agent: str | None = None) -> None:
+        self.spans.append(StageSpan(stage=stage, duration_ms=max(0.0, duration_ms), agent=agent))
+
+    def as_metadata(self) -> list[dict[str, Any]]:
+        return [
+            {"stage": span.stage, "agent": span.agent, "durationMs": round(span.duration_ms, 3)}
+            for span in self.spans
+        ]
+
+
 class MetricsCollector:
     def __init__(self) -> None:
         self._lock = Lock()
@@ -31,6 +66,28 @@ class MetricsCollector:
         self._http_latency_bucket_count: dict[tuple[str, str, str], int] = {}
         self._checkout_total: dict[str, int] = {"success": 0, "failed": 0}
         self._security_events_total: dict[tuple[str, str], int] = {}
+        self._search_index_operations_total: dict[str, int] = {}
+        self._search_index_duration_sum_ms: dict[str, float] = {}
+        self._search_index_last_duration_ms: dict[str, float] = {}
+        self._search_index_documents = 0
+        self._search_cache_lookups_total: dict[tuple[str, str], int] = {}
+        self._intent_cache_events_total: dict[str, int] = {}
+        self._llm_cache_lookups_total: dict[tuple[str, str, str], int] = {}
+        self._concurrency_limit: dict[str, int] = {}
+        self._concurrency_in_flight: dict[str, int] = {}
+        self._concurrency_rejections_total: dict[str, int] = {}
+        self._agent_executions_total: dict[tuple[str, str], int] = {}
+        self._agent_execution_duration_sum_ms: dict[tuple[str, str], float] = {}
+        self._agent_executor_state: dict[str, int] = {"queued": 0, "running": 0, "workers": 0}
+        self._write_behind_pending: dict[str, int] = {}
+        self._write_behind_flushes_total: dict[str, int] = {}
+        self._write_behind_flush_duration_sum_ms: dict[str, float] = {}
+        self._write_behind_records_total: dict[tuple[str, str], int] = {}
+        self._write_behind_overflows_total: dict[str, int] = {}
+        self._write_behind_dropped_total: dict[tuple[str, str], int] = {}
+        self._stage_duration_count: dict[tuple[str, str, str], int] = {}
+        self._stage_duration_sum_ms: dict[tuple[str, str, str], float] = {}
+        self._stage_duration_bucket_count: dict[tuple[str, str, str, str], int] = {}
 
     def record_http(
         self,
@@ -71,6 +128,98 @@ class MetricsCollector:
             key = (normalized_event, normalized_severity)
             self._security_events_total[key] = self._security_events_total.get(key, 0) + 1
 
+    def record_search_index(self, *, operation: str, duration_ms: float, documents: int) -> None:
+        normalized_operation = str(operation).strip().lower() or "unknown"
+        with self._lock:
+            self._search_index_operations_total[normalized_operation] = (
+                self._search_index_operations_total.get(normalized_operation, 0) + 1
+            )
+            self._search_index_duration_sum_ms[normalized_operation] = (
+                self._search_index_duration_sum_ms.get(normalized_operation, 0.0) + duration_ms
+            )
+            self._search_index_last_duration_ms[normalized_operation] = duration_ms
+            self._search_index_documents = max(0, int(documents))
+
+    def record_search_cache(self, *, tier: str, hit: bool) -> None:
+        normalized_tier = str(tier).strip().lower() or "unknown"
+        key = (normalized_tier, "hit" if hit else "miss")
+        with self._lock:
+            self._search_cache_lookups_total[key] = self._search_cache_lookups_total.get(key, 0) + 1
+
+    def record_intent_cache(self, *, event: str) -> None:
+        normalized_event = str(event).strip().lower() or "unknown"
+        with self._lock:
+            self._intent_cache_events_total[normalized_event] = (
+                self._intent_cache_events_total.get(normalized_event, 0) + 1
+            )
+
+    def record_llm_cache(self, *, kind: str, tier: str, hit: bool) -> None:
+        key = (
+            str(kind).strip().lower() or "unknown",
+            str(tier).strip().lower() or "unknown",
+            "hit" if hit else "miss",
+        )
+        with self._lock:
+            self._llm_cache_lookups_total[key] = self._llm_cache_lookups_total.get(key, 0) + 1
+
+    def set_concurrency_state(self, *, limiter: str, limit: int, in_flight: int) -> None:
+        name = str(limiter).strip().lower() or "unknown"
+        with self._lock:
+            self._concurrency_limit[name] = int(limit)
+            self._concurrency_in_flight[name] = int(in_flight)
+
+    def record_concurrency_rejection(self, *, limiter: str) -> None:
+        name = str(limiter).strip().lower() or "unknown"
+        with self._lock:
+            self._concurrency_rejections_total[name] = self._concurrency_rejections_total.get(name, 0) + 1
+
+    def record_agent_execution(self, *, agent: str, mode: str, duration_ms: float) -> None:
+        key = (str(agent).strip().lower() or "unknown", str(mode).strip().lower() or "unknown")
+        with self._lock:
+            self._agent_executions_total[key] = self._agent_executions_total.get(key, 0) + 1
+            self._agent_execution_duration_sum_ms[key] = self._agent_execution_duration_sum_ms.get(key, 0.0) + duration_ms
+
+    def set_agent_executor_state(self, *, queued: int, running: int, workers: int) -> None:
+        with self._lock:
+            self._agent_executor_state = {"queued": int(queued), "running": int(running), "workers": int(workers)}
+
+    def set_write_behind_pending(self, *, queue: str, pending: int) -> None:
+        with self._lock:
+            self._write_behind_pending[str(queue)] = int(pending)
+
+    def record_write_behind_flush(self, *, queue: str, records: int, duration_ms: float, success: bool) -> None:
+        name = str(queue)
+        key = (name, "ok" if success else "error")
+        with self._lock:
+            self._write_behind_flushes_total[name] = self._write_behind_flushes_total.get(name, 0) + 1
+            self._write_behind_flush_duration_sum_ms[name] = (
+                self._write_behind_flush_duration_sum_ms.get(name, 0.0) + duration_ms
+            )
+            self._write_behind_records_total[key] = self._write_behind_records_total.get(key, 0) + int(records)
+
+    def record_write_behind_overflow(self, *, queue: str) -> None:
+        name = str(queue)
+        with self._lock:
+            self._write_behind_overflows_total[name] = self._write_behind_overflows_total.get(name, 0) + 1
+
+    def record_write_behind_dropped(self, *, queue: str, kind: str, records: int) -> None:
+        key = (str(queue), str(kind))
+        with self._lock:
+            self._write_behind_dropped_total[key] = self._write_behind_dropped_total.get(key, 0) + int(records)
+
+    def record_stage(self, *, stage: str, intent: str, agent: str, duration_ms: float) -> None:
+        key = (
+            str(stage).strip().lower() or "unknown",
+            str(intent).strip().lower() or "unknown",
+            str(agent).strip().lower() or "unknown",
+        )
+        with self._lock:
+            self._stage_duration_count[key] = self._stage_duration_count.get(key, 0) + 1
+            self._stage_duration_sum_ms[key] = self._stage_duration_sum_ms.get(key, 0.0) + duration_ms
+            for bucket_label in self._bucket_labels(duration_ms, _STAGE_BUCKETS_MS):
+                bucket_key = (*key, bucket_label)
+                self._stage_duration_bucket_count[bucket_key] = self._stage_duration_bucket_count.get(bucket_key, 0) + 1
+
     def render_prometheus(self) -> str:
         with self._lock:
             lines: list[str] = []
@@ -118,11 +267,110 @@ class MetricsCollector:
                     f'commerce_security_events_total{{event_type="{event_type}",severity="{severity}"}} {count}'
                 )
 
+            lines.append("# HELP commerce_search_index_duration_ms Product search index build/refresh time in milliseconds.")
+            lines.append("# TYPE commerce_search_index_duration_ms summary")
+            for operation, count in sorted(self._search_index_operations_total.items()):
+                sum_value = self._search_index_duration_sum_ms.get(operation, 0.0)
+                lines.append(f'commerce_search_index_duration_ms_sum{{operation="{operation}"}} {sum_value:.4f}')
+                lines.append(f'commerce_search_index_duration_ms_count{{operation="{operation}"}} {count}')
+
+            lines.append("# HELP commerce_search_index_last_duration_ms Duration of the latest search index operation.")
+            lines.append("# TYPE commerce_search_index_last_duration_ms gauge")
+            for operation, value in sorted(self._search_index_last_duration_ms.items()):
+                lines.append(f'commerce_search_index_last_duration_ms{{operation="{operation}"}} {value:.4f}')
+
+            lines.append("# HELP commerce_search_index_documents Documents currently held by the product search index.")
+            lines.append("# TYPE commerce_search_index_documents gauge")
+            lines.append(f"commerce_search_index_documents {self._search_index_documents}")
+
+            lines.append("# HELP commerce_search_cache_lookups_total Product search result cache lookups by tier and result.")
+            lines.append("# TYPE commerce_search_cache_lookups_total counter")
+            for (tier, result), count in sorted(self._search_cache_lookups_total.items()):
+                lines.append(f'commerce_search_cache_lookups_total{{tier="{tier}",result="{result}"}} {count}')
+
+            lines.append("# HELP commerce_intent_cache_events_total Rule intent cache hits, misses and evictions.")
+            lines.append("# TYPE commerce_intent_cache_events_total counter")
+            for event, count in sorted(self._intent_cache_events_total.items()):
+                lines.append(f'commerce_intent_cache_events_total{{event="{event}"}} {count}')
+
+            lines.append("# HELP commerce_llm_cache_lookups_total LLM response cache lookups by call kind, tier and result.")
+            lines.append("# TYPE commerce_llm_cache_lookups_total counter")
+            for (kind, tier, result), count in sorted(self._llm_cache_lookups_total.items()):
+                lines.append(f'commerce_llm_cache_lookups_total{{kind="{kind}",tier="{tier}",result="{result}"}} {count}')
+
+            lines.append("# HELP commerce_concurrency_limit Current adaptive concurrency limit by limiter.")
+            lines.append("# TYPE commerce_concurrency_limit gauge")
+            for name, value in sorted(self._concurrency_limit.items()):
+                lines.append(f'commerce_concurrency_limit{{limiter="{name}"}} {value}')
+
+            lines.append("# HELP commerce_concurrency_in_flight Calls currently holding a limiter slot.")
+            lines.append("# TYPE commerce_concurrency_in_flight gauge")
+            for name, value in sorted(self._concurrency_in_flight.items()):
+                lines.append(f'commerce_concurrency_in_flight{{limiter="{name}"}} {value}')
+
+            lines.append("# HELP commerce_concurrency_rejections_total Calls turned away because the limiter was full.")
+            lines.append("# TYPE commerce_concurrency_rejections_total counter")
+            for name, count in sorted(self._concurrency_rejections_total.items()):
+                lines.append(f'commerce_concurrency_rejections_total{{limiter="{name}"}} {count}')
+
+            lines.append("# HELP commerce_agent_execution_duration_ms Agent action duration by agent and execution mode.")
+            lines.append("# TYPE commerce_agent_execution_duration_ms summary")
+            for (agent, mode), count in sorted(self._agent_executions_total.items()):
+                sum_value = self._agent_execution_duration_sum_ms.get((agent, mode), 0.0)
+                lines.append(f'commerce_agent_execution_duration_ms_sum{{agent="{agent}",mode="{mode}"}} {sum_value:.4f}')
+                lines.append(f'commerce_agent_execution_duration_ms_count{{agent="{agent}",mode="{mode}"}} {count}')
+
+            lines.append("# HELP commerce_agent_executor_threads Sync agent executor queue, busy and total workers.")
+            lines.append("# TYPE commerce_agent_executor_threads gauge")
+            for state, value in sorted(self._agent_executor_state.items()):
+                lines.append(f'commerce_agent_executor_threads{{state="{state}"}} {value}')
+
+            lines.append("# HELP commerce_write_behind_pending Records accepted but not yet written, by queue.")
+            lines.append("# TYPE commerce_write_behind_pending gauge")
+            for name, value in sorted(self._write_behind_pending.items()):
+                lines.append(f'commerce_write_behind_pending{{queue="{name}"}} {value}')
+
+            lines.append("# HELP commerce_write_behind_flush_duration_ms Time spent writing one batch, by queue.")
+            lines.append("# TYPE commerce_write_behind_flush_duration_ms summary")
+            for name, count in sorted(self._write_behind_flushes_total.items()):
+                sum_value = self._write_behind_flush_duration_sum_ms.get(name, 0.0)
+                lines.append(f'commerce_write_behind_flush_duration_ms_sum{{queue="{name}"}} {sum_value:.4f}')
+                lines.append(f'commerce_write_behind_flush_duration_ms_count{{queue="{name}"}} {count}')
+
+            lines.append("# HELP commerce_write_behind_records_total Records in each flushed batch by queue and outcome.")
+            lines.append("# TYPE commerce_write_behind_records_total counter")
+            for (name, result), count in sorted(self._write_behind_records_total.items()):
+                lines.append(f'commerce_write_behind_records_total{{queue="{name}",result="{result}"}} {count}')
+
+            lines.append("# HELP commerce_write_behind_overflows_total Records written inline because the queue was full.")
+            lines.append("# TYPE commerce_write_behind_overflows_total counter")
+            for name, count in sorted(self._write_behind_overflows_total.items()):
+                lines.append(f'commerce_write_behind_overflows_total{{queue="{name}"}} {count}')
+
+            lines.append("# HELP commerce_write_behind_dropped_total Records given up on after failed writes, by queue and kind.")
+            lines.append("# TYPE commerce_write_behind_dropped_total counter")
+            for (name, kind), count in sorted(self._write_behind_dropped_total.items()):
+                lines.append(f'commerce_write_behind_dropped_total{{queue="{name}",kind="{kind}"}} {count}')
+
+            lines.append("# HELP commerce_orchestrator_stage_duration_ms Orchestrator pipeline stage latency by intent and agent.")
+            lines.append("# TYPE commerce_orchestrator_stage_duration_ms histogram")
+            for stage, intent, agent in sorted(self._stage_duration_count):
+                labels = f'stage="{stage}",intent="{intent}",agent="{agent}"'
+                for bucket in list(_STAGE_BUCKETS_MS) + ["+Inf"]:
+                    bucket_label = str(bucket)
+                    bucket_count = self._stage_duration_bucket_count.get((stage, intent, agent, bucket_label), 0)
+                    lines.append(f'commerce_orchestrator_stage_duration_ms_bucket{{{labels},le="{bucket_label}"}} {bucket_count}')
+                sum_value = self._stage_duration_sum_ms[(stage, intent, agent)]
+                lines.append(f"commerce_orchestrator_stage_duration_ms_sum{{{labels}}} {sum_value:.4f}")
+                lines.append(
+                    f"commerce_orchestrator_stage_duration_ms_count{{{labels}}} {self._stage_duration_count[(stage, intent, agent)]}"
+                )
+
             return "\n".join(lines) + "\n"
 
-    def _bucket_labels(self, duration_ms: float) -> Iterable[str]:
+    def _bucket_labels(self, duration_ms: float, buckets: tuple[int, ...] = _LATENCY_BUCKETS_MS) -> Iterable[str]:
         labels: list[str] = []
-        for bucket in _LATENCY_BUCKETS_MS:
+        for bucket in buckets:
             if duration_ms <= bucket:
                 labels.append(str(bucket))
         labels.append("+Inf")
@@ -10,6 +10,7 @@ class MongoClientManager:
     uri: str
     enabled: bool
     _client: Any = None
+    _async_client: Any = None
     _last_error: str | None = None
 
     def connect(self) -> None:
@@ -47,17 +48,41 @@ class MongoClientManager:
     def client(self) -> Any:
         return self._client
 
+    @property
+    def async_client(self) -> Any:
+        """asyncio client for the app's event loop; None until :meth:`aconnect` ran."""
+        return self._async_client
+
+    async def aconnect(self) -> None:
+        # Only once the sync client proved the server is reachable.
+        if self._client is None:
+            return
+        try:
+            from pymongo import AsyncMongoClient
+
+            self._async_client = AsyncMongoClient(self.uri, serverSelectionTimeoutMS=2000)
+        except Exception as exc:
+            self._async_client = None
+            print(f"WARNING: Failed to create async MongoDB client for {self.uri}: {exc}")
+
     def disconnect(self) -> None:
         if self._client:
             self._client.close()
         self._client = None
 
+    async def adisconnect(self) -> None:
+        client, self._async_client = self._async_client, None
+        if client is not None:
+            with suppress(Exception):
+                await client.close()
+
 
 @dataclass
 class RedisClientManager:
     url: str
     enabled: bool
     _client: Any = None
+    _async_client: Any = None
     _last_error: str | None = None
 
     def connect(self) -> None:
@@ -94,8 +119,30 @@ class RedisClientManager:
     def client(self) -> Any:
         return self._client
 
+    @property
+    def async_client(self) -> Any:
+        """asyncio client for the app's event loop; None until :meth:`aconnect` ran."""
+        return self._async_client
+
+    async def aconnect(self) -> None:
+        if self._client is None:
+            return
+        try:
+            import redis.asyncio
+
+            self._async_client = redis.asyncio.from_url(self.url, socket_timeout=2)
+        except Exception as exc:
+            self._async_client = None
+            print(f"WARNING: Failed to create async Redis client for {self.url}: {exc}")
+
     def disconnect(self) -> None:
         if self._client:
             with suppress(Exception):
                 self._client.close()
         self._client = None
+
+    async def adisconnect(self) -> None:
+        client, self._async_client = self._async_client, None
+        if client is not None:
+            with suppress(Exception):
+                await client.aclose()
@@ -0,0 +1,222 @@
+from __future__ import annotations
+
+from collections import Counter
+from collections.abc import Callable, Hashable
+from threading import Condition, Lock, Thread, get_ident
+from time import monotonic, perf_counter
+from typing import Any
+
+from app.infrastructure.logging import get_logger
+from app.infrastructure.observability import MetricsCollector
+
+WriteHandler = Callable[[list[tuple[Hashable, Any]]], None]
+
+
+class WriteBehindQueue:
+    """Bounded queue of writes that a background thread applies in batches.
+
+    Each record has a ``kind`` (whose registered handler writes a batch of
+    ``(key, payload)`` pairs in submit order, coalescing per key as it sees fit)
+    and a ``key`` such as a session or user id. Readers call :meth:`settle`
+    before reading a key, which writes anything still pending for it, so the
+    deferral is never visible to the next request.
+
+    :meth:`submit` never blocks: it returns ``False`` when the queue is full,
+    disabled (``max_pending=0``) or closed, and the caller writes inline.
+
+    When a handler raises, its records go back to the front of the queue (as
+    far as ``max_pending`` allows) and are retried up to ``max_attempts`` times;
+    records that cannot be retried are logged and counted as dropped.
+    """
+
+    def __init__(
+        self,
+        *,
+        name: str = "bookkeeping",
+        max_pending: int = 10000,
+        batch_size: int = 256,
+        flush_interval_seconds: float = 0.05,
+        max_attempts: int = 3,
+        retry_delay_seconds: float = 0.5,
+        metrics_collector: MetricsCollector | None = None,
+    ) -> None:
+        self.name = name
+        self.max_pending = max(0, int(max_pending))
+        self.batch_size = max(1, int(batch_size))
+        self.flush_interval_seconds = max(0.0, float(flush_interval_seconds))
+        self.max_attempts = max(1, int(max_attempts))
+        self.retry_delay_seconds = max(0.0, float(retry_delay_seconds))
+        self.metrics_collector = metrics_collector
+        self.logger = get_logger(__name__)
+        self._handlers: dict[str, WriteHandler] = {}
+        # (kind, key, payload, failed attempts so far)
+        self._pending: list[tuple[str, Hashable, Any, int]] = []
+        self._pending_keys: Counter[tuple[str, Hashable]] = Counter()
+        self._flushing_keys: Counter[tuple[str, Hashable]] = Counter()
+        self._flushing_thread: int | None = None
+        self._lock = Lock()
+        self._ready = Condition(self._lock)
+        self._flush_lock = Lock()
+        self._worker: Thread | None = None
+        self._closed = False
+        self._last_flush_failed = False
+        self._publish(0)
+
+    @property
+    def pending(self) -> int:
+        with self._lock:
+            return len(self._pending)
+
+    def register(self, kind: str, handler: WriteHandler) -> None:
+        self._handlers[kind] = handler
+
+    def submit(self, kind: str, key: Hashable, payload: Any) -> bool:
+        if kind not in self._handlers:
+            raise ValueError(f"No write-behind handler registered for {kind!r}")
+        overflow = False
+        with self._ready:
+            accepted = not self._closed and len(self._pending) < self.max_pending
+            if accepted:
+                self._pending.append((kind, key, payload, 0))
+                self._pending_keys[(kind, key)] += 1
+                self._ensure_worker()
+                if len(self._pending) >= self.batch_size:
+                    self._ready.notify()
+            else:
+                overflow = not self._closed and self.max_pending > 0
+            depth = len(self._pending)
+        if overflow and self.metrics_collector is not None:
+            self.metrics_collector.record_write_behind_overflow(queue=self.name)
+        self._publish(depth)
+        return accepted
+
+    def settle(self, kind: str, key: Hashable | None = None) -> None:
+        """Write whatever is pending for ``key`` (any key of ``kind`` when ``None``).
+
+        Only the matching records are taken out of the queue, so a reader does
+        not write everyone else's backlog on its own thread.
+        """
+        if self._flushing_thread == get_ident():
+            return
+        while self._has_pending(kind, key):
+            self._flush(lambda record: record[0] == kind and (key is None or record[1] == key))
+
+    def flush(self) -> int:
+        """Write the next batch on the calling thread; returns how many records it held."""
+        return self._flush(None)
+
+    def _flush(self, select: Callable[[tuple[str, Hashable, Any, int]], bool] | None) -> int:
+        with self._flush_lock:
+            with self._lock:
+                if select is None:
+                    batch, self._pending = self._pending[: self.batch_size], self._pending[self.batch_size :]
+                else:
+                    batch, rest = [], []
+                    for record in self._pending:
+                        (batch if len(batch) < self.batch_size and select(record) else rest).append(record)
+                    self._pending = rest
+                for kind, key, _, _ in batch:
+                    self._pending_keys[(kind, key)] -= 1
+                    self._flushing_keys[(kind, key)] += 1
+                self._pending_keys += Counter()
+                depth = len(self._pending)
+            if not batch:
+                return 0
+            self._publish(depth)
+
+            by_kind: dict[str, list[tuple[Hashable, Any, int]]] = {}
+            for kind, key, payload, attempts in batch:
+                by_kind.setdefault(kind, []).append((key, payload, attempts))
+            started = perf_counter()
+            failed: list[tuple[str, Hashable, Any, int]] = []
+            self._flushing_thread = get_ident()
+            try:
+                for kind, items in by_kind.items():
+                    try:
+                        self._handlers[kind]([(key, payload) for key, payload, _ in items])
+                    except Exception:
+                        self.logger.exception("Write-behind flush failed", queue=self.name, kind=kind, records=len(items))
+                        failed.extend((kind, key, payload, attempts + 1) for key, payload, attempts in items)
+            finally:
+                self._flushing_thread = None
+                with self._lock:
+                    self._flushing_keys.clear()
+            self._last_flush_failed = bool(failed)
+            if failed:
+                self._retry(failed)
+            if self.metrics_collector is not None:
+                self.metrics_collector.record_write_behind_flush(
+                    queue=self.name,
+                    records=len(batch),
+                    duration_ms=(perf_counter() - started) * 1000,
+                    success=not failed,
+                )
+            return len(batch)
+
+    def close(self, *, timeout: float = 5.0) -> None:
+        """Stop accepting records and drain what is queued (inline writes take over)."""
+        with self._ready:
+            self._closed = True
+            self._ready.notify_all()
+            worker = self._worker
+        if worker is not None:
+            worker.join(timeout=max(0.0, timeout))
+        while self.flush():
+            pass
+
+    def _retry(self, failed: list[tuple[str, Hashable, Any, int]]) -> None:
+        """Put failed records back in front of the queue, dropping what cannot be retried."""
+        retry: list[tuple[str, Hashable, Any, int]] = []
+        dropped: Counter[str] = Counter()
+        with self._lock:
+            room = max(0, self.max_pending - len(self._pending))
+            for record in failed:
+                if record[3] < self.max_attempts and len(retry) < room:
+                    retry.append(record)
+                    self._pending_keys[(record[0], record[1])] += 1
+                else:
+                    dropped[record[0]] += 1
+            self._pending[:0] = retry
+            depth = len(self._pending)
+        self._publish(depth)
+        for kind, records in dropped.items():
+            self.logger.error("Write-behind records dropped", queue=self.name, kind=kind, records=records)
+            if self.metrics_collector is not None:
+                self.metrics_collector.record_write_behind_dropped(queue=self.name, kind=kind, records=records)
+
+    def _has_pending(self, kind: str, key: Hashable | None) -> bool:
+        with self._lock:
+            if key is not None:
+                return self._pending_keys[(kind, key)] > 0 or self._flushing_keys[(kind, key)] > 0
+            return any(pending_kind == kind for pending_kind, _ in (*self._pending_keys, *self._flushing_keys))
+
+    def _ensure_worker(self) -> None:
+        if self._worker is None or not self._worker.is_alive():
+            self._worker = Thread(target=self._run, name=f"write-behind-{self.name}", daemon=True)
+            self._worker.start()
+
+    def _run(self) -> None:
+        while True:
+            with self._ready:
+                while not self._pending and not self._closed:
+                    self._ready.wait()
+                if not self._pending:
+                    return
+                # Give a batch a moment to fill up before writing it.
+                deadline = monotonic() + self.flush_interval_seconds
+                while len(self._pending) < self.batch_size and not self._closed:
+                    remaining = deadline - monotonic()
+                    if remaining <= 0:
+                        break
+                    self._ready.wait(remaining)
+            self.flush()
+            if self._last_flush_failed:
+                # Give a failing store a moment before the retry.
+                with self._ready:
+                    if not self._closed:
+                        self._ready.wait(self.retry_delay_seconds)
+
+    def _publish(self, depth: int) -> None:
+        if self.metrics_collector is None:
+            return
+        self.metrics_collector.set_write_behind_pending(queue=self.name, pending=depth)
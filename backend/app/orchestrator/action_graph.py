@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any
+
+from app.orchestrator.types import AgentAction
+
+
+# State each action reads and writes. Two actions conflict when one writes
+# something the other touches; conflicting actions keep their plan order.
+_CART = "cart"
+_ORDER = "order"
+_MEMORY = "memory"
+_SUPPORT = "support"
+_EVERYTHING = frozenset({_CART, _ORDER, _MEMORY, _SUPPORT})
+
+ACTION_EFFECTS: dict[str, tuple[frozenset[str], frozenset[str]]] = {
+    "search_products": (frozenset({_MEMORY}), frozenset()),
+    "get_cart": (frozenset({_CART}), frozenset()),
+    "add_item": (frozenset({_CART}), frozenset({_CART})),
+    "add_multiple_items": (frozenset({_CART}), frozenset({_CART})),
+    "update_item": (frozenset({_CART}), frozenset({_CART})),
+    "adjust_item_quantity": (frozenset({_CART}), frozenset({_CART})),
+    "remove_item": (frozenset({_CART}), frozenset({_CART})),
+    "clear_cart": (frozenset(), frozenset({_CART})),
+    "apply_discount": (frozenset({_CART}), frozenset({_CART})),
+    "checkout_summary": (frozenset({_CART}), frozenset({_CART, _ORDER})),
+    "get_order_status": (frozenset({_ORDER}), frozenset()),
+    "cancel_order": (frozenset({_ORDER}), frozenset({_ORDER})),
+    "request_refund": (frozenset({_ORDER}), frozenset({_ORDER})),
+    "change_order_address": (frozenset({_ORDER}), frozenset({_ORDER})),
+    "show_memory": (frozenset({_MEMORY}), frozenset()),
+    "save_preference": (frozenset({_MEMORY}), frozenset({_MEMORY})),
+    "forget_preference": (frozenset({_MEMORY}), frozenset({_MEMORY})),
+    "clear_memory": (frozenset(), frozenset({_MEMORY})),
+    "ticket_status": (frozenset({_SUPPORT}), frozenset()),
+    "answer_question": (frozenset(), frozenset()),
+    "create_ticket": (frozenset({_SUPPORT}), frozenset({_SUPPORT})),
+    "close_ticket": (frozenset({_SUPPORT}), frozenset({_SUPPORT})),
+}
+
+
+@dataclass(frozen=True)
+class ActionNode:
+    """One plan step: ``depends_on`` holds the indexes of steps that must finish first.
+
+    ``consumes`` is the index of the step whose result fills in this step's
+    params (an ``add_item`` without a product picks from an earlier search).
+    """
+
+    index: int
+    action: AgentAction
+    depends_on: frozenset[int]
+    consumes: int | None = None
+
+
+def action_effects(name: str) -> tuple[frozenset[str], frozenset[str]]:
+    """``(reads, writes)`` for an action; unknown actions are treated as touching everything."""
+    return ACTION_EFFECTS.get(name, (_EVERYTHING, _EVERYTHING))
+
+
+def build_action_graph(actions: list[AgentAction], *, atomic: bool = False) -> list[ActionNode]:
+    """Order-preserving dependency graph over ``actions`` (edges only point backwards).
+
+    In ``atomic`` mode every write also waits for all earlier steps, so nothing
+    is changed once an earlier step has failed; reads may still run ahead, and
+    the caller discards their results if an earlier step fails.
+    """
+    nodes: list[ActionNode] = []
+    for index, action in enumerate(actions):
+        reads, writes = action_effects(action.name)
+        depends_on: set[int] = set()
+        for earlier in nodes:
+            earlier_reads, earlier_writes = action_effects(earlier.action.name)
+            if writes & (earlier_reads | earlier_writes) or reads & earlier_writes:
+                depends_on.add(earlier.index)
+        if atomic and writes:
+            depends_on.update(range(index))
+        consumes = _consumed_step(action, nodes)
+        if consumes is not None:
+            depends_on.add(consumes)
+        nodes.append(ActionNode(index=index, action=action, depends_on=frozenset(depends_on), consumes=consumes))
+    return nodes
+
+
+def _consumed_step(action: AgentAction, earlier: list[ActionNode]) -> int | None:
+    if action.name != "add_item" or _has_value(action.params, "productId") or _has_value(action.params, "query"):
+        return None
+    for node in reversed(earlier):
+        if node.action.name == "search_products":
+            return node.index
+    return None
+
+
+def _has_value(params: dict[str, Any], key: str) -> bool:
+    return bool(str(params.get(key) or "").strip())
@@ -1,15 +1,25 @@
 from __future__ import annotations
 
+import asyncio
 from typing import Any
 
 from fastapi import HTTPException
 
-from app.orchestrator.types import AgentContext, IntentResult
+from app.orchestrator.types import AgentContext, IntentResult, LazyAgentContext
 from app.services.cart_service import CartService
 from app.services.memory_service import MemoryService
 from app.services.session_service import SessionService
 
 
+# Data each intent's agents read from the context. Anything not listed is still
+# available, but only fetched if an agent (or a planner-added action) touches it.
+INTENT_CONTEXT_NEEDS: dict[str, frozenset[str]] = {
+    "product_search": frozenset({"memory"}),
+    "search_and_add_to_cart": frozenset({"memory"}),
+    "checkout": frozenset({"cart"}),
+}
+
+
 class ContextBuilder:
     def __init__(
         self,
@@ -21,6 +31,10 @@ class ContextBuilder:
         self.cart_service = cart_service
         self.memory_service = memory_service
 
+    @staticmethod
+    def needs_for(intent: IntentResult) -> frozenset[str]:
+        return INTENT_CONTEXT_NEEDS.get(intent.name, frozenset())
+
     def build(
         self,
         *,
@@ -30,26 +44,92 @@ class ContextBuilder:
         channel: str,
         recent_messages: list[dict[str, Any]] | None = None,
     ) -> AgentContext:
+        session, session_id = self._resolve_session(session_id=session_id, channel=channel)
+        context = self._lazy_context(
+            session=session,
+            session_id=session_id,
+            user_id=user_id,
+            channel=channel,
+            recent_messages=recent_messages,
+        )
+        for name in sorted(self.needs_for(intent)):
+            getattr(context, name)
+        return context
+
+    async def abuild(
+        self,
+        *,
+        intent: IntentResult,
+        session_id: str,
+        user_id: str | None,
+        channel: str,
+        recent_messages: list[dict[str, Any]] | None = None,
+    ) -> AgentContext:
+        """Async :meth:`build`: the intent's declared needs are fetched concurrently.
+
+        Memory only depends on the user, so it loads alongside the session; the
+        cart is keyed by the session (which may be recreated here), so it follows it.
+        """
+        needs = self.needs_for(intent)
+        memory_task: asyncio.Task[dict[str, Any]] | None = None
+        if "memory" in needs and user_id:
+            memory_task = asyncio.create_task(asyncio.to_thread(self.memory_service.get_memory_snapshot, user_id=user_id))
+        try:
+            session, session_id = await asyncio.to_thread(
+                self._resolve_session,
+                session_id=session_id,
+                channel=channel,
+            )
+            prefetched: dict[str, Any] = {}
+            if "cart" in needs:
+                prefetched["cart"] = await asyncio.to_thread(
+                    self.cart_service.get_cart,
+                    user_id=user_id,
+                    session_id=session_id,
+                )
+            if memory_task is not None:
+                prefetched["memory"] = await memory_task
+        except BaseException:
+            if memory_task is not None:
+                memory_task.cancel()
+            raise
+
+        return self._lazy_context(
+            session=session,
+            session_id=session_id,
+            user_id=user_id,
+            channel=channel,
+            recent_messages=recent_messages,
+            **prefetched,
+        )
+
+    def _resolve_session(self, *, session_id: str, channel: str) -> tuple[dict[str, Any], str]:
         try:
             session = self.session_service.get_session(session_id=session_id)
         except HTTPException:
             session = self.session_service.create_session(channel=channel, initial_context={})
             session_id = session["id"]
+        return session, session_id
 
-        cart = self.cart_service.get_cart(user_id=user_id, session_id=session_id)
-        preferences: dict[str, Any] | None = None
-        memory: dict[str, Any] | None = None
+    def _lazy_context(
+        self,
+        *,
+        session: dict[str, Any],
+        session_id: str,
+        user_id: str | None,
+        channel: str,
+        recent_messages: list[dict[str, Any]] | None,
+        **prefetched: Any,
+    ) -> LazyAgentContext:
+        loaders = {"cart": lambda: self.cart_service.get_cart(user_id=user_id, session_id=session_id)}
         if user_id:
-            memory = self.memory_service.get_memory_snapshot(user_id=user_id)
-            preferences = memory.get("preferences")
-
-        return AgentContext(
+            loaders["memory"] = lambda: self.memory_service.get_memory_snapshot(user_id=user_id)
+        return LazyAgentContext(
+            loaders=loaders,
             session_id=session_id,
             user_id=user_id,
             channel=channel,
             session=session,
-            cart=cart,
-            preferences=preferences,
-            memory=memory,
             recent_messages=recent_messages or [],
+            **prefetched,
         )
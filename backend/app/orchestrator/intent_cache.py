@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+from collections import OrderedDict
+from threading import Lock
+from typing import Any, Hashable
+
+from app.infrastructure.observability import MetricsCollector
+from app.orchestrator.types import IntentResult
+
+
+class FrozenDict(dict):
+    """Read-only dict; still a ``dict`` for isinstance checks and JSON/BSON encoding."""
+
+    def _readonly(self, *args: Any, **kwargs: Any) -> None:
+        raise TypeError("cached intent entities are read-only")
+
+    __setitem__ = __delitem__ = _readonly
+    clear = pop = popitem = setdefault = update = _readonly
+    __ior__ = _readonly
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        # Copies (copy/deepcopy/pickle) come back as ordinary, mutable dicts.
+        return dict, (dict(self),)
+
+
+class FrozenList(list):
+    """Read-only list counterpart of :class:`FrozenDict`."""
+
+    def _readonly(self, *args: Any, **kwargs: Any) -> None:
+        raise TypeError("cached intent entities are read-only")
+
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = _readonly
+    append = clear = extend = insert = pop = remove = reverse = sort = _readonly
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        return list, (list(self),)
+
+
+def freeze(value: Any) -> Any:
+    if isinstance(value, dict):
+        return FrozenDict((key, freeze(item)) for key, item in value.items())
+    if isinstance(value, (list, tuple)):
+        return FrozenList(freeze(item) for item in value)
+    return value
+
+
+def frozen_result(result: IntentResult) -> IntentResult:
+    return IntentResult(name=result.name, confidence=result.confidence, entities=freeze(result.entities))
+
+
+class IntentCache:
+    """Bounded LRU of rule-classifier results.
+
+    Stored results are deep-frozen, so the same instance can be handed to
+    every caller without copying and without risk of one request editing
+    another's entities.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_entries: int = 2048,
+        metrics_collector: MetricsCollector | None = None,
+    ) -> None:
+        self.max_entries = max(0, int(max_entries))
+        self.metrics_collector = metrics_collector
+        self._lock = Lock()
+        self._entries: OrderedDict[Hashable, IntentResult] = OrderedDict()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def get(self, key: Hashable) -> IntentResult | None:
+        if self.max_entries == 0:
+            return None
+        with self._lock:
+            cached = self._entries.get(key)
+            if cached is None:
+                self._misses += 1
+            else:
+                self._hits += 1
+                self._entries.move_to_end(key)
+        self._record("hit" if cached is not None else "miss")
+        return cached
+
+    def put(self, key: Hashable, result: IntentResult) -> IntentResult:
+        frozen = frozen_result(result)
+        if self.max_entries == 0:
+            return frozen
+        evicted = 0
+        with self._lock:
+            self._entries[key] = frozen
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                evicted += 1
+            self._evictions += evicted
+        for _ in range(evicted):
+            self._record("eviction")
+        return frozen
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "size": len(self._entries),
+                "maxEntries": self.max_entries,
+                "hits": self._hits,
+                "misses": self._misses,
+                "evictions": self._evictions,
+                "hitRate": round(self._hits / lookups, 4) if lookups else 0.0,
+            }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _record(self, event: str) -> None:
+        if self.metrics_collector is None:
+            return
+        self.metrics_collector.record_intent_cache(event=event)
@@ -1,17 +1,261 @@
 from __future__ import annotations
 
 import re
+from collections.abc import Sequence
+from concurrent.futures import Executor, ProcessPoolExecutor
+from contextlib import nullcontext
 from typing import Any
 
-from app.infrastructure.llm_client import LLMClient
+from app.infrastructure.llm_client import LLMClient, LLMIntentPrediction
+from app.infrastructure.observability import StageTrace
+from app.orchestrator.intent_cache import IntentCache, frozen_result
+from app.orchestrator.intent_model import IntentModel
+from app.orchestrator.keyword_matcher import KeywordAutomaton
 from app.orchestrator.types import IntentResult
 
 
+_PHRASE_SEPARATORS = re.compile(r"[_\s]+")
+_WHITESPACE = re.compile(r"\s+")
+_NUMBER = re.compile(r"\b(\d+)\b")
+_PUNCTUATION = re.compile(r"[,:;]")
+_ORDER_ID = re.compile(r"(order[_\-]?\d+|ord[_\-]?\d+)")
+_TICKET_ID = re.compile(r"(ticket[_\-]?(?:item[_\-]?)?\d+)")
+_PRODUCT_ID = re.compile(r"(prod[_\-]?\d+)")
+_VARIANT_ID = re.compile(r"(var[_\-]?\d+)")
+_ITEM_ID = re.compile(r"(item[_\-]?\d+)")
+_ID_TOKENS = re.compile(r"\b(prod[_\-]?\d+|var[_\-]?\d+|item[_\-]?\d+)\b", re.IGNORECASE)
+_SIZE = re.compile(r"\bsize\s*([a-z0-9\-]+)\b", re.IGNORECASE)
+_PRICE_BELOW = re.compile(r"(under|below)\s*\$?(\d+)")
+_PRICE_ABOVE = re.compile(r"(over|above)\s*\$?(\d+)")
+_BRAND = re.compile(r"(?:brand|from|by)\s*(?:is|=|:)?\s*([a-zA-Z0-9&\-\s]{2,80})", re.IGNORECASE)
+_DISCOUNT_CODE = re.compile(r"(?:code|coupon|promo)\s*(?:is|=|:)?\s*([a-zA-Z0-9_-]{4,20})", re.IGNORECASE)
+_CODE_CANDIDATE = re.compile(r"\b([A-Za-z0-9]{4,20})\b")
+_COMBO_CART_CLAUSE = re.compile(r"\b(and\s+)?(add|put)\b.*\bcart\b", re.IGNORECASE)
+_SHIPPING_FIELDS = {
+    field: re.compile(rf"(?:{pattern})\s*[:=]\s*([^,;]+)", re.IGNORECASE)
+    for field, pattern in {
+        "name": r"name",
+        "line1": r"line1|address|street",
+        "line2": r"line2|apt|suite",
+        "city": r"city",
+        "state": r"state",
+        "postalCode": r"postal\s*code|postalcode|zip",
+        "country": r"country",
+    }.items()
+}
+_ADD_WORD = re.compile(r"\badd\b", re.IGNORECASE)
+_TO_CART = re.compile(r"\bto\b\s+\b(my\s+)?cart\b", re.IGNORECASE)
+_ADD_FILLER = re.compile(
+    r"\b(please|the|a|an|item|items|quantity|qty|of|for|me|my|cart|with|color)\b",
+    re.IGNORECASE,
+)
+_CART_ITEM_FILLER = re.compile(
+    r"\b(remove|delete|drop|update|change|set|increase|decrease|reduce|quantity|qty|from|in|cart|my|the)\b",
+    re.IGNORECASE,
+)
+_MULTI_ADD_PREFIX = re.compile(r"^.*?\badd\b", re.IGNORECASE)
+_MULTI_ADD_SUFFIX = re.compile(r"\bto\b\s+\b(my\s+)?cart\b.*$", re.IGNORECASE)
+_MULTI_ADD_SPLIT = re.compile(r"\s*(?:,|\band\b)\s*")
+_MULTI_ADD_FILLER = re.compile(r"\b(of|a|an|the|please|to|my|cart)\b")
+_PREFERENCE_SIZE = re.compile(r"\b(?:size\s*(?:is|=)?|wear size)\s*(xxs|xs|s|m|l|xl|xxl|\d{1,2})\b")
+_PREFERENCE_MAX = re.compile(r"(?:under|below|max(?:imum)?)\s*\$?(\d+)")
+_PREFERENCE_MIN = re.compile(r"(?:over|above|min(?:imum)?)\s*\$?(\d+)")
+_PREFERENCE_BRANDS = re.compile(r"(?:brand|brands?)\s*(?:is|are|=|:)?\s*([a-z0-9,\s&-]{2,120})")
+_PREFERENCE_BRAND_SPLIT = re.compile(r"(?:,|and)")
+_PREFERENCE_LEAD = re.compile(r"i prefer |i like ")
+_VIEW_CART = re.compile(r"\b(view|show|open|see|display)\s+(my\s+)?cart\b")
+
+_COLORS = (
+    "black", "blue", "white", "green", "red", "gray", "grey", "charcoal", "navy",
+    "yellow", "purple", "orange", "pink", "brown", "tan", "beige", "gold", "silver",
+    "maroon", "teal", "olive", "magenta", "cyan"
+)
+_KNOWN_BRANDS = (
+    "strideforge", "peakroute", "aerothread", "carryworks", "urbanbound", "trailtech", "luxthread", "vanguards"
+)
+_SEARCH_VERBS = ("find", "search", "show me", "recommend", "looking for")
+_PRICE_WORDS = ("under", "below", "over", "above")
+_ORDER_STATUS_PHRASES = (
+    "order status",
+    "where is my order",
+    "track order",
+    "hasn't arrived",
+    "hasnt arrived",
+    "not arrived",
+    "order is late",
+    "order late",
+    "delayed order",
+    "order delayed",
+)
+_DELTA_DOWN = ("decrease", "reduce", "minus", "less")
+_DELTA_UP = ("increase", "plus", "more", "another")
+_ADJUST_TOKENS = ("increase", "decrease", "reduce", "minus", "plus", "one more", "one less", "another")
+_CLEAR_CART_PHRASES = (
+    "clear cart",
+    "empty cart",
+    "remove all from cart",
+    "delete all from cart",
+    "clear my cart",
+    "empty my cart",
+)
+_ESCALATION_PHRASES = (
+    "human agent",
+    "support agent",
+    "talk to support",
+    "talk to a person",
+    "connect me to support",
+    "open a ticket",
+    "escalate",
+    "need help with issue",
+)
+_SUPPORT_STATUS_PHRASES = (
+    "ticket status",
+    "support status",
+    "status of my ticket",
+    "my support ticket",
+    "any update on ticket",
+)
+_SUPPORT_CLOSE_PHRASES = (
+    "close ticket",
+    "resolve ticket",
+    "mark ticket resolved",
+)
+_SHOW_MEMORY_PHRASES = (
+    "what do you remember",
+    "show my preferences",
+    "show memory",
+    "what are my preferences",
+    "what do you know about me",
+    "remembered about me",
+)
+_CLEAR_MEMORY_PHRASES = (
+    "clear memory",
+    "clear my memory",
+    "forget everything",
+    "reset my preferences",
+    "clear preferences",
+)
+_PREFERENCE_MARKERS = ("remember", "note that", "save preference")
+_PREFERENCE_FACTS = ("my size is", "i wear size", "budget", "price range")
+_PREFERENCE_BLOCKERS = ("show me", "find", "search", "add to cart", "checkout", "order status")
+_PREFERENCE_CATEGORIES = ("shoes", "clothing", "accessories")
+_PREFERENCE_STYLES = ("denim", "casual", "formal", "sport", "athleisure", "vintage", "streetwear", "minimal")
+_PREFERENCE_COLORS = ("black", "blue", "white", "green", "red", "gray", "charcoal", "navy")
+_FORGET_VALUES = ("shoes", "clothing", "accessories", "denim", "black", "blue", "green", "red", "gray")
+_NON_PRODUCT_TOPICS = (
+    "support",
+    "ticket",
+    "order",
+    "refund",
+    "cancel",
+    "checkout",
+    "memory",
+    "preference",
+    "cart",
+)
+_PRODUCT_TOKENS = (
+    "shoe", "shoes", "sneaker", "sneakers", "runner", "running", "trail", "hoodie",
+    "jogger", "joggers", "sock", "socks", "backpack", "bag", "clothing", "accessories",
+    "denim", "athleisure", "tee", "tshirt", "shirt", "pants", "trousers", "shorts",
+    "jacket", "coat", "vest", "hat", "cap", "beanie", "gloves", "watch", "belt",
+    "wallet", "purse", "handbag", "tote"
+)
+_REFINEMENT_BLOCKERS = ("cart", "checkout", "order", "refund", "ticket", "support")
+_MAX_CACHED_MESSAGE_CHARS = 512
+# Intents the local model may assign: their entities can be rebuilt from the message alone.
+_MODEL_INTENTS = frozenset(
+    {
+        "product_search",
+        "add_to_cart",
+        "remove_from_cart",
+        "update_cart",
+        "adjust_cart_quantity",
+        "view_cart",
+        "clear_cart",
+        "apply_discount",
+        "checkout",
+        "order_status",
+        "cancel_order",
+        "request_refund",
+        "support_status",
+        "support_close",
+        "support_escalation",
+        "show_memory",
+        "clear_memory",
+    }
+)
+
+# Every literal the rule cascade tests for. Each message is scanned once and the
+# rules read membership from the resulting hit set.
+_KEYWORDS = KeywordAutomaton(
+    (
+        "add", "address", "cancel", "cart", "change", "checkout", "place order", "buy now", "code",
+        "delivery", "update", "refund", "remove", "apply", "use", "discount", "coupon", "promo",
+        "update cart", "change quantity", "set quantity", "quantity", "qty", "help", "agent",
+        "i prefer", "i like", "i prefer ", "i like ", "hoodie", "jogger", "runner", "sneaker",
+        "forget", "remove preference", "everything", "all preferences", "size", "price", "budget",
+        "category", "categories", "style", "color", "brand", "what", "whats", "what's",
+        *_COLORS,
+        *_KNOWN_BRANDS,
+        *_SEARCH_VERBS,
+        *_PRICE_WORDS,
+        *_ORDER_STATUS_PHRASES,
+        *_DELTA_DOWN,
+        *_DELTA_UP,
+        *_ADJUST_TOKENS,
+        *_CLEAR_CART_PHRASES,
+        *_ESCALATION_PHRASES,
+        *_SUPPORT_STATUS_PHRASES,
+        *_SUPPORT_CLOSE_PHRASES,
+        *_SHOW_MEMORY_PHRASES,
+        *_CLEAR_MEMORY_PHRASES,
+        *_PREFERENCE_MARKERS,
+        *_PREFERENCE_FACTS,
+        *_PREFERENCE_BLOCKERS,
+        *_PREFERENCE_CATEGORIES,
+        *_PREFERENCE_STYLES,
+        *_FORGET_VALUES,
+        *_NON_PRODUCT_TOPICS,
+        *_PRODUCT_TOKENS,
+        *_REFINEMENT_BLOCKERS,
+    )
+)
+
+
+_BATCH_WORKER: "IntentClassifier | None" = None
+_NO_PRODUCT_CONTEXT: dict[str, Any] = {"recent": []}
+
+
+def _init_batch_worker(model: IntentModel | None, model_min_confidence: float, cache_entries: int) -> None:
+    global _BATCH_WORKER
+    _BATCH_WORKER = IntentClassifier(
+        cache=IntentCache(max_entries=cache_entries),
+        model=model,
+        model_min_confidence=model_min_confidence,
+    )
+
+
+def _classify_batch_chunk(rows: list[tuple[str, dict[str, Any] | None]]) -> list[IntentResult]:
+    if _BATCH_WORKER is None:
+        raise RuntimeError("batch worker was not initialised")
+    return [_BATCH_WORKER._classify_local(message=message, context=context) for message, context in rows]
+
+
 class IntentClassifier:
     """Lightweight rule-first classifier for commerce intents."""
 
-    def __init__(self, llm_client: LLMClient | None = None) -> None:
+    def __init__(
+        self,
+        llm_client: LLMClient | None = None,
+        cache: IntentCache | None = None,
+        model: IntentModel | None = None,
+        *,
+        model_min_confidence: float = 0.8,
+    ) -> None:
         self.llm_client = llm_client
+        self.cache = cache if cache is not None else IntentCache(max_entries=0)
+        self.model = model
+        self.model_min_confidence = model_min_confidence
 
     def classify(
         self,
@@ -20,215 +264,346 @@ class IntentClassifier:
         *,
         allow_llm: bool = True,
     ) -> IntentResult:
-        rule_intent = self._classify_rules(message=message, context=context)
-        if not allow_llm:
+        rule_intent = self._classify_local(message=message, context=context)
+        if not self._should_ask_llm(rule_intent, allow_llm=allow_llm):
             return rule_intent
         llm_choice = self._classify_with_llm(message=message, context=context)
+        return self._prefer(rule_intent, llm_choice)
+
+    async def aclassify(
+        self,
+        message: str,
+        context: dict[str, Any] | None = None,
+        *,
+        allow_llm: bool = True,
+        trace: StageTrace | None = None,
+    ) -> IntentResult:
+        """:meth:`classify` for the event loop: the LLM tier is awaited on the shared connection pool.
+
+        With a ``trace``, the LLM call is timed as the ``llm_classify`` stage.
+        """
+        rule_intent = self._classify_local(message=message, context=context)
+        if not self._should_ask_llm(rule_intent, allow_llm=allow_llm) or self.llm_client is None:
+            return rule_intent
+        with trace.span("llm_classify") if trace is not None else nullcontext():
+            prediction = await self.llm_client.aclassify_intent(message=message, recent_messages=self._recent(context))
+        return self._prefer(rule_intent, self._from_prediction(prediction))
+
+    def classify_batch(
+        self,
+        messages: Sequence[str],
+        contexts: Sequence[dict[str, Any] | None] | None = None,
+        *,
+        workers: int = 1,
+        chunk_size: int = 1000,
+        executor: Executor | None = None,
+    ) -> list[IntentResult]:
+        """Classify many messages with the local tiers (rules and model), never the LLM.
+
+        Results line up with ``messages``. With ``workers > 1`` (or an executor
+        from :meth:`process_pool`) the input is sharded into ``chunk_size``
+        slices and classified across processes.
+        """
+        if contexts is not None and len(contexts) != len(messages):
+            raise ValueError("contexts must be the same length as messages")
+        rows = list(zip(messages, contexts if contexts is not None else [None] * len(messages)))
+        if executor is None and (workers <= 1 or len(rows) <= chunk_size):
+            return [self._classify_local(message=message, context=context) for message, context in rows]
+
+        # Workers only need the one context bit the rules read, so ship that instead
+        # of whole conversation histories: None means "recent product turn".
+        rows = [(message, None if self._has_product_context(context) else _NO_PRODUCT_CONTEXT) for message, context in rows]
+        size = max(1, int(chunk_size))
+        chunks = [rows[start : start + size] for start in range(0, len(rows), size)]
+        if executor is not None:
+            shards = executor.map(_classify_batch_chunk, chunks)
+            return [frozen_result(result) for shard in shards for result in shard]
+        with self.process_pool(workers) as pool:
+            shards = pool.map(_classify_batch_chunk, chunks)
+            return [frozen_result(result) for shard in shards for result in shard]
+
+    def process_pool(self, workers: int) -> ProcessPoolExecutor:
+        """A process pool whose workers each hold a copy of this classifier's local tiers."""
+        return ProcessPoolExecutor(
+            max_workers=max(1, int(workers)),
+            initializer=_init_batch_worker,
+            initargs=(self.model, self.model_min_confidence, self.cache.max_entries),
+        )
+
+    def _should_ask_llm(self, rule_intent: IntentResult, *, allow_llm: bool) -> bool:
+        if not allow_llm:
+            return False
+        # Rules or the local model are already sure; only ambiguous messages pay for the LLM.
+        return self.model is None or rule_intent.confidence < self.model_min_confidence
+
+    @staticmethod
+    def _prefer(rule_intent: IntentResult, llm_choice: IntentResult | None) -> IntentResult:
         if llm_choice is None:
             return rule_intent
         if llm_choice.confidence >= max(0.7, rule_intent.confidence):
             return llm_choice
         return rule_intent
 
+    @staticmethod
+    def _recent(context: dict[str, Any] | None) -> list[dict[str, Any]]:
+        if not context:
+            return []
+        raw_recent = context.get("recent", [])
+        if not isinstance(raw_recent, list):
+            return []
+        return [item for item in raw_recent if isinstance(item, dict)]
+
     def _classify_with_llm(self, *, message: str, context: dict[str, Any] | None) -> IntentResult | None:
         if self.llm_client is None:
             return None
-        recent = []
-        if context:
-            raw_recent = context.get("recent", [])
-            if isinstance(raw_recent, list):
-                recent = [item for item in raw_recent if isinstance(item, dict)]
-        prediction = self.llm_client.classify_intent(message=message, recent_messages=recent)
+        prediction = self.llm_client.classify_intent(message=message, recent_messages=self._recent(context))
+        return self._from_prediction(prediction)
+
+    @staticmethod
+    def _from_prediction(prediction: LLMIntentPrediction | None) -> IntentResult | None:
         if prediction is None:
             return None
         return IntentResult(
             name=prediction.intent,
             confidence=prediction.confidence,
             entities=prediction.entities,
+            from_llm_cache=prediction.cached,
+        )
+
+    def _classify_local(self, *, message: str, context: dict[str, Any] | None) -> IntentResult:
+        # Rules and the model only see the stripped message and whether a product
+        # turn is recent, so that pair is the whole cache key.
+        normalized = message.strip()
+        if len(normalized) > _MAX_CACHED_MESSAGE_CHARS:
+            return frozen_result(self._classify_uncached(message=message, context=context))
+        key = (normalized, self._has_product_context(context))
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+        return self.cache.put(key, self._classify_uncached(message=message, context=context))
+
+    def _classify_uncached(self, *, message: str, context: dict[str, Any] | None) -> IntentResult:
+        rule_intent = self._classify_rules(message=message, context=context)
+        if self.model is None or rule_intent.name != "general_question" or not message.strip():
+            return rule_intent
+        prediction = self.model.predict(message)
+        if prediction is None:
+            return rule_intent
+        name, probability = prediction
+        if name not in _MODEL_INTENTS or probability < self.model_min_confidence:
+            return rule_intent
+        return IntentResult(
+            name=name,
+            confidence=round(probability, 4),
+            entities=self._entities_for(name, message),
         )
 
+    def _entities_for(self, intent: str, message: str) -> dict[str, Any]:
+        """Rebuild the entities a rule would have attached to ``intent``."""
+        text = message.strip().lower()
+        hits = _KEYWORDS.scan(text)
+        entities: dict[str, Any] = {}
+        if intent == "product_search":
+            entities.update(self._extract_price_range(text))
+            entities.update(self._extract_size(message))
+            entities.update(self._extract_color(hits))
+            entities.update(self._extract_brand(message, hits))
+            entities["query"] = message.strip()
+        elif intent == "add_to_cart":
+            entities.update(self._extract_quantity(text))
+            entities.update(self._extract_product_or_variant_id(text))
+            entities.update(self._extract_size(message))
+            entities.update(self._extract_color(hits))
+            entities.update(self._extract_brand(message, hits))
+            query = self._extract_add_query(message)
+            if query:
+                entities["query"] = query
+        elif intent in {"remove_from_cart", "update_cart", "adjust_cart_quantity"}:
+            if intent == "adjust_cart_quantity":
+                entities.update(self._extract_delta(text, hits))
+            else:
+                entities.update(self._extract_quantity(text))
+            entities.update(self._extract_product_or_item_id(text))
+            query = self._extract_cart_item_query(message)
+            if query:
+                entities["query"] = query
+        elif intent == "apply_discount":
+            entities.update(self._extract_discount_code(message))
+        elif intent in {"order_status", "cancel_order", "request_refund"}:
+            entities.update(self._extract_order_id(text))
+        elif intent in {"support_status", "support_close", "support_escalation"}:
+            entities.update(self._extract_ticket_id(text))
+            if intent == "support_escalation":
+                entities["query"] = message.strip()
+        return entities
+
     def _classify_rules(self, *, message: str, context: dict[str, Any] | None = None) -> IntentResult:
         text = message.strip().lower()
-        phrase_text = re.sub(r"[_\s]+", " ", text).strip()
+        phrase_text = _PHRASE_SEPARATORS.sub(" ", text).strip()
         entities: dict[str, Any] = {}
 
         if not text:
             return IntentResult(name="general_question", confidence=0.2, entities={})
 
-        if ("cart" in text or "my cart" in text) and self._contains_order_status_phrase(text):
+        hits = _KEYWORDS.scan(text)
+        phrase_hits = hits if phrase_text == text else _KEYWORDS.scan(phrase_text)
+
+        if "cart" in hits and self._contains_order_status_phrase(hits):
             entities.update(self._extract_order_id(text))
             return IntentResult(name="multi_status", confidence=0.9, entities=entities)
 
         # Memory intents.
-        if self._is_show_memory_request(text):
+        if self._is_show_memory_request(hits):
             return IntentResult(name="show_memory", confidence=0.93, entities={})
-        if self._is_clear_memory_request(text):
+        if self._is_clear_memory_request(hits):
             return IntentResult(name="clear_memory", confidence=0.92, entities={})
-        forget = self._extract_forget_preference(message)
+        forget = self._extract_forget_preference(hits)
         if forget:
             return IntentResult(name="forget_preference", confidence=0.9, entities=forget)
-        updates = self._extract_preference_updates(message)
-        if updates and self._is_preference_statement(text):
+        updates = self._extract_preference_updates(text, hits)
+        if updates and self._is_preference_statement(hits):
             return IntentResult(name="save_preference", confidence=0.88, entities={"updates": updates})
 
         # Order intents.
-        if "order" in text and "address" in text and any(token in text for token in ("change", "update", "delivery")):
+        if "order" in hits and "address" in hits and any(token in hits for token in ("change", "update", "delivery")):
             entities.update(self._extract_order_id(text))
             entities.update(self._extract_shipping_address(message))
             return IntentResult(name="change_order_address", confidence=0.88, entities=entities)
-        if "cancel" in text and "order" in text:
+        if "cancel" in hits and "order" in hits:
             entities.update(self._extract_order_id(text))
             return IntentResult(name="cancel_order", confidence=0.91, entities=entities)
-        if "refund" in text and "order" in text:
+        if "refund" in hits and "order" in hits:
             entities.update(self._extract_order_id(text))
             return IntentResult(name="request_refund", confidence=0.9, entities=entities)
-        if self._contains_order_status_phrase(text):
+        if self._contains_order_status_phrase(hits):
             entities.update(self._extract_order_id(text))
             return IntentResult(name="order_status", confidence=0.9, entities=entities)
-        if "checkout" in text or "place order" in text or "buy now" in text:
+        if "checkout" in hits or "place order" in hits or "buy now" in hits:
             return IntentResult(name="checkout", confidence=0.95, entities={})
 
-        if self._is_support_status_request(text):
+        if self._is_support_status_request(hits):
             entities.update(self._extract_ticket_id(text))
             return IntentResult(name="support_status", confidence=0.9, entities=entities)
-        if self._is_support_close_request(text):
+        if self._is_support_close_request(hits):
             entities.update(self._extract_ticket_id(text))
             return IntentResult(name="support_close", confidence=0.9, entities=entities)
-        if self._is_support_escalation_request(text):
+        if self._is_support_escalation_request(hits):
             entities.update(self._extract_ticket_id(text))
             entities["query"] = message.strip()
             return IntentResult(name="support_escalation", confidence=0.88, entities=entities)
 
-        if ("add" in text and "cart" in text) and any(
-            token in text
-            for token in (
-                "find",
-                "search",
-                "show me",
-                "recommend",
-                "looking for",
-                "under",
-                "below",
-                "over",
-                "above",
-            )
-        ):
+        if ("add" in hits and "cart" in hits) and any(token in hits for token in (*_SEARCH_VERBS, *_PRICE_WORDS)):
             entities.update(self._extract_quantity(text))
             entities.update(self._extract_product_or_variant_id(text))
             entities.update(self._extract_price_range(text))
             entities.update(self._extract_size(message))
-            entities.update(self._extract_color(text))
-            entities.update(self._extract_brand(message))
+            entities.update(self._extract_color(hits))
+            entities.update(self._extract_brand(message, hits))
             entities["query"] = self._extract_search_query_for_combo(message)
             return IntentResult(name="search_and_add_to_cart", confidence=0.93, entities=entities)
 
         # Cart intents.
-        if self._is_clear_cart_request(text):
+        if self._is_clear_cart_request(hits):
             return IntentResult(name="clear_cart", confidence=0.94, entities={})
-        if self._is_adjust_cart_quantity_request(text):
+        if self._is_adjust_cart_quantity_request(hits):
             entities.update(self._extract_product_or_item_id(text))
-            entities.update(self._extract_delta(text))
+            entities.update(self._extract_delta(text, hits))
             query = self._extract_cart_item_query(message)
             if query:
                 entities["query"] = query
             return IntentResult(name="adjust_cart_quantity", confidence=0.89, entities=entities)
-        multi_items = self._extract_multi_add_items(message)
+        multi_items = self._extract_multi_add_items(message, hits)
         if len(multi_items) >= 2:
             return IntentResult(name="add_multiple_to_cart", confidence=0.9, entities={"items": multi_items})
-        if any(token in text for token in ("discount", "coupon", "promo")) and any(
-            token in text for token in ("apply", "use", "code")
+        if any(token in hits for token in ("discount", "coupon", "promo")) and any(
+            token in hits for token in ("apply", "use", "code")
         ):
             entities.update(self._extract_discount_code(message))
             return IntentResult(name="apply_discount", confidence=0.9, entities=entities)
-        if "remove" in text and "cart" in text:
+        if "remove" in hits and "cart" in hits:
             entities.update(self._extract_quantity(text))
             entities.update(self._extract_product_or_item_id(text))
             query = self._extract_cart_item_query(message)
             if query:
                 entities["query"] = query
             return IntentResult(name="remove_from_cart", confidence=0.88, entities=entities)
-        if any(phrase in text for phrase in ["update cart", "change quantity", "set quantity"]):
+        if any(phrase in hits for phrase in ("update cart", "change quantity", "set quantity")):
             entities.update(self._extract_quantity(text))
             entities.update(self._extract_product_or_item_id(text))
             query = self._extract_cart_item_query(message)
             if query:
                 entities["query"] = query
             return IntentResult(name="update_cart", confidence=0.86, entities=entities)
-        if "add" in text and "cart" in text:
+        if "add" in hits and "cart" in hits:
             entities.update(self._extract_quantity(text))
             entities.update(self._extract_product_or_variant_id(text))
             entities.update(self._extract_size(message))
-            entities.update(self._extract_color(text))
-            entities.update(self._extract_brand(message))
+            entities.update(self._extract_color(hits))
+            entities.update(self._extract_brand(message, hits))
             query = self._extract_add_query(message)
             if query:
                 entities["query"] = query
             return IntentResult(name="add_to_cart", confidence=0.92, entities=entities)
-        if self._is_view_cart_request(phrase_text):
+        if self._is_view_cart_request(phrase_text, phrase_hits):
             return IntentResult(name="view_cart", confidence=0.9, entities={})
 
         # Product intents.
-        if any(token in text for token in ["find", "search", "show me", "recommend", "looking for"]):
+        if any(token in hits for token in _SEARCH_VERBS):
             entities.update(self._extract_price_range(text))
             entities.update(self._extract_size(message))
-            entities.update(self._extract_color(text))
-            entities.update(self._extract_brand(message))
+            entities.update(self._extract_color(hits))
+            entities.update(self._extract_brand(message, hits))
             entities["query"] = message.strip()
             return IntentResult(name="product_search", confidence=0.84, entities=entities)
-        if self._is_price_refinement_request(text=phrase_text, context=context):
+        if self._is_price_refinement_request(text=phrase_text, hits=phrase_hits, context=context):
             entities.update(self._extract_price_range(text))
             entities.update(self._extract_size(message))
-            entities.update(self._extract_color(text))
-            entities.update(self._extract_brand(message))
+            entities.update(self._extract_color(hits))
+            entities.update(self._extract_brand(message, hits))
             entities["query"] = message.strip()
             return IntentResult(name="product_search", confidence=0.8, entities=entities)
-        if self._looks_like_product_query(phrase_text):
+        if self._looks_like_product_query(phrase_hits):
             entities.update(self._extract_price_range(text))
             entities.update(self._extract_size(message))
-            entities.update(self._extract_color(text))
-            entities.update(self._extract_brand(message))
+            entities.update(self._extract_color(hits))
+            entities.update(self._extract_brand(message, hits))
             entities["query"] = message.strip()
             return IntentResult(name="product_search", confidence=0.78, entities=entities)
 
         return IntentResult(name="general_question", confidence=0.6, entities={"query": message.strip()})
 
     def _extract_order_id(self, text: str) -> dict[str, Any]:
-        match = re.search(r"(order[_\-]?\d+|ord[_\-]?\d+)", text)
+        match = _ORDER_ID.search(text)
         return {"orderId": match.group(1)} if match else {}
 
     def _extract_ticket_id(self, text: str) -> dict[str, Any]:
-        match = re.search(r"(ticket[_\-]?(?:item[_\-]?)?\d+)", text)
+        match = _TICKET_ID.search(text)
         if not match:
             return {}
         return {"ticketId": match.group(1).replace("-", "_")}
 
     def _extract_quantity(self, text: str) -> dict[str, Any]:
-        match = re.search(r"\b(\d+)\b", text)
+        match = _NUMBER.search(text)
         if not match:
             return {}
         quantity = max(1, min(50, int(match.group(1))))
         return {"quantity": quantity}
 
-    def _extract_color(self, text: str) -> dict[str, Any]:
-        colors = (
-            "black", "blue", "white", "green", "red", "gray", "grey", "charcoal", "navy",
-            "yellow", "purple", "orange", "pink", "brown", "tan", "beige", "gold", "silver",
-            "maroon", "teal", "olive", "magenta", "cyan"
-        )
-        for color in colors:
-            if color in text:
+    def _extract_color(self, hits: frozenset[str]) -> dict[str, Any]:
+        for color in _COLORS:
+            if color in hits:
                 return {"color": color}
         return {}
 
     def _extract_size(self, message: str) -> dict[str, Any]:
-        match = re.search(r"\bsize\s*([a-z0-9\-]+)\b", message, flags=re.IGNORECASE)
+        match = _SIZE.search(message)
         if not match:
             return {}
         return {"size": match.group(1).strip().upper()}
 
     def _extract_price_range(self, text: str) -> dict[str, Any]:
-        below = re.search(r"(under|below)\s*\$?(\d+)", text)
-        above = re.search(r"(over|above)\s*\$?(\d+)", text)
+        below = _PRICE_BELOW.search(text)
+        above = _PRICE_ABOVE.search(text)
         entities: dict[str, Any] = {}
         if below:
             entities["maxPrice"] = float(below.group(2))
@@ -236,29 +611,23 @@ class IntentClassifier:
             entities["minPrice"] = float(above.group(2))
         return entities
 
-    def _extract_brand(self, message: str) -> dict[str, Any]:
-        match = re.search(
-            r"(?:brand|from|by)\s*(?:is|=|:)?\s*([a-zA-Z0-9&\-\s]{2,80})",
-            message,
-            flags=re.IGNORECASE,
-        )
+    def _extract_brand(self, message: str, hits: frozenset[str]) -> dict[str, Any]:
+        match = _BRAND.search(message)
         if match:
             raw = match.group(1).strip(" .,;")
             if raw:
                 # Basic filtering to avoid common words being caught as brands
                 if raw.lower() not in ("me", "my", "the", "a", "an", "this", "that", "these", "those"):
                     return {"brand": raw.lower()}
-        
-        known = ("strideforge", "peakroute", "aerothread", "carryworks", "urbanbound", "trailtech", "luxthread", "vanguards")
-        lowered = message.lower()
-        for token in known:
-            if token in lowered:
+
+        for token in _KNOWN_BRANDS:
+            if token in hits:
                 return {"brand": token}
         return {}
 
     def _extract_product_or_variant_id(self, text: str) -> dict[str, Any]:
-        product_match = re.search(r"(prod[_\-]?\d+)", text)
-        variant_match = re.search(r"(var[_\-]?\d+)", text)
+        product_match = _PRODUCT_ID.search(text)
+        variant_match = _VARIANT_ID.search(text)
         entities: dict[str, Any] = {}
         if product_match:
             entities["productId"] = product_match.group(1).replace("-", "_")
@@ -267,49 +636,33 @@ class IntentClassifier:
         return entities
 
     def _extract_product_or_item_id(self, text: str) -> dict[str, Any]:
-        item_match = re.search(r"(item[_\-]?\d+)", text)
+        item_match = _ITEM_ID.search(text)
         if item_match:
             return {"itemId": item_match.group(1).replace("-", "_")}
         return self._extract_product_or_variant_id(text)
 
-    def _extract_delta(self, text: str) -> dict[str, Any]:
-        if "set quantity" in text:
+    def _extract_delta(self, text: str, hits: frozenset[str]) -> dict[str, Any]:
+        if "set quantity" in hits:
             return {}
-        amount_match = re.search(r"\b(\d+)\b", text)
+        amount_match = _NUMBER.search(text)
         amount = max(1, int(amount_match.group(1))) if amount_match else 1
-        if any(token in text for token in ("decrease", "reduce", "minus", "less")):
+        if any(token in hits for token in _DELTA_DOWN):
             return {"delta": -amount}
-        if any(token in text for token in ("increase", "plus", "more", "another")):
+        if any(token in hits for token in _DELTA_UP):
             return {"delta": amount}
         return {}
 
-    def _contains_order_status_phrase(self, text: str) -> bool:
-        if "order" not in text:
+    def _contains_order_status_phrase(self, hits: frozenset[str]) -> bool:
+        if "order" not in hits:
             return False
-        phrases = (
-            "order status",
-            "where is my order",
-            "track order",
-            "hasn't arrived",
-            "hasnt arrived",
-            "not arrived",
-            "order is late",
-            "order late",
-            "delayed order",
-            "order delayed",
-        )
-        return any(phrase in text for phrase in phrases)
+        return any(phrase in hits for phrase in _ORDER_STATUS_PHRASES)
 
     def _extract_discount_code(self, message: str) -> dict[str, Any]:
-        explicit = re.search(
-            r"(?:code|coupon|promo)\s*(?:is|=|:)?\s*([a-zA-Z0-9_-]{4,20})",
-            message,
-            flags=re.IGNORECASE,
-        )
+        explicit = _DISCOUNT_CODE.search(message)
         if explicit:
             return {"code": explicit.group(1).upper()}
 
-        candidates = re.findall(r"\b([A-Za-z0-9]{4,20})\b", message)
+        candidates = _CODE_CANDIDATE.findall(message)
         stop_words = {"APPLY", "DISCOUNT", "COUPON", "PROMO", "CODE", "PLEASE", "THIS", "THAT"}
         for candidate in candidates:
             token = candidate.upper()
@@ -318,32 +671,14 @@ class IntentClassifier:
         return {}
 
     def _extract_search_query_for_combo(self, message: str) -> str:
-        cleaned = re.sub(
-            r"\b(and\s+)?(add|put)\b.*\bcart\b",
-            " ",
-            message,
-            flags=re.IGNORECASE,
-        )
-        cleaned = re.sub(r"\s+", " ", cleaned).strip()
+        cleaned = _COMBO_CART_CLAUSE.sub(" ", message)
+        cleaned = _WHITESPACE.sub(" ", cleaned).strip()
         return cleaned
 
     def _extract_shipping_address(self, message: str) -> dict[str, Any]:
-        patterns = {
-            "name": r"name",
-            "line1": r"line1|address|street",
-            "line2": r"line2|apt|suite",
-            "city": r"city",
-            "state": r"state",
-            "postalCode": r"postal\s*code|postalcode|zip",
-            "country": r"country",
-        }
         fields: dict[str, str] = {}
-        for field, pattern in patterns.items():
-            match = re.search(
-                rf"(?:{pattern})\s*[:=]\s*([^,;]+)",
-                message,
-                flags=re.IGNORECASE,
-            )
+        for field, pattern in _SHIPPING_FIELDS.items():
+            match = pattern.search(message)
             if match:
                 fields[field] = match.group(1).strip()
 
@@ -363,110 +698,67 @@ class IntentClassifier:
         return {"shippingAddress": shipping}
 
     def _extract_add_query(self, message: str) -> str:
-        cleaned = re.sub(r"\badd\b", " ", message, flags=re.IGNORECASE)
-        cleaned = re.sub(r"\bto\b\s+\b(my\s+)?cart\b", " ", cleaned, flags=re.IGNORECASE)
-        cleaned = re.sub(r"\b(prod[_\-]?\d+|var[_\-]?\d+|item[_\-]?\d+)\b", " ", cleaned, flags=re.IGNORECASE)
-        cleaned = re.sub(r"\b\d+\b", " ", cleaned)
-        cleaned = re.sub(
-            r"\b(please|the|a|an|item|items|quantity|qty|of|for|me|my|cart|with|color)\b",
-            " ",
-            cleaned,
-            flags=re.IGNORECASE,
-        )
-        cleaned = re.sub(r"[,:;]", " ", cleaned)
-        cleaned = re.sub(r"\s+", " ", cleaned).strip()
+        cleaned = _ADD_WORD.sub(" ", message)
+        cleaned = _TO_CART.sub(" ", cleaned)
+        cleaned = _ID_TOKENS.sub(" ", cleaned)
+        cleaned = _NUMBER.sub(" ", cleaned)
+        cleaned = _ADD_FILLER.sub(" ", cleaned)
+        cleaned = _PUNCTUATION.sub(" ", cleaned)
+        cleaned = _WHITESPACE.sub(" ", cleaned).strip()
         if cleaned.lower() in {"", "to", "cart"}:
             return ""
         return cleaned
 
     def _extract_cart_item_query(self, message: str) -> str:
-        cleaned = re.sub(
-            r"\b(remove|delete|drop|update|change|set|increase|decrease|reduce|quantity|qty|from|in|cart|my|the)\b",
-            " ",
-            message,
-            flags=re.IGNORECASE,
-        )
-        cleaned = re.sub(r"\b(prod[_\-]?\d+|var[_\-]?\d+|item[_\-]?\d+)\b", " ", cleaned, flags=re.IGNORECASE)
-        cleaned = re.sub(r"\b\d+\b", " ", cleaned)
-        cleaned = re.sub(r"[,:;]", " ", cleaned)
-        cleaned = re.sub(r"\s+", " ", cleaned).strip()
+        cleaned = _CART_ITEM_FILLER.sub(" ", message)
+        cleaned = _ID_TOKENS.sub(" ", cleaned)
+        cleaned = _NUMBER.sub(" ", cleaned)
+        cleaned = _PUNCTUATION.sub(" ", cleaned)
+        cleaned = _WHITESPACE.sub(" ", cleaned).strip()
         return cleaned
 
-    def _is_clear_cart_request(self, text: str) -> bool:
-        phrases = (
-            "clear cart",
-            "empty cart",
-            "remove all from cart",
-            "delete all from cart",
-            "clear my cart",
-            "empty my cart",
-        )
-        return any(phrase in text for phrase in phrases)
+    def _is_clear_cart_request(self, hits: frozenset[str]) -> bool:
+        return any(phrase in hits for phrase in _CLEAR_CART_PHRASES)
 
-    def _is_adjust_cart_quantity_request(self, text: str) -> bool:
-        if "set quantity" in text:
+    def _is_adjust_cart_quantity_request(self, hits: frozenset[str]) -> bool:
+        if "set quantity" in hits:
             return False
-        if "cart" not in text and "quantity" not in text and "qty" not in text:
+        if "cart" not in hits and "quantity" not in hits and "qty" not in hits:
             return False
-        return any(
-            token in text
-            for token in ("increase", "decrease", "reduce", "minus", "plus", "one more", "one less", "another")
-        )
+        return any(token in hits for token in _ADJUST_TOKENS)
 
-    def _is_support_escalation_request(self, text: str) -> bool:
-        phrases = (
-            "human agent",
-            "support agent",
-            "talk to support",
-            "talk to a person",
-            "connect me to support",
-            "open a ticket",
-            "escalate",
-            "need help with issue",
-        )
-        if any(phrase in text for phrase in phrases):
+    def _is_support_escalation_request(self, hits: frozenset[str]) -> bool:
+        if any(phrase in hits for phrase in _ESCALATION_PHRASES):
             return True
-        return "help" in text and "order" in text and "agent" in text
-
-    def _is_support_status_request(self, text: str) -> bool:
-        phrases = (
-            "ticket status",
-            "support status",
-            "status of my ticket",
-            "my support ticket",
-            "any update on ticket",
-        )
-        return any(phrase in text for phrase in phrases)
+        return "help" in hits and "order" in hits and "agent" in hits
 
-    def _is_support_close_request(self, text: str) -> bool:
-        phrases = (
-            "close ticket",
-            "resolve ticket",
-            "mark ticket resolved",
-        )
-        return any(phrase in text for phrase in phrases)
+    def _is_support_status_request(self, hits: frozenset[str]) -> bool:
+        return any(phrase in hits for phrase in _SUPPORT_STATUS_PHRASES)
 
-    def _extract_multi_add_items(self, message: str) -> list[dict[str, Any]]:
-        lower = message.lower()
-        if "add" not in lower or "cart" not in lower:
+    def _is_support_close_request(self, hits: frozenset[str]) -> bool:
+        return any(phrase in hits for phrase in _SUPPORT_CLOSE_PHRASES)
+
+    def _extract_multi_add_items(self, message: str, hits: frozenset[str]) -> list[dict[str, Any]]:
+        if "add" not in hits or "cart" not in hits:
             return []
-        body = re.sub(r"^.*?\badd\b", "", lower, flags=re.IGNORECASE).strip()
-        body = re.sub(r"\bto\b\s+\b(my\s+)?cart\b.*$", "", body, flags=re.IGNORECASE).strip()
-        body = re.sub(r"\s+", " ", body).strip(" .,;")
+        lower = message.lower()
+        body = _MULTI_ADD_PREFIX.sub("", lower).strip()
+        body = _MULTI_ADD_SUFFIX.sub("", body).strip()
+        body = _WHITESPACE.sub(" ", body).strip(" .,;")
         if not body:
             return []
-        parts = re.split(r"\s*(?:,|\band\b)\s*", body)
+        parts = _MULTI_ADD_SPLIT.split(body)
         items: list[dict[str, Any]] = []
         for part in parts:
             chunk = part.strip(" .,;")
             if not chunk:
                 continue
-            qty_match = re.search(r"\b(\d+)\b", chunk)
+            qty_match = _NUMBER.search(chunk)
             quantity = max(1, min(50, int(qty_match.group(1)))) if qty_match else 1
-            color = self._extract_color(chunk).get("color")
-            query = re.sub(r"\b\d+\b", " ", chunk)
-            query = re.sub(r"\b(of|a|an|the|please|to|my|cart)\b", " ", query)
-            query = re.sub(r"\s+", " ", query).strip()
+            color = self._extract_color(_KEYWORDS.scan(chunk)).get("color")
+            query = _NUMBER.sub(" ", chunk)
+            query = _MULTI_ADD_FILLER.sub(" ", query)
+            query = _WHITESPACE.sub(" ", query).strip()
             if not query:
                 continue
             payload: dict[str, Any] = {"query": query, "quantity": quantity}
@@ -475,47 +767,30 @@ class IntentClassifier:
             items.append(payload)
         return items
 
-    def _is_show_memory_request(self, text: str) -> bool:
-        phrases = (
-            "what do you remember",
-            "show my preferences",
-            "show memory",
-            "what are my preferences",
-            "what do you know about me",
-            "remembered about me",
-        )
-        return any(phrase in text for phrase in phrases)
-
-    def _is_clear_memory_request(self, text: str) -> bool:
-        phrases = (
-            "clear memory",
-            "clear my memory",
-            "forget everything",
-            "reset my preferences",
-            "clear preferences",
-        )
-        return any(phrase in text for phrase in phrases)
+    def _is_show_memory_request(self, hits: frozenset[str]) -> bool:
+        return any(phrase in hits for phrase in _SHOW_MEMORY_PHRASES)
+
+    def _is_clear_memory_request(self, hits: frozenset[str]) -> bool:
+        return any(phrase in hits for phrase in _CLEAR_MEMORY_PHRASES)
 
-    def _is_preference_statement(self, text: str) -> bool:
-        if any(token in text for token in ("remember", "note that", "save preference")):
+    def _is_preference_statement(self, hits: frozenset[str]) -> bool:
+        if any(token in hits for token in _PREFERENCE_MARKERS):
             return True
-        if any(token in text for token in ("my size is", "i wear size", "budget", "price range")):
+        if any(token in hits for token in _PREFERENCE_FACTS):
             return True
-        if "i prefer" in text or "i like" in text:
-            blocking = ("show me", "find", "search", "add to cart", "checkout", "order status")
-            return not any(token in text for token in blocking)
+        if "i prefer" in hits or "i like" in hits:
+            return not any(token in hits for token in _PREFERENCE_BLOCKERS)
         return False
 
-    def _extract_preference_updates(self, message: str) -> dict[str, Any]:
-        text = message.strip().lower()
+    def _extract_preference_updates(self, text: str, hits: frozenset[str]) -> dict[str, Any]:
         updates: dict[str, Any] = {}
 
-        size_match = re.search(r"\b(?:size\s*(?:is|=)?|wear size)\s*(xxs|xs|s|m|l|xl|xxl|\d{1,2})\b", text)
+        size_match = _PREFERENCE_SIZE.search(text)
         if size_match:
             updates["size"] = size_match.group(1).upper()
 
-        max_match = re.search(r"(?:under|below|max(?:imum)?)\s*\$?(\d+)", text)
-        min_match = re.search(r"(?:over|above|min(?:imum)?)\s*\$?(\d+)", text)
+        max_match = _PREFERENCE_MAX.search(text)
+        min_match = _PREFERENCE_MIN.search(text)
         if max_match or min_match:
             price_range: dict[str, float] = {}
             if min_match:
@@ -524,42 +799,33 @@ class IntentClassifier:
                 price_range["max"] = float(max_match.group(1))
             updates["priceRange"] = price_range
 
-        categories = []
-        for category in ("shoes", "clothing", "accessories"):
-            if category in text:
-                categories.append(category)
-        if "hoodie" in text or "jogger" in text:
+        categories = [category for category in _PREFERENCE_CATEGORIES if category in hits]
+        if "hoodie" in hits or "jogger" in hits:
             categories.append("clothing")
-        if "runner" in text or "sneaker" in text:
+        if "runner" in hits or "sneaker" in hits:
             categories.append("shoes")
         if categories:
             updates["categories"] = sorted(set(categories))
 
-        styles = []
-        for style in ("denim", "casual", "formal", "sport", "athleisure", "vintage", "streetwear", "minimal"):
-            if style in text:
-                styles.append(style)
+        styles = [style for style in _PREFERENCE_STYLES if style in hits]
         if styles:
             updates["stylePreferences"] = sorted(set(styles))
 
-        colors = []
-        for color in ("black", "blue", "white", "green", "red", "gray", "charcoal", "navy"):
-            if color in text:
-                colors.append(color)
+        colors = [color for color in _PREFERENCE_COLORS if color in hits]
         if colors:
             updates["colorPreferences"] = sorted(set(colors))
 
-        brand_match = re.search(r"(?:brand|brands?)\s*(?:is|are|=|:)?\s*([a-z0-9,\s&-]{2,120})", text)
+        brand_match = _PREFERENCE_BRANDS.search(text)
         if brand_match:
-            chunks = re.split(r"(?:,|and)", brand_match.group(1))
+            chunks = _PREFERENCE_BRAND_SPLIT.split(brand_match.group(1))
             brands = [token.strip() for token in chunks if token.strip()]
             if brands:
                 updates["brandPreferences"] = brands
 
-        if ("i prefer " in text or "i like " in text) and not any(
+        if ("i prefer " in hits or "i like " in hits) and not any(
             key in updates for key in ("categories", "stylePreferences", "colorPreferences", "brandPreferences")
         ):
-            suffix = re.split(r"i prefer |i like ", text, maxsplit=1)
+            suffix = _PREFERENCE_LEAD.split(text, maxsplit=1)
             if len(suffix) == 2:
                 candidate = suffix[1].strip(" .,!?")
                 if candidate:
@@ -567,47 +833,55 @@ class IntentClassifier:
 
         return updates
 
-    def _extract_forget_preference(self, message: str) -> dict[str, Any]:
-        text = message.strip().lower()
-        if "forget" not in text and "remove preference" not in text:
+    def _extract_forget_preference(self, hits: frozenset[str]) -> dict[str, Any]:
+        if "forget" not in hits and "remove preference" not in hits:
             return {}
-        if "everything" in text or "all preferences" in text:
+        if "everything" in hits or "all preferences" in hits:
             return {"key": "all"}
 
-        if "size" in text:
+        if "size" in hits:
             return {"key": "size"}
-        if "price" in text or "budget" in text:
+        if "price" in hits or "budget" in hits:
             return {"key": "priceRange"}
-        if "category" in text or "categories" in text:
+        if "category" in hits or "categories" in hits:
             return {"key": "categories"}
-        if "style" in text:
+        if "style" in hits:
             return {"key": "stylePreferences"}
-        if "color" in text:
+        if "color" in hits:
             return {"key": "colorPreferences"}
-        if "brand" in text:
+        if "brand" in hits:
             return {"key": "brandPreferences"}
 
-        for token in ("shoes", "clothing", "accessories", "denim", "black", "blue", "green", "red", "gray"):
-            if token in text:
+        for token in _FORGET_VALUES:
+            if token in hits:
                 return {"value": token}
         return {}
 
-    def _is_view_cart_request(self, text: str) -> bool:
+    def _is_view_cart_request(self, text: str, hits: frozenset[str]) -> bool:
         if not text:
             return False
         if text in {'cart', 'my cart', 'view cart', 'show cart', 'show me cart', 'view my cart'}:
             return True
-        if re.search(r'\b(view|show|open|see|display)\s+(my\s+)?cart\b', text):
+        if _VIEW_CART.search(text):
             return True
-        if ('what' in text or 'whats' in text or "what's" in text) and 'cart' in text:
+        if ('what' in hits or 'whats' in hits or "what's" in hits) and 'cart' in hits:
             return True
         return False
 
-    def _is_price_refinement_request(self, *, text: str, context: dict[str, Any] | None) -> bool:
+    def _is_price_refinement_request(
+        self,
+        *,
+        text: str,
+        hits: frozenset[str],
+        context: dict[str, Any] | None,
+    ) -> bool:
         if not self._extract_price_range(text):
             return False
-        if any(token in text for token in ('cart', 'checkout', 'order', 'refund', 'ticket', 'support')):
+        if any(token in hits for token in _REFINEMENT_BLOCKERS):
             return False
+        return self._has_product_context(context)
+
+    def _has_product_context(self, context: dict[str, Any] | None) -> bool:
         if context is None:
             return True
         recent = context.get('recent', [])
@@ -622,31 +896,7 @@ class IntentClassifier:
                 return True
         return False
 
-    def _looks_like_product_query(self, text: str) -> bool:
-        if not text:
+    def _looks_like_product_query(self, hits: frozenset[str]) -> bool:
+        if any(token in hits for token in _NON_PRODUCT_TOPICS):
             return False
-        if any(
-            token in text
-            for token in (
-                'support',
-                'ticket',
-                'order',
-                'refund',
-                'cancel',
-                'checkout',
-                'memory',
-                'preference',
-                'cart',
-            )
-        ):
-            return False
-        product_tokens = (
-            'shoe', 'shoes', 'sneaker', 'sneakers', 'runner', 'running', 'trail', 'hoodie',
-            'jogger', 'joggers', 'sock', 'socks', 'backpack', 'bag', 'clothing', 'accessories',
-            'denim', 'athleisure', 'tee', 'tshirt', 'shirt', 'pants', 'trousers', 'shorts',
-            'jacket', 'coat', 'vest', 'hat', 'cap', 'beanie', 'gloves', 'watch', 'belt',
-            'wallet', 'purse', 'handbag', 'tote'
-        )
-        return any(token in text for token in product_tokens)
-
-
+        return any(token in hits for token in _PRODUCT_TOKENS)
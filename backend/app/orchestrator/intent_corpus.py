@@ -0,0 +1,295 @@
+from __future__ import annotations
+
+from typing import Any
+
+# Labelled natural-language corpus behind the nl_eval gates. It lives in the app
+# package so the intent model trainer can use it in the shipped image as well.
+
+
+def _build_accuracy_gate_cases() -> list[dict[str, Any]]:
+    cases: list[dict[str, Any]] = []
+
+    products = [
+        "running shoes",
+        "hoodie",
+        "trail shoes",
+        "sports socks",
+        "training backpack",
+        "water bottle",
+    ]
+    quantities = [1, 2, 3, 4, 5]
+
+    for quantity in quantities:
+        for product in products:
+            cases.append(
+                {
+                    "message": f"add {quantity} {product} to cart",
+                    "intent": "add_to_cart",
+                    "actions": ["add_item"],
+                }
+            )
+            cases.append(
+                {
+                    "message": f"remove {quantity} {product} from cart",
+                    "intent": "remove_from_cart",
+                    "actions": ["remove_item"],
+                }
+            )
+
+    for product in products:
+        cases.append(
+            {
+                "message": f"find {product} under 150",
+                "intent": "product_search",
+                "actions": ["search_products"],
+            }
+        )
+        cases.append(
+            {
+                "message": f"search {product} over 40",
+                "intent": "product_search",
+                "actions": ["search_products"],
+            }
+        )
+
+    for code in ["SAVE10", "SAVE20", "SUMMER25", "WELCOME5", "VIP30"]:
+        cases.append(
+            {
+                "message": f"apply discount code {code}",
+                "intent": "apply_discount",
+                "actions": ["apply_discount"],
+            }
+        )
+
+    for order_idx in range(101, 136):
+        cases.append(
+            {
+                "message": f"where is my order order_{order_idx}",
+                "intent": "order_status",
+                "actions": ["get_order_status"],
+            }
+        )
+        cases.append(
+            {
+                "message": f"cancel order order_{order_idx}",
+                "intent": "cancel_order",
+                "actions": ["cancel_order"],
+            }
+        )
+
+    for ticket_idx in range(301, 341):
+        cases.append(
+            {
+                "message": f"ticket status ticket_{ticket_idx}",
+                "intent": "support_status",
+                "actions": ["ticket_status"],
+            }
+        )
+        cases.append(
+            {
+                "message": f"close ticket ticket_{ticket_idx}",
+                "intent": "support_close",
+                "actions": ["close_ticket"],
+            }
+        )
+
+    for color in ["black", "blue", "white", "green", "navy"]:
+        for size in ["M", "L", "10"]:
+            cases.append(
+                {
+                    "message": f"remember I like {color} and my size is {size}",
+                    "intent": "save_preference",
+                    "actions": ["save_preference"],
+                }
+            )
+
+    for price in [90, 110, 130, 150, 170, 190, 210, 230, 250, 270, 290, 310, 330, 350, 370]:
+        cases.append(
+            {
+                "message": f"under {price}",
+                "context": {"recent": [{"intent": "product_search", "agent": "product"}]},
+                "intent": "product_search",
+                "actions": ["search_products"],
+            }
+        )
+
+    for _ in range(10):
+        cases.append(
+            {
+                "message": "show my cart and order status",
+                "intent": "multi_status",
+                "actions": ["get_cart", "get_order_status"],
+            }
+        )
+        cases.append(
+            {
+                "message": "show me cart",
+                "intent": "view_cart",
+                "actions": ["get_cart"],
+            }
+        )
+        cases.append(
+            {
+                "message": "please empty my cart",
+                "intent": "clear_cart",
+                "actions": ["clear_cart"],
+            }
+        )
+        cases.append(
+            {
+                "message": "checkout",
+                "intent": "checkout",
+                "actions": ["checkout_summary"],
+            }
+        )
+
+    return cases
+
+
+# Bulk phrasings scored as a whole against the 95% accuracy gate.
+ACCURACY_GATE_CASES = _build_accuracy_gate_cases()
+
+# Individually asserted cases, including expected entities.
+INTENT_AND_ACTION_CASES: list[dict[str, Any]] = [
+    {
+        "id": "product_search_price_filter",
+        "message": "show me running shoes under 150",
+        "expected_intent": "product_search",
+        "expected_actions": ["search_products"],
+        "entities": {"maxPrice": 150.0},
+    },
+    {
+        "id": "add_single_with_quantity",
+        "message": "add 2 running shoes to cart",
+        "expected_intent": "add_to_cart",
+        "expected_actions": ["add_item"],
+        "entities": {"quantity": 2},
+    },
+    {
+        "id": "add_multiple_items",
+        "message": "add 2 running shoes and 1 hoodie to cart",
+        "expected_intent": "add_multiple_to_cart",
+        "expected_actions": ["add_multiple_items"],
+        "entities": {"items_min": 2},
+    },
+    {
+        "id": "view_cart_phrase",
+        "message": "show me cart",
+        "expected_intent": "view_cart",
+        "expected_actions": ["get_cart"],
+        "entities": {},
+    },
+    {
+        "id": "clear_cart",
+        "message": "please empty my cart",
+        "expected_intent": "clear_cart",
+        "expected_actions": ["clear_cart"],
+        "entities": {},
+    },
+    {
+        "id": "adjust_quantity",
+        "message": "increase quantity of hoodie in cart by 2",
+        "expected_intent": "adjust_cart_quantity",
+        "expected_actions": ["adjust_item_quantity"],
+        "entities": {"delta": 2},
+    },
+    {
+        "id": "remove_quantity",
+        "message": "remove 2 running shoes from cart",
+        "expected_intent": "remove_from_cart",
+        "expected_actions": ["remove_item"],
+        "entities": {"quantity": 2},
+    },
+    {
+        "id": "checkout",
+        "message": "checkout",
+        "expected_intent": "checkout",
+        "expected_actions": ["checkout_summary"],
+        "entities": {},
+    },
+    {
+        "id": "order_status",
+        "message": "where is my order order_123",
+        "expected_intent": "order_status",
+        "expected_actions": ["get_order_status"],
+        "entities": {"orderId": "order_123"},
+    },
+    {
+        "id": "multi_status",
+        "message": "show my cart and order status",
+        "expected_intent": "multi_status",
+        "expected_actions": ["get_cart", "get_order_status"],
+        "entities": {},
+    },
+    {
+        "id": "discount_code",
+        "message": "apply discount code save20",
+        "expected_intent": "apply_discount",
+        "expected_actions": ["apply_discount"],
+        "entities": {"code": "SAVE20"},
+    },
+    {
+        "id": "save_preference",
+        "message": "remember i like denim and my size is m",
+        "expected_intent": "save_preference",
+        "expected_actions": ["save_preference"],
+        "entities": {"size": "M", "style": "denim"},
+    },
+    {
+        "id": "show_memory",
+        "message": "what do you remember about me",
+        "expected_intent": "show_memory",
+        "expected_actions": ["show_memory"],
+        "entities": {},
+    },
+    {
+        "id": "forget_preference",
+        "message": "forget denim",
+        "expected_intent": "forget_preference",
+        "expected_actions": ["forget_preference"],
+        "entities": {"value": "denim"},
+    },
+    {
+        "id": "clear_memory",
+        "message": "clear my memory",
+        "expected_intent": "clear_memory",
+        "expected_actions": ["clear_memory"],
+        "entities": {},
+    },
+    {
+        "id": "support_escalation",
+        "message": "connect me to support agent for payment issue",
+        "expected_intent": "support_escalation",
+        "expected_actions": ["create_ticket"],
+        "entities": {},
+    },
+    {
+        "id": "support_status",
+        "message": "ticket status",
+        "expected_intent": "support_status",
+        "expected_actions": ["ticket_status"],
+        "entities": {},
+    },
+    {
+        "id": "support_close",
+        "message": "close ticket ticket_123",
+        "expected_intent": "support_close",
+        "expected_actions": ["close_ticket"],
+        "entities": {"ticketId": "ticket_123"},
+    },
+    {
+        "id": "id_based_add",
+        "message": "add prod_001 var_001 to cart",
+        "expected_intent": "add_to_cart",
+        "expected_actions": ["add_item"],
+        "entities": {"productId": "prod_001", "variantId": "var_001"},
+    },
+    {
+        "id": "price_refinement",
+        "message": "under 150",
+        "context": {"recent": [{"intent": "product_search", "agent": "product"}]},
+        "expected_intent": "product_search",
+        "expected_actions": ["search_products"],
+        "entities": {"maxPrice": 150.0},
+    },
+]
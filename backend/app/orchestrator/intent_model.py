@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+import re
+from pathlib import Path
+from typing import Any, Iterable
+
+from app.core.utils import iso_now
+
+
+MODEL_FORMAT_VERSION = 1
+
+_DIGITS = re.compile(r"\d+")
+_WHITESPACE = re.compile(r"[_\s]+")
+
+
+def normalize_text(message: str) -> str:
+    """Lowercase, collapse separators and fold digit runs so ids do not leak into features."""
+    text = _DIGITS.sub("0", str(message or "").lower())
+    return _WHITESPACE.sub(" ", text).strip()
+
+
+class IntentModel:
+    """Local linear intent model: character n-gram TF-IDF plus logistic regression.
+
+    Trained offline by ``app.scripts.train_intent_model`` and loaded once at
+    startup. Prediction is a sparse dot product, so it costs microseconds
+    where an LLM round trip costs hundreds of milliseconds.
+    """
+
+    def __init__(self, pipeline: Any, *, metadata: dict[str, Any] | None = None) -> None:
+        self.pipeline = pipeline
+        self.metadata = dict(metadata or {})
+        self.labels: list[str] = [str(label) for label in pipeline.classes_]
+
+    @classmethod
+    def train(cls, examples: Iterable[tuple[str, str]], *, c: float = 8.0) -> "IntentModel":
+        from sklearn.feature_extraction.text import TfidfVectorizer
+        from sklearn.linear_model import LogisticRegression
+        from sklearn.pipeline import Pipeline
+
+        messages: list[str] = []
+        labels: list[str] = []
+        for message, label in examples:
+            if str(message).strip() and str(label).strip():
+                messages.append(str(message))
+                labels.append(str(label))
+        if len(set(labels)) < 2:
+            raise ValueError("training data needs at least two intents")
+
+        pipeline = Pipeline(
+            [
+                (
+                    "tfidf",
+                    TfidfVectorizer(
+                        preprocessor=normalize_text,
+                        analyzer="char_wb",
+                        ngram_range=(2, 5),
+                        sublinear_tf=True,
+                    ),
+                ),
+                ("clf", LogisticRegression(C=c, max_iter=2000, class_weight="balanced")),
+            ]
+        )
+        pipeline.fit(messages, labels)
+        return cls(
+            pipeline,
+            metadata={"trainedAt": iso_now(), "examples": len(messages), "formatVersion": MODEL_FORMAT_VERSION},
+        )
+
+    def predict(self, message: str) -> tuple[str, float] | None:
+        text = str(message or "").strip()
+        if not text:
+            return None
+        probabilities = self.pipeline.predict_proba([text])[0]
+        best = int(probabilities.argmax())
+        return self.labels[best], float(probabilities[best])
+
+    def save(self, path: str | Path) -> None:
+        import joblib
+
+        target = Path(path)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        joblib.dump({"pipeline": self.pipeline, "metadata": self.metadata}, target)
+
+    @classmethod
+    def load(cls, path: str | Path) -> "IntentModel | None":
+        """Load a model written by :meth:`save`; a missing or unreadable file yields ``None``."""
+        source = Path(path)
+        if not source.is_file():
+            return None
+        try:
+            import joblib
+
+            payload = joblib.load(source)
+            metadata = payload.get("metadata", {})
+            if int(metadata.get("formatVersion", 0)) != MODEL_FORMAT_VERSION:
+                return None
+            return cls(payload["pipeline"], metadata=metadata)
+        except Exception:
+            return None
@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+from collections import deque
+from typing import Iterable
+
+
+class KeywordAutomaton:
+    """Aho-Corasick matcher reporting every keyword that occurs in a text.
+
+    ``keyword in automaton.scan(text)`` is equivalent to ``keyword in text``
+    for every registered keyword, but the text is walked once no matter how
+    many keywords are registered. Matches are plain substrings, overlapping
+    and not word bounded, exactly like the ``in`` operator.
+    """
+
+    def __init__(self, keywords: Iterable[str]) -> None:
+        self.keywords = frozenset(keyword for keyword in keywords if keyword)
+        goto: list[dict[str, int]] = [{}]
+        outputs: list[set[str]] = [set()]
+        for keyword in sorted(self.keywords):
+            state = 0
+            for char in keyword:
+                following = goto[state].get(char)
+                if following is None:
+                    following = len(goto)
+                    goto[state][char] = following
+                    goto.append({})
+                    outputs.append(set())
+                state = following
+            outputs[state].add(keyword)
+
+        # Breadth-first so every failure target is finished before it is used.
+        fail = [0] * len(goto)
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, following in goto[state].items():
+                queue.append(following)
+                fallback = fail[state]
+                while fallback and char not in goto[fallback]:
+                    fallback = fail[fallback]
+                target = goto[fallback].get(char, 0)
+                fail[following] = target if target != following else 0
+                outputs[following] |= outputs[fail[following]]
+
+        self._goto = goto
+        self._fail = fail
+        self._outputs = [frozenset(found) for found in outputs]
+        self._alphabet = frozenset(char for keyword in self.keywords for char in keyword)
+
+    def scan(self, text: str) -> frozenset[str]:
+        goto = self._goto
+        fail = self._fail
+        outputs = self._outputs
+        alphabet = self._alphabet
+        hits: set[str] = set()
+        state = 0
+        for char in text:
+            if char not in alphabet:
+                state = 0
+                continue
+            following = goto[state].get(char)
+            while following is None and state:
+                state = fail[state]
+                following = goto[state].get(char)
+            state = following or 0
+            if outputs[state]:
+                hits.update(outputs[state])
+        return frozenset(hits)
@@ -3,22 +3,34 @@ from __future__ import annotations
 import asyncio
 import hashlib
 from dataclasses import asdict
+from time import perf_counter
 from typing import Any
 from app.infrastructure.logging import get_logger
 from app.infrastructure.logging import get_logger
 
 from app.agents.base_agent import BaseAgent
+from app.agents.executor import AgentExecutor
 from app.infrastructure.llm_client import LLMActionPlan, LLMClient
+from app.infrastructure.observability import MetricsCollector, StageTrace
 from app.orchestrator.action_extractor import ActionExtractor
+from app.orchestrator.action_graph import ActionNode, build_action_graph
 from app.orchestrator.agent_router import AgentRouter
 from app.orchestrator.context_builder import ContextBuilder
 from app.orchestrator.intent_classifier import IntentClassifier
 from app.orchestrator.response_formatter import ResponseFormatter
-from app.orchestrator.types import AgentAction, AgentExecutionResult, AgentResponse
+from app.orchestrator.types import AgentAction, AgentContext, AgentExecutionResult, AgentResponse, IntentResult
 from app.services.interaction_service import InteractionService
 from app.services.memory_service import MemoryService
 
 
+# Rule actions that only read state, so they can run while the planner is still
+# thinking and simply be discarded if the planner's answer wins.
+_SPECULATIVE_ACTIONS = {"search_products", "get_cart", "get_order_status"}
+
+_SKIPPED_ATOMIC_MESSAGE = "Skipped due to previous failure in atomic mode."
+_DEADLINE_MESSAGE = "Not finished within the request deadline."
+
+
 class Orchestrator:
     def __init__(
         self,
@@ -32,6 +44,8 @@ class Orchestrator:
         interaction_service: InteractionService,
         memory_service: MemoryService,
         agents: dict[str, BaseAgent],
+        agent_executor: AgentExecutor | None = None,
+        metrics_collector: MetricsCollector | None = None,
     ) -> None:
         self.intent_classifier = intent_classifier
         self.context_builder = context_builder
@@ -42,6 +56,8 @@ class Orchestrator:
         self.interaction_service = interaction_service
         self.memory_service = memory_service
         self.agents = agents
+        self.agent_executor = agent_executor if agent_executor is not None else AgentExecutor()
+        self.metrics_collector = metrics_collector
         self.logger = get_logger(__name__)
 
     async def process_message(
@@ -77,9 +93,12 @@ class Orchestrator:
         channel: str,
         stream: bool = False,
     ):
-        recent = self.interaction_service.recent(session_id=session_id, limit=12)
-        if not recent and user_id:
-            recent = self._recent_from_memory(user_id=user_id, limit=12)
+        started = perf_counter()
+        trace = StageTrace()
+        with trace.span("recent_history"):
+            recent = self.interaction_service.recent(session_id=session_id, limit=12)
+            if not recent and user_id:
+                recent = self._recent_from_memory(user_id=user_id, limit=12)
 
         decision_policy = self._decision_policy()
         planner_enabled_for_request = self._planner_enabled_for_request(
@@ -88,18 +107,22 @@ class Orchestrator:
         )
         allow_classifier_llm = decision_policy == "classifier_first" and not planner_enabled_for_request
 
-        intent = self.intent_classifier.classify(
-            message=message,
-            context={"recent": recent},
-            allow_llm=allow_classifier_llm,
-        )
-        context = self.context_builder.build(
-            intent=intent,
-            session_id=session_id,
-            user_id=user_id,
-            channel=channel,
-            recent_messages=recent,
-        )
+        with trace.span("classify"):
+            intent = await self.intent_classifier.aclassify(
+                message=message,
+                context={"recent": recent},
+                allow_llm=allow_classifier_llm,
+                trace=trace,
+            )
+        with trace.span("context_build"):
+            context = await self.context_builder.abuild(
+                intent=intent,
+                session_id=session_id,
+                user_id=user_id,
+                channel=channel,
+                recent_messages=recent,
+            )
+        context.trace = trace
         actions = self.action_extractor.extract(intent)
         route_agent_name = self.router.route(intent)
 
@@ -108,13 +131,21 @@ class Orchestrator:
         should_try_planner = planner_enabled_for_request and (
             decision_policy == "planner_first" or len(actions) > 1
         )
+        speculative_result: AgentExecutionResult | None = None
+        winning_path = "rules"
+        planner_deadline = self._planner_deadline_seconds(started)
         if should_try_planner:
             planner_attempted = True
-            planner_plan = self._build_llm_action_plan(
-                message=message,
-                recent=recent,
-                inferred_intent=intent.name,
-            )
+            with trace.span("llm_plan"):
+                planner_plan, speculative_result, winning_path = await self._race_planner(
+                    message=message,
+                    recent=recent,
+                    intent=intent,
+                    actions=actions,
+                    route_agent_name=route_agent_name,
+                    context=context,
+                    deadline_seconds=planner_deadline,
+                )
 
         planner_used = False
         planner_steps: list[dict[str, Any]] = []
@@ -162,20 +193,26 @@ class Orchestrator:
                     route_agent_name=route_agent_name,
                     actions=actions,
                     context=context,
+                    deadline_seconds=self._action_deadline_seconds(started),
                 )
             elif len(actions) == 1:
                 action = actions[0]
                 agent_name = action.target_agent or route_agent_name
                 agent = self.agents[agent_name]
-                result = await asyncio.to_thread(agent.execute, action, context)
+                if speculative_result is not None:
+                    result = speculative_result
+                else:
+                    result = await self.agent_executor.run(agent, action, context)
             else:
                 result, agent_name = await self._execute_multi_action(
                     route_agent_name=route_agent_name,
                     actions=actions,
                     context=context,
                     intent_name=intent.name,
+                    deadline_seconds=self._action_deadline_seconds(started),
                 )
 
+        format_started = perf_counter()
         response: AgentResponse = self.formatter.format(
             result=result,
             intent=intent,
@@ -188,6 +225,12 @@ class Orchestrator:
             "mode": self._planner_execution_mode(),
             "maxActions": action_limit,
             "truncatedActionCount": truncated_action_count,
+            "winningPath": winning_path,
+            "plannerDeadlineMs": round(planner_deadline * 1000) if planner_deadline is not None else None,
+        }
+        response.metadata["llmCache"] = {
+            "intent": intent.from_llm_cache,
+            "planner": planner_plan is not None and planner_plan.cached,
         }
         if planner_plan is not None:
             response.metadata["planner"] = {
@@ -209,8 +252,11 @@ class Orchestrator:
                 "stepCount": 0,
                 "steps": [],
             }
-        
+
         payload = self._to_transport_payload(response)
+        trace.add("format", (perf_counter() - format_started) * 1000)
+        if self._timings_in_metadata():
+            payload["metadata"]["timings"] = trace.as_metadata()
 
         # If streaming is requested and we have a message, yield it in chunks
         # In the future, this is where we'd yield real LLM chunks
@@ -237,50 +283,105 @@ class Orchestrator:
             
             yield {"type": "stream_end", "payload": {}}
 
-        # Record and update context
-        self.interaction_service.record(
-            session_id=context.session_id,
-            user_id=context.user_id,
-            message=message,
-            intent=intent.name,
-            agent=agent_name,
-            response=payload,
-        )
-        self.context_builder.session_service.update_conversation(
-            session_id=context.session_id,
-            last_intent=intent.name,
-            last_agent=agent_name,
-            last_message=message,
-            entities=intent.entities,
-        )
-        asyncio.create_task(
-            self._record_memory(
+        # Bookkeeping goes to the write-behind queue (inline only if it is full);
+        # readers of the session, history or memory settle pending writes first.
+        with trace.span("record_interaction"):
+            record = self.interaction_service.record_later(
+                session_id=context.session_id,
+                user_id=context.user_id,
+                message=message,
+                intent=intent.name,
+                agent=agent_name,
+                response=payload,
+            )
+        with trace.span("session_update"):
+            self.context_builder.session_service.update_conversation_later(
+                session_id=context.session_id,
+                last_intent=intent.name,
+                last_agent=agent_name,
+                last_message=message,
+                entities=intent.entities,
+            )
+        with trace.span("memory_update"):
+            self.memory_service.record_interaction_later(
                 user_id=context.user_id,
                 intent=intent.name,
                 message=message,
                 response=payload,
+                message_id=record["id"],
             )
-        )
+        self._record_trace(trace, intent=intent.name, agent=agent_name)
 
         yield {"type": "final_response", "payload": payload}
 
-    async def _record_memory(
+    def _record_trace(self, trace: StageTrace, *, intent: str, agent: str) -> None:
+        """Export the request's stage timings; agent spans carry their own agent, the rest the responding one."""
+        if self.metrics_collector is None:
+            return
+        for span in trace.spans:
+            self.metrics_collector.record_stage(
+                stage=span.stage,
+                intent=intent,
+                agent=span.agent or agent,
+                duration_ms=span.duration_ms,
+            )
+
+    async def _race_planner(
         self,
         *,
-        user_id: str | None,
-        intent: str,
         message: str,
-        response: dict[str, Any],
-    ) -> None:
-        await asyncio.to_thread(
-            self.memory_service.record_interaction,
-            user_id=user_id,
-            intent=intent,
-            message=message,
-            response=response,
+        recent: list[dict[str, Any]],
+        intent: IntentResult,
+        actions: list[AgentAction],
+        route_agent_name: str,
+        context: AgentContext,
+        deadline_seconds: float | None,
+    ) -> tuple[LLMActionPlan | None, AgentExecutionResult | None, str]:
+        """Run the planner under its deadline, hedged by a read-only rule action.
+
+        Returns the plan to execute (``None`` means use the rule actions), the
+        rule action's result if it already ran, and which path won: ``planner``,
+        ``speculative`` (the rule action answered first, or the planner declined
+        and its result was reused), ``deadline`` or ``rules``.
+        """
+        planner = asyncio.create_task(
+            self._build_llm_action_plan(message=message, recent=recent, inferred_intent=intent.name)
         )
+        speculative: asyncio.Task[AgentExecutionResult] | None = None
+        if self._speculation_enabled() and len(actions) == 1 and actions[0].name in _SPECULATIVE_ACTIONS:
+            agent = self.agents[actions[0].target_agent or route_agent_name]
+            speculative = asyncio.create_task(self.agent_executor.run(agent, actions[0], context))
+
+        loop = asyncio.get_running_loop()
+        deadline = None if deadline_seconds is None else loop.time() + deadline_seconds
+        pending: set[asyncio.Task[Any]] = {planner} if speculative is None else {planner, speculative}
+        winning_path = "deadline"
+        while planner in pending:
+            timeout = None if deadline is None else max(0.0, deadline - loop.time())
+            done, pending = await asyncio.wait(pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+            if not done:
+                break
+            if planner in done:
+                plan = planner.result()
+                if plan is not None and (plan.needs_clarification or plan.actions):
+                    if speculative is not None:
+                        speculative.cancel()
+                    return plan, None, "planner"
+                winning_path = "rules" if speculative is None else "speculative"
+                break
+            if speculative is not None and speculative in done:
+                if speculative.exception() is None and speculative.result().success:
+                    winning_path = "speculative"
+                    break
+                # A failed read is no better than waiting; give the planner the rest of its budget.
+
+        if not planner.done():
+            planner.cancel()
+        if speculative is None:
+            return None, None, winning_path
+        return None, await speculative, winning_path
 
-    def _build_llm_action_plan(
+    async def _build_llm_action_plan(
         self,
         *,
         message: str,
@@ -290,7 +391,7 @@ class Orchestrator:
         if self.llm_client is None:
             return None
         try:
-            return self.llm_client.plan_actions(
+            return await self.llm_client.aplan_actions(
                 message=message,
                 recent_messages=recent,
                 inferred_intent=inferred_intent,
@@ -308,6 +409,30 @@ class Orchestrator:
             return raw
         return "partial"
 
+    def _planner_deadline_seconds(self, started: float) -> float | None:
+        """What is left of the request's latency budget for the planner (``None``: no deadline)."""
+        if self.llm_client is None:
+            return None
+        budget_ms = float(self.llm_client.settings.llm_planner_latency_budget_ms)
+        if budget_ms <= 0:
+            return None
+        return max(0.0, budget_ms / 1000 - (perf_counter() - started))
+
+    def _action_deadline_seconds(self, started: float) -> float | None:
+        """What is left of the request deadline for running actions (``None``: no deadline)."""
+        if self.llm_client is None:
+            return None
+        deadline_ms = float(self.llm_client.settings.orchestrator_request_deadline_ms)
+        if deadline_ms <= 0:
+            return None
+        return max(0.0, deadline_ms / 1000 - (perf_counter() - started))
+
+    def _timings_in_metadata(self) -> bool:
+        return self.llm_client is not None and bool(self.llm_client.settings.orchestrator_debug_timings)
+
+    def _speculation_enabled(self) -> bool:
+        return self.llm_client is not None and bool(self.llm_client.settings.llm_planner_speculation_enabled)
+
     def _decision_policy(self) -> str:
         if self.llm_client is None:
             return "planner_first"
@@ -350,6 +475,7 @@ class Orchestrator:
         route_agent_name: str,
         actions: list[Any],
         context: Any,
+        deadline_seconds: float | None = None,
     ) -> tuple[AgentExecutionResult, str, list[dict[str, Any]]]:
         mode = self._planner_execution_mode()
         atomic = mode == "atomic"
@@ -360,10 +486,30 @@ class Orchestrator:
         any_success = False
         all_success = True
 
-        for index, action in enumerate(actions, start=1):
+        outcomes = await self._run_action_graph(
+            route_agent_name=route_agent_name,
+            actions=actions,
+            context=context,
+            atomic=atomic,
+            deadline_seconds=deadline_seconds,
+        )
+        for node, result, skip_code in outcomes:
+            action = node.action
             agent_name = action.target_agent or route_agent_name
-            agent = self.agents[agent_name]
-            result = await asyncio.to_thread(agent.execute, action, context)
+            if result is None:
+                skip_message = _SKIPPED_ATOMIC_MESSAGE if skip_code == "SKIPPED_ATOMIC_MODE" else _DEADLINE_MESSAGE
+                all_success = False
+                steps.append(
+                    {
+                        "index": node.index + 1,
+                        "action": action.name,
+                        "targetAgent": agent_name,
+                        "success": False,
+                        "message": skip_message,
+                        "error": {"code": skip_code, "message": skip_message},
+                    }
+                )
+                continue
 
             if agent_name in combined_data:
                 existing = combined_data[agent_name]
@@ -389,7 +535,7 @@ class Orchestrator:
                 error = {"code": code, "message": result.message}
             steps.append(
                 {
-                    "index": index,
+                    "index": node.index + 1,
                     "action": action.name,
                     "targetAgent": agent_name,
                     "success": result.success,
@@ -398,23 +544,6 @@ class Orchestrator:
                 }
             )
 
-            if atomic and not result.success:
-                for skipped_index, skipped in enumerate(actions[index:], start=index + 1):
-                    steps.append(
-                        {
-                            "index": skipped_index,
-                            "action": skipped.name,
-                            "targetAgent": skipped.target_agent or route_agent_name,
-                            "success": False,
-                            "message": "Skipped due to previous failure in atomic mode.",
-                            "error": {
-                                "code": "SKIPPED_ATOMIC_MODE",
-                                "message": "Skipped due to previous failure in atomic mode.",
-                            },
-                        }
-                    )
-                break
-
         overall_success = all_success if atomic else any_success
         if not messages:
             messages = ["I couldn't execute the requested action plan."]
@@ -432,6 +561,74 @@ class Orchestrator:
             steps,
         )
 
+    async def _run_action_graph(
+        self,
+        *,
+        route_agent_name: str,
+        actions: list[Any],
+        context: Any,
+        atomic: bool,
+        deadline_seconds: float | None,
+    ) -> list[tuple[ActionNode, AgentExecutionResult | None, str | None]]:
+        """Run each action as soon as the actions it depends on have finished.
+
+        Returns ``(node, result, skip_code)`` per action in plan order. In atomic
+        mode a failure stops every later step from starting, and every later step
+        (including a read that already ran ahead) is reported as
+        ``SKIPPED_ATOMIC_MODE``; earlier steps still run, as they would in plan
+        order. Steps still pending at the deadline are cancelled and reported as
+        ``DEADLINE_EXCEEDED``; a step already running on a worker thread may
+        still complete in the background.
+        """
+        nodes = build_action_graph(actions, atomic=atomic)
+        results: dict[int, AgentExecutionResult] = {}
+        waiting = list(nodes)
+        running: dict[asyncio.Task[AgentExecutionResult], ActionNode] = {}
+        failed_at: int | None = None
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + deadline_seconds if deadline_seconds is not None else None
+
+        async def run_node(node: ActionNode) -> AgentExecutionResult:
+            action = node.action
+            if node.consumes is not None:
+                action = self._with_inferred_selection(action, results.get(node.consumes))
+            agent = self.agents[action.target_agent or route_agent_name]
+            return await self.agent_executor.run(agent, action, context)
+
+        expired = False
+        try:
+            while waiting or running:
+                if failed_at is not None:
+                    waiting = [node for node in waiting if node.index < failed_at]
+                for node in [node for node in waiting if node.depends_on <= results.keys()]:
+                    waiting.remove(node)
+                    running[asyncio.create_task(run_node(node))] = node
+                if not running:
+                    break
+                timeout = max(0.0, deadline - loop.time()) if deadline is not None else None
+                done, _ = await asyncio.wait(running, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+                if not done:
+                    expired = True
+                    break
+                for task in done:
+                    node = running.pop(task)
+                    results[node.index] = task.result()
+                    if atomic and not results[node.index].success:
+                        failed_at = node.index if failed_at is None else min(failed_at, node.index)
+        finally:
+            for task in running:
+                task.cancel()
+
+        outcomes: list[tuple[ActionNode, AgentExecutionResult | None, str | None]] = []
+        for node in nodes:
+            if failed_at is not None and node.index > failed_at:
+                outcomes.append((node, None, "SKIPPED_ATOMIC_MODE"))
+            elif node.index in results:
+                outcomes.append((node, results[node.index], None))
+            else:
+                outcomes.append((node, None, "DEADLINE_EXCEEDED" if expired else "SKIPPED_ATOMIC_MODE"))
+        return outcomes
+
     async def _execute_multi_action(
         self,
         *,
@@ -439,6 +636,7 @@ class Orchestrator:
         actions: list[Any],
         context: Any,
         intent_name: str,
+        deadline_seconds: float | None = None,
     ) -> tuple[AgentExecutionResult, str]:
         if intent_name == "search_and_add_to_cart":
             return await self._execute_search_add_sequence(
@@ -449,48 +647,31 @@ class Orchestrator:
 
         mode = self._planner_execution_mode()
         atomic = mode == "atomic"
+        outcomes = await self._run_action_graph(
+            route_agent_name=route_agent_name,
+            actions=actions,
+            context=context,
+            atomic=atomic,
+            deadline_seconds=deadline_seconds,
+        )
 
-        if atomic:
-            combined_data: dict[str, Any] = {}
-            messages: list[str] = []
-            suggested: list[dict[str, str]] = []
-            all_success = True
-            for action in actions:
-                agent_name = action.target_agent or route_agent_name
-                agent = self.agents[agent_name]
-                result = await asyncio.to_thread(agent.execute, action, context)
-                combined_data[agent_name] = result.data
-                messages.append(result.message)
-                suggested.extend(result.next_actions)
-                all_success = all_success and result.success
-                if not result.success:
-                    break
-            return (
-                AgentExecutionResult(
-                    success=all_success,
-                    message=" ".join(messages),
-                    data=combined_data,
-                    next_actions=suggested[:6],
-                ),
-                "orchestrator",
-            )
-
-        async def run_action(action: Any) -> tuple[str, AgentExecutionResult]:
-            agent_name = action.target_agent or route_agent_name
-            agent = self.agents[agent_name]
-            result = await asyncio.to_thread(agent.execute, action, context)
-            return agent_name, result
-
-        pairs = await asyncio.gather(*(run_action(action) for action in actions))
         combined_data: dict[str, Any] = {}
         messages: list[str] = []
         suggested: list[dict[str, str]] = []
         success = True
-        for agent_name, result in pairs:
+        for node, result, skip_code in outcomes:
+            if result is None:
+                success = False
+                if skip_code == "DEADLINE_EXCEEDED" and not atomic:
+                    continue
+                break
+            agent_name = node.action.target_agent or route_agent_name
             combined_data[agent_name] = result.data
             messages.append(result.message)
             suggested.extend(result.next_actions)
             success = success and result.success
+        if not messages:
+            messages = [_DEADLINE_MESSAGE]
 
         return (
             AgentExecutionResult(
@@ -518,23 +699,11 @@ class Orchestrator:
         for action in actions:
             effective_action = action
             if action.name == "add_item":
-                inferred = self._infer_product_selection(previous_result)
-                enriched_params = {**action.params}
-                if not enriched_params.get("productId") and inferred.get("productId"):
-                    enriched_params["productId"] = inferred["productId"]
-                if not enriched_params.get("variantId") and inferred.get("variantId"):
-                    enriched_params["variantId"] = inferred["variantId"]
-                if not enriched_params.get("quantity"):
-                    enriched_params["quantity"] = 1
-                effective_action = AgentAction(
-                    name=action.name,
-                    params=enriched_params,
-                    target_agent=action.target_agent,
-                )
+                effective_action = self._with_inferred_selection(action, previous_result)
 
             agent_name = effective_action.target_agent or route_agent_name
             agent = self.agents[agent_name]
-            result = await asyncio.to_thread(agent.execute, effective_action, context)
+            result = await self.agent_executor.run(agent, effective_action, context)
             previous_result = result
 
             combined_data[agent_name] = result.data
@@ -552,6 +721,23 @@ class Orchestrator:
             "orchestrator",
         )
 
+    def _with_inferred_selection(
+        self, action: AgentAction, previous_result: AgentExecutionResult | None
+    ) -> AgentAction:
+        inferred = self._infer_product_selection(previous_result)
+        enriched_params = {**action.params}
+        if not enriched_params.get("productId") and inferred.get("productId"):
+            enriched_params["productId"] = inferred["productId"]
+        if not enriched_params.get("variantId") and inferred.get("variantId"):
+            enriched_params["variantId"] = inferred["variantId"]
+        if not enriched_params.get("quantity"):
+            enriched_params["quantity"] = 1
+        return AgentAction(
+            name=action.name,
+            params=enriched_params,
+            target_agent=action.target_agent,
+        )
+
     def _infer_product_selection(
         self, result: AgentExecutionResult | None
     ) -> dict[str, str]:
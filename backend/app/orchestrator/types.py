@@ -1,14 +1,19 @@
 from __future__ import annotations
 
+from collections.abc import Callable
 from dataclasses import dataclass, field
+from threading import Lock
 from typing import Any
 
+from app.infrastructure.observability import StageTrace
 
-@dataclass
+
+@dataclass(frozen=True)
 class IntentResult:
     name: str
     confidence: float
     entities: dict[str, Any] = field(default_factory=dict)
+    from_llm_cache: bool = False
 
 
 @dataclass
@@ -28,6 +33,86 @@ class AgentContext:
     preferences: dict[str, Any] | None
     memory: dict[str, Any] | None = None
     recent_messages: list[dict[str, Any]] = field(default_factory=list)
+    trace: StageTrace | None = field(default=None, repr=False, compare=False)
+
+
+class LazyAgentContext(AgentContext):
+    """An :class:`AgentContext` whose cart and memory are fetched on first access.
+
+    ``loaders`` maps ``"cart"`` and ``"memory"`` to zero-argument fetchers;
+    ``preferences`` comes from the memory snapshot. A field that was passed a
+    value, or assigned one later, is never fetched.
+    """
+
+    _LAZY_FIELDS = ("cart", "memory")
+
+    def __init__(self, *, loaders: dict[str, Callable[[], Any]], **fields: Any) -> None:
+        self._values: dict[str, Any] = {}
+        self._loaders: dict[str, Callable[[], Any]] = {}
+        self._resolve_lock = Lock()
+        provided = {name for name in (*self._LAZY_FIELDS, "preferences") if name in fields}
+        fields.setdefault("cart", None)
+        fields.setdefault("preferences", None)
+        super().__init__(**fields)
+        for name in self._LAZY_FIELDS:
+            if name not in provided and name in loaders:
+                self._values.pop(name, None)
+                self._loaders[name] = loaders[name]
+        if "preferences" not in provided:
+            self._values.pop("preferences", None)
+
+    def is_resolved(self, name: str) -> bool:
+        return name in self._values
+
+    def __repr__(self) -> str:
+        # Never fetch just to print (asyncio and logging repr their arguments).
+        shown = {
+            name: repr(self._values[name]) if name in self._values else "<unresolved>"
+            for name in ("cart", "preferences", "memory")
+        }
+        return (
+            f"LazyAgentContext(session_id={self.session_id!r}, user_id={self.user_id!r}, "
+            f"channel={self.channel!r}, cart={shown['cart']}, preferences={shown['preferences']}, "
+            f"memory={shown['memory']})"
+        )
+
+    def _resolve(self, name: str) -> Any:
+        if name in self._values:
+            return self._values[name]
+        with self._resolve_lock:
+            if name not in self._values:
+                loader = self._loaders.pop(name, None)
+                self._values[name] = loader() if loader is not None else None
+            return self._values[name]
+
+    @property  # type: ignore[override]
+    def cart(self) -> dict[str, Any] | None:
+        return self._resolve("cart")
+
+    @cart.setter
+    def cart(self, value: dict[str, Any] | None) -> None:
+        self._loaders.pop("cart", None)
+        self._values["cart"] = value
+
+    @property  # type: ignore[override]
+    def memory(self) -> dict[str, Any] | None:
+        return self._resolve("memory")
+
+    @memory.setter
+    def memory(self, value: dict[str, Any] | None) -> None:
+        self._loaders.pop("memory", None)
+        self._values["memory"] = value
+
+    @property  # type: ignore[override]
+    def preferences(self) -> dict[str, Any] | None:
+        if "preferences" not in self._values:
+            memory = self.memory
+            self._values.setdefault("preferences", memory.get("preferences") if memory else None)
+        return self._values["preferences"]
+
+    @preferences.setter
+    def preferences(self, value: dict[str, Any] | None) -> None:
+        self._values["preferences"] = value
 
 
 @dataclass
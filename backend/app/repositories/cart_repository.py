@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import asyncio
 import json
 from copy import deepcopy
 from typing import Any
@@ -35,6 +36,26 @@ class CartRepository:
             return deepcopy(persisted)
         return None
 
+    async def aget_for_user_or_session(self, *, user_id: str | None, session_id: str) -> dict[str, Any] | None:
+        """:meth:`get_for_user_or_session` over the asyncio clients (on a worker thread without them)."""
+        collection = self._async_mongo_collection()
+        if collection is None:
+            return await asyncio.to_thread(self.get_for_user_or_session, user_id=user_id, session_id=session_id)
+        payload = await collection.find_one(self._cart_filter(user_id=user_id, session_id=session_id), sort=[("updatedAt", -1)])
+        persisted = self._clean_row(payload)
+        if persisted is None:
+            return None
+        await self._awrite_to_redis(persisted)
+        return deepcopy(persisted)
+
+    async def acreate(self, cart: dict[str, Any]) -> dict[str, Any]:
+        await self._awrite_through(cart)
+        return deepcopy(cart)
+
+    async def aupdate(self, cart: dict[str, Any]) -> dict[str, Any]:
+        await self._awrite_through(cart)
+        return deepcopy(cart)
+
     def clear_for_user(self, user_id: str) -> dict[str, Any] | None:
         cart = self.get_for_user_or_session(user_id=user_id, session_id="")
         if not cart:
@@ -50,6 +71,26 @@ class CartRepository:
         self._write_to_redis(cart)
         self._write_to_mongo(cart)
 
+    async def _awrite_through(self, cart: dict[str, Any]) -> None:
+        collection = self._async_mongo_collection()
+        if collection is None:
+            await asyncio.to_thread(self._write_through, cart)
+            return
+        await self._awrite_to_redis(cart)
+        await collection.update_one(
+            {"cartId": cart["id"]},
+            {"$set": {"cartId": cart["id"], **deepcopy(cart)}},
+            upsert=True,
+        )
+
+    async def _awrite_to_redis(self, cart: dict[str, Any]) -> None:
+        client = self.redis_manager.async_client
+        if client is None:
+            if self._redis_client() is not None:
+                await asyncio.to_thread(self._write_to_redis, cart)
+            return
+        await client.set(self._redis_key(cart["id"]), json.dumps(cart), ex=60 * 60)
+
     def _redis_client(self) -> Any | None:
         return self.redis_manager.client
 
@@ -62,6 +103,15 @@ class CartRepository:
             database = client["commerce"]
         return database["carts"]
 
+    def _async_mongo_collection(self) -> Any | None:
+        client = self.mongo_manager.async_client
+        if client is None:
+            return None
+        database = client.get_default_database()
+        if database is None:
+            database = client["commerce"]
+        return database["carts"]
+
     def _redis_key(self, cart_id: str) -> str:
         return f"cart:{cart_id}"
 
@@ -97,26 +147,26 @@ class CartRepository:
         collection = self._mongo_collection()
         if collection is None:
             return None
+        payload = collection.find_one(self._cart_filter(user_id=user_id, session_id=session_id), sort=[("updatedAt", -1)])
+        return self._clean_row(payload)
 
+    @staticmethod
+    def _cart_filter(*, user_id: str | None, session_id: str) -> dict[str, Any]:
         if user_id:
-            payload = collection.find_one(
-                {
-                    "userId": user_id,
-                    "$or": [{"status": "active"}, {"status": {"$exists": False}}],
-                },
-                sort=[("updatedAt", -1)],
-            )
-        else:
-            payload = collection.find_one(
-                {
-                    "sessionId": session_id,
-                    "$and": [
-                        {"$or": [{"userId": None}, {"userId": {"$exists": False}}]},
-                        {"$or": [{"status": "active"}, {"status": {"$exists": False}}]},
-                    ],
-                },
-                sort=[("updatedAt", -1)],
-            )
+            return {
+                "userId": user_id,
+                "$or": [{"status": "active"}, {"status": {"$exists": False}}],
+            }
+        return {
+            "sessionId": session_id,
+            "$and": [
+                {"$or": [{"userId": None}, {"userId": {"$exists": False}}]},
+                {"$or": [{"status": "active"}, {"status": {"$exists": False}}]},
+            ],
+        }
+
+    @staticmethod
+    def _clean_row(payload: Any) -> dict[str, Any] | None:
         if not payload:
             return None
         payload.pop("_id", None)
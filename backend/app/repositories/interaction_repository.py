@@ -4,6 +4,8 @@ import json
 from copy import deepcopy
 from typing import Any
 
+from pymongo import UpdateOne
+
 from app.infrastructure.persistence_clients import MongoClientManager, RedisClientManager
 class InteractionRepository:
     def __init__(
@@ -24,6 +26,21 @@ class InteractionRepository:
         self._write_to_mongo(payload)
         return deepcopy(payload)
 
+    def create_many(self, payloads: list[dict[str, Any]]) -> None:
+        """Append a batch: one ``bulk_write``, then one pipelined read and write per session list.
+
+        Safe to replay after a partial failure: Mongo upserts by message id and
+        the Redis append skips messages the list already holds.
+        """
+        by_session: dict[str, list[dict[str, Any]]] = {}
+        for payload in payloads:
+            session_id = str(payload.get("sessionId", ""))
+            if not session_id:
+                raise ValueError("Interaction payload requires sessionId")
+            by_session.setdefault(session_id, []).append(deepcopy(payload))
+        self._write_many_to_mongo(payloads)
+        self._append_many_to_redis(by_session)
+
     def recent(self, *, session_id: str, limit: int = 12) -> list[dict[str, Any]]:
         safe_limit = max(1, min(limit, 200))
         cached = self._read_session_from_redis(session_id)
@@ -74,6 +91,20 @@ class InteractionRepository:
             entries = entries[-500:]
         self._write_session_to_redis(session_id, entries)
 
+    def _append_many_to_redis(self, by_session: dict[str, list[dict[str, Any]]]) -> None:
+        client = self._redis_client()
+        if client is None or not by_session:
+            return
+        session_ids = list(by_session)
+        existing = client.mget([self._redis_key(session_id) for session_id in session_ids])
+        pipe = client.pipeline()
+        for session_id, payload in zip(session_ids, existing):
+            entries = self._decode_entries(payload)
+            seen = {entry.get("id") for entry in entries}
+            entries.extend(entry for entry in by_session[session_id] if entry.get("id") not in seen)
+            pipe.set(self._redis_key(session_id), json.dumps(entries[-500:]), ex=24 * 60 * 60)
+        pipe.execute()
+
     def _write_session_to_redis(self, session_id: str, entries: list[dict[str, Any]]) -> None:
         client = self._redis_client()
         if client is None:
@@ -84,7 +115,10 @@ class InteractionRepository:
         client = self._redis_client()
         if client is None:
             return []
-        payload = client.get(self._redis_key(session_id))
+        return self._decode_entries(client.get(self._redis_key(session_id)))
+
+    @staticmethod
+    def _decode_entries(payload: Any) -> list[dict[str, Any]]:
         if not payload:
             return []
         if isinstance(payload, bytes):
@@ -107,6 +141,22 @@ class InteractionRepository:
             upsert=True,
         )
 
+    def _write_many_to_mongo(self, payloads: list[dict[str, Any]]) -> None:
+        collection = self._mongo_collection()
+        if collection is None or not payloads:
+            return
+        collection.bulk_write(
+            [
+                UpdateOne(
+                    {"messageId": payload["id"]},
+                    {"$set": {"messageId": payload["id"], **deepcopy(payload)}},
+                    upsert=True,
+                )
+                for payload in payloads
+            ],
+            ordered=False,
+        )
+
     def _read_session_from_mongo(self, session_id: str) -> list[dict[str, Any]]:
         collection = self._mongo_collection()
         if collection is None:
@@ -2,7 +2,7 @@ from __future__ import annotations
 
 import json
 from copy import deepcopy
-from typing import Any
+from typing import Any, Iterable
 
 from app.infrastructure.persistence_clients import MongoClientManager, RedisClientManager
 class InventoryRepository:
@@ -32,6 +32,28 @@ class InventoryRepository:
         self._write_to_redis(payload)
         return payload
 
+    def get_many(self, variant_ids: Iterable[str]) -> dict[str, dict[str, Any]]:
+        """Fetch several stock rows with one MGET plus one ``$in`` query for misses."""
+        wanted = list(dict.fromkeys(str(variant_id) for variant_id in variant_ids if variant_id))
+        if not wanted:
+            return {}
+        found = self._read_many_from_redis(wanted)
+        misses = [variant_id for variant_id in wanted if variant_id not in found]
+        if not misses:
+            return found
+
+        collection = self._mongo_collection()
+        if collection is None:
+            return found
+        loaded: list[dict[str, Any]] = []
+        for row in collection.find({"variantId": {"$in": misses}}):
+            row.pop("_id", None)
+            if isinstance(row, dict) and row.get("variantId"):
+                found[str(row["variantId"])] = row
+                loaded.append(row)
+        self._write_many_to_redis(loaded)
+        return found
+
     def upsert(self, stock: dict[str, Any]) -> dict[str, Any]:
         self._write_to_redis(stock)
         self._write_to_mongo(stock)
@@ -90,6 +112,34 @@ class InventoryRepository:
             return None
         return decoded if isinstance(decoded, dict) else None
 
+    def _read_many_from_redis(self, variant_ids: list[str]) -> dict[str, dict[str, Any]]:
+        client = self._redis_client()
+        if client is None:
+            return {}
+        payloads = client.mget([self._redis_key(variant_id) for variant_id in variant_ids])
+        found: dict[str, dict[str, Any]] = {}
+        for variant_id, payload in zip(variant_ids, payloads):
+            if not payload:
+                continue
+            if isinstance(payload, bytes):
+                payload = payload.decode("utf-8")
+            try:
+                decoded = json.loads(payload)
+            except json.JSONDecodeError:
+                continue
+            if isinstance(decoded, dict):
+                found[variant_id] = decoded
+        return found
+
+    def _write_many_to_redis(self, rows: list[dict[str, Any]]) -> None:
+        client = self._redis_client()
+        if client is None or not rows:
+            return
+        pipe = client.pipeline()
+        for stock in rows:
+            pipe.set(self._redis_key(str(stock["variantId"])), json.dumps(stock), ex=60 * 60)
+        pipe.execute()
+
     def _delete_from_redis(self, variant_id: str) -> None:
         client = self._redis_client()
         if client is None:
@@ -4,6 +4,8 @@ import json
 from copy import deepcopy
 from typing import Any
 
+from pymongo import UpdateOne
+
 from app.infrastructure.persistence_clients import MongoClientManager, RedisClientManager
 class MemoryRepository:
     def __init__(
@@ -31,6 +33,26 @@ class MemoryRepository:
         self._write_to_mongo(user_id, payload)
         return deepcopy(payload)
 
+    def upsert_many(self, payloads: dict[str, dict[str, Any]]) -> None:
+        """Write several users' memory with one Redis pipeline and one ``bulk_write``."""
+        if not payloads:
+            return
+        client = self._redis_client()
+        if client is not None:
+            pipe = client.pipeline()
+            for user_id, payload in payloads.items():
+                pipe.set(self._redis_key(user_id), json.dumps(payload), ex=24 * 60 * 60)
+            pipe.execute()
+        collection = self._mongo_collection()
+        if collection is not None:
+            collection.bulk_write(
+                [
+                    UpdateOne({"userId": user_id}, {"$set": {"userId": user_id, **deepcopy(payload)}}, upsert=True)
+                    for user_id, payload in payloads.items()
+                ],
+                ordered=False,
+            )
+
     def _redis_client(self) -> Any | None:
         return self.redis_manager.client
 
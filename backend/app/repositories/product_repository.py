@@ -1,33 +1,149 @@
 from __future__ import annotations
 
+import asyncio
 import json
+from bisect import insort
 from copy import deepcopy
-from typing import Any
+from dataclasses import dataclass, field
+from threading import RLock
+from time import monotonic
+from types import MappingProxyType
+from typing import Any, Iterable, Mapping
+
+from pymongo import UpdateOne
 
 from app.infrastructure.persistence_clients import MongoClientManager, RedisClientManager
+
+
+@dataclass(frozen=True)
+class CatalogSnapshot:
+    """Immutable, name-ordered view of the catalog at a given version.
+
+    Product dicts are shared between readers and must be treated as read-only;
+    copy them before handing them to code that mutates.
+    """
+
+    version: int
+    products: tuple[dict[str, Any], ...] = ()
+    by_id: Mapping[str, dict[str, Any]] = field(default_factory=lambda: MappingProxyType({}))
+
+    @classmethod
+    def from_products(cls, *, version: int, products: list[dict[str, Any]]) -> "CatalogSnapshot":
+        ordered = tuple(products)
+        return cls(
+            version=version,
+            products=ordered,
+            by_id=MappingProxyType({str(product["id"]): product for product in ordered}),
+        )
+
+
+# Lower-cased copies of the browse facets, stored next to each product so
+# case-insensitive filters are plain equality matches the indexes can serve.
+FACET_KEYS_FIELD = "facetKeys"
+
+
+def _facet_value(value: Any) -> str:
+    return str(value or "").strip().lower()
+
+
+def facet_keys(product: Mapping[str, Any]) -> dict[str, Any]:
+    """The ``facetKeys`` document stored with ``product``.
+
+    Status follows the listing rule: a missing status counts as active, while
+    an explicit null or empty one does not.
+    """
+    variants = product.get("variants")
+    return {
+        "status": str(product.get("status", "active")).strip().lower(),
+        "category": _facet_value(product.get("category")),
+        "brand": _facet_value(product.get("brand")),
+        "variants": [
+            {"color": _facet_value(variant.get("color")), "size": _facet_value(variant.get("size"))}
+            for variant in (variants if isinstance(variants, list) else [])
+            if isinstance(variant, dict)
+        ],
+    }
+
+
 class ProductRepository:
+    CATALOG_VERSION_KEY = "catalog:version"
+
     def __init__(
         self,
         *,
         mongo_manager: MongoClientManager,
         redis_manager: RedisClientManager,
+        version_check_interval_seconds: float = 1.0,
     ) -> None:
         self.mongo_manager = mongo_manager
         self.redis_manager = redis_manager
+        self.version_check_interval_seconds = max(0.0, float(version_check_interval_seconds))
+        self._snapshot_lock = RLock()
+        self._snapshot: CatalogSnapshot | None = None
+        self._snapshot_checked_at = 0.0
+        self._known_version = 0
+        self._version_checked_at = 0.0
+        self._local_version = 0
+        self._facet_keys_ready = False
+
+    @property
+    def catalog_version(self) -> int:
+        """Current catalog version without loading the snapshot.
+
+        Polled from Redis on the same interval as the snapshot, so it is cheap
+        enough to tag per-request caches with.
+        """
+        with self._snapshot_lock:
+            now = monotonic()
+            if now - self._version_checked_at >= self.version_check_interval_seconds:
+                self._known_version = self._read_catalog_version()
+                self._version_checked_at = now
+            return self._known_version
+
+    async def acatalog_version(self) -> int:
+        """:attr:`catalog_version` for event-loop callers, polling Redis with the asyncio client."""
+        if monotonic() - self._version_checked_at < self.version_check_interval_seconds:
+            return self._known_version
+        client = self.redis_manager.async_client
+        if client is None:
+            return await asyncio.to_thread(lambda: self.catalog_version)
+        version = self._parse_version(await client.get(self.CATALOG_VERSION_KEY))
+        with self._snapshot_lock:
+            self._known_version = version
+            self._version_checked_at = monotonic()
+        return version
+
+    def snapshot(self) -> CatalogSnapshot:
+        """Return the current catalog snapshot, reloading only when the version moved.
+
+        Writes made by this process patch the snapshot in place; writes from other
+        workers are detected through the shared Redis version key, polled at most
+        once per ``version_check_interval_seconds``.
+        """
+        with self._snapshot_lock:
+            current = self._snapshot
+            now = monotonic()
+            if current is not None and now - self._snapshot_checked_at < self.version_check_interval_seconds:
+                return current
+            remote_version = self._read_catalog_version()
+            self._snapshot_checked_at = now
+            self._known_version = remote_version
+            self._version_checked_at = now
+            if current is not None and current.version == remote_version:
+                return current
+            loaded = self._load_snapshot(version=remote_version)
+            if loaded is None:
+                return CatalogSnapshot(version=remote_version)
+            self._snapshot = loaded
+            return loaded
+
+    def invalidate_snapshot(self) -> None:
+        with self._snapshot_lock:
+            self._snapshot = None
+            self._snapshot_checked_at = 0.0
 
     def list_all(self) -> list[dict[str, Any]]:
-        collection = self._mongo_collection()
-        if collection is None:
-            return []
-        rows = list(collection.find({}).sort("name", 1))
-        products: list[dict[str, Any]] = []
-        for row in rows:
-            row.pop("_id", None)
-            row.pop("productId", None)
-            if isinstance(row, dict):
-                products.append(row)
-                self._write_to_redis(row)
-        return products
+        return deepcopy(list(self.snapshot().products))
 
     def get(self, product_id: str) -> dict[str, Any] | None:
         cached = self._read_from_redis(product_id)
@@ -42,24 +158,175 @@ class ProductRepository:
             return None
         payload.pop("_id", None)
         payload.pop("productId", None)
+        payload.pop(FACET_KEYS_FIELD, None)
         if not isinstance(payload, dict):
             return None
         self._write_to_redis(payload)
         return payload
 
+    def get_many(self, product_ids: Iterable[str]) -> dict[str, dict[str, Any]]:
+        """Fetch several products with one MGET plus one ``$in`` query for misses.
+
+        Missing ids are left out of the result; Mongo hits are written back to
+        Redis in a single pipeline.
+        """
+        wanted = list(dict.fromkeys(str(product_id) for product_id in product_ids if product_id))
+        if not wanted:
+            return {}
+        found = self._read_many_from_redis(wanted)
+        misses = [product_id for product_id in wanted if product_id not in found]
+        if not misses:
+            return found
+
+        collection = self._mongo_collection()
+        if collection is None:
+            return found
+        loaded: list[dict[str, Any]] = []
+        for row in collection.find({"productId": {"$in": misses}}):
+            row.pop("_id", None)
+            row.pop("productId", None)
+            row.pop(FACET_KEYS_FIELD, None)
+            if isinstance(row, dict) and row.get("id"):
+                found[str(row["id"])] = row
+                loaded.append(row)
+        self._write_many_to_redis(loaded)
+        return found
+
     def create(self, product: dict[str, Any]) -> dict[str, Any]:
         self._write_to_redis(product)
         self._write_to_mongo(product)
+        self._patch_snapshot(upserted=deepcopy(product))
         return deepcopy(product)
 
     def update(self, product: dict[str, Any]) -> dict[str, Any]:
         self._write_to_redis(product)
         self._write_to_mongo(product)
+        self._patch_snapshot(upserted=deepcopy(product))
         return deepcopy(product)
 
     def delete(self, product_id: str) -> None:
         self._delete_from_redis(product_id)
         self._delete_from_mongo(product_id)
+        self._patch_snapshot(removed_id=product_id)
+
+    def find_page(
+        self,
+        *,
+        category: str | None = None,
+        brand: str | None = None,
+        color: str | None = None,
+        size: str | None = None,
+        min_price: float | None = None,
+        max_price: float | None = None,
+        skip: int = 0,
+        limit: int = 20,
+    ) -> tuple[list[dict[str, Any]], int] | None:
+        """Filter, sort and paginate active products inside Mongo.
+
+        Returns the requested page in name order plus the total match count, or
+        None when Mongo is unavailable so callers can fall back to the snapshot.
+        """
+        collection = self._mongo_collection()
+        if collection is None:
+            return None
+        if not self._facet_keys_ready:
+            self._backfill_facet_keys(collection)
+
+        query = self._page_query(
+            category=category, brand=brand, color=color, size=size, min_price=min_price, max_price=max_price
+        )
+        total = int(collection.count_documents(query))
+        if total == 0 or skip >= total:
+            return [], total
+        cursor = (
+            collection.find(query, {"_id": 0, "productId": 0, FACET_KEYS_FIELD: 0})
+            .sort("name", 1)
+            .skip(max(0, skip))
+            .limit(max(1, limit))
+        )
+        return [product for product in map(self._clean_row, cursor) if product], total
+
+    async def afind_page(
+        self,
+        *,
+        category: str | None = None,
+        brand: str | None = None,
+        color: str | None = None,
+        size: str | None = None,
+        min_price: float | None = None,
+        max_price: float | None = None,
+        skip: int = 0,
+        limit: int = 20,
+    ) -> tuple[list[dict[str, Any]], int] | None:
+        """:meth:`find_page` over the asyncio Mongo client (on a worker thread without one)."""
+        filters = {
+            "category": category,
+            "brand": brand,
+            "color": color,
+            "size": size,
+            "min_price": min_price,
+            "max_price": max_price,
+        }
+        collection = self._async_mongo_collection()
+        if collection is None or not self._facet_keys_ready:
+            # The one-off facet key backfill stays on the sync path.
+            return await asyncio.to_thread(lambda: self.find_page(**filters, skip=skip, limit=limit))
+
+        query = self._page_query(**filters)
+        total = int(await collection.count_documents(query))
+        if total == 0 or skip >= total:
+            return [], total
+        cursor = (
+            collection.find(query, {"_id": 0, "productId": 0, FACET_KEYS_FIELD: 0})
+            .sort("name", 1)
+            .skip(max(0, skip))
+            .limit(max(1, limit))
+        )
+        return [product for product in map(self._clean_row, await cursor.to_list()) if product], total
+
+    @staticmethod
+    def _page_query(
+        *,
+        category: str | None,
+        brand: str | None,
+        color: str | None,
+        size: str | None,
+        min_price: float | None,
+        max_price: float | None,
+    ) -> dict[str, Any]:
+        query: dict[str, Any] = {f"{FACET_KEYS_FIELD}.status": "active"}
+        normalized_category = _facet_value(category)
+        if normalized_category and normalized_category != "all":
+            query[f"{FACET_KEYS_FIELD}.category"] = normalized_category
+        normalized_brand = _facet_value(brand)
+        if normalized_brand:
+            query[f"{FACET_KEYS_FIELD}.brand"] = normalized_brand
+        variant_match: dict[str, Any] = {}
+        normalized_color = _facet_value(color)
+        if normalized_color:
+            variant_match["color"] = normalized_color
+        normalized_size = _facet_value(size)
+        if normalized_size:
+            variant_match["size"] = normalized_size
+        if variant_match:
+            query[f"{FACET_KEYS_FIELD}.variants"] = {"$elemMatch": variant_match}
+        price_range: dict[str, float] = {}
+        if min_price is not None:
+            price_range["$gte"] = float(min_price)
+        if max_price is not None:
+            price_range["$lte"] = float(max_price)
+        if price_range:
+            query["price"] = price_range
+        return query
+
+    @staticmethod
+    def _clean_row(row: Any) -> dict[str, Any] | None:
+        if not isinstance(row, dict):
+            return None
+        row.pop("_id", None)
+        row.pop("productId", None)
+        row.pop(FACET_KEYS_FIELD, None)
+        return row if row.get("id") else None
 
     def list_categories(self) -> list[str]:
         collection = self._mongo_collection()
@@ -85,11 +352,90 @@ class ProductRepository:
             if updated_product:
                 updated_product.pop("_id", None)
                 updated_product.pop("productId", None)
+                updated_product.pop(FACET_KEYS_FIELD, None)
                 self._write_to_redis(updated_product)
+                if getattr(result, "modified_count", result.matched_count) > 0:
+                    self._patch_snapshot(upserted=updated_product)
 
     def name_map(self) -> dict[str, str]:
-        products = self.list_all()
-        return {str(product["id"]): str(product.get("name", "Unknown")) for product in products if product.get("id")}
+        return {
+            product_id: str(product.get("name", "Unknown"))
+            for product_id, product in self.snapshot().by_id.items()
+            if product_id
+        }
+
+    def _load_snapshot(self, *, version: int) -> CatalogSnapshot | None:
+        collection = self._mongo_collection()
+        if collection is None:
+            return None
+        products: list[dict[str, Any]] = []
+        for row in collection.find({}).sort("name", 1):
+            row.pop("_id", None)
+            row.pop("productId", None)
+            row.pop(FACET_KEYS_FIELD, None)
+            if isinstance(row, dict) and row.get("id"):
+                products.append(row)
+        return CatalogSnapshot.from_products(version=version, products=products)
+
+    def _backfill_facet_keys(self, collection: Any) -> None:
+        # Products written before facetKeys existed (or by tools that bypass this
+        # repository) would never match a pushed-down filter; fill them in once.
+        with self._snapshot_lock:
+            if self._facet_keys_ready:
+                return
+            updates = [
+                UpdateOne({"productId": row["productId"]}, {"$set": {FACET_KEYS_FIELD: facet_keys(row)}})
+                for row in collection.find({FACET_KEYS_FIELD: {"$exists": False}}, {"_id": 0})
+                if row.get("productId")
+            ]
+            if updates:
+                collection.bulk_write(updates, ordered=False)
+            self._facet_keys_ready = True
+
+    def _patch_snapshot(
+        self,
+        *,
+        upserted: dict[str, Any] | None = None,
+        removed_id: str | None = None,
+    ) -> None:
+        with self._snapshot_lock:
+            previous = self._snapshot
+            next_version = self._bump_catalog_version()
+            self._known_version = next_version
+            self._version_checked_at = monotonic()
+            if previous is None or next_version != previous.version + 1:
+                # Another worker wrote in between; reload on the next read.
+                self._snapshot = None
+                self._snapshot_checked_at = 0.0
+                return
+
+            target_id = str(upserted["id"]) if upserted is not None else str(removed_id or "")
+            products = [product for product in previous.products if str(product["id"]) != target_id]
+            if upserted is not None:
+                insort(products, upserted, key=lambda product: str(product.get("name", "")))
+            self._snapshot = CatalogSnapshot.from_products(version=next_version, products=products)
+
+    def _read_catalog_version(self) -> int:
+        client = self._redis_client()
+        if client is None:
+            return self._local_version
+        return self._parse_version(client.get(self.CATALOG_VERSION_KEY))
+
+    @staticmethod
+    def _parse_version(raw: Any) -> int:
+        if isinstance(raw, bytes):
+            raw = raw.decode("utf-8")
+        try:
+            return int(raw or 0)
+        except (TypeError, ValueError):
+            return 0
+
+    def _bump_catalog_version(self) -> int:
+        client = self._redis_client()
+        if client is None:
+            self._local_version += 1
+            return self._local_version
+        return int(client.incr(self.CATALOG_VERSION_KEY))
 
     def _redis_client(self) -> Any | None:
         return self.redis_manager.client
@@ -103,6 +449,15 @@ class ProductRepository:
             database = client["commerce"]
         return database["products"]
 
+    def _async_mongo_collection(self) -> Any | None:
+        client = self.mongo_manager.async_client
+        if client is None:
+            return None
+        database = client.get_default_database()
+        if database is None:
+            database = client["commerce"]
+        return database["products"]
+
     def _redis_key(self, product_id: str) -> str:
         return f"product:{product_id}"
 
@@ -127,6 +482,34 @@ class ProductRepository:
             return None
         return decoded if isinstance(decoded, dict) else None
 
+    def _read_many_from_redis(self, product_ids: list[str]) -> dict[str, dict[str, Any]]:
+        client = self._redis_client()
+        if client is None:
+            return {}
+        payloads = client.mget([self._redis_key(product_id) for product_id in product_ids])
+        found: dict[str, dict[str, Any]] = {}
+        for product_id, payload in zip(product_ids, payloads):
+            if not payload:
+                continue
+            if isinstance(payload, bytes):
+                payload = payload.decode("utf-8")
+            try:
+                decoded = json.loads(payload)
+            except json.JSONDecodeError:
+                continue
+            if isinstance(decoded, dict):
+                found[product_id] = decoded
+        return found
+
+    def _write_many_to_redis(self, products: list[dict[str, Any]]) -> None:
+        client = self._redis_client()
+        if client is None or not products:
+            return
+        pipe = client.pipeline()
+        for product in products:
+            pipe.set(self._redis_key(str(product["id"])), json.dumps(product), ex=60 * 60)
+        pipe.execute()
+
     def _delete_from_redis(self, product_id: str) -> None:
         client = self._redis_client()
         if client is None:
@@ -139,7 +522,7 @@ class ProductRepository:
             return
         collection.update_one(
             {"productId": product["id"]},
-            {"$set": {"productId": product["id"], **deepcopy(product)}},
+            {"$set": {"productId": product["id"], **deepcopy(product), FACET_KEYS_FIELD: facet_keys(product)}},
             upsert=True,
         )
 
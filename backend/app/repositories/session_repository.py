@@ -44,9 +44,36 @@ class SessionRepository:
         except json.JSONDecodeError:
             return None
 
+    def get_many(self, session_ids: list[str]) -> dict[str, dict[str, Any]]:
+        client = self._redis_client()
+        if not client or not session_ids:
+            return {}
+        found: dict[str, dict[str, Any]] = {}
+        for session_id, payload in zip(session_ids, client.mget([self._redis_key(sid) for sid in session_ids])):
+            if not payload:
+                continue
+            if isinstance(payload, bytes):
+                payload = payload.decode("utf-8")
+            try:
+                decoded = json.loads(payload)
+            except json.JSONDecodeError:
+                continue
+            if isinstance(decoded, dict):
+                found[session_id] = decoded
+        return found
+
     def update(self, session: dict[str, Any]) -> dict[str, Any]:
         return self.create(session)
 
+    def update_many(self, sessions: list[dict[str, Any]]) -> None:
+        client = self._redis_client()
+        if not client or not sessions:
+            return
+        pipe = client.pipeline()
+        for session in sessions:
+            pipe.set(self._redis_key(session["id"]), json.dumps(session), ex=60 * 60)
+        pipe.execute()
+
     def delete(self, session_id: str) -> None:
         client = self._redis_client()
         if client:
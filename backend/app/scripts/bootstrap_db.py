@@ -9,6 +9,7 @@ from pymongo import MongoClient
 
 from app.core.config import Settings
 from app.infrastructure.mongo_indexes import ensure_mongo_indexes, resolve_database
+from app.repositories.product_repository import FACET_KEYS_FIELD, facet_keys
 from app.scripts.create_indexes import _connect_with_retry
 from app.store.in_memory import InMemoryStore
 
@@ -97,7 +98,10 @@ def run(
         seeded["products"] = _upsert_map(
             collection=db["products"],
             key_field="productId",
-            rows=state.get("products_by_id", {}),
+            rows={
+                product_id: {**row, FACET_KEYS_FIELD: facet_keys(row)}
+                for product_id, row in state.get("products_by_id", {}).items()
+            },
         )
         seeded["categories"] = _upsert_map(
             collection=db["categories"],
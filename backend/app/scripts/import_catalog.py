@@ -0,0 +1,369 @@
+from __future__ import annotations
+
+import argparse
+import csv
+import json
+import sys
+from collections.abc import Iterable, Iterator
+from itertools import islice
+from pathlib import Path
+from time import perf_counter
+from typing import Any
+
+from pymongo import UpdateOne
+
+from app.core.config import Settings
+from app.core.utils import iso_now
+from app.infrastructure.mongo_indexes import resolve_database
+from app.infrastructure.persistence_clients import RedisClientManager
+from app.repositories.product_repository import FACET_KEYS_FIELD, ProductRepository, facet_keys
+from app.scripts.create_indexes import _connect_with_retry
+
+
+_VALID_STATUSES = {"active", "draft", "archived"}
+_LIST_FIELDS = ("images", "tags", "features")
+_MAX_REPORTED_ERRORS = 20
+
+
+def _parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Stream a JSONL or CSV product catalog into MongoDB and Redis.")
+    parser.add_argument("path", help="Catalog file (.jsonl or .csv).")
+    parser.add_argument(
+        "--format",
+        choices=("auto", "jsonl", "csv"),
+        default="auto",
+        help="Input format (defaults to the file extension).",
+    )
+    parser.add_argument("--batch-size", type=int, default=1000, help="Rows per bulk_write batch.")
+    parser.add_argument("--mongo-uri", default=None, help="MongoDB connection URI (defaults to MONGODB_URI env).")
+    parser.add_argument("--database", default=None, help="Mongo database name override.")
+    parser.add_argument("--redis-url", default=None, help="Redis URL (defaults to REDIS_URL env).")
+    parser.add_argument(
+        "--redis",
+        action=argparse.BooleanOptionalAction,
+        default=True,
+        help="Invalidate cached products/stock in Redis and bump the catalog version.",
+    )
+    parser.add_argument("--dry-run", action="store_true", help="Validate rows without writing anything.")
+    parser.add_argument("--retries", type=int, default=12, help="Retry attempts if Mongo is not ready.")
+    parser.add_argument("--retry-delay", type=float, default=2.0, help="Delay in seconds between retries.")
+    parser.add_argument("--timeout-ms", type=int, default=2500, help="Mongo server selection timeout (ms).")
+    parser.add_argument("--quiet", action="store_true", help="Suppress per-batch progress on stderr.")
+    return parser
+
+
+def _iter_rows(path: Path, fmt: str) -> Iterator[tuple[int, Any]]:
+    """Yield ``(line_number, raw_row)`` without reading the whole file."""
+    resolved = fmt
+    if resolved == "auto":
+        resolved = "csv" if path.suffix.lower() == ".csv" else "jsonl"
+    with path.open("r", encoding="utf-8", newline="") as handle:
+        if resolved == "csv":
+            for line_number, row in enumerate(csv.DictReader(handle), start=2):
+                yield line_number, row
+            return
+        for line_number, line in enumerate(handle, start=1):
+            text = line.strip()
+            if not text:
+                continue
+            try:
+                yield line_number, json.loads(text)
+            except json.JSONDecodeError as exc:
+                yield line_number, ValueError(f"invalid JSON: {exc.msg}")
+
+
+def _parse_list(value: Any) -> list[Any]:
+    if value is None or value == "":
+        return []
+    if isinstance(value, list):
+        return list(value)
+    text = str(value).strip()
+    if text.startswith("["):
+        decoded = json.loads(text)
+        if not isinstance(decoded, list):
+            raise ValueError("expected a JSON array")
+        return decoded
+    return [part.strip() for part in text.split("|") if part.strip()]
+
+
+def _parse_object(value: Any) -> dict[str, Any]:
+    if value is None or value == "":
+        return {}
+    if isinstance(value, dict):
+        return dict(value)
+    decoded = json.loads(str(value))
+    if not isinstance(decoded, dict):
+        raise ValueError("expected a JSON object")
+    return decoded
+
+
+def _normalize_product(row: Any, *, active_categories: set[str], now: str) -> dict[str, Any]:
+    """Validate one catalog row into the stored product shape, raising ValueError."""
+    if isinstance(row, Exception):
+        raise ValueError(str(row))
+    if not isinstance(row, dict):
+        raise ValueError("row must be an object")
+
+    product_id = str(row.get("id") or "").strip()
+    name = str(row.get("name") or "").strip()
+    category = str(row.get("category") or "").strip().lower()
+    if not product_id:
+        raise ValueError("missing id")
+    if not name:
+        raise ValueError("missing name")
+    if not category:
+        raise ValueError("missing category")
+    if active_categories and category not in active_categories:
+        raise ValueError(f"unknown category: {category}")
+    try:
+        price = float(row.get("price"))
+    except (TypeError, ValueError):
+        raise ValueError("price must be a number") from None
+    if price < 0:
+        raise ValueError("price must be non-negative")
+    status = str(row.get("status") or "active").strip().lower()
+    if status not in _VALID_STATUSES:
+        raise ValueError(f"invalid status: {status}")
+
+    try:
+        variants = _parse_list(row.get("variants"))
+        lists = {field: [str(item) for item in _parse_list(row.get(field))] for field in _LIST_FIELDS}
+        specifications = _parse_object(row.get("specifications"))
+    except json.JSONDecodeError as exc:
+        raise ValueError(f"invalid JSON column: {exc.msg}") from None
+    for variant in variants:
+        if not isinstance(variant, dict) or not str(variant.get("id") or "").strip():
+            raise ValueError("every variant needs an id")
+        inventory = variant.get("inventory")
+        if isinstance(inventory, dict) and inventory:
+            variant["inventory"] = {**inventory, **_stock_quantities(inventory)}
+
+    return {
+        "id": product_id,
+        "name": name,
+        "description": str(row.get("description") or ""),
+        "category": category,
+        "subcategory": str(row.get("subcategory") or "").strip().lower(),
+        "brand": str(row.get("brand") or "Generic").strip(),
+        "price": price,
+        "currency": str(row.get("currency") or "USD"),
+        "images": lists["images"],
+        "variants": variants,
+        "rating": float(row.get("rating") or 0.0),
+        "reviewCount": int(float(row.get("reviewCount") or 0)),
+        "tags": lists["tags"],
+        "features": lists["features"],
+        "specifications": specifications,
+        "status": status,
+        "createdAt": str(row.get("createdAt") or ""),
+        "updatedAt": now,
+    }
+
+
+def _stock_quantities(inventory: dict[str, Any]) -> dict[str, int]:
+    try:
+        available = max(0, int(float(inventory.get("availableQuantity", 10))))
+        total = max(available, int(float(inventory.get("totalQuantity", available))))
+    except (TypeError, ValueError, OverflowError):
+        raise ValueError("inventory quantities must be numbers") from None
+    return {"totalQuantity": total, "availableQuantity": available}
+
+
+def _inventory_rows(product: dict[str, Any], *, now: str) -> list[dict[str, Any]]:
+    """Stock upserts for a product's variants.
+
+    Quantities given in the row replace the stored total, but active
+    reservations are kept: available stock is capped at total minus reserved,
+    the same rule ProductService applies. Without quantities, existing stock
+    is left alone and new variants start with ProductService's default.
+    """
+    rows: list[dict[str, Any]] = []
+    for variant in product["variants"]:
+        variant_id = str(variant["id"])
+        keys = {"variantId": variant_id, "productId": product["id"], "updatedAt": now}
+        inventory = variant.get("inventory")
+        if isinstance(inventory, dict) and inventory:
+            total = inventory["totalQuantity"]
+            available = inventory["availableQuantity"]
+            variant["inStock"] = available > 0
+            reserved = {"$min": [{"$max": [0, {"$ifNull": ["$reservedQuantity", 0]}]}, total]}
+            update = [
+                {"$set": {**keys, "totalQuantity": total, "reservedQuantity": reserved}},
+                {"$set": {"availableQuantity": {"$min": [available, {"$subtract": [total, "$reservedQuantity"]}]}}},
+            ]
+            rows.append({"variantId": variant_id, "update": update})
+            continue
+        variant.setdefault("inStock", True)
+        update = {
+            "$set": keys,
+            "$setOnInsert": {"totalQuantity": 10, "availableQuantity": 10, "reservedQuantity": 0},
+        }
+        rows.append({"variantId": variant_id, "update": update})
+    return rows
+
+
+def _batches(rows: Iterable[tuple[int, Any]], size: int) -> Iterator[list[tuple[int, Any]]]:
+    iterator = iter(rows)
+    while True:
+        batch = list(islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
+
+def _write_batch(
+    *,
+    db: Any,
+    redis_client: Any | None,
+    products: list[dict[str, Any]],
+    inventory: list[dict[str, Any]],
+) -> None:
+    db["products"].bulk_write([_product_upsert(product) for product in products], ordered=False)
+    if inventory:
+        db["inventory"].bulk_write(
+            [
+                UpdateOne({"variantId": stock["variantId"]}, stock["update"], upsert=True)
+                for stock in inventory
+            ],
+            ordered=False,
+        )
+    if redis_client is None:
+        return
+    # Stored documents keep fields the import does not own (createdAt, reservations),
+    # so cached copies are dropped and reloaded from Mongo on the next read.
+    pipe = redis_client.pipeline()
+    for product in products:
+        pipe.delete(f"product:{product['id']}")
+    for stock in inventory:
+        pipe.delete(f"inventory:{stock['variantId']}")
+    pipe.execute()
+
+
+def _product_upsert(product: dict[str, Any]) -> UpdateOne:
+    selector = {"productId": product["id"]}
+    fields = {"productId": product["id"], **product, FACET_KEYS_FIELD: facet_keys(product)}
+    created_at = fields.pop("createdAt")
+    if created_at:
+        return UpdateOne(selector, {"$set": {**fields, "createdAt": created_at}}, upsert=True)
+    return UpdateOne(selector, {"$set": fields, "$setOnInsert": {"createdAt": product["updatedAt"]}}, upsert=True)
+
+
+def run(
+    *,
+    path: str,
+    fmt: str,
+    batch_size: int,
+    mongo_uri: str | None,
+    database: str | None,
+    redis_url: str | None,
+    use_redis: bool,
+    dry_run: bool,
+    retries: int,
+    retry_delay: float,
+    timeout_ms: int,
+    progress: Any | None = None,
+) -> dict[str, Any]:
+    settings = Settings.from_env()
+    uri = mongo_uri or settings.mongodb_uri
+    safe_batch_size = max(1, batch_size)
+    client = None
+    db: Any = None
+    redis_manager: RedisClientManager | None = None
+    if not dry_run:
+        client = _connect_with_retry(uri=uri, retries=retries, retry_delay=retry_delay, timeout_ms=timeout_ms)
+        db = resolve_database(client, database)
+        if use_redis:
+            redis_manager = RedisClientManager(url=redis_url or settings.redis_url, enabled=True)
+            redis_manager.connect()
+
+    read = 0
+    imported = 0
+    variants = 0
+    errors: list[dict[str, Any]] = []
+    invalid = 0
+    catalog_version: int | None = None
+    started = perf_counter()
+    try:
+        active_categories: set[str] = set()
+        if db is not None:
+            active_categories = {
+                str(row.get("slug", "")).strip().lower()
+                for row in db["categories"].find({}, {"slug": 1, "status": 1})
+                if str(row.get("status", "active")).lower() == "active"
+            }
+        redis_client = redis_manager.client if redis_manager is not None else None
+
+        for batch_number, batch in enumerate(_batches(_iter_rows(Path(path), fmt), safe_batch_size), start=1):
+            now = iso_now()
+            products: list[dict[str, Any]] = []
+            inventory: list[dict[str, Any]] = []
+            for line_number, row in batch:
+                read += 1
+                try:
+                    product = _normalize_product(row, active_categories=active_categories, now=now)
+                except (TypeError, ValueError) as exc:
+                    invalid += 1
+                    if len(errors) < _MAX_REPORTED_ERRORS:
+                        errors.append({"line": line_number, "error": str(exc)})
+                    continue
+                inventory.extend(_inventory_rows(product, now=now))
+                products.append(product)
+
+            if products and db is not None:
+                _write_batch(db=db, redis_client=redis_client, products=products, inventory=inventory)
+            imported += len(products)
+            variants += len(inventory)
+            if progress is not None:
+                elapsed = max(perf_counter() - started, 1e-9)
+                print(
+                    f"batch {batch_number}: {read} rows read, {imported} imported, {read / elapsed:.0f} rows/sec",
+                    file=progress,
+                )
+
+        if redis_client is not None and imported:
+            # Workers poll this key and reload their catalog snapshot when it moves.
+            catalog_version = int(redis_client.incr(ProductRepository.CATALOG_VERSION_KEY))
+    finally:
+        if redis_manager is not None:
+            redis_manager.disconnect()
+        if client is not None:
+            client.close()
+
+    elapsed = perf_counter() - started
+    return {
+        "path": path,
+        "dryRun": dry_run,
+        "rowsRead": read,
+        "imported": imported,
+        "variants": variants,
+        "invalid": invalid,
+        "errors": errors,
+        "elapsedSeconds": round(elapsed, 3),
+        "rowsPerSecond": round(read / elapsed, 1) if elapsed > 0 else 0.0,
+        "redis": redis_manager.status if redis_manager is not None else "skipped",
+        "catalogVersion": catalog_version,
+    }
+
+
+def main() -> int:
+    args = _parser().parse_args()
+    summary = run(
+        path=args.path,
+        fmt=args.format,
+        batch_size=args.batch_size,
+        mongo_uri=args.mongo_uri,
+        database=args.database,
+        redis_url=args.redis_url,
+        use_redis=args.redis,
+        dry_run=args.dry_run,
+        retries=args.retries,
+        retry_delay=args.retry_delay,
+        timeout_ms=args.timeout_ms,
+        progress=None if args.quiet else sys.stderr,
+    )
+    print(json.dumps(summary, indent=2))
+    return 0 if summary["invalid"] == 0 else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
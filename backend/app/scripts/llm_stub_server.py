@@ -0,0 +1,232 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import math
+import random
+import threading
+import time
+from collections import Counter
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+from app.infrastructure.llm_client import LLMClient
+from app.infrastructure.prompts import ACTION_PLANNING_PROMPT, INTENT_CLASSIFICATION_PROMPT
+from app.orchestrator.action_extractor import ActionExtractor
+from app.orchestrator.intent_classifier import IntentClassifier
+from app.orchestrator.types import IntentResult
+
+
+DEFAULT_STREAM_TEXT = "Happy to help! Here is what I found for you."
+
+
+@dataclass
+class StubConfig:
+    """Behaviour of the stub: ``latency`` is a distribution spec (see :func:`latency_sampler`).
+
+    ``responses`` overrides the generated bodies per call kind and intent, e.g.
+    ``{"plan": {"view_cart": {...}}, "intent": {"checkout": {...}}}``; a
+    ``"*"`` intent matches anything.
+    """
+
+    latency: str = "fixed:0"
+    error_rate: float = 0.0
+    error_status: int = 503
+    confidence: float = 0.9
+    stream_text: str = DEFAULT_STREAM_TEXT
+    stream_chunk_ms: float = 15.0
+    seed: int | None = None
+    responses: dict[str, dict[str, Any]] = field(default_factory=dict)
+
+
+def latency_sampler(spec: str, rng: random.Random) -> Callable[[], float]:
+    """Milliseconds per call from ``fixed:MS``, ``uniform:LO:HI``, ``normal:MEAN:SD`` or ``lognormal:MEDIAN:SIGMA``."""
+    kind, _, raw = str(spec).strip().lower().partition(":")
+    try:
+        args = [float(part) for part in raw.split(":") if part]
+    except ValueError as exc:
+        raise ValueError(f"invalid latency spec {spec!r}") from exc
+    if kind == "fixed" and len(args) == 1:
+        return lambda: max(0.0, args[0])
+    if kind == "uniform" and len(args) == 2:
+        return lambda: max(0.0, rng.uniform(args[0], args[1]))
+    if kind == "normal" and len(args) == 2:
+        return lambda: max(0.0, rng.gauss(args[0], args[1]))
+    if kind == "lognormal" and len(args) == 2 and args[0] > 0:
+        mu = math.log(args[0])
+        return lambda: rng.lognormvariate(mu, args[1])
+    raise ValueError(f"invalid latency spec {spec!r}")
+
+
+def create_app(config: StubConfig | None = None) -> FastAPI:
+    """An OpenRouter-compatible ``/chat/completions`` endpoint backed by the rule classifier."""
+    settings = config or StubConfig()
+    rng = random.Random(settings.seed)
+    sample_latency_ms = latency_sampler(settings.latency, rng)
+    classifier = IntentClassifier()
+    extractor = ActionExtractor()
+    stats: Counter[str] = Counter()
+    app = FastAPI(title="LLM stub")
+    app.state.stats = stats
+
+    def intent_of(prompt: dict[str, Any]) -> str:
+        inferred = str(prompt.get("inferredIntent") or "").strip()
+        if inferred:
+            return inferred
+        return classifier.classify(str(prompt.get("message", "")), allow_llm=False).name
+
+    def canned(kind: str, intent: str) -> dict[str, Any] | None:
+        overrides = settings.responses.get(kind, {})
+        return overrides.get(intent, overrides.get("*"))
+
+    def intent_body(intent: str) -> dict[str, Any]:
+        return canned("intent", intent) or {"intent": intent, "confidence": settings.confidence, "entities": {}}
+
+    def plan_body(intent: str, prompt: dict[str, Any]) -> dict[str, Any]:
+        override = canned("plan", intent)
+        if override is not None:
+            return override
+        rule = classifier.classify(str(prompt.get("message", "")), allow_llm=False)
+        actions = []
+        for action in extractor.extract(IntentResult(name=intent, confidence=rule.confidence, entities=rule.entities)):
+            spec = LLMClient.SUPPORTED_PLANNER_ACTIONS.get(action.name)
+            if spec is not None:
+                actions.append({"name": action.name, "targetAgent": spec["target"], "params": action.params})
+        return {
+            "actions": actions,
+            "confidence": settings.confidence if actions else 0.0,
+            "needsClarification": False,
+            "clarificationQuestion": "",
+        }
+
+    async def stream_body(text: str) -> Any:
+        words = text.split(" ")
+        for index, word in enumerate(words):
+            chunk = {"choices": [{"delta": {"content": word if index == 0 else f" {word}"}}]}
+            yield f"data: {json.dumps(chunk)}\n\n"
+            await asyncio.sleep(settings.stream_chunk_ms / 1000)
+        yield "data: [DONE]\n\n"
+
+    async def completions(request: Request) -> Any:
+        body = await request.json()
+        messages = body.get("messages") or [{}, {}]
+        system_prompt = str(messages[0].get("content", ""))
+        user_prompt = str(messages[-1].get("content", ""))
+        streaming = bool(body.get("stream"))
+        if streaming:
+            kind = "stream"
+        elif system_prompt == ACTION_PLANNING_PROMPT:
+            kind = "plan"
+        elif system_prompt == INTENT_CLASSIFICATION_PROMPT:
+            kind = "intent"
+        else:
+            kind = "other"
+        stats[f"{kind}.requests"] += 1
+
+        await asyncio.sleep(sample_latency_ms() / 1000)
+        if rng.random() < settings.error_rate:
+            stats[f"{kind}.errors"] += 1
+            return JSONResponse({"error": {"message": "stub injected failure"}}, status_code=settings.error_status)
+
+        if streaming:
+            return StreamingResponse(stream_body(settings.stream_text), media_type="text/event-stream")
+        try:
+            prompt = json.loads(user_prompt)
+        except json.JSONDecodeError:
+            prompt = {"message": user_prompt}
+        if not isinstance(prompt, dict):
+            prompt = {"message": user_prompt}
+        intent = intent_of(prompt)
+        content = plan_body(intent, prompt) if kind == "plan" else intent_body(intent)
+        return {
+            "id": f"stub-{sum(stats.values())}",
+            "object": "chat.completion",
+            "model": body.get("model", "stub"),
+            "choices": [{"index": 0, "message": {"role": "assistant", "content": json.dumps(content)}, "finish_reason": "stop"}],
+        }
+
+    app.add_api_route("/chat/completions", completions, methods=["POST"])
+    app.add_api_route("/v1/chat/completions", completions, methods=["POST"])
+    app.add_api_route("/stats", lambda: dict(stats), methods=["GET"])
+    return app
+
+
+@contextmanager
+def serve_in_thread(config: StubConfig | None = None, *, host: str = "127.0.0.1", port: int = 0) -> Iterator[str]:
+    """Run the stub on a background thread and yield its base URL (``port=0`` picks a free port)."""
+    import uvicorn
+
+    server = uvicorn.Server(
+        uvicorn.Config(create_app(config), host=host, port=port, log_level="warning", lifespan="off")
+    )
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    deadline = time.monotonic() + 10
+    while not server.started:
+        if not thread.is_alive() or time.monotonic() > deadline:
+            raise RuntimeError("LLM stub server failed to start")
+        time.sleep(0.01)
+    bound_port = server.servers[0].sockets[0].getsockname()[1]
+    try:
+        yield f"http://{host}:{bound_port}"
+    finally:
+        server.should_exit = True
+        thread.join(timeout=5)
+
+
+def _parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description="Serve an OpenRouter-compatible stub for offline LLM load tests "
+        "(point OPENROUTER_BASE_URL at it)."
+    )
+    parser.add_argument("--host", default="127.0.0.1", help="Bind address.")
+    parser.add_argument("--port", type=int, default=8089, help="Bind port.")
+    parser.add_argument(
+        "--latency",
+        default="lognormal:400:0.5",
+        help="fixed:MS, uniform:LO:HI, normal:MEAN:SD or lognormal:MEDIAN:SIGMA (milliseconds).",
+    )
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of calls answered with an error.")
+    parser.add_argument("--error-status", type=int, default=503, help="HTTP status used for injected errors.")
+    parser.add_argument("--confidence", type=float, default=0.9, help="Confidence reported in generated answers.")
+    parser.add_argument("--responses", default=None, help="JSON file of canned bodies keyed by kind and intent.")
+    parser.add_argument("--stream-chunk-ms", type=float, default=15.0, help="Delay between streamed chunks.")
+    parser.add_argument("--seed", type=int, default=None, help="Seed for latency and error sampling.")
+    return parser
+
+
+def main() -> int:
+    parser = _parser()
+    args = parser.parse_args()
+    try:
+        latency_sampler(args.latency, random.Random())
+    except ValueError as exc:
+        parser.error(str(exc))
+    responses: dict[str, dict[str, Any]] = {}
+    if args.responses:
+        with open(args.responses, "r", encoding="utf-8") as handle:
+            responses = json.load(handle)
+    config = StubConfig(
+        latency=args.latency,
+        error_rate=max(0.0, min(1.0, args.error_rate)),
+        error_status=args.error_status,
+        confidence=args.confidence,
+        stream_chunk_ms=max(0.0, args.stream_chunk_ms),
+        seed=args.seed,
+        responses=responses,
+    )
+
+    import uvicorn
+
+    uvicorn.run(create_app(config), host=args.host, port=args.port, log_level="warning")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
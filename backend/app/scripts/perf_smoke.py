@@ -3,13 +3,20 @@ from __future__ import annotations
 import argparse
 import json
 import math
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import replace
 from statistics import mean
 from time import perf_counter
 from typing import Any
 
+import httpx
 from fastapi.testclient import TestClient
 
+from app.container import llm_client
+from app.infrastructure.llm_response_cache import LLMResponseCache
 from app.main import app
+from app.scripts.llm_stub_server import StubConfig, serve_in_thread
 
 
 def _parser() -> argparse.ArgumentParser:
@@ -29,6 +36,14 @@ def _parser() -> argparse.ArgumentParser:
         default=200.0,
         help="Max p95 latency for websocket message->response roundtrip.",
     )
+    parser.add_argument(
+        "--llm-stub",
+        default=None,
+        metavar="LATENCY",
+        help="Run planner-first against a local LLM stub with this latency spec (e.g. lognormal:300:0.5); "
+        "the LLM response cache is bypassed so every message reaches the stub.",
+    )
+    parser.add_argument("--llm-stub-error-rate", type=float, default=0.0, help="Injected stub error rate.")
     return parser
 
 
@@ -47,6 +62,31 @@ def _measure_ms(fn: Any) -> tuple[float, Any]:
     return elapsed_ms, result
 
 
+@contextmanager
+def _llm_stub(latency: str | None, error_rate: float) -> Iterator[dict[str, Any] | None]:
+    if not latency:
+        yield None
+        return
+    with serve_in_thread(StubConfig(latency=latency, error_rate=error_rate, seed=7)) as base_url:
+        original_settings, original_cache = llm_client.settings, llm_client.response_cache
+        llm_client.settings = replace(
+            original_settings,
+            llm_enabled=True,
+            openrouter_api_key="stub",
+            openrouter_base_url=base_url,
+            llm_planner_enabled=True,
+            planner_feature_enabled=True,
+            planner_canary_percent=100,
+        )
+        llm_client.response_cache = LLMResponseCache(max_entries=0)
+        info: dict[str, Any] = {"latency": latency, "errorRate": error_rate}
+        try:
+            yield info
+        finally:
+            llm_client.settings, llm_client.response_cache = original_settings, original_cache
+            info["requests"] = httpx.get(f"{base_url}/stats").json()
+
+
 def run(
     *,
     iterations: int,
@@ -54,6 +94,29 @@ def run(
     products_p95_ms: float,
     interactions_p95_ms: float,
     ws_roundtrip_p95_ms: float,
+    llm_stub: str | None = None,
+    llm_stub_error_rate: float = 0.0,
+) -> dict[str, Any]:
+    with _llm_stub(llm_stub, llm_stub_error_rate) as stub:
+        summary = _run_scenarios(
+            iterations=iterations,
+            ws_iterations=ws_iterations,
+            products_p95_ms=products_p95_ms,
+            interactions_p95_ms=interactions_p95_ms,
+            ws_roundtrip_p95_ms=ws_roundtrip_p95_ms,
+        )
+    if stub is not None:
+        summary["llmStub"] = stub
+    return summary
+
+
+def _run_scenarios(
+    *,
+    iterations: int,
+    ws_iterations: int,
+    products_p95_ms: float,
+    interactions_p95_ms: float,
+    ws_roundtrip_p95_ms: float,
 ) -> dict[str, Any]:
     safe_iterations = max(5, iterations)
     safe_ws_iterations = max(5, ws_iterations)
@@ -148,6 +211,8 @@ def main() -> int:
         products_p95_ms=args.products_p95_ms,
         interactions_p95_ms=args.interactions_p95_ms,
         ws_roundtrip_p95_ms=args.ws_roundtrip_p95_ms,
+        llm_stub=args.llm_stub,
+        llm_stub_error_rate=args.llm_stub_error_rate,
     )
     print(json.dumps(result, indent=2))
     return 0 if result["pass"] else 1
@@ -0,0 +1,170 @@
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from collections import Counter, deque
+from collections.abc import Iterator
+from contextlib import nullcontext
+from itertools import islice
+from pathlib import Path
+from time import perf_counter
+from typing import IO, Any
+
+from app.core.config import Settings
+from app.orchestrator.intent_cache import IntentCache
+from app.orchestrator.intent_classifier import IntentClassifier
+from app.orchestrator.intent_model import IntentModel
+
+
+_RECENT_TURNS = 12
+
+
+def _parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description="Re-classify a JSONL interaction log and write one intent result per line."
+    )
+    parser.add_argument("path", help="Interaction log (.jsonl), or - for stdin.")
+    parser.add_argument("--output", default="-", help="Where to write results (defaults to stdout).")
+    parser.add_argument("--workers", type=int, default=1, help="Classifier processes (1 classifies in-process).")
+    parser.add_argument("--chunk-size", type=int, default=2000, help="Messages per worker task.")
+    parser.add_argument("--model", default=None, help="Intent model path (defaults to INTENT_MODEL_PATH).")
+    parser.add_argument("--cache-entries", type=int, default=4096, help="Intent cache size per process.")
+    parser.add_argument("--quiet", action="store_true", help="Suppress per-block progress on stderr.")
+    return parser
+
+
+def _iter_records(handle: IO[str]) -> Iterator[tuple[int, dict[str, Any] | None]]:
+    for line_number, line in enumerate(handle, start=1):
+        text = line.strip()
+        if not text:
+            continue
+        try:
+            record = json.loads(text)
+        except json.JSONDecodeError:
+            yield line_number, None
+            continue
+        yield line_number, record if isinstance(record, dict) and isinstance(record.get("message"), str) else None
+
+
+def _context_for(record: dict[str, Any], history: dict[str, deque[dict[str, Any]]]) -> dict[str, Any] | None:
+    """Explicit ``context`` wins; otherwise rebuild ``recent`` from earlier turns of the same session."""
+    context = record.get("context")
+    if isinstance(context, dict):
+        return context
+    session_id = str(record.get("sessionId") or "")
+    if not session_id:
+        return None
+    turns = history.setdefault(session_id, deque(maxlen=_RECENT_TURNS))
+    context = {"recent": list(turns)}
+    turns.append({"intent": str(record.get("intent") or ""), "agent": str(record.get("agent") or "")})
+    return context
+
+
+def run(
+    *,
+    path: str,
+    output: IO[str],
+    workers: int,
+    chunk_size: int,
+    model_path: str | None,
+    cache_entries: int,
+    progress: IO[str] | None = None,
+) -> dict[str, Any]:
+    settings = Settings.from_env()
+    resolved_model = model_path if model_path is not None else settings.intent_model_path
+    model = IntentModel.load(resolved_model) if resolved_model else None
+    classifier = IntentClassifier(
+        cache=IntentCache(max_entries=cache_entries),
+        model=model,
+        model_min_confidence=settings.intent_model_min_confidence,
+    )
+    safe_chunk = max(1, chunk_size)
+    block_size = safe_chunk * max(1, workers) * 4
+
+    read = 0
+    invalid = 0
+    compared = 0
+    changed = 0
+    intents: Counter[str] = Counter()
+    history: dict[str, deque[dict[str, Any]]] = {}
+    started = perf_counter()
+    source = sys.stdin if path == "-" else Path(path).open("r", encoding="utf-8")
+    pool = classifier.process_pool(workers) if workers > 1 else nullcontext(None)
+    try:
+        with pool as executor:
+            records = _iter_records(source)
+            while True:
+                block = list(islice(records, block_size))
+                if not block:
+                    break
+                valid = [(line_number, record) for line_number, record in block if record is not None]
+                read += len(block)
+                invalid += len(block) - len(valid)
+                results = classifier.classify_batch(
+                    [record["message"] for _, record in valid],
+                    [_context_for(record, history) for _, record in valid],
+                    chunk_size=safe_chunk,
+                    executor=executor,
+                )
+                for (line_number, record), result in zip(valid, results):
+                    row: dict[str, Any] = {
+                        "line": line_number,
+                        "message": record["message"],
+                        "intent": result.name,
+                        "confidence": result.confidence,
+                        "entities": result.entities,
+                    }
+                    if record.get("id"):
+                        row["id"] = record["id"]
+                    previous = record.get("intent")
+                    if isinstance(previous, str) and previous:
+                        compared += 1
+                        row["previousIntent"] = previous
+                        row["changed"] = previous != result.name
+                        changed += int(row["changed"])
+                    intents[result.name] += 1
+                    output.write(json.dumps(row) + "\n")
+                if progress is not None:
+                    elapsed = max(perf_counter() - started, 1e-9)
+                    print(f"{read} lines, {read / elapsed:.0f} messages/sec", file=progress)
+    finally:
+        if source is not sys.stdin:
+            source.close()
+
+    elapsed = perf_counter() - started
+    return {
+        "path": path,
+        "linesRead": read,
+        "classified": read - invalid,
+        "invalid": invalid,
+        "compared": compared,
+        "changed": changed,
+        "intents": dict(intents.most_common()),
+        "workers": max(1, workers),
+        "model": resolved_model if model is not None else None,
+        "cache": classifier.cache.stats() if workers <= 1 else None,
+        "elapsedSeconds": round(elapsed, 3),
+        "messagesPerSecond": round(read / elapsed, 1) if elapsed > 0 else 0.0,
+    }
+
+
+def main() -> int:
+    args = _parser().parse_args()
+    target = nullcontext(sys.stdout) if args.output == "-" else open(args.output, "w", encoding="utf-8")
+    with target as output:
+        summary = run(
+            path=args.path,
+            output=output,
+            workers=args.workers,
+            chunk_size=args.chunk_size,
+            model_path=args.model,
+            cache_entries=args.cache_entries,
+            progress=None if args.quiet else sys.stderr,
+        )
+    print(json.dumps(summary, indent=2), file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
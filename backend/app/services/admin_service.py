@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from app.infrastructure.write_behind import WriteBehindQueue
 from app.repositories.interaction_repository import InteractionRepository
 from app.repositories.order_repository import OrderRepository
 from app.repositories.product_repository import ProductRepository
@@ -18,6 +19,7 @@ class AdminService:
         support_repository: SupportRepository,
         product_repository: ProductRepository,
         voice_recovery_service: VoiceRecoveryService,
+        write_behind: WriteBehindQueue | None = None,
     ) -> None:
         self.session_repository = session_repository
         self.order_repository = order_repository
@@ -25,6 +27,7 @@ class AdminService:
         self.support_repository = support_repository
         self.product_repository = product_repository
         self.voice_recovery_service = voice_recovery_service
+        self.write_behind = write_behind
 
     def stats(self) -> dict[str, object]:
         today = utc_now().date().isoformat()
@@ -48,6 +51,9 @@ class AdminService:
 
         top_products = sorted(by_product.values(), key=lambda item: int(item["sold"]), reverse=True)[:5]
 
+        if self.write_behind is not None:
+            # Count interactions still waiting on the write-behind queue too.
+            self.write_behind.settle("interaction")
         interactions = self.interaction_repository.list_by_date(date_prefix=today)
         by_agent: dict[str, dict[str, object]] = {}
         for record in interactions:
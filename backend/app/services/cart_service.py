@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import asyncio
 from copy import deepcopy
 from datetime import datetime, timedelta, timezone
 from typing import Any
@@ -30,6 +31,20 @@ class CartService:
         cart = self._get_or_create_cart(user_id=user_id, session_id=session_id)
         return deepcopy(cart)
 
+    async def aget_cart(self, user_id: str | None, session_id: str) -> dict[str, Any]:
+        """:meth:`get_cart` for event-loop callers, over the repository's asyncio paths."""
+        existing = await self.cart_repository.aget_for_user_or_session(user_id=user_id, session_id=session_id)
+        if existing:
+            keep = self._renew_or_abandon(existing)
+            await self.cart_repository.aupdate(existing)
+            if keep:
+                return deepcopy(existing)
+        anonymous_id = await asyncio.to_thread(self._resolve_anonymous_id, session_id=session_id)
+        cart = await self.cart_repository.acreate(
+            self._new_cart(user_id=user_id, session_id=session_id, anonymous_id=anonymous_id)
+        )
+        return deepcopy(cart)
+
     def add_item(
         self,
         user_id: str | None,
@@ -196,23 +211,36 @@ class CartService:
     def _get_or_create_cart(self, user_id: str | None, session_id: str) -> dict[str, Any]:
         existing = self.cart_repository.get_for_user_or_session(user_id=user_id, session_id=session_id)
         if existing:
-            if self._is_cart_expired(existing):
-                existing["status"] = "abandoned"
-                existing["updatedAt"] = iso_now()
-                self.cart_repository.update(existing)
-            else:
-                existing["status"] = "active"
-                existing["expiresAt"] = self._next_cart_expiry()
-                self.cart_repository.update(existing)
+            keep = self._renew_or_abandon(existing)
+            self.cart_repository.update(existing)
+            if keep:
                 return existing
+        return self.cart_repository.create(
+            self._new_cart(
+                user_id=user_id,
+                session_id=session_id,
+                anonymous_id=self._resolve_anonymous_id(session_id=session_id),
+            )
+        )
+
+    def _renew_or_abandon(self, cart: dict[str, Any]) -> bool:
+        """Extend a live cart's expiry or mark an expired one abandoned; True when it is still usable."""
+        if self._is_cart_expired(cart):
+            cart["status"] = "abandoned"
+            cart["updatedAt"] = iso_now()
+            return False
+        cart["status"] = "active"
+        cart["expiresAt"] = self._next_cart_expiry()
+        return True
 
+    def _new_cart(self, *, user_id: str | None, session_id: str, anonymous_id: str | None) -> dict[str, Any]:
         cart_id = generate_id("cart")
         now = iso_now()
-        cart = {
+        return {
             "id": cart_id,
             "userId": user_id,
             "sessionId": session_id,
-            "anonymousId": self._resolve_anonymous_id(session_id=session_id),
+            "anonymousId": anonymous_id,
             "items": [],
             "subtotal": 0.0,
             "tax": 0.0,
@@ -227,7 +255,6 @@ class CartService:
             "updatedAt": now,
             "expiresAt": self._next_cart_expiry(),
         }
-        return self.cart_repository.create(cart)
 
     def _resolve_product_variant(
         self, product_id: str, variant_id: str
@@ -0,0 +1 @@
+# Product catalog package
@@ -0,0 +1,160 @@
+from __future__ import annotations
+
+from typing import Any, Mapping, Sequence
+
+import numpy as np
+
+
+def _normalize(value: Any) -> str:
+    return str(value or "").strip().lower()
+
+
+def _as_float(value: Any, default: float) -> float:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return default
+
+
+def _as_int(value: Any) -> int:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return 0
+
+
+class ProductColumns:
+    """Columnar view of a product list for vectorized filtering and ranking.
+
+    Row ``i`` describes ``products[i]``. Category and brand are dictionary
+    encoded, so per-category and per-brand weights become a single gather.
+    Unparseable prices are stored as NaN and never match a price range.
+    """
+
+    def __init__(self, products: Sequence[dict[str, Any]]) -> None:
+        size = len(products)
+        self.size = size
+        self.ids = [str(item.get("id", "")) for item in products]
+        self.price = np.fromiter(
+            (_as_float(item.get("price"), float("nan")) for item in products), dtype=np.float64, count=size
+        )
+        self.rating = np.fromiter(
+            (_as_float(item.get("rating", 0.0), 0.0) for item in products), dtype=np.float64, count=size
+        )
+        self.review_count = np.fromiter(
+            (_as_int(item.get("reviewCount", 0)) for item in products), dtype=np.int64, count=size
+        )
+        self.category_codes, self.categories = self._encode([_normalize(item.get("category")) for item in products])
+        self.brand_codes, self.brands = self._encode([_normalize(item.get("brand")) for item in products])
+
+    def price_mask(self, *, min_price: float | None = None, max_price: float | None = None) -> np.ndarray:
+        mask = ~np.isnan(self.price)
+        if min_price is not None:
+            mask &= self.price >= float(min_price)
+        if max_price is not None:
+            mask &= self.price <= float(max_price)
+        return mask
+
+    def within_price(
+        self,
+        positions: np.ndarray,
+        *,
+        min_price: float | None = None,
+        max_price: float | None = None,
+    ) -> np.ndarray:
+        prices = self.price[positions]
+        keep = ~np.isnan(prices)
+        if min_price is not None:
+            keep &= prices >= float(min_price)
+        if max_price is not None:
+            keep &= prices <= float(max_price)
+        return positions[keep]
+
+    def affinity_scores(
+        self,
+        *,
+        product_scores: Mapping[str, Any],
+        category_scores: Mapping[str, Any],
+        brand_scores: Mapping[str, Any],
+        rows: np.ndarray | None = None,
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Direct, category and brand weights for ``rows`` (every row when None)."""
+        rows = np.arange(self.size, dtype=np.int64) if rows is None else np.asarray(rows, dtype=np.int64)
+        if product_scores:
+            direct = np.fromiter(
+                (_as_int(product_scores.get(self.ids[row], 0)) for row in rows.tolist()), dtype=np.int64, count=len(rows)
+            )
+        else:
+            direct = np.zeros(len(rows), dtype=np.int64)
+        by_category = self._code_weights(self.categories, category_scores)[self.category_codes[rows]]
+        by_brand = self._code_weights(self.brands, brand_scores)[self.brand_codes[rows]]
+        return direct, by_category, by_brand
+
+    def rank_by_affinity(
+        self,
+        *,
+        product_scores: Mapping[str, Any],
+        category_scores: Mapping[str, Any],
+        brand_scores: Mapping[str, Any],
+        rows: Sequence[int] | np.ndarray | None = None,
+        limit: int | None = None,
+    ) -> list[int]:
+        """Rows (all, or ``rows`` in their given order) by (direct, category, brand, rating) descending, ties kept stable."""
+        selected = np.arange(self.size, dtype=np.int64) if rows is None else np.asarray(rows, dtype=np.int64)
+        direct, by_category, by_brand = self.affinity_scores(
+            product_scores=product_scores,
+            category_scores=category_scores,
+            brand_scores=brand_scores,
+            rows=selected,
+        )
+        order = top_k_descending([direct, by_category, by_brand, self.rating[selected]], limit=limit)
+        return selected[order].tolist()
+
+    @staticmethod
+    def _encode(values: list[str]) -> tuple[np.ndarray, list[str]]:
+        vocabulary: dict[str, int] = {}
+        codes = np.fromiter(
+            (vocabulary.setdefault(value, len(vocabulary)) for value in values), dtype=np.int32, count=len(values)
+        )
+        return codes, list(vocabulary)
+
+    @staticmethod
+    def _code_weights(vocabulary: list[str], scores: Mapping[str, Any]) -> np.ndarray:
+        weights = np.zeros(len(vocabulary), dtype=np.int64)
+        if not scores:
+            return weights
+        for code, value in enumerate(vocabulary):
+            weights[code] = _as_int(scores.get(value, 0))
+        return weights
+
+
+def top_k_descending(keys: list[np.ndarray], *, limit: int | None = None) -> list[int]:
+    """Indices of the ``limit`` largest rows under lexicographic ``keys``.
+
+    Equal rows keep their input order, matching ``sorted(..., reverse=True)``.
+    Keys are folded into one exact integer rank so ``argpartition`` can select
+    the top rows in linear time before only those are sorted.
+    """
+    size = len(keys[0]) if keys else 0
+    if size == 0:
+        return []
+    k = size if limit is None else max(0, min(int(limit), size))
+    if k == 0:
+        return []
+
+    composite = np.zeros(size, dtype=np.int64)
+    capacity = 1
+    for key in keys:
+        # Dense rank of the negated key: 0 is the best value for this column.
+        uniques, ranks = np.unique(-np.asarray(key), return_inverse=True)
+        capacity *= len(uniques)
+        if capacity * size >= 2**62:
+            order = np.lexsort([np.arange(size)] + [-np.asarray(column) for column in reversed(keys)])
+            return order[:k].tolist()
+        composite = composite * len(uniques) + ranks.astype(np.int64)
+    composite = composite * size + np.arange(size, dtype=np.int64)
+
+    if k < size:
+        selected = np.argpartition(composite, k - 1)[:k]
+        return selected[np.argsort(composite[selected])].tolist()
+    return np.argsort(composite).tolist()
@@ -0,0 +1,148 @@
+from __future__ import annotations
+
+from typing import Any
+
+import numpy as np
+
+from app.repositories.product_repository import CatalogSnapshot
+from app.services.catalog.columns import ProductColumns
+
+
+FACET_FIELDS = ("category", "brand", "status", "color", "size")
+
+
+def _normalize(value: Any) -> str:
+    return str(value or "").strip().lower()
+
+
+class FacetIndex:
+    """Inverted index over one catalog snapshot.
+
+    Postings hold snapshot positions, which follow the snapshot's name order,
+    so intersecting them yields candidates in the same order a full scan would.
+    Color and size are indexed per variant, including their combination.
+    Price ranges are applied as vectorized masks over the columnar view.
+    """
+
+    def __init__(self, snapshot: CatalogSnapshot) -> None:
+        self.snapshot = snapshot
+        self.version = snapshot.version
+        self._products = snapshot.products
+        self.columns = ProductColumns(self._products)
+        postings: dict[str, dict[str, list[int]]] = {name: {} for name in FACET_FIELDS}
+        variant_pairs: dict[tuple[str, str], list[int]] = {}
+
+        for position, item in enumerate(self._products):
+            status = str(item.get("status", "active")).strip().lower()
+            postings["status"].setdefault(status, []).append(position)
+            postings["category"].setdefault(_normalize(item.get("category")), []).append(position)
+            postings["brand"].setdefault(_normalize(item.get("brand")), []).append(position)
+
+            variants = item.get("variants", [])
+            colors: set[str] = set()
+            sizes: set[str] = set()
+            pairs: set[tuple[str, str]] = set()
+            if isinstance(variants, list):
+                for variant in variants:
+                    if not isinstance(variant, dict):
+                        continue
+                    color = _normalize(variant.get("color"))
+                    size = _normalize(variant.get("size"))
+                    colors.add(color)
+                    sizes.add(size)
+                    pairs.add((color, size))
+            for color in colors:
+                if color:
+                    postings["color"].setdefault(color, []).append(position)
+            for size in sizes:
+                if size:
+                    postings["size"].setdefault(size, []).append(position)
+            for pair in pairs:
+                variant_pairs.setdefault(pair, []).append(position)
+
+        self._postings = postings
+        self._variant_pairs = variant_pairs
+        self._position_by_id = {str(item.get("id", "")): position for position, item in enumerate(self._products)}
+
+    def postings(self, facet: str, value: str) -> list[int]:
+        return self._postings.get(facet, {}).get(_normalize(value), [])
+
+    def positions_of(self, products: list[dict[str, Any]]) -> list[int]:
+        """Snapshot positions of ``products`` (in their order), for ranking over :attr:`columns`."""
+        return [self._position_by_id[str(item.get("id", ""))] for item in products]
+
+    def values(self, facet: str) -> list[str]:
+        return sorted(value for value in self._postings.get(facet, {}) if value)
+
+    def filter(
+        self,
+        *,
+        category: str | None = None,
+        brand: str | None = None,
+        status: str | None = "active",
+        color: str | None = None,
+        size: str | None = None,
+        min_price: float | None = None,
+        max_price: float | None = None,
+    ) -> list[dict[str, Any]]:
+        positions = self.filter_positions(
+            category=category,
+            brand=brand,
+            status=status,
+            color=color,
+            size=size,
+            min_price=min_price,
+            max_price=max_price,
+        )
+        return [self._products[position] for position in positions]
+
+    def filter_positions(
+        self,
+        *,
+        category: str | None = None,
+        brand: str | None = None,
+        status: str | None = "active",
+        color: str | None = None,
+        size: str | None = None,
+        min_price: float | None = None,
+        max_price: float | None = None,
+    ) -> list[int]:
+        requested = {
+            "status": _normalize(status),
+            "category": _normalize(category),
+            "brand": _normalize(brand),
+            "color": _normalize(color),
+            "size": _normalize(size),
+        }
+        if requested["category"] == "all":
+            requested["category"] = ""
+
+        if requested["color"] and requested["size"]:
+            # Both constraints must hold on the same variant, not on two different ones.
+            pair = (requested.pop("color"), requested.pop("size"))
+            lists = [self._variant_pairs.get(pair, [])]
+        else:
+            lists = []
+        lists.extend(self.postings(facet, value) for facet, value in requested.items() if value)
+        has_price = min_price is not None or max_price is not None
+
+        if not lists and not has_price:
+            return list(range(len(self._products)))
+
+        selected: set[int] | None = None
+        for posting in sorted(lists, key=len):
+            if not posting:
+                return []
+            selected = set(posting) if selected is None else selected.intersection(posting)
+            if not selected:
+                return []
+
+        if has_price:
+            if selected is None:
+                mask = self.columns.price_mask(min_price=min_price, max_price=max_price)
+                return np.flatnonzero(mask).tolist()
+            positions = np.fromiter(selected, dtype=np.int64, count=len(selected))
+            positions = self.columns.within_price(positions, min_price=min_price, max_price=max_price)
+            return np.sort(positions).tolist()
+
+        return sorted(selected or ())
@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+import hashlib
+import json
+from collections import OrderedDict
+from copy import deepcopy
+from threading import Lock
+from typing import Any
+
+from app.infrastructure.observability import MetricsCollector
+from app.infrastructure.persistence_clients import RedisClientManager
+
+
+class SearchResultCache:
+    """Bounded LRU of product listing pages with an optional Redis second tier.
+
+    Keys embed the catalog version, so any product write moves readers onto a
+    fresh key space; stale entries simply age out of the LRU and Redis TTL.
+    """
+
+    def __init__(
+        self,
+        *,
+        redis_manager: RedisClientManager | None = None,
+        metrics_collector: MetricsCollector | None = None,
+        max_entries: int = 512,
+        ttl_seconds: int = 300,
+    ) -> None:
+        self.redis_manager = redis_manager
+        self.metrics_collector = metrics_collector
+        self.max_entries = max(0, int(max_entries))
+        self.ttl_seconds = max(1, int(ttl_seconds))
+        self._lock = Lock()
+        self._entries: OrderedDict[str, dict[str, Any]] = OrderedDict()
+
+    @staticmethod
+    def key(*, version: int, **filters: Any) -> str:
+        payload = json.dumps(filters, sort_keys=True, default=str)
+        digest = hashlib.sha1(payload.encode("utf-8")).hexdigest()
+        return f"search:v{int(version)}:{digest}"
+
+    def get(self, key: str) -> dict[str, Any] | None:
+        if self.max_entries == 0:
+            return None
+        with self._lock:
+            cached = self._entries.get(key)
+            if cached is not None:
+                self._entries.move_to_end(key)
+        if cached is not None:
+            self._record(tier="l1", hit=True)
+            return deepcopy(cached)
+        self._record(tier="l1", hit=False)
+
+        client = self._redis_client()
+        if client is None:
+            return None
+        payload = client.get(key)
+        if isinstance(payload, bytes):
+            payload = payload.decode("utf-8")
+        decoded: Any = None
+        if payload:
+            try:
+                decoded = json.loads(payload)
+            except json.JSONDecodeError:
+                decoded = None
+        if not isinstance(decoded, dict):
+            self._record(tier="l2", hit=False)
+            return None
+        self._record(tier="l2", hit=True)
+        self._remember(key, decoded)
+        return deepcopy(decoded)
+
+    def put(self, key: str, value: dict[str, Any]) -> None:
+        if self.max_entries == 0:
+            return
+        stored = deepcopy(value)
+        self._remember(key, stored)
+        client = self._redis_client()
+        if client is None:
+            return
+        client.set(key, json.dumps(stored), ex=self.ttl_seconds)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _remember(self, key: str, value: dict[str, Any]) -> None:
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def _redis_client(self) -> Any | None:
+        if self.redis_manager is None:
+            return None
+        return self.redis_manager.client
+
+    def _record(self, *, tier: str, hit: bool) -> None:
+        if self.metrics_collector is None:
+            return
+        self.metrics_collector.record_search_cache(tier=tier, hit=hit)
@@ -0,0 +1,195 @@
+from __future__ import annotations
+
+from threading import RLock
+from typing import Any
+
+from app.infrastructure.observability import MetricsCollector, RequestTimer
+
+
+def document_text(item: dict[str, Any]) -> str:
+    tags = item.get("tags", [])
+    features = item.get("features", [])
+    tag_text = " ".join(str(token) for token in tags) if isinstance(tags, list) else ""
+    feature_text = " ".join(str(token) for token in features) if isinstance(features, list) else ""
+    return (
+        f"{item.get('name', '')} {item.get('description', '')} {item.get('brand', '')} "
+        f"{tag_text} {feature_text}"
+    ).lower()
+
+
+class ProductSearchIndex:
+    """Long-lived TF-IDF index over the product catalog.
+
+    The vectorizer is fitted once on the whole catalog and single documents are
+    re-transformed on writes, so a query costs one transform plus a sparse dot
+    product. The vocabulary is refitted once enough documents have drifted.
+    """
+
+    def __init__(
+        self,
+        *,
+        metrics_collector: MetricsCollector | None = None,
+        refit_drift_ratio: float = 0.2,
+        min_refit_drift: int = 25,
+    ) -> None:
+        self.metrics_collector = metrics_collector
+        self.refit_drift_ratio = max(0.0, float(refit_drift_ratio))
+        self.min_refit_drift = max(1, int(min_refit_drift))
+        self._lock = RLock()
+        self._built = False
+        self._vectorizer: Any = None
+        self._texts: dict[str, str] = {}
+        self._signatures: dict[str, str] = {}
+        self._rows: dict[str, Any] = {}
+        self._matrix: Any = None
+        self._positions: dict[str, int] = {}
+        self._drift = 0
+
+    @property
+    def built(self) -> bool:
+        return self._built
+
+    @property
+    def size(self) -> int:
+        return len(self._texts)
+
+    def rebuild(self, products: list[dict[str, Any]]) -> None:
+        timer = RequestTimer.start()
+        with self._lock:
+            self._texts = {}
+            self._signatures = {}
+            for item in products:
+                product_id = str(item.get("id", "")).strip()
+                if not product_id:
+                    continue
+                self._texts[product_id] = document_text(item)
+                self._signatures[product_id] = self._signature(item)
+            self._fit()
+            self._built = True
+            documents = len(self._texts)
+        self._record(operation="build", timer=timer, documents=documents)
+
+    def upsert(self, product: dict[str, Any]) -> None:
+        product_id = str(product.get("id", "")).strip()
+        if not product_id:
+            return
+        timer = RequestTimer.start()
+        with self._lock:
+            self._upsert_locked([product])
+            documents = len(self._texts)
+        self._record(operation="refresh", timer=timer, documents=documents)
+
+    def remove(self, product_id: str) -> None:
+        timer = RequestTimer.start()
+        with self._lock:
+            if self._texts.pop(product_id, None) is None:
+                return
+            self._signatures.pop(product_id, None)
+            self._rows.pop(product_id, None)
+            self._matrix = None
+            documents = len(self._texts)
+        self._record(operation="refresh", timer=timer, documents=documents)
+
+    def rank(self, query: str, candidates: list[dict[str, Any]]) -> list[dict[str, Any]] | None:
+        """Order candidates by TF-IDF similarity to the query.
+
+        Returns None when no vectorizer is available so callers can fall back
+        to basic substring matching.
+        """
+        normalized_query = query.strip().lower()
+        if not candidates:
+            return []
+
+        with self._lock:
+            stale = [
+                item
+                for item in candidates
+                if self._signatures.get(str(item.get("id", ""))) != self._signature(item)
+            ]
+            if stale:
+                timer = RequestTimer.start()
+                self._upsert_locked(stale)
+                self._record(operation="refresh", timer=timer, documents=len(self._texts))
+            if self._vectorizer is None:
+                return None
+            if self._matrix is None:
+                self._stack_rows()
+            vectorizer = self._vectorizer
+            matrix = self._matrix
+            positions = [self._positions[str(item.get("id", ""))] for item in candidates]
+            texts = [self._texts[str(item.get("id", ""))] for item in candidates]
+
+        query_vector = vectorizer.transform([normalized_query])
+        similarities = (matrix[positions] @ query_vector.T).toarray().ravel()
+
+        scored: list[tuple[float, dict[str, Any]]] = []
+        for index, score in enumerate(similarities):
+            if score > 0.0 or normalized_query in texts[index]:
+                scored.append((float(score), candidates[index]))
+        scored.sort(key=lambda pair: pair[0], reverse=True)
+        return [item for _, item in scored]
+
+    def _upsert_locked(self, products: list[dict[str, Any]]) -> None:
+        changed: list[str] = []
+        for item in products:
+            product_id = str(item.get("id", "")).strip()
+            if not product_id:
+                continue
+            self._texts[product_id] = document_text(item)
+            self._signatures[product_id] = self._signature(item)
+            changed.append(product_id)
+        if not changed:
+            return
+
+        self._drift += len(changed)
+        threshold = max(self.min_refit_drift, int(len(self._texts) * self.refit_drift_ratio))
+        if self._vectorizer is None or self._drift >= threshold:
+            self._fit()
+            return
+
+        transformed = self._vectorizer.transform([self._texts[product_id] for product_id in changed])
+        for offset, product_id in enumerate(changed):
+            self._rows[product_id] = transformed[offset]
+        self._matrix = None
+
+    def _fit(self) -> None:
+        self._rows = {}
+        self._matrix = None
+        self._positions = {}
+        self._vectorizer = None
+        self._drift = 0
+        if not self._texts:
+            return
+        try:
+            from sklearn.feature_extraction.text import TfidfVectorizer
+
+            vectorizer = TfidfVectorizer(stop_words="english")
+            product_ids = list(self._texts.keys())
+            matrix = vectorizer.fit_transform([self._texts[product_id] for product_id in product_ids])
+        except Exception:
+            return
+        self._vectorizer = vectorizer
+        self._matrix = matrix.tocsr()
+        self._positions = {product_id: index for index, product_id in enumerate(product_ids)}
+        self._rows = {product_id: self._matrix[index] for index, product_id in enumerate(product_ids)}
+
+    def _stack_rows(self) -> None:
+        from scipy.sparse import vstack
+
+        product_ids = list(self._rows.keys())
+        self._matrix = vstack([self._rows[product_id] for product_id in product_ids]).tocsr()
+        self._positions = {product_id: index for index, product_id in enumerate(product_ids)}
+
+    def _record(self, *, operation: str, timer: RequestTimer, documents: int) -> None:
+        if self.metrics_collector is None:
+            return
+        self.metrics_collector.record_search_index(
+            operation=operation,
+            duration_ms=timer.elapsed_ms(),
+            documents=documents,
+        )
+
+    @staticmethod
+    def _signature(item: dict[str, Any]) -> str:
+        updated_at = str(item.get("updatedAt") or "").strip()
+        return updated_at or document_text(item)
@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+import heapq
+import re
+from array import array
+from bisect import bisect_left
+from typing import Any
+
+from app.repositories.product_repository import CatalogSnapshot
+
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def _normalize(value: Any) -> str:
+    return _WHITESPACE.sub(" ", str(value or "")).strip().lower()
+
+
+class SuggestionIndex:
+    """Prefix index of product names, brands, categories and tags.
+
+    Suggestions are ranked by popularity once, at build time. Every word start
+    of a suggestion's text is stored as one entry of a sorted key array with
+    the suggestion's rank alongside, so the entries matching a prefix are one
+    contiguous ``bisect`` range. Prefixes up to ``head_depth`` characters,
+    whose ranges span most of the catalog, get their best ``max_results``
+    ranks precomputed; longer ones pick the best ranks out of their range.
+    """
+
+    def __init__(self, snapshot: CatalogSnapshot, *, max_results: int = 10, head_depth: int = 2) -> None:
+        self.snapshot = snapshot
+        self.max_results = max(1, int(max_results))
+        self.head_depth = max(0, int(head_depth))
+        self._suggestions: list[dict[str, Any]] = []
+        self._heads: dict[str, list[int]] = {}
+
+        weights: dict[tuple[str, str], float] = {}
+        labels: dict[tuple[str, str], dict[str, Any]] = {}
+        for item in snapshot.products:
+            if (_normalize(item.get("status", "active")) or "active") != "active":
+                continue
+            popularity = self._popularity(item)
+            name = str(item.get("name", "")).strip()
+            if name:
+                key = ("product", str(item.get("id", "")))
+                weights[key] = popularity
+                labels[key] = {"text": name, "type": "product", "productId": str(item.get("id", ""))}
+            terms = [("brand", item.get("brand")), ("category", item.get("category"))]
+            tags = item.get("tags", [])
+            if isinstance(tags, list):
+                terms.extend(("tag", tag) for tag in tags)
+            for kind, raw in terms:
+                text = str(raw or "").strip()
+                if not text:
+                    continue
+                key = (kind, _normalize(text))
+                weights[key] = weights.get(key, 0.0) + popularity
+                labels.setdefault(key, {"text": text, "type": kind})
+
+        # Walk suggestions in rank order so every head list is already sorted and capped.
+        ranked = sorted(weights, key=lambda key: (-weights[key], _normalize(labels[key]["text"]), key))
+        entries: list[tuple[str, int]] = []
+        for rank, key in enumerate(ranked):
+            self._suggestions.append(labels[key])
+            text = _normalize(labels[key]["text"])
+            for start in [0] + [match.end() for match in _WHITESPACE.finditer(text)]:
+                suffix = text[start:]
+                entries.append((suffix, rank))
+                for depth in range(1, min(self.head_depth, len(suffix)) + 1):
+                    head = self._heads.setdefault(suffix[:depth], [])
+                    if len(head) < self.max_results and (not head or head[-1] != rank):
+                        head.append(rank)
+        entries.sort()
+        self._keys = [suffix for suffix, _ in entries]
+        self._ranks = array("I", (rank for _, rank in entries))
+
+    @property
+    def size(self) -> int:
+        return len(self._suggestions)
+
+    def suggest(self, prefix: str, *, limit: int = 8) -> list[dict[str, Any]]:
+        normalized = _normalize(prefix)
+        limit = min(max(0, int(limit)), self.max_results)
+        if not normalized or not limit:
+            return []
+        if len(normalized) <= self.head_depth:
+            ranks = self._heads.get(normalized, [])[:limit]
+        else:
+            start = bisect_left(self._keys, normalized)
+            end = bisect_left(self._keys, normalized + "\uffff", start)
+            ranks = heapq.nsmallest(limit, set(self._ranks[start:end]))
+        return [dict(self._suggestions[rank]) for rank in ranks]
+
+    @staticmethod
+    def _popularity(item: dict[str, Any]) -> float:
+        try:
+            reviews = max(0, int(item.get("reviewCount", 0)))
+        except (TypeError, ValueError):
+            reviews = 0
+        try:
+            rating = max(0.0, float(item.get("rating", 0.0)))
+        except (TypeError, ValueError):
+            rating = 0.0
+        return (1 + reviews) * (1.0 + rating)
@@ -88,8 +88,8 @@ class CategoryService:
 
         if next_slug != str(existing.get("slug", "")):
             active_products = [
-                product
-                for product in self.product_repository.list_all()
+                deepcopy(product)
+                for product in self.product_repository.snapshot().products
                 if str(product.get("category", "")).strip().lower()
                 == str(existing.get("slug", "")).strip().lower()
             ]
@@ -115,7 +115,7 @@ class CategoryService:
         slug = str(existing.get("slug", "")).strip().lower()
         in_use = [
             product
-            for product in self.product_repository.list_all()
+            for product in self.product_repository.snapshot().products
             if str(product.get("category", "")).strip().lower() == slug
         ]
         if in_use:
@@ -1,8 +1,10 @@
 from __future__ import annotations
 
 from copy import deepcopy
+from collections.abc import Hashable
 from typing import Any
 
+from app.infrastructure.write_behind import WriteBehindQueue
 from app.repositories.interaction_repository import InteractionRepository
 from app.core.utils import generate_id, iso_now
 
@@ -11,8 +13,12 @@ class InteractionService:
     def __init__(
         self,
         interaction_repository: InteractionRepository,
+        write_behind: WriteBehindQueue | None = None,
     ) -> None:
         self.interaction_repository = interaction_repository
+        self.write_behind = write_behind
+        if write_behind is not None:
+            write_behind.register("interaction", self._write_batch)
 
     def record(
         self,
@@ -24,24 +30,78 @@ class InteractionService:
         agent: str,
         response: dict[str, Any],
     ) -> dict[str, Any]:
-        payload = {
-            "id": generate_id("msg"),
-            "sessionId": session_id,
-            "userId": user_id,
-            "message": message,
-            "intent": intent,
-            "agent": agent,
-            "response": response,
-            "timestamp": iso_now(),
-        }
+        payload = self._payload(
+            session_id=session_id,
+            user_id=user_id,
+            message=message,
+            intent=intent,
+            agent=agent,
+            response=response,
+        )
+        self._settle(session_id)
         self.interaction_repository.create(payload)
         return deepcopy(payload)
 
+    def record_later(
+        self,
+        *,
+        session_id: str,
+        user_id: str | None,
+        message: str,
+        intent: str,
+        agent: str,
+        response: dict[str, Any],
+    ) -> dict[str, Any]:
+        """Like :meth:`record`, but queued on the write-behind queue when there is room."""
+        payload = self._payload(
+            session_id=session_id,
+            user_id=user_id,
+            message=message,
+            intent=intent,
+            agent=agent,
+            response=response,
+        )
+        if self.write_behind is None or not self.write_behind.submit("interaction", session_id, payload):
+            self._settle(session_id)
+            self.interaction_repository.create(payload)
+        return deepcopy(payload)
+
     def recent(self, *, session_id: str, limit: int = 12) -> list[dict[str, Any]]:
+        self._settle(session_id)
         return self.interaction_repository.recent(session_id=session_id, limit=limit)
 
     def history_for_session(self, *, session_id: str, limit: int = 50) -> list[dict[str, Any]]:
+        self._settle(session_id)
         return self.interaction_repository.list_for_session(session_id=session_id, limit=limit)
 
     def history_for_user(self, *, user_id: str, limit: int = 100) -> list[dict[str, Any]]:
+        self._settle(None)
         return self.interaction_repository.list_for_user(user_id=user_id, limit=limit)
+
+    def _payload(
+        self,
+        *,
+        session_id: str,
+        user_id: str | None,
+        message: str,
+        intent: str,
+        agent: str,
+        response: dict[str, Any],
+    ) -> dict[str, Any]:
+        return {
+            "id": generate_id("msg"),
+            "sessionId": session_id,
+            "userId": user_id,
+            "message": message,
+            "intent": intent,
+            "agent": agent,
+            "response": response,
+            "timestamp": iso_now(),
+        }
+
+    def _write_batch(self, items: list[tuple[Hashable, Any]]) -> None:
+        self.interaction_repository.create_many([payload for _, payload in items])
+
+    def _settle(self, session_id: str | None) -> None:
+        if self.write_behind is not None:
+            self.write_behind.settle("interaction", session_id)
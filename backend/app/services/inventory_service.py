@@ -54,11 +54,12 @@ class InventoryService:
         Returns reservation snapshots used to rollback on payment failure.
         """
         reservations: list[dict[str, Any]] = []
+        stocks = self.inventory_repository.get_many(str(item["variantId"]) for item in items)
         # Validate all items first.
         for item in items:
             variant_id = item["variantId"]
             quantity = int(item["quantity"])
-            stock = self.inventory_repository.get(variant_id)
+            stock = stocks.get(str(variant_id))
             if not stock:
                 raise HTTPException(
                     status_code=409,
@@ -70,16 +71,11 @@ class InventoryService:
                     detail=f"Insufficient inventory for variant {variant_id}",
                 )
 
-        # Reserve quantities.
+        # Reserve quantities; repeated variants keep mutating the same stock row.
         for item in items:
             variant_id = item["variantId"]
             quantity = int(item["quantity"])
-            stock = self.inventory_repository.get(variant_id)
-            if not stock:
-                raise HTTPException(
-                    status_code=409,
-                    detail=f"Inventory not found for variant {variant_id}",
-                )
+            stock = stocks[str(variant_id)]
             snapshot = {
                 "variantId": variant_id,
                 "reservedQuantity": stock["reservedQuantity"],
@@ -95,10 +91,11 @@ class InventoryService:
         return reservations
 
     def commit_reservation(self, items: list[dict[str, Any]]) -> None:
+        stocks = self.inventory_repository.get_many(str(item["variantId"]) for item in items)
         for item in items:
             variant_id = item["variantId"]
             quantity = int(item["quantity"])
-            stock = self.inventory_repository.get(variant_id)
+            stock = stocks.get(str(variant_id))
             if not stock:
                 continue
             stock["reservedQuantity"] = max(0, stock["reservedQuantity"] - quantity)
@@ -108,9 +105,10 @@ class InventoryService:
             self._sync_variant_stock_flag(variant_id=variant_id, available=stock["availableQuantity"])
 
     def rollback_reservation(self, snapshots: list[dict[str, Any]]) -> None:
+        stocks = self.inventory_repository.get_many(str(snapshot["variantId"]) for snapshot in snapshots)
         for snapshot in snapshots:
             variant_id = snapshot["variantId"]
-            stock = self.inventory_repository.get(variant_id)
+            stock = stocks.get(str(variant_id))
             if not stock:
                 continue
             stock["reservedQuantity"] = snapshot["reservedQuantity"]
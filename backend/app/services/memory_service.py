@@ -1,15 +1,20 @@
 from __future__ import annotations
 
+from collections.abc import Hashable
 from copy import deepcopy
 from typing import Any
 
+from app.infrastructure.write_behind import WriteBehindQueue
 from app.repositories.memory_repository import MemoryRepository
-from app.core.utils import iso_now
+from app.core.utils import generate_id, iso_now
 
 
 class MemoryService:
-    def __init__(self, memory_repository: MemoryRepository) -> None:
+    def __init__(self, memory_repository: MemoryRepository, write_behind: WriteBehindQueue | None = None) -> None:
         self.memory_repository = memory_repository
+        self.write_behind = write_behind
+        if write_behind is not None:
+            write_behind.register("memory", self._write_interaction_batch)
 
     def _default_memory(self) -> dict[str, Any]:
         return {
@@ -33,6 +38,10 @@ class MemoryService:
         }
 
     def get_memory_snapshot(self, user_id: str) -> dict[str, Any]:
+        self._settle(user_id)
+        return self._load_snapshot(user_id)
+
+    def _load_snapshot(self, user_id: str) -> dict[str, Any]:
         payload = self.memory_repository.get(user_id)
         if payload is None:
             payload = self._default_memory()
@@ -122,6 +131,7 @@ class MemoryService:
         return {"success": True}
 
     def clear_memory(self, *, user_id: str) -> dict[str, Any]:
+        self._settle(user_id)
         payload = self._default_memory()
         payload["updatedAt"] = iso_now()
         self.memory_repository.upsert(user_id, payload)
@@ -173,22 +183,73 @@ class MemoryService:
         intent: str,
         message: str,
         response: dict[str, Any],
+        message_id: str | None = None,
     ) -> None:
         if not user_id:
             return
         payload = self.get_memory_snapshot(user_id)
+        self._apply_interaction(payload, intent=intent, message=message, response=response, message_id=message_id)
+        self.memory_repository.upsert(user_id, payload)
+
+    def record_interaction_later(
+        self,
+        *,
+        user_id: str | None,
+        intent: str,
+        message: str,
+        response: dict[str, Any],
+        message_id: str | None = None,
+    ) -> None:
+        """Like :meth:`record_interaction`, but queued on the write-behind queue when there is room."""
+        if not user_id:
+            return
+        entry = {
+            "intent": intent,
+            "message": message,
+            "response": response,
+            "message_id": message_id or generate_id("msg"),
+        }
+        if self.write_behind is None or not self.write_behind.submit("memory", user_id, entry):
+            self.record_interaction(user_id=user_id, **entry)
+
+    def _write_interaction_batch(self, items: list[tuple[Hashable, Any]]) -> None:
+        # One read and one write per user, however many messages they sent. A
+        # retried batch skips messages whose history entry already landed, so
+        # history and affinity counts are not applied twice.
+        payloads: dict[str, dict[str, Any]] = {}
+        applied: dict[str, set[Any]] = {}
+        for user_id, entry in items:
+            key = str(user_id)
+            if key not in payloads:
+                payloads[key] = self._load_snapshot(key)
+                applied[key] = {item.get("messageId") for item in payloads[key].get("interactionHistory", [])}
+            if entry.get("message_id") in applied[key]:
+                continue
+            self._apply_interaction(payloads[key], **entry)
+        self.memory_repository.upsert_many(payloads)
+
+    def _apply_interaction(
+        self,
+        payload: dict[str, Any],
+        *,
+        intent: str,
+        message: str,
+        response: dict[str, Any],
+        message_id: str | None = None,
+    ) -> None:
         history = payload["interactionHistory"]
-        history.append(
-            {
-                "type": intent,
-                "timestamp": iso_now(),
-                "summary": {
-                    "query": message[:180],
-                    "action": intent,
-                    "response": str(response.get("message", ""))[:180],
-                },
-            }
-        )
+        record: dict[str, Any] = {
+            "type": intent,
+            "timestamp": iso_now(),
+            "summary": {
+                "query": message[:180],
+                "action": intent,
+                "response": str(response.get("message", ""))[:180],
+            },
+        }
+        if message_id:
+            record["messageId"] = message_id
+        history.append(record)
         payload["interactionHistory"] = history[-200:]
         affinities = payload.setdefault(
             "productAffinities",
@@ -229,13 +290,17 @@ class MemoryService:
                 brand_scores[brand] = int(brand_scores.get(brand, 0)) + 1
 
         payload["updatedAt"] = iso_now()
-        self.memory_repository.upsert(user_id, payload)
 
     def get_history(self, *, user_id: str, limit: int = 20) -> dict[str, Any]:
+        self._settle(user_id)
         payload = self.memory_repository.get(user_id) or {}
         history = payload.get("interactionHistory", [])
         return {"history": deepcopy(history[-max(1, min(limit, 100)) :])}
 
+    def _settle(self, user_id: str) -> None:
+        if self.write_behind is not None:
+            self.write_behind.settle("memory", user_id)
+
     def _ensure_preferences(self, payload: Any) -> dict[str, Any]:
         defaults = self._default_memory()["preferences"]
         if not isinstance(payload, dict):
@@ -1,13 +1,19 @@
 from __future__ import annotations
 
+import asyncio
 from copy import deepcopy
-from typing import Any
+from threading import Lock, Thread
+from typing import Any, Iterable, Mapping
 
 from fastapi import HTTPException
 
 from app.repositories.category_repository import CategoryRepository
 from app.repositories.inventory_repository import InventoryRepository
-from app.repositories.product_repository import ProductRepository
+from app.repositories.product_repository import CatalogSnapshot, ProductRepository
+from app.services.catalog.facets import FacetIndex
+from app.services.catalog.result_cache import SearchResultCache
+from app.services.catalog.search_index import ProductSearchIndex
+from app.services.catalog.suggest import SuggestionIndex
 from app.core.utils import generate_id, iso_now
 
 
@@ -17,10 +23,24 @@ class ProductService:
         product_repository: ProductRepository,
         category_repository: CategoryRepository,
         inventory_repository: InventoryRepository,
+        search_index: ProductSearchIndex | None = None,
+        result_cache: SearchResultCache | None = None,
     ) -> None:
         self.product_repository = product_repository
         self.category_repository = category_repository
         self.inventory_repository = inventory_repository
+        self.search_index = search_index or ProductSearchIndex()
+        self.result_cache = result_cache if result_cache is not None else SearchResultCache(max_entries=0)
+        self._facet_index: FacetIndex | None = None
+        self._facet_lock = Lock()
+        self._suggestions: SuggestionIndex | None = None
+        self._suggest_lock = Lock()
+        self._suggest_rebuilding = False
+
+    def warm_search_index(self) -> None:
+        snapshot = self.product_repository.snapshot()
+        self.search_index.rebuild(list(snapshot.products))
+        self._suggestions = SuggestionIndex(snapshot)
 
     def list_products(
         self,
@@ -31,107 +51,351 @@ class ProductService:
         max_price: float | None,
         page: int,
         limit: int,
+        color: str | None = None,
+        size: str | None = None,
+        affinities: Mapping[str, Any] | None = None,
+    ) -> dict[str, Any]:
+        """One page of active products matching the filters and query.
+
+        With ``affinities`` (a memory ``productAffinities`` payload) the whole
+        match set is ordered by the shopper's product, category and brand
+        weights before paginating; such pages are personal, so not cached.
+        """
+        normalized_query = (query or "").strip().lower()
+        safe_page = max(1, page)
+        safe_limit = min(100, max(1, limit))
+        weights = self._affinity_weights(affinities)
+        if weights is not None:
+            return self._query_products(
+                normalized_query=normalized_query,
+                category=category,
+                brand=brand,
+                color=color,
+                size=size,
+                min_price=min_price,
+                max_price=max_price,
+                page=safe_page,
+                limit=safe_limit,
+                version=self.product_repository.catalog_version,
+                weights=weights,
+            )[0]
+
+        version = self.product_repository.catalog_version
+        cache_key = self._cache_key(
+            version=version,
+            query=normalized_query,
+            category=category,
+            brand=brand,
+            color=color,
+            size=size,
+            min_price=min_price,
+            max_price=max_price,
+            page=safe_page,
+            limit=safe_limit,
+        )
+        cached = self.result_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        result, source_version = self._query_products(
+            normalized_query=normalized_query,
+            category=category,
+            brand=brand,
+            color=color,
+            size=size,
+            min_price=min_price,
+            max_price=max_price,
+            page=safe_page,
+            limit=safe_limit,
+            version=version,
+        )
+        if source_version == version:
+            # Only cache pages built from the version they are keyed under.
+            self.result_cache.put(cache_key, result)
+        return result
+
+    async def alist_products(
+        self,
+        query: str | None,
+        category: str | None,
+        brand: str | None,
+        min_price: float | None,
+        max_price: float | None,
+        page: int,
+        limit: int,
+        color: str | None = None,
+        size: str | None = None,
+        affinities: Mapping[str, Any] | None = None,
     ) -> dict[str, Any]:
+        """:meth:`list_products` for event-loop callers.
+
+        Cache hits and pushed-down browse pages use the asyncio Redis and Mongo
+        clients; text search ranks against the in-memory snapshot, which may
+        need a reload, so it runs on a worker thread.
+        """
         normalized_query = (query or "").strip().lower()
-        normalized_category = (category or "").strip().lower()
-        normalized_brand = (brand or "").strip().lower()
         safe_page = max(1, page)
         safe_limit = min(100, max(1, limit))
+        weights = self._affinity_weights(affinities)
+        if weights is not None:
+            result, _ = await asyncio.to_thread(
+                self._query_products,
+                normalized_query=normalized_query,
+                category=category,
+                brand=brand,
+                color=color,
+                size=size,
+                min_price=min_price,
+                max_price=max_price,
+                page=safe_page,
+                limit=safe_limit,
+                version=await self.product_repository.acatalog_version(),
+                weights=weights,
+            )
+            return result
 
-        products = self.product_repository.list_all()
-
-        # Phase 1: Hard Filtering (Category, Brand, Price, Status)
-        def hard_filter(item: dict[str, Any]) -> bool:
-            status = str(item.get("status", "active")).strip().lower()
-            if status not in {"active"}:
-                return False
-            if normalized_category and normalized_category != "all" and str(item["category"]).lower() != normalized_category:
-                return False
-            if normalized_brand and str(item.get("brand", "")).lower() != normalized_brand:
-                return False
-            if min_price is not None and item["price"] < min_price:
-                return False
-            if max_price is not None and item["price"] > max_price:
-                return False
-            return True
-
-        candidates = [item for item in products if hard_filter(item)]
+        version = await self.product_repository.acatalog_version()
+        cache_key = self._cache_key(
+            version=version,
+            query=normalized_query,
+            category=category,
+            brand=brand,
+            color=color,
+            size=size,
+            min_price=min_price,
+            max_price=max_price,
+            page=safe_page,
+            limit=safe_limit,
+        )
+        cached = self.result_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        pushed_down = None
+        if not normalized_query:
+            pushed_down = await self.product_repository.afind_page(
+                category=category,
+                brand=brand,
+                color=color,
+                size=size,
+                min_price=min_price,
+                max_price=max_price,
+                skip=(safe_page - 1) * safe_limit,
+                limit=safe_limit,
+            )
+        if pushed_down is not None:
+            page_items, total = pushed_down
+            result = self._page_payload(page_items, page=safe_page, limit=safe_limit, total=total)
+            source_version = version
+        else:
+            result, source_version = await asyncio.to_thread(
+                self._query_products,
+                normalized_query=normalized_query,
+                category=category,
+                brand=brand,
+                color=color,
+                size=size,
+                min_price=min_price,
+                max_price=max_price,
+                page=safe_page,
+                limit=safe_limit,
+                version=version,
+            )
+        if source_version == version:
+            self.result_cache.put(cache_key, result)
+        return result
+
+    def _cache_key(
+        self,
+        *,
+        version: int,
+        query: str,
+        category: str | None,
+        brand: str | None,
+        color: str | None,
+        size: str | None,
+        min_price: float | None,
+        max_price: float | None,
+        page: int,
+        limit: int,
+    ) -> str:
+        return self.result_cache.key(
+            version=version,
+            query=query,
+            category=str(category or "").strip().lower(),
+            brand=str(brand or "").strip().lower(),
+            color=str(color or "").strip().lower(),
+            size=str(size or "").strip().lower(),
+            min_price=None if min_price is None else float(min_price),
+            max_price=None if max_price is None else float(max_price),
+            page=page,
+            limit=limit,
+        )
+
+    def _query_products(
+        self,
+        *,
+        normalized_query: str,
+        category: str | None,
+        brand: str | None,
+        color: str | None,
+        size: str | None,
+        min_price: float | None,
+        max_price: float | None,
+        page: int,
+        limit: int,
+        version: int,
+        weights: tuple[Mapping[str, Any], Mapping[str, Any], Mapping[str, Any]] | None = None,
+    ) -> tuple[dict[str, Any], int]:
+        if not normalized_query and weights is None:
+            # Plain browse: let Mongo filter, sort and paginate over its indexes.
+            pushed_down = self.product_repository.find_page(
+                category=category,
+                brand=brand,
+                color=color,
+                size=size,
+                min_price=min_price,
+                max_price=max_price,
+                skip=(page - 1) * limit,
+                limit=limit,
+            )
+            if pushed_down is not None:
+                page_items, total = pushed_down
+                return self._page_payload(page_items, page=page, limit=limit, total=total), version
+
+        snapshot = self.product_repository.snapshot()
+        facets = self._facets_for(snapshot)
+
+        # Phase 1: Hard Filtering (Category, Brand, Variant, Price, Status) via the facet index
+        candidates = facets.filter(
+            category=category,
+            brand=brand,
+            status="active",
+            color=color,
+            size=size,
+            min_price=min_price,
+            max_price=max_price,
+        )
 
         if not candidates:
-            return {
-                "products": [],
-                "pagination": {
-                    "page": safe_page,
-                    "limit": safe_limit,
-                    "total": 0,
-                    "pages": 0,
-                },
-            }
+            return self._page_payload([], page=page, limit=limit, total=0), snapshot.version
 
         # Phase 2: Search (Semantic vs Basic)
         if normalized_query:
-            try:
-                from sklearn.feature_extraction.text import TfidfVectorizer
-                from sklearn.metrics.pairwise import cosine_similarity
-                import numpy as np
-
-                # Prepare corpus
-                corpus = []
-                for item in candidates:
-                    tags = item.get("tags", [])
-                    features = item.get("features", [])
-                    tag_text = " ".join(str(token) for token in tags) if isinstance(tags, list) else ""
-                    feature_text = " ".join(str(token) for token in features) if isinstance(features, list) else ""
-                    text = f"{item['name']} {item['description']} {item.get('brand', '')} {tag_text} {feature_text}".lower()
-                    corpus.append(text)
-
-                vectorizer = TfidfVectorizer(stop_words='english')
-                tfidf_matrix = vectorizer.fit_transform(corpus)
-                query_vec = vectorizer.transform([normalized_query])
-                
-                similarities = cosine_similarity(query_vec, tfidf_matrix).flatten()
-                
-                # Zip and filter by minimum similarity threshold (e.g. 0.05) 
-                # or just use it for ranking
-                scored_candidates = []
-                for idx, score in enumerate(similarities):
-                    # We keep items that have some overlap or if the name literally matches
-                    if score > 0.0 or normalized_query in corpus[idx]:
-                        scored_candidates.append((score, candidates[idx]))
-
-                # Sort by score descending
-                scored_candidates.sort(key=lambda x: x[0], reverse=True)
-                filtered = [item for _, item in scored_candidates]
-            except Exception:
-                # Fallback to basic search if scikit-learn fails
+            if not self.search_index.built:
+                self.search_index.rebuild(list(snapshot.products))
+            ranked = self.search_index.rank(normalized_query, candidates)
+            if ranked is None:
+                # Fallback to basic search if the TF-IDF index is unavailable
                 def basic_match(item: dict[str, Any]) -> bool:
                     haystack = f"{item['name']} {item.get('description', '')} {item.get('brand', '')}".lower()
                     return normalized_query in haystack
-                filtered = [item for item in candidates if basic_match(item)]
+                ranked = [item for item in candidates if basic_match(item)]
+            filtered = ranked
         else:
             filtered = candidates
 
         total = len(filtered)
-        start = (safe_page - 1) * safe_limit
-        end = start + safe_limit
-        page_items = filtered[start:end]
+        start = (page - 1) * limit
+        end = start + limit
+        if weights is not None and filtered:
+            # Phase 3: Personal order over every match (search order breaks ties), top-k up to this page.
+            product_scores, category_scores, brand_scores = weights
+            order = facets.columns.rank_by_affinity(
+                product_scores=product_scores,
+                category_scores=category_scores,
+                brand_scores=brand_scores,
+                rows=facets.positions_of(filtered),
+                limit=end,
+            )
+            filtered = [snapshot.products[position] for position in order]
+        page_items = deepcopy(filtered[start:end])
+        return self._page_payload(page_items, page=page, limit=limit, total=total), snapshot.version
+
+    @staticmethod
+    def _affinity_weights(
+        affinities: Mapping[str, Any] | None,
+    ) -> tuple[Mapping[str, Any], Mapping[str, Any], Mapping[str, Any]] | None:
+        """Product, category and brand weights, or None when there is nothing to personalize with."""
+        if not isinstance(affinities, Mapping):
+            return None
+        product_scores = affinities.get("products", {})
+        category_scores = affinities.get("categories", {})
+        brand_scores = affinities.get("brands", {})
+        if not isinstance(product_scores, Mapping) or not isinstance(category_scores, Mapping):
+            return None
+        if not isinstance(brand_scores, Mapping):
+            brand_scores = {}
+        if not (product_scores or category_scores or brand_scores):
+            return None
+        return product_scores, category_scores, brand_scores
 
+    @staticmethod
+    def _page_payload(products: list[dict[str, Any]], *, page: int, limit: int, total: int) -> dict[str, Any]:
         return {
-            "products": page_items,
+            "products": products,
             "pagination": {
-                "page": safe_page,
-                "limit": safe_limit,
+                "page": page,
+                "limit": limit,
                 "total": total,
-                "pages": (total + safe_limit - 1) // safe_limit if total else 0,
+                "pages": (total + limit - 1) // limit if total else 0,
             },
         }
 
+    def _facets_for(self, snapshot: CatalogSnapshot) -> FacetIndex:
+        index = self._facet_index
+        if index is not None and index.snapshot is snapshot:
+            return index
+        with self._facet_lock:
+            index = self._facet_index
+            if index is None or index.snapshot is not snapshot:
+                index = FacetIndex(snapshot)
+                self._facet_index = index
+        return index
+
+    def suggest(self, prefix: str, *, limit: int = 8) -> dict[str, Any]:
+        index = self._suggestions_for(self.product_repository.snapshot())
+        return {"query": prefix, "suggestions": index.suggest(prefix, limit=limit)}
+
+    def _suggestions_for(self, snapshot: CatalogSnapshot) -> SuggestionIndex:
+        """The suggestion index; when the catalog moved, the stale one answers while a thread rebuilds it.
+
+        Only a cold start (nothing warmed at startup) builds on the request path.
+        """
+        index = self._suggestions
+        if index is None:
+            with self._suggest_lock:
+                index = self._suggestions
+                if index is None:
+                    index = self._suggestions = SuggestionIndex(snapshot)
+            return index
+        if index.snapshot is not snapshot:
+            self._rebuild_suggestions_later()
+        return index
+
+    def _rebuild_suggestions_later(self) -> None:
+        with self._suggest_lock:
+            if self._suggest_rebuilding:
+                return
+            self._suggest_rebuilding = True
+        Thread(target=self._rebuild_suggestions, name="suggestion-index", daemon=True).start()
+
+    def _rebuild_suggestions(self) -> None:
+        try:
+            self._suggestions = SuggestionIndex(self.product_repository.snapshot())
+        finally:
+            with self._suggest_lock:
+                self._suggest_rebuilding = False
+
     def get_product(self, product_id: str) -> dict[str, Any]:
         product = self.product_repository.get(product_id)
         if not product:
             raise HTTPException(status_code=404, detail="Product not found")
         return deepcopy(product)
 
+    def get_products(self, product_ids: Iterable[str]) -> dict[str, dict[str, Any]]:
+        return deepcopy(self.product_repository.get_many(product_ids))
+
     def create_product(self, payload: dict[str, Any]) -> dict[str, Any]:
         product_id = payload.get("id") or generate_id("prod")
         if self.product_repository.get(product_id):
@@ -163,6 +427,7 @@ class ProductService:
             raise HTTPException(status_code=400, detail="Invalid product status")
         self._sync_variant_inventory(product_id=product_id, variants=product["variants"], replace_existing=False)
         self.product_repository.create(product)
+        self.search_index.upsert(product)
 
         return deepcopy(product)
 
@@ -217,6 +482,7 @@ class ProductService:
             )
         product["updatedAt"] = iso_now()
         self.product_repository.update(product)
+        self.search_index.upsert(product)
         return deepcopy(product)
 
     def delete_product(self, product_id: str) -> None:
@@ -228,6 +494,7 @@ class ProductService:
             if variant_id:
                 self.inventory_repository.delete(variant_id)
         self.product_repository.delete(product_id)
+        self.search_index.remove(product_id)
 
     def list_categories(self) -> dict[str, Any]:
         rows = self.category_repository.list_all()
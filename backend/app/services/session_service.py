@@ -1,18 +1,27 @@
 from __future__ import annotations
 
+from collections.abc import Callable, Hashable
 from datetime import datetime, timedelta, timezone
+from threading import Lock
 from typing import Any
 
 from fastapi import HTTPException
 
+from app.infrastructure.write_behind import WriteBehindQueue
 from app.repositories.session_repository import SessionRepository
 from app.core.utils import generate_id, utc_now
 
 
 class SessionService:
-    def __init__(self, session_repository: SessionRepository) -> None:
+    def __init__(self, session_repository: SessionRepository, write_behind: WriteBehindQueue | None = None) -> None:
         self.session_repository = session_repository
+        self.write_behind = write_behind
         self._expiry_minutes = 30
+        # Sessions are stored whole, so every read-modify-write (including the
+        # write-behind conversation batch) holds this lock.
+        self._update_lock = Lock()
+        if write_behind is not None:
+            write_behind.register("conversation", self._write_conversation_batch)
 
     def create_session(
         self,
@@ -74,6 +83,8 @@ class SessionService:
         return self.session_repository.create(session)
 
     def get_session(self, session_id: str) -> dict[str, Any]:
+        if self.write_behind is not None:
+            self.write_behind.settle("conversation", session_id)
         session = self.session_repository.get(session_id)
         if not session:
             raise HTTPException(status_code=404, detail="Session not found")
@@ -86,19 +97,10 @@ class SessionService:
         self.session_repository.delete(session_id)
 
     def touch(self, session_id: str) -> None:
-        session = self.session_repository.get(session_id)
-        if not session:
-            return
-        self._mark_active(session)
-        self.session_repository.update(session)
+        self._modify(session_id, lambda session: None)
 
     def attach_user(self, session_id: str, user_id: str) -> None:
-        session = self.session_repository.get(session_id)
-        if not session:
-            return
-        session["userId"] = user_id
-        self._mark_active(session)
-        self.session_repository.update(session)
+        self._modify(session_id, lambda session: session.__setitem__("userId", user_id))
 
     def resolve_user_session(
         self,
@@ -118,22 +120,25 @@ class SessionService:
             if expires_at is not None and expires_at <= utc_now():
                 self.session_repository.delete(str(existing["id"]))
                 existing = None
-        if existing:
-            existing["channel"] = channel or existing.get("channel", "web")
-            if anonymous_id and not existing.get("anonymousId"):
-                existing["anonymousId"] = anonymous_id
+
+        def refresh(session: dict[str, Any]) -> None:
+            session["channel"] = channel or session.get("channel", "web")
+            if anonymous_id and not session.get("anonymousId"):
+                session["anonymousId"] = anonymous_id
             if user_agent:
-                existing["userAgent"] = user_agent
+                session["userAgent"] = user_agent
             if ip_address:
-                existing["ipAddress"] = ip_address
+                session["ipAddress"] = ip_address
             if metadata:
-                merged_metadata = existing.get("metadata", {})
+                merged_metadata = session.get("metadata", {})
                 if not isinstance(merged_metadata, dict):
                     merged_metadata = {}
-                existing["metadata"] = {**merged_metadata, **metadata}
-            self._mark_active(existing)
-            self.session_repository.update(existing)
-            return existing
+                session["metadata"] = {**merged_metadata, **metadata}
+
+        if existing:
+            refreshed = self._modify(str(existing["id"]), refresh)
+            if refreshed:
+                return refreshed
 
         if preferred_session_id:
             preferred = self.session_repository.get(preferred_session_id)
@@ -143,22 +148,14 @@ class SessionService:
                     self.session_repository.delete(str(preferred["id"]))
                     preferred = None
             if preferred:
-                preferred["userId"] = user_id
-                preferred["channel"] = channel or preferred.get("channel", "web")
-                if anonymous_id and not preferred.get("anonymousId"):
-                    preferred["anonymousId"] = anonymous_id
-                if user_agent:
-                    preferred["userAgent"] = user_agent
-                if ip_address:
-                    preferred["ipAddress"] = ip_address
-                if metadata:
-                    merged_metadata = preferred.get("metadata", {})
-                    if not isinstance(merged_metadata, dict):
-                        merged_metadata = {}
-                    preferred["metadata"] = {**merged_metadata, **metadata}
-                self._mark_active(preferred)
-                self.session_repository.update(preferred)
-                return preferred
+
+                def claim(session: dict[str, Any]) -> None:
+                    session["userId"] = user_id
+                    refresh(session)
+
+                claimed = self._modify(str(preferred["id"]), claim)
+                if claimed:
+                    return claimed
 
         return self.create_session(
             channel=channel,
@@ -179,9 +176,67 @@ class SessionService:
         last_message: str,
         entities: dict[str, Any] | None = None,
     ) -> None:
-        session = self.session_repository.get(session_id)
-        if not session:
-            return
+        self._modify(
+            session_id,
+            lambda session: self._apply_conversation(
+                session,
+                last_intent=last_intent,
+                last_agent=last_agent,
+                last_message=last_message,
+                entities=entities,
+            ),
+        )
+
+    def update_conversation_later(
+        self,
+        *,
+        session_id: str,
+        last_intent: str,
+        last_agent: str,
+        last_message: str,
+        entities: dict[str, Any] | None = None,
+    ) -> None:
+        """Like :meth:`update_conversation`, but queued on the write-behind queue when there is room."""
+        update = {
+            "last_intent": last_intent,
+            "last_agent": last_agent,
+            "last_message": last_message,
+            "entities": entities,
+        }
+        if self.write_behind is None or not self.write_behind.submit("conversation", session_id, update):
+            self.update_conversation(session_id=session_id, **update)
+
+    def _write_conversation_batch(self, items: list[tuple[Hashable, Any]]) -> None:
+        # Each update overwrites the same fields, so only the newest per session matters.
+        latest = {str(session_id): update for session_id, update in items}
+        with self._update_lock:
+            sessions = self.session_repository.get_many(list(latest))
+            for session_id, session in sessions.items():
+                self._apply_conversation(session, **latest[session_id])
+            self.session_repository.update_many(list(sessions.values()))
+
+    def _modify(self, session_id: str, change: Callable[[dict[str, Any]], None]) -> dict[str, Any] | None:
+        """Read, change and write one session once its pending conversation update is written."""
+        if self.write_behind is not None:
+            self.write_behind.settle("conversation", session_id)
+        with self._update_lock:
+            session = self.session_repository.get(session_id)
+            if not session:
+                return None
+            change(session)
+            self._mark_active(session)
+            self.session_repository.update(session)
+            return session
+
+    def _apply_conversation(
+        self,
+        session: dict[str, Any],
+        *,
+        last_intent: str,
+        last_agent: str,
+        last_message: str,
+        entities: dict[str, Any] | None,
+    ) -> None:
         conversation = session.setdefault("context", {}).setdefault("conversation", {})
         conversation["lastIntent"] = last_intent
         conversation["lastAgent"] = last_agent
@@ -195,7 +250,6 @@ class SessionService:
             conversation_state["lastMessage"] = last_message
             conversation_state["entities"] = entities or {}
         self._mark_active(session)
-        self.session_repository.update(session)
 
     def cleanup_expired(self) -> int:
         now = utc_now()
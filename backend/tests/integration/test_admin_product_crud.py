@@ -1,8 +1,23 @@
+from time import monotonic, sleep
+from typing import Any
+
 from fastapi.testclient import TestClient
 
 from app.main import app
 
 
+def _suggestions_once_rebuilt(client: TestClient, query: str, *, expect_empty: bool) -> list[dict[str, Any]]:
+    # A catalog write is picked up by a background rebuild; the stale index answers meanwhile.
+    deadline = monotonic() + 5
+    while True:
+        response = client.get("/v1/products/suggest", params={"query": query})
+        assert response.status_code == 200
+        suggestions = response.json()["suggestions"]
+        if bool(suggestions) != expect_empty or monotonic() > deadline:
+            return suggestions
+        sleep(0.02)
+
+
 def test_admin_can_manage_products() -> None:
     client = TestClient(app)
 
@@ -66,3 +81,40 @@ def test_admin_can_manage_products() -> None:
     missing = client.get("/v1/products/prod_900001")
     assert missing.status_code == 404
 
+
+
+def test_product_suggestions_follow_catalog_writes() -> None:
+    client = TestClient(app)
+
+    admin_login = client.post(
+        "/v1/auth/login",
+        json={"email": "admin@example.com", "password": "AdminPass123!"},
+    )
+    assert admin_login.status_code == 200
+    headers = {"Authorization": f"Bearer {admin_login.json()['accessToken']}"}
+
+    create = client.post(
+        "/v1/admin/products",
+        headers=headers,
+        json={
+            "id": "prod_900002",
+            "name": "Zephyrline Windbreaker",
+            "description": "Suggest endpoint fixture",
+            "category": "clothing",
+            "price": 79.0,
+            "currency": "USD",
+            "images": [],
+            "variants": [{"id": "var_900002", "size": "M", "color": "navy", "inStock": True}],
+            "rating": 0,
+            "reviewCount": 0,
+        },
+    )
+    assert create.status_code == 201
+
+    suggestions = _suggestions_once_rebuilt(client, "zephyr", expect_empty=False)
+    assert suggestions[0]["productId"] == "prod_900002"
+    assert suggestions[0]["type"] == "product"
+
+    delete = client.delete("/v1/admin/products/prod_900002", headers=headers)
+    assert delete.status_code == 204
+    assert _suggestions_once_rebuilt(client, "zephyr", expect_empty=True) == []
@@ -514,7 +514,7 @@ def test_interaction_llm_planner_executes_multi_step_cart_actions(monkeypatch) -
     client = TestClient(app)
     session_id = _create_session(client)
 
-    def fake_plan_actions(*, message: str, recent_messages: list[dict[str, object]] | None = None, inferred_intent: str | None = None) -> LLMActionPlan | None:
+    async def fake_plan_actions(*, message: str, recent_messages: list[dict[str, object]] | None = None, inferred_intent: str | None = None) -> LLMActionPlan | None:
         lowered = message.lower()
         if "running shoes" not in lowered:
             return None
@@ -536,7 +536,7 @@ def test_interaction_llm_planner_executes_multi_step_cart_actions(monkeypatch) -
             clarification_question="",
         )
 
-    monkeypatch.setattr(llm_client, "plan_actions", fake_plan_actions)
+    monkeypatch.setattr(llm_client, "aplan_actions", fake_plan_actions)
 
     response = client.post(
         "/v1/interactions/message",
@@ -554,6 +554,8 @@ def test_interaction_llm_planner_executes_multi_step_cart_actions(monkeypatch) -
     assert payload["metadata"]["planner"]["stepCount"] == 2
     assert payload["metadata"]["planner"]["steps"][0]["action"] == "add_item"
     assert payload["metadata"]["planner"]["steps"][0]["targetAgent"] == "cart"
+    assert payload["metadata"]["llmCache"] == {"intent": False, "planner": False}
+    assert payload["metadata"]["executionPolicy"]["winningPath"] == "planner"
 
     cart = client.get("/v1/cart", headers={"X-Session-Id": session_id})
     assert cart.status_code == 200
@@ -580,7 +582,7 @@ def test_interaction_planner_atomic_mode_reports_step_errors(monkeypatch) -> Non
     )
     monkeypatch.setattr(llm_client, "settings", planner_settings)
 
-    def fake_plan_actions(*, message: str, recent_messages: list[dict[str, object]] | None = None, inferred_intent: str | None = None) -> LLMActionPlan | None:
+    async def fake_plan_actions(*, message: str, recent_messages: list[dict[str, object]] | None = None, inferred_intent: str | None = None) -> LLMActionPlan | None:
         return LLMActionPlan(
             actions=[
                 LLMPlannedAction(
@@ -599,7 +601,7 @@ def test_interaction_planner_atomic_mode_reports_step_errors(monkeypatch) -> Non
             clarification_question="",
         )
 
-    monkeypatch.setattr(llm_client, "plan_actions", fake_plan_actions)
+    monkeypatch.setattr(llm_client, "aplan_actions", fake_plan_actions)
 
     response = client.post(
         "/v1/interactions/message",
@@ -649,3 +651,33 @@ def test_interaction_planner_canary_zero_disables_planner_attempt(monkeypatch) -
     execution_policy = response.json()["payload"]["metadata"]["executionPolicy"]
     assert execution_policy["plannerEnabled"] is False
     assert execution_policy["plannerAttempted"] is False
+
+
+def test_interaction_reports_stage_timings(monkeypatch) -> None:
+    from dataclasses import replace
+
+    from app.container import llm_client
+
+    client = TestClient(app)
+    session_id = _create_session(client)
+    monkeypatch.setattr(
+        llm_client,
+        "settings",
+        replace(llm_client.settings, orchestrator_debug_timings=True, planner_canary_percent=0),
+    )
+
+    response = client.post(
+        "/v1/interactions/message",
+        json={"sessionId": session_id, "content": "show my cart", "channel": "web"},
+    )
+    assert response.status_code == 200
+    timings = response.json()["payload"]["metadata"]["timings"]
+    stages = [timing["stage"] for timing in timings]
+    assert stages[:3] == ["recent_history", "classify", "context_build"]
+    assert {"agent", "format"} <= set(stages)
+    assert next(timing for timing in timings if timing["stage"] == "agent")["agent"] == "cart"
+    assert all(timing["durationMs"] >= 0 for timing in timings)
+
+    metrics = client.get("/metrics").text
+    assert 'commerce_orchestrator_stage_duration_ms_count{stage="agent",intent="view_cart",agent="cart"}' in metrics
+    assert 'commerce_orchestrator_stage_duration_ms_bucket{stage="session_update",intent="view_cart",agent="cart",le="+Inf"}' in metrics
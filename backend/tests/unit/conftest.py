@@ -2,6 +2,20 @@ import pytest
 from typing import Any
 from app.container import redis_manager, mongo_manager
 
+class _FakeRedisPipeline:
+    def __init__(self, parent: "_FakeRedisClient") -> None:
+        self.parent = parent
+        self.ops: list[tuple[str, str, int | None]] = []
+
+    def set(self, key: str, value: str, ex: int | None = None) -> "_FakeRedisPipeline":
+        self.ops.append((key, value, ex))
+        return self
+
+    def execute(self) -> list[bool]:
+        for key, value, ex in self.ops:
+            self.parent.set(key, value, ex=ex)
+        return [True for _ in self.ops]
+
 class _FakeRedisClient:
     def __init__(self) -> None:
         self.store: dict[str, Any] = {}
@@ -15,6 +29,17 @@ class _FakeRedisClient:
     def delete(self, key: str) -> None:
         self.store.pop(key, None)
 
+    def mget(self, keys: list[str]) -> list[Any]:
+        return [self.store.get(key) for key in keys]
+
+    def pipeline(self) -> "_FakeRedisPipeline":
+        return _FakeRedisPipeline(self)
+
+    def incr(self, key: str) -> int:
+        value = int(self.store.get(key) or 0) + 1
+        self.store[key] = str(value)
+        return value
+
     def scan_iter(self, match: str = "*") -> Any:
         prefix = match.replace("*", "")
         for k in self.store:
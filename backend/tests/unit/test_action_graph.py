@@ -0,0 +1,169 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from types import SimpleNamespace
+from typing import Any
+
+from app.core.config import Settings
+from app.orchestrator.action_graph import build_action_graph
+from app.orchestrator.orchestrator_core import Orchestrator
+from app.orchestrator.types import AgentAction, AgentContext, AgentExecutionResult
+
+
+class _Agent:
+    def __init__(self, name: str, *, delay: float = 0.05, failing: set[str] | None = None) -> None:
+        self.name = name
+        self.delay = delay
+        self.failing = failing or set()
+        self.calls: list[tuple[str, dict[str, Any], float]] = []
+
+    def execute(self, action: AgentAction, context: AgentContext) -> AgentExecutionResult:
+        self.calls.append((action.name, dict(action.params), time.perf_counter()))
+        time.sleep(self.delay)
+        if action.name in self.failing:
+            return AgentExecutionResult(success=False, message=f"{action.name} failed", data={"code": "NOPE"})
+        data: dict[str, Any] = {}
+        if action.name == "search_products":
+            data = {"products": [{"id": "prod_1", "variants": [{"id": "var_1"}]}]}
+        return AgentExecutionResult(success=True, message=f"{action.name} ok", data=data)
+
+
+def _orchestrator(*, mode: str = "partial", deadline_ms: int = 8000, **agents: _Agent) -> Orchestrator:
+    settings = Settings(llm_planner_execution_mode=mode, orchestrator_request_deadline_ms=deadline_ms)
+    return Orchestrator(
+        intent_classifier=SimpleNamespace(),
+        context_builder=SimpleNamespace(),
+        action_extractor=SimpleNamespace(),
+        router=SimpleNamespace(),
+        formatter=SimpleNamespace(),
+        llm_client=SimpleNamespace(settings=settings),
+        interaction_service=SimpleNamespace(),
+        memory_service=SimpleNamespace(),
+        agents=dict(agents),
+    )
+
+
+def _plan(orchestrator: Orchestrator, actions: list[AgentAction], deadline: float | None = None) -> Any:
+    context = AgentContext(session_id="s1", user_id=None, channel="web", session={}, cart=None, preferences=None)
+    return asyncio.run(
+        orchestrator._execute_planned_actions(
+            route_agent_name="cart",
+            actions=actions,
+            context=context,
+            deadline_seconds=deadline,
+        )
+    )
+
+
+def test_action_graph_orders_only_conflicting_actions() -> None:
+    nodes = build_action_graph(
+        [
+            AgentAction(name="get_order_status", target_agent="order"),
+            AgentAction(name="get_cart", target_agent="cart"),
+            AgentAction(name="search_products", params={"query": "hoodie"}, target_agent="product"),
+            AgentAction(name="add_item", params={"quantity": 1}, target_agent="cart"),
+            AgentAction(name="save_preference", params={"updates": {}}, target_agent="memory"),
+        ]
+    )
+    assert [sorted(node.depends_on) for node in nodes] == [[], [], [], [1, 2], [2]]
+    assert nodes[3].consumes == 2
+
+    atomic = build_action_graph(
+        [AgentAction(name="get_cart"), AgentAction(name="get_order_status"), AgentAction(name="cancel_order")],
+        atomic=True,
+    )
+    assert [sorted(node.depends_on) for node in atomic] == [[], [], [0, 1]]
+    assert sorted(build_action_graph([AgentAction(name="get_cart"), AgentAction(name="mystery")])[1].depends_on) == [0]
+
+
+def test_independent_planned_actions_run_in_parallel() -> None:
+    cart, order = _Agent("cart", delay=0.2), _Agent("order", delay=0.2)
+    orchestrator = _orchestrator(cart=cart, order=order)
+
+    started = time.perf_counter()
+    result, agent_name, steps = _plan(
+        orchestrator,
+        [AgentAction(name="get_order_status", target_agent="order"), AgentAction(name="get_cart", target_agent="cart")],
+    )
+    elapsed = time.perf_counter() - started
+
+    assert agent_name == "orchestrator" and result.success
+    assert [step["action"] for step in steps] == ["get_order_status", "get_cart"]
+    assert result.message == "get_order_status ok get_cart ok"
+    assert elapsed < 0.35
+
+
+def test_dependent_add_item_consumes_the_search_result() -> None:
+    product, cart = _Agent("product"), _Agent("cart")
+    orchestrator = _orchestrator(product=product, cart=cart)
+
+    result, _, steps = _plan(
+        orchestrator,
+        [
+            AgentAction(name="search_products", params={"query": "hoodie"}, target_agent="product"),
+            AgentAction(name="add_item", params={}, target_agent="cart"),
+        ],
+    )
+
+    assert result.success and [step["success"] for step in steps] == [True, True]
+    assert cart.calls[0][1] == {"productId": "prod_1", "variantId": "var_1", "quantity": 1}
+    assert cart.calls[0][2] >= product.calls[0][2] + product.delay
+
+
+def test_atomic_mode_skips_every_step_after_a_failure() -> None:
+    cart, order = _Agent("cart", failing={"add_item"}), _Agent("order", delay=0.0)
+    orchestrator = _orchestrator(mode="atomic", cart=cart, order=order)
+
+    result, _, steps = _plan(
+        orchestrator,
+        [
+            AgentAction(name="add_item", params={"query": "nope"}, target_agent="cart"),
+            AgentAction(name="get_order_status", target_agent="order"),
+            AgentAction(name="cancel_order", params={"orderId": "o1"}, target_agent="order"),
+        ],
+    )
+
+    assert result.success is False
+    assert steps[0]["error"]["code"] == "NOPE"
+    assert [step["error"]["code"] for step in steps[1:]] == ["SKIPPED_ATOMIC_MODE", "SKIPPED_ATOMIC_MODE"]
+    # The read may run ahead (its result is discarded); the write never starts.
+    assert "cancel_order" not in [call[0] for call in order.calls]
+    assert result.message == "add_item failed"
+
+
+def test_atomic_failure_of_a_read_that_ran_ahead_still_runs_earlier_steps() -> None:
+    product, cart = _Agent("product", delay=0.1), _Agent("cart")
+    order = _Agent("order", delay=0.0, failing={"get_order_status"})
+    orchestrator = _orchestrator(mode="atomic", product=product, cart=cart, order=order)
+
+    result, _, steps = _plan(
+        orchestrator,
+        [
+            AgentAction(name="search_products", params={"query": "hoodie"}, target_agent="product"),
+            AgentAction(name="add_item", params={}, target_agent="cart"),
+            AgentAction(name="get_order_status", target_agent="order"),
+        ],
+    )
+
+    assert result.success is False
+    assert [step["success"] for step in steps] == [True, True, False]
+    assert steps[2]["error"]["code"] == "NOPE"
+    assert cart.calls[0][1] == {"productId": "prod_1", "variantId": "var_1", "quantity": 1}
+
+
+def test_unfinished_steps_are_reported_at_the_deadline() -> None:
+    cart, order = _Agent("cart", delay=0.0), _Agent("order", delay=0.5)
+    orchestrator = _orchestrator(cart=cart, order=order)
+
+    started = time.perf_counter()
+    result, _, steps = _plan(
+        orchestrator,
+        [AgentAction(name="get_cart", target_agent="cart"), AgentAction(name="get_order_status", target_agent="order")],
+        deadline=0.1,
+    )
+
+    assert time.perf_counter() - started < 0.4
+    assert result.success and result.data["partialFailure"] is True
+    assert steps[0]["success"] is True
+    assert steps[1]["error"]["code"] == "DEADLINE_EXCEEDED"
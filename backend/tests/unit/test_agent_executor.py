@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+
+from app.agents.base_agent import BaseAgent
+from app.agents.executor import AgentExecutor
+from app.infrastructure.observability import MetricsCollector
+from app.orchestrator.types import AgentAction, AgentContext, AgentExecutionResult
+
+
+class _SyncAgent(BaseAgent):
+    name = "legacy"
+
+    def __init__(self) -> None:
+        self.threads: list[str] = []
+
+    def execute(self, action: AgentAction, context: AgentContext) -> AgentExecutionResult:
+        self.threads.append(threading.current_thread().name)
+        return AgentExecutionResult(success=True, message=action.name)
+
+
+class _NativeAgent(_SyncAgent):
+    name = "native"
+    async_native = True
+
+    async def aexecute(self, action: AgentAction, context: AgentContext) -> AgentExecutionResult:
+        return self.execute(action, context)
+
+
+def _context() -> AgentContext:
+    return AgentContext(session_id="s1", user_id=None, channel="web", session={}, cart=None, preferences=None)
+
+
+def test_agent_executor_awaits_native_agents_and_pools_sync_ones() -> None:
+    metrics = MetricsCollector()
+    executor = AgentExecutor(max_workers=2, metrics_collector=metrics)
+    legacy, native = _SyncAgent(), _NativeAgent()
+
+    async def scenario() -> list[AgentExecutionResult]:
+        return await asyncio.gather(
+            *(executor.run(legacy, AgentAction(name=f"a{index}"), _context()) for index in range(4)),
+            executor.run(native, AgentAction(name="n"), _context()),
+        )
+
+    results = asyncio.run(scenario())
+
+    assert [result.message for result in results] == ["a0", "a1", "a2", "a3", "n"]
+    assert all(name.startswith("agent") for name in legacy.threads)
+    assert native.threads == ["MainThread"]
+    rendered = metrics.render_prometheus()
+    assert 'commerce_agent_execution_duration_ms_count{agent="legacy",mode="executor"} 4' in rendered
+    assert 'commerce_agent_execution_duration_ms_count{agent="native",mode="native"} 1' in rendered
+    assert 'commerce_agent_executor_threads{state="queued"} 0' in rendered
+    assert 'commerce_agent_executor_threads{state="workers"} 2' in rendered
+
+    # A stopped executor starts a fresh pool on the next call.
+    executor.shutdown()
+    result = asyncio.run(executor.run(legacy, AgentAction(name="again"), _context()))
+    assert result.message == "again"
+    assert asyncio.run(legacy.aexecute(AgentAction(name="direct"), _context())).message == "direct"
+
+
+def test_agent_executor_awaits_native_actions_of_sync_agents() -> None:
+    class _PartlyNativeAgent(_NativeAgent):
+        name = "partly"
+        async_native = False
+        native_actions = frozenset({"read"})
+
+    executor = AgentExecutor(max_workers=1)
+    agent = _PartlyNativeAgent()
+
+    asyncio.run(executor.run(agent, AgentAction(name="read"), _context()))
+    asyncio.run(executor.run(agent, AgentAction(name="write"), _context()))
+
+    assert agent.threads[0] == "MainThread" and agent.threads[1].startswith("agent")
+    executor.shutdown()
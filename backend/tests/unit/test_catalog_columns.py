@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+import random
+from typing import Any
+
+import numpy as np
+
+from app.services.catalog.columns import ProductColumns, top_k_descending
+
+
+def _catalog(size: int, seed: int = 7) -> list[dict[str, Any]]:
+    rng = random.Random(seed)
+    return [
+        {
+            "id": f"prod_{index}",
+            "category": rng.choice(["shoes", "Clothing", "accessories"]),
+            "brand": rng.choice(["StrideForge", "PeakRoute", "AeroThread"]),
+            "price": round(rng.uniform(10, 200), 2),
+            "rating": rng.choice([3.5, 4.0, 4.5, 5.0]),
+            "reviewCount": rng.randint(0, 500),
+        }
+        for index in range(size)
+    ]
+
+
+def _reference_rank(
+    products: list[dict[str, Any]],
+    product_scores: dict[str, int],
+    category_scores: dict[str, int],
+    brand_scores: dict[str, int],
+) -> list[str]:
+    def rank(item: dict[str, Any]) -> tuple[int, int, int, float]:
+        return (
+            int(product_scores.get(item["id"], 0)),
+            int(category_scores.get(str(item["category"]).strip().lower(), 0)),
+            int(brand_scores.get(str(item["brand"]).strip().lower(), 0)),
+            float(item["rating"]),
+        )
+
+    return [item["id"] for item in sorted(products, key=rank, reverse=True)]
+
+
+def test_rank_by_affinity_matches_tuple_sort_and_top_k() -> None:
+    products = _catalog(300)
+    product_scores = {"prod_5": 3, "prod_42": 1}
+    category_scores = {"clothing": 2, "shoes": 1}
+    brand_scores = {"peakroute": 4}
+    columns = ProductColumns(products)
+
+    expected = _reference_rank(products, product_scores, category_scores, brand_scores)
+    full = columns.rank_by_affinity(
+        product_scores=product_scores,
+        category_scores=category_scores,
+        brand_scores=brand_scores,
+    )
+    top = columns.rank_by_affinity(
+        product_scores=product_scores,
+        category_scores=category_scores,
+        brand_scores=brand_scores,
+        limit=8,
+    )
+
+    assert [products[index]["id"] for index in full] == expected
+    assert [products[index]["id"] for index in top] == expected[:8]
+
+
+def test_rank_by_affinity_over_a_row_subset_returns_catalog_rows() -> None:
+    products = _catalog(120)
+    category_scores = {"shoes": 2}
+    brand_scores = {"aerothread": 1}
+    columns = ProductColumns(products)
+    rows = list(range(1, 120, 3))
+
+    ranked = columns.rank_by_affinity(
+        product_scores={"prod_4": 5},
+        category_scores=category_scores,
+        brand_scores=brand_scores,
+        rows=rows,
+        limit=5,
+    )
+
+    subset = [products[row] for row in rows]
+    assert [products[row]["id"] for row in ranked] == _reference_rank(
+        subset, {"prod_4": 5}, category_scores, brand_scores
+    )[:5]
+    assert ranked[0] == 4
+
+def test_columns_encode_codes_and_mask_prices() -> None:
+    products = _catalog(5) + [{"id": "prod_bad", "category": "shoes", "brand": "x", "price": "n/a"}]
+    columns = ProductColumns(products)
+
+    assert columns.categories[columns.category_codes[0]] == str(products[0]["category"]).lower()
+    assert columns.review_count.dtype == np.int64
+    assert not columns.price_mask()[-1]
+    in_range = columns.within_price(np.arange(columns.size), min_price=50.0, max_price=150.0)
+    assert [products[index]["id"] for index in in_range] == [
+        item["id"] for item in products[:5] if 50.0 <= item["price"] <= 150.0
+    ]
+
+
+def test_top_k_descending_keeps_input_order_for_ties() -> None:
+    keys = [np.array([1, 2, 2, 1, 2]), np.array([0.5, 0.1, 0.1, 0.9, 0.3])]
+
+    assert top_k_descending(keys) == [4, 1, 2, 3, 0]
+    assert top_k_descending(keys, limit=2) == [4, 1]
+    assert top_k_descending([np.array([])], limit=3) == []
@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+from typing import Any
+
+from app.repositories.product_repository import CatalogSnapshot
+from app.services.catalog.facets import FacetIndex
+
+
+def _product(product_id: str, name: str, **fields: Any) -> dict[str, Any]:
+    return {
+        "id": product_id,
+        "name": name,
+        "category": fields.get("category", "shoes"),
+        "brand": fields.get("brand", "StrideForge"),
+        "status": fields.get("status", "active"),
+        "price": fields.get("price", 100.0),
+        "variants": fields.get("variants", []),
+    }
+
+
+def _snapshot() -> CatalogSnapshot:
+    products = [
+        _product(
+            "prod_a",
+            "Alpha Runner",
+            price=80.0,
+            variants=[{"id": "v1", "color": "Blue", "size": "10"}, {"id": "v2", "color": "black", "size": "11"}],
+        ),
+        _product("prod_b", "Bravo Hoodie", category="clothing", brand="AeroThread", price=60.0),
+        _product("prod_c", "Charlie Trail", price=150.0, variants=[{"id": "v3", "color": "green", "size": "10"}]),
+        _product("prod_d", "Delta Draft", price=90.0, status="draft"),
+    ]
+    return CatalogSnapshot.from_products(version=7, products=products)
+
+
+def _ids(rows: list[dict[str, Any]]) -> list[str]:
+    return [row["id"] for row in rows]
+
+
+def test_facet_index_intersects_postings_in_catalog_order() -> None:
+    index = FacetIndex(_snapshot())
+
+    assert index.version == 7
+    assert _ids(index.filter()) == ["prod_a", "prod_b", "prod_c"]
+    assert _ids(index.filter(category="SHOES")) == ["prod_a", "prod_c"]
+    assert _ids(index.filter(category="all", brand="aerothread")) == ["prod_b"]
+    assert _ids(index.filter(status=None)) == ["prod_a", "prod_b", "prod_c", "prod_d"]
+    assert _ids(index.filter(color="blue")) == ["prod_a"]
+    assert _ids(index.filter(size="10")) == ["prod_a", "prod_c"]
+    assert index.filter(category="shoes", brand="aerothread") == []
+    assert index.values("color") == ["black", "blue", "green"]
+
+
+def test_facet_index_applies_price_ranges() -> None:
+    index = FacetIndex(_snapshot())
+
+    assert _ids(index.filter(min_price=80.0, max_price=150.0)) == ["prod_a", "prod_c"]
+    assert _ids(index.filter(max_price=79.99)) == ["prod_b"]
+    assert _ids(index.filter(category="shoes", max_price=100.0)) == ["prod_a"]
+    assert _ids(index.filter(status=None, min_price=85.0, max_price=95.0)) == ["prod_d"]
+    assert index.filter(min_price=200.0) == []
+
+
+def test_facet_index_matches_color_and_size_on_the_same_variant() -> None:
+    index = FacetIndex(_snapshot())
+
+    assert _ids(index.filter(color="blue", size="10")) == ["prod_a"]
+    assert _ids(index.filter(color="BLACK", size="11")) == ["prod_a"]
+    # prod_a has a blue variant and a size 11 variant, but no blue size 11.
+    assert index.filter(color="blue", size="11") == []
+    assert _ids(index.filter(color="green", size="10", max_price=200.0)) == ["prod_c"]
+
+
+def test_facet_index_treats_only_a_missing_status_as_active() -> None:
+    missing = _product("prod_e", "Echo Missing")
+    del missing["status"]
+    products = [missing, _product("prod_f", "Foxtrot Null", status=None), _product("prod_g", "Golf Empty", status="")]
+    index = FacetIndex(CatalogSnapshot.from_products(version=1, products=products))
+
+    assert _ids(index.filter()) == ["prod_e"]
+    assert len(index.filter(status=None)) == 3
@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+from time import monotonic, sleep
+from types import SimpleNamespace
+from typing import Any
+
+from app.repositories.product_repository import CatalogSnapshot
+from app.services.catalog.suggest import SuggestionIndex
+from app.services.product_service import ProductService
+
+
+def _product(product_id: str, name: str, **fields: Any) -> dict[str, Any]:
+    return {
+        "id": product_id,
+        "name": name,
+        "category": fields.get("category", "shoes"),
+        "brand": fields.get("brand", "StrideForge"),
+        "status": fields.get("status", "active"),
+        "tags": fields.get("tags", []),
+        "rating": fields.get("rating", 4.0),
+        "reviewCount": fields.get("reviewCount", 0),
+    }
+
+
+def _index(max_results: int = 10) -> SuggestionIndex:
+    products = [
+        _product("prod_a", "Running Shoes Pro", reviewCount=10, tags=["running"]),
+        _product("prod_b", "Road Runner", reviewCount=500),
+        _product("prod_c", "Rain Shell", category="clothing", brand="PeakRoute", reviewCount=50),
+        _product("prod_d", "Retired Racer", status="archived", reviewCount=9000),
+    ]
+    return SuggestionIndex(CatalogSnapshot.from_products(version=1, products=products), max_results=max_results)
+
+
+def test_suggestions_rank_by_popularity_and_match_word_starts() -> None:
+    index = _index()
+
+    assert [row["text"] for row in index.suggest("r", limit=2)] == ["Road Runner", "Rain Shell"]
+    # "Road Runner" matches on its second word; a tag used by a single product
+    # ties with that product on popularity and the shorter text wins.
+    assert [row["text"] for row in index.suggest("  RUN")] == ["Road Runner", "running", "Running Shoes Pro"]
+    assert index.suggest("pro")[0] == {"text": "Running Shoes Pro", "type": "product", "productId": "prod_a"}
+    assert index.suggest("stride")[0] == {"text": "StrideForge", "type": "brand"}
+    assert index.suggest("retired") == []
+    assert index.suggest("") == []
+    assert index.suggest("zzz") == []
+
+
+def test_suggestion_lists_are_capped_per_prefix() -> None:
+    index = _index(max_results=2)
+
+    assert len(index.suggest("r", limit=10)) == 2
+    assert index.size == 8
+
+
+def test_product_service_serves_the_old_index_while_rebuilding() -> None:
+    snapshots = [CatalogSnapshot.from_products(version=1, products=[_product("prod_a", "Road Runner")])]
+    repository = SimpleNamespace(snapshot=lambda: snapshots[-1])
+    service = ProductService(
+        product_repository=repository,  # type: ignore[arg-type]
+        category_repository=None,  # type: ignore[arg-type]
+        inventory_repository=None,  # type: ignore[arg-type]
+    )
+    assert [row["text"] for row in service.suggest("ro")["suggestions"]] == ["Road Runner"]
+
+    snapshots.append(CatalogSnapshot.from_products(version=2, products=[_product("prod_b", "Rocket Racer")]))
+    # The catalog moved: the request is answered from the previous index.
+    assert [row["text"] for row in service.suggest("ro")["suggestions"]] == ["Road Runner"]
+
+    deadline = monotonic() + 2
+    while service._suggest_rebuilding and monotonic() < deadline:
+        sleep(0.01)
+    assert [row["text"] for row in service.suggest("ro")["suggestions"]] == ["Rocket Racer"]
@@ -1,10 +1,12 @@
 from __future__ import annotations
 
+import asyncio
 import time
 
 from app.infrastructure.circuit_breaker import CircuitBreaker, CircuitBreakerOpenError
 from app.infrastructure.llm_client import LLMIntentPrediction
 from app.orchestrator.intent_classifier import IntentClassifier
+from app.orchestrator.keyword_matcher import KeywordAutomaton
 
 
 class _StubLLMClient:
@@ -14,6 +16,9 @@ class _StubLLMClient:
     def classify_intent(self, *, message: str, recent_messages: list[dict[str, object]] | None = None) -> LLMIntentPrediction | None:
         return self.prediction
 
+    async def aclassify_intent(self, *, message: str, recent_messages: list[dict[str, object]] | None = None) -> LLMIntentPrediction | None:
+        return self.prediction
+
 
 def test_circuit_breaker_opens_and_recovers() -> None:
     breaker = CircuitBreaker(failure_threshold=2, recovery_timeout_seconds=0.1)
@@ -52,6 +57,10 @@ def test_intent_classifier_prefers_higher_confidence_llm_result() -> None:
     assert result.name == "checkout"
     assert result.confidence == 0.82
 
+    awaited = asyncio.run(classifier.aclassify("please help me complete payment", context={"recent": []}))
+    assert awaited == result
+    assert asyncio.run(classifier.aclassify("view cart", allow_llm=False)).name == "view_cart"
+
 
 def test_intent_classifier_detects_search_and_add_combo() -> None:
     classifier = IntentClassifier()
@@ -139,3 +148,9 @@ def test_intent_classifier_detects_price_refinement_query() -> None:
     assert result.name == "product_search"
     assert result.entities["maxPrice"] == 150.0
 
+
+def test_keyword_automaton_matches_substring_semantics() -> None:
+    keywords = ("cart", "my cart", "order", "order status", "he", "she", "hers", "his", "art")
+    automaton = KeywordAutomaton(keywords)
+    for text in ("what's in my cart", "order status for ord_1", "ushers", "his cartography", "", "zzz"):
+        assert automaton.scan(text) == {keyword for keyword in keywords if keyword in text}
@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+from app.core.config import Settings
+from app.infrastructure.concurrency_limiter import AdaptiveConcurrencyLimiter
+from app.infrastructure.llm_client import LLMClient
+from app.infrastructure.observability import MetricsCollector
+from app.orchestrator.intent_classifier import IntentClassifier
+
+
+def test_limiter_grows_additively_and_backs_off_multiplicatively() -> None:
+    metrics = MetricsCollector()
+    limiter = AdaptiveConcurrencyLimiter(
+        initial_limit=2,
+        max_limit=4,
+        latency_target_ms=100,
+        backoff=0.5,
+        metrics_collector=metrics,
+    )
+
+    assert limiter.try_acquire() and limiter.try_acquire()
+    assert limiter.try_acquire() is False
+    for _ in range(2):
+        limiter.release(latency_ms=10)
+    for _ in range(6):
+        limiter.try_acquire()
+        limiter.try_acquire()
+        limiter.release(latency_ms=10)
+        limiter.release(latency_ms=10)
+    assert limiter.snapshot.limit == 4
+
+    assert limiter.try_acquire()
+    limiter.release(latency_ms=500)
+    assert limiter.snapshot.limit == 2
+    assert limiter.try_acquire()
+    limiter.release(success=False, latency_ms=5)
+    assert limiter.snapshot.limit == 1
+    assert limiter.snapshot.in_flight == 0
+
+    rendered = metrics.render_prometheus()
+    assert 'commerce_concurrency_limit{limiter="llm"} 1' in rendered
+    assert 'commerce_concurrency_in_flight{limiter="llm"} 0' in rendered
+    assert 'commerce_concurrency_rejections_total{limiter="llm"} 1' in rendered
+
+
+def test_limiter_backs_off_once_per_wave_of_slow_calls() -> None:
+    limiter = AdaptiveConcurrencyLimiter(initial_limit=8, latency_target_ms=100, backoff=0.75)
+
+    for _ in range(8):
+        assert limiter.try_acquire()
+    for _ in range(8):
+        limiter.release(latency_ms=500)
+    assert limiter.snapshot.limit == 6
+
+    # Calls admitted after the backoff are a new signal.
+    assert limiter.try_acquire()
+    limiter.release(latency_ms=500)
+    assert limiter.snapshot.limit == 4
+def test_full_limiter_falls_back_to_rules_without_calling_the_llm() -> None:
+    settings = Settings(
+        llm_enabled=True,
+        openrouter_api_key="sk-test",
+        llm_planner_enabled=False,
+        llm_intent_classifier_enabled=True,
+    )
+    limiter = AdaptiveConcurrencyLimiter(initial_limit=1, max_limit=1)
+    client = LLMClient(settings=settings, limiter=limiter)
+    calls: list[str] = []
+    client._call_llm = lambda user_prompt, system_prompt: calls.append(user_prompt) or '{"intent":"checkout","confidence":0.95}'  # type: ignore[method-assign]
+
+    assert limiter.try_acquire()
+    assert client.classify_intent(message="help me pay") is None
+    result = IntentClassifier(llm_client=client).classify("view cart")
+    assert result.name == "view_cart"
+    assert calls == []
+    assert limiter.snapshot.rejected == 2
+
+    limiter.release()
+    prediction = client.classify_intent(message="help me pay")
+    assert prediction is not None and prediction.intent == "checkout"
+    assert limiter.snapshot.in_flight == 0
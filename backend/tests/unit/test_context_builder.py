@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from typing import Any
+
+from fastapi import HTTPException
+
+from app.orchestrator.context_builder import ContextBuilder
+from app.orchestrator.types import IntentResult, LazyAgentContext
+
+
+class _Sessions:
+    def __init__(self, *, known: set[str]) -> None:
+        self.known = known
+        self.created = 0
+
+    def get_session(self, session_id: str) -> dict[str, Any]:
+        time.sleep(0.1)
+        if session_id not in self.known:
+            raise HTTPException(status_code=404, detail="Session not found")
+        return {"id": session_id}
+
+    def create_session(self, channel: str = "web", initial_context: dict[str, Any] | None = None) -> dict[str, Any]:
+        self.created += 1
+        return {"id": f"session_new_{self.created}", "channel": channel}
+
+
+class _Carts:
+    def __init__(self) -> None:
+        self.calls: list[str] = []
+
+    def get_cart(self, user_id: str | None, session_id: str) -> dict[str, Any]:
+        self.calls.append(session_id)
+        return {"sessionId": session_id, "itemCount": 0}
+
+
+class _Memory:
+    def __init__(self) -> None:
+        self.calls = 0
+        self.threads: set[str] = set()
+
+    def get_memory_snapshot(self, user_id: str) -> dict[str, Any]:
+        self.calls += 1
+        self.threads.add(threading.current_thread().name)
+        time.sleep(0.1)
+        return {"preferences": {"size": "M"}, "productAffinities": {}}
+
+
+def _builder(known: set[str] | None = None) -> tuple[ContextBuilder, _Sessions, _Carts, _Memory]:
+    sessions, carts, memory = _Sessions(known=known or {"s1"}), _Carts(), _Memory()
+    return ContextBuilder(session_service=sessions, cart_service=carts, memory_service=memory), sessions, carts, memory
+
+
+def test_context_builder_fetches_only_what_the_intent_needs() -> None:
+    builder, _, carts, memory = _builder()
+
+    context = asyncio.run(
+        builder.abuild(intent=IntentResult(name="support_status", confidence=0.9), session_id="s1", user_id="u1", channel="web")
+    )
+    assert isinstance(context, LazyAgentContext)
+    assert carts.calls == [] and memory.calls == 0
+
+    # Undeclared data is still there, fetched once on first access.
+    assert context.preferences == {"size": "M"}
+    assert context.memory is not None and context.memory["preferences"] == {"size": "M"}
+    assert context.cart == {"sessionId": "s1", "itemCount": 0}
+    assert context.cart is context.cart
+    assert carts.calls == ["s1"] and memory.calls == 1
+
+
+def test_context_builder_prefetches_memory_alongside_the_session() -> None:
+    builder, _, carts, memory = _builder()
+
+    started = time.perf_counter()
+    context = asyncio.run(
+        builder.abuild(intent=IntentResult(name="product_search", confidence=0.9), session_id="s1", user_id="u1", channel="web")
+    )
+    elapsed = time.perf_counter() - started
+
+    assert context.is_resolved("memory") and not context.is_resolved("cart")
+    assert context.preferences == {"size": "M"}
+    assert memory.calls == 1 and carts.calls == []
+    assert elapsed < 0.18
+
+
+def test_context_builder_keys_the_cart_on_a_recreated_session() -> None:
+    builder, sessions, carts, memory = _builder(known=set())
+
+    context = asyncio.run(
+        builder.abuild(intent=IntentResult(name="checkout", confidence=0.9), session_id="gone", user_id=None, channel="web")
+    )
+    assert sessions.created == 1
+    assert context.session_id == "session_new_1"
+    assert context.is_resolved("cart") and carts.calls == ["session_new_1"]
+    assert context.memory is None and context.preferences is None and memory.calls == 0
+
+    sync_context = builder.build(
+        intent=IntentResult(name="checkout", confidence=0.9), session_id="gone", user_id=None, channel="web"
+    )
+    assert sync_context.is_resolved("cart") and sync_context.session_id == "session_new_2"
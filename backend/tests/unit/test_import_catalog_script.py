@@ -0,0 +1,204 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from app.scripts import import_catalog
+
+
+class _FakeCollection:
+    def __init__(self, rows: list[dict[str, Any]] | None = None) -> None:
+        self.rows = rows or []
+        self.bulk_calls: list[list[Any]] = []
+
+    def find(self, *_args: Any, **_kwargs: Any) -> list[dict[str, Any]]:
+        return list(self.rows)
+
+    def bulk_write(self, ops: list[Any], ordered: bool = True) -> None:
+        assert ordered is False
+        self.bulk_calls.append(list(ops))
+
+
+class _FakeDB:
+    def __init__(self) -> None:
+        self.collections: dict[str, _FakeCollection] = {
+            "categories": _FakeCollection(
+                [{"slug": "shoes", "status": "active"}, {"slug": "retired", "status": "archived"}]
+            )
+        }
+
+    def __getitem__(self, name: str) -> _FakeCollection:
+        return self.collections.setdefault(name, _FakeCollection())
+
+
+class _FakeMongoClient:
+    def __init__(self) -> None:
+        self.db = _FakeDB()
+        self.closed = False
+
+    def close(self) -> None:
+        self.closed = True
+
+
+class _FakePipeline:
+    def __init__(self, parent: "_FakeRedis") -> None:
+        self.parent = parent
+        self.deleted: list[str] = []
+
+    def delete(self, key: str) -> "_FakePipeline":
+        self.deleted.append(key)
+        return self
+
+    def execute(self) -> None:
+        self.parent.pipelines.append(self.deleted)
+
+
+class _FakeRedis:
+    def __init__(self) -> None:
+        self.pipelines: list[list[str]] = []
+        self.version = 4
+
+    def pipeline(self) -> _FakePipeline:
+        return _FakePipeline(self)
+
+    def incr(self, _key: str) -> int:
+        self.version += 1
+        return self.version
+
+
+class _FakeRedisManager:
+    instance: "_FakeRedisManager | None" = None
+
+    def __init__(self, *, url: str, enabled: bool) -> None:
+        self.client = _FakeRedis()
+        self.status = "connected"
+        self.disconnected = False
+        _FakeRedisManager.instance = self
+
+    def connect(self) -> None:
+        return None
+
+    def disconnect(self) -> None:
+        self.disconnected = True
+
+
+def _row(product_id: str, **fields: Any) -> dict[str, Any]:
+    return {"id": product_id, "name": f"Shoe {product_id}", "category": "shoes", "price": 50.0, **fields}
+
+
+def _run(path: Path, **overrides: Any) -> dict[str, Any]:
+    options: dict[str, Any] = {
+        "path": str(path),
+        "fmt": "auto",
+        "batch_size": 2,
+        "mongo_uri": "mongodb://localhost:27017/commerce",
+        "database": "commerce",
+        "redis_url": "redis://localhost:6379/0",
+        "use_redis": True,
+        "dry_run": False,
+        "retries": 1,
+        "retry_delay": 0.01,
+        "timeout_ms": 500,
+    }
+    options.update(overrides)
+    return import_catalog.run(**options)
+
+
+def test_import_catalog_streams_jsonl_in_bulk_batches(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    fake_client = _FakeMongoClient()
+    monkeypatch.setattr(import_catalog, "_connect_with_retry", lambda **_kwargs: fake_client)
+    monkeypatch.setattr(import_catalog, "resolve_database", lambda _client, _db: fake_client.db)
+    monkeypatch.setattr(import_catalog, "RedisClientManager", _FakeRedisManager)
+
+    catalog = tmp_path / "catalog.jsonl"
+    lines = [
+        json.dumps(_row("prod_1", variants=[{"id": "var_1", "inventory": {"availableQuantity": 0}}])),
+        json.dumps(_row("prod_2", tags="trail|daily")),
+        "{not json",
+        json.dumps(_row("prod_3", category="retired")),
+        json.dumps(_row("prod_4", price="free")),
+        json.dumps(_row("prod_5", variants=[{"id": "var_5"}])),
+    ]
+    catalog.write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+    summary = _run(catalog)
+
+    assert summary["rowsRead"] == 6
+    assert summary["imported"] == 3
+    assert summary["invalid"] == 3
+    assert [error["line"] for error in summary["errors"]] == [3, 4, 5]
+    assert summary["rowsPerSecond"] > 0
+    assert summary["catalogVersion"] == 5
+    assert fake_client.closed is True
+
+    product_batches = fake_client.db["products"].bulk_calls
+    assert [len(batch) for batch in product_batches] == [2, 1]
+    first = product_batches[0][0]._doc
+    assert first["$set"]["variants"][0]["inStock"] is False
+    assert first["$setOnInsert"] == {"createdAt": first["$set"]["updatedAt"]}
+    assert product_batches[0][1]._doc["$set"]["tags"] == ["trail", "daily"]
+
+    stock_ops = [op for batch in fake_client.db["inventory"].bulk_calls for op in batch]
+    explicit, stored_total = stock_ops[0]._doc
+    assert explicit["$set"]["totalQuantity"] == 0
+    assert stored_total["$set"]["availableQuantity"] == {"$min": [0, {"$subtract": [0, "$reservedQuantity"]}]}
+    assert "availableQuantity" not in stock_ops[1]._doc["$set"]
+    assert stock_ops[1]._doc["$setOnInsert"]["availableQuantity"] == 10
+
+    manager = _FakeRedisManager.instance
+    assert manager is not None and manager.disconnected is True
+    assert manager.client.pipelines[0] == ["product:prod_1", "product:prod_2", "inventory:var_1"]
+
+
+def test_import_catalog_dry_run_validates_csv_without_connecting(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    def fail_connect(**_kwargs: Any) -> None:
+        raise AssertionError("dry run must not connect")
+
+    monkeypatch.setattr(import_catalog, "_connect_with_retry", fail_connect)
+    catalog = tmp_path / "catalog.csv"
+    catalog.write_text(
+        "id,name,category,price,variants,status\n"
+        'prod_1,Road Shoe,shoes,80,"[{""id"": ""var_1""}]",active\n'
+        "prod_2,Bad Status,shoes,80,,hidden\n",
+        encoding="utf-8",
+    )
+
+    summary = _run(catalog, dry_run=True)
+
+    assert summary["imported"] == 1
+    assert summary["errors"] == [{"line": 3, "error": "invalid status: hidden"}]
+    assert summary["redis"] == "skipped"
+    assert summary["catalogVersion"] is None
+
+
+def test_import_catalog_keeps_reservations_and_rejects_bad_quantities(tmp_path: Path) -> None:
+    catalog = tmp_path / "catalog.jsonl"
+    lines = [
+        json.dumps(_row("prod_1", variants=[{"id": "var_1", "inventory": {"availableQuantity": "lots"}}])),
+        json.dumps(_row("prod_2", variants=[{"id": "var_2", "inventory": {"availableQuantity": "8"}}])),
+    ]
+    catalog.write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+    summary = _run(catalog, dry_run=True)
+
+    assert summary["imported"] == 1
+    assert summary["errors"] == [{"line": 1, "error": "inventory quantities must be numbers"}]
+
+    product = import_catalog._normalize_product(
+        _row("prod_2", variants=[{"id": "var_2", "inventory": {"availableQuantity": "8", "totalQuantity": 12}}]),
+        active_categories=set(),
+        now="2026-01-01T00:00:00Z",
+    )
+    [stock] = import_catalog._inventory_rows(product, now="2026-01-01T00:00:00Z")
+    totals, available = stock["update"]
+    # Reservations survive the import and available stock never exceeds total - reserved.
+    assert totals["$set"]["totalQuantity"] == 12
+    assert totals["$set"]["reservedQuantity"] == {
+        "$min": [{"$max": [0, {"$ifNull": ["$reservedQuantity", 0]}]}, 12]
+    }
+    assert available["$set"] == {"availableQuantity": {"$min": [8, {"$subtract": [12, "$reservedQuantity"]}]}}
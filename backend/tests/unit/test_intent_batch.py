@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+import io
+import json
+from pathlib import Path
+
+import pytest
+
+from app.orchestrator.intent_classifier import IntentClassifier
+from app.scripts import replay_intents
+
+
+_MESSAGES = [
+    "view cart",
+    "where is my order order_42",
+    "under 150",
+    "add 2 running shoes and 1 hoodie to cart",
+    "apply discount code SAVE20",
+    "under 150",
+    "hello",
+]
+_CONTEXTS = [None, None, {"recent": [{"intent": "view_cart", "agent": "cart"}]}, None, None, None, {"recent": "bad"}]
+
+
+def test_classify_batch_matches_single_classification_in_process_and_pool() -> None:
+    classifier = IntentClassifier()
+    expected = [
+        classifier.classify(message, context=context, allow_llm=False)
+        for message, context in zip(_MESSAGES, _CONTEXTS)
+    ]
+
+    serial = classifier.classify_batch(_MESSAGES, _CONTEXTS)
+    pooled = classifier.classify_batch(_MESSAGES, _CONTEXTS, workers=2, chunk_size=2)
+
+    assert serial == expected
+    assert pooled == expected
+    assert [result.name for result in pooled][2] == "general_question"
+    with pytest.raises(TypeError):
+        pooled[1].entities["orderId"] = "other"
+    with pytest.raises(ValueError):
+        classifier.classify_batch(_MESSAGES, _CONTEXTS[:2])
+
+
+def test_replay_intents_rebuilds_session_context_and_reports_changes(tmp_path: Path) -> None:
+    log = tmp_path / "interactions.jsonl"
+    rows = [
+        {"id": "m1", "sessionId": "s1", "message": "show me running shoes", "intent": "product_search", "agent": "product"},
+        {"id": "m2", "sessionId": "s1", "message": "under 150", "intent": "general_question", "agent": "general"},
+        {"id": "m3", "sessionId": "s2", "message": "under 150", "intent": "general_question", "agent": "general"},
+    ]
+    log.write_text("\n".join(json.dumps(row) for row in rows) + "\nnot json\n", encoding="utf-8")
+    output = io.StringIO()
+
+    summary = replay_intents.run(
+        path=str(log),
+        output=output,
+        workers=1,
+        chunk_size=10,
+        model_path="",
+        cache_entries=16,
+    )
+
+    results = [json.loads(line) for line in output.getvalue().splitlines()]
+    assert [row["intent"] for row in results] == ["product_search", "product_search", "general_question"]
+    assert [row["id"] for row in results] == ["m1", "m2", "m3"]
+    assert summary["linesRead"] == 4
+    assert summary["invalid"] == 1
+    assert summary["changed"] == 1
+    assert summary["messagesPerSecond"] > 0
@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+import copy
+import json
+
+import pytest
+
+from app.infrastructure.observability import MetricsCollector
+from app.orchestrator.intent_cache import IntentCache
+from app.orchestrator.intent_classifier import IntentClassifier
+
+
+def test_intent_cache_reuses_frozen_results_and_tracks_stats() -> None:
+    metrics = MetricsCollector()
+    classifier = IntentClassifier(cache=IntentCache(max_entries=2, metrics_collector=metrics))
+
+    first = classifier.classify("add 2 black runners and 1 blue hoodie to cart", allow_llm=False)
+    second = classifier.classify("  add 2 black runners and 1 blue hoodie to cart ", allow_llm=False)
+    assert first is second
+    assert first.name == "add_multiple_to_cart"
+
+    with pytest.raises(TypeError):
+        first.entities["items"].append({"query": "socks"})
+    with pytest.raises(TypeError):
+        first.entities["items"][0]["quantity"] = 5
+    assert isinstance(first.entities["items"], list)
+    assert json.loads(json.dumps(first.entities)) == first.entities
+    thawed = copy.deepcopy(first.entities)
+    thawed["items"].append({"query": "socks"})
+
+    classifier.classify("view cart", allow_llm=False)
+    classifier.classify("checkout", allow_llm=False)
+    stats = classifier.cache.stats()
+    assert stats["size"] == 2
+    assert stats["hits"] == 1
+    assert stats["misses"] == 3
+    assert stats["evictions"] == 1
+
+    rendered = metrics.render_prometheus()
+    assert 'commerce_intent_cache_events_total{event="hit"} 1' in rendered
+    assert 'commerce_intent_cache_events_total{event="eviction"} 1' in rendered
+
+
+def test_intent_cache_key_includes_recent_product_context() -> None:
+    classifier = IntentClassifier(cache=IntentCache(max_entries=8))
+
+    refined = classifier.classify(
+        "under 150",
+        context={"recent": [{"intent": "product_search", "agent": "product"}]},
+        allow_llm=False,
+    )
+    unrelated = classifier.classify(
+        "under 150",
+        context={"recent": [{"intent": "view_cart", "agent": "cart"}]},
+        allow_llm=False,
+    )
+    assert refined.name == "product_search"
+    assert unrelated.name == "general_question"
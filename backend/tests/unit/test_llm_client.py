@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import asyncio
 import json
 from typing import Any
 
@@ -247,3 +248,74 @@ def test_build_action_plan_prompt_contains_allowed_actions() -> None:
     assert payload["inferredIntent"] == "add_to_cart"
     assert payload["allowedActions"] == ["add_item", "get_cart"]
     assert payload["recent"][0]["intent"] == "product_search"
+
+def test_async_calls_share_one_pooled_client() -> None:
+    requests: list[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        body = json.loads(request.content)
+        content = (
+            '{"actions":[{"name":"get_cart","targetAgent":"cart","params":{}}],"confidence":0.9}'
+            if "allowedActions" in body["messages"][1]["content"]
+            else '{"intent":"checkout","confidence":0.9,"entities":{}}'
+        )
+        return httpx.Response(200, json={"choices": [{"message": {"content": content}}]})
+
+    settings = _base_settings(llm_planner_enabled=True, llm_decision_policy="classifier_first", llm_connect_timeout_seconds=1.5)
+    client = LLMClient(settings=settings, transport=httpx.MockTransport(handler))
+
+    async def scenario() -> tuple[Any, Any, bool, bool]:
+        prediction = await client.aclassify_intent(message="checkout")
+        pool = client._http
+        plan = await client.aplan_actions(message="show my cart")
+        same_pool = client._http is pool and pool is not None
+        assert pool.timeout.connect == 1.5
+        await client.aclose()
+        return prediction, plan, same_pool, pool.is_closed
+
+    prediction, plan, same_pool, closed = asyncio.run(scenario())
+
+    assert prediction is not None and prediction.intent == "checkout"
+    assert plan is not None and [action.name for action in plan.actions] == ["get_cart"]
+    assert same_pool is True
+    assert closed is True
+    assert len(requests) == 2
+    assert requests[0].headers["Authorization"] == "Bearer sk-test"
+    assert json.loads(requests[0].content)["response_format"] == {"type": "json_object"}
+
+def test_switching_event_loops_closes_the_previous_pool() -> None:
+    transport = httpx.MockTransport(
+        lambda request: httpx.Response(
+            200, json={"choices": [{"message": {"content": '{"intent":"checkout","confidence":0.9,"entities":{}}'}}]}
+        )
+    )
+    client = LLMClient(settings=_base_settings(), transport=transport)
+
+    async def classify() -> Any:
+        await client.aclassify_intent(message="checkout")
+        return client._http
+
+    first_pool = asyncio.run(classify())
+
+    async def next_loop() -> tuple[Any, bool]:
+        pool = await classify()
+        await client.aclose()
+        return pool, first_pool.is_closed
+
+    second_pool, first_closed = asyncio.run(next_loop())
+
+    assert second_pool is not first_pool
+    assert first_closed is True and second_pool.is_closed
+
+
+def test_async_classify_records_failures_on_the_circuit_breaker() -> None:
+    transport = httpx.MockTransport(lambda request: httpx.Response(503, json={}))
+    client = LLMClient(
+        settings=_base_settings(llm_circuit_breaker_failure_threshold=1),
+        transport=transport,
+    )
+
+    assert asyncio.run(client.aclassify_intent(message="checkout")) is None
+    assert client.circuit_breaker.snapshot.state == "open"
+    assert asyncio.run(client.aclassify_intent(message="checkout")) is None
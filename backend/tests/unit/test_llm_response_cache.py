@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+import asyncio
+import json
+from typing import Any
+
+from app.core.config import Settings
+from app.infrastructure.llm_client import LLMClient
+from app.infrastructure.llm_response_cache import LLMResponseCache
+from app.infrastructure.observability import MetricsCollector
+from app.infrastructure.persistence_clients import RedisClientManager
+
+
+class _FakeRedisClient:
+    def __init__(self) -> None:
+        self.store: dict[str, Any] = {}
+
+    def set(self, key: str, value: str, ex: int | None = None) -> None:
+        self.store[key] = value
+
+    def get(self, key: str) -> Any:
+        return self.store.get(key)
+
+
+def _redis_manager() -> RedisClientManager:
+    manager = RedisClientManager(url="redis://localhost:6379/0", enabled=True)
+    manager._client = _FakeRedisClient()
+    return manager
+
+
+def _key(user_prompt: str, **overrides: Any) -> str:
+    params: dict[str, Any] = {
+        "kind": "plan",
+        "model": "m",
+        "temperature": 0.0,
+        "system_prompt": "sys",
+        "user_prompt": user_prompt,
+    }
+    params.update(overrides)
+    return LLMResponseCache.key(**params)
+
+
+def test_llm_response_cache_keys_on_canonical_prompt_and_expires() -> None:
+    assert _key('{"message": "hi", "recent": []}') == _key('{"recent":[],"message":"hi"}')
+    assert _key('{"message": "hi"}') != _key('{"message": "hi"}', temperature=0.2)
+    assert _key('{"message": "hi"}') != _key('{"message": "hi"}', model="other")
+    assert _key('{"message": "hi"}').startswith("llm:plan:")
+
+    metrics = MetricsCollector()
+    redis_manager = _redis_manager()
+    cache = LLMResponseCache(redis_manager=redis_manager, metrics_collector=metrics, max_entries=4, ttl_seconds=60)
+    key = _key('{"message": "hi"}')
+    cache.put(key, {"intent": "checkout"})
+    assert cache.get(key) == {"intent": "checkout"}
+
+    # An expired local entry falls through to Redis (which keeps its own TTL).
+    cache._entries[key] = (0.0, {"intent": "stale"})
+    assert cache.get(key) == {"intent": "checkout"}
+    assert LLMResponseCache(redis_manager=redis_manager, max_entries=4).get(key) == {"intent": "checkout"}
+    assert LLMResponseCache(max_entries=0).get(key) is None
+
+    rendered = metrics.render_prometheus()
+    assert 'commerce_llm_cache_lookups_total{kind="plan",tier="l1",result="hit"} 1' in rendered
+    assert 'commerce_llm_cache_lookups_total{kind="plan",tier="l2",result="hit"} 1' in rendered
+
+
+def test_llm_client_serves_repeat_prompts_from_cache() -> None:
+    settings = Settings(
+        llm_enabled=True,
+        openrouter_api_key="sk-test",
+        llm_planner_enabled=True,
+        llm_intent_classifier_enabled=False,
+    )
+    client = LLMClient(settings=settings, response_cache=LLMResponseCache(redis_manager=_redis_manager()))
+    calls: list[str] = []
+
+    def fake_call(*, user_prompt: str, system_prompt: str) -> str:
+        calls.append(user_prompt)
+        return json.dumps(
+            {
+                "actions": [{"name": "add_item", "targetAgent": "cart", "params": {"query": "hoodie", "quantity": 1}}],
+                "confidence": 0.9,
+            }
+        )
+
+    async def fake_acall(*, user_prompt: str, system_prompt: str) -> str:
+        return fake_call(user_prompt=user_prompt, system_prompt=system_prompt)
+
+    client._call_llm = fake_call  # type: ignore[method-assign]
+    client._acall_llm = fake_acall  # type: ignore[method-assign]
+
+    first = client.plan_actions(message="add a hoodie")
+    second = client.plan_actions(message="add a hoodie")
+    third = asyncio.run(client.aplan_actions(message="add a hoodie"))
+
+    assert first is not None and first.cached is False
+    assert second is not None and second.cached is True
+    assert third is not None and third.cached is True
+    assert second.actions == first.actions
+    assert len(calls) == 1
+
+    assert asyncio.run(client.aplan_actions(message="add two hoodies")) is not None
+    assert len(calls) == 2
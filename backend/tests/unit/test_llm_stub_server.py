@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+import asyncio
+import random
+
+import httpx
+import pytest
+
+from app.core.config import Settings
+from app.infrastructure.llm_client import LLMClient
+from app.scripts.llm_stub_server import StubConfig, create_app, latency_sampler, serve_in_thread
+
+
+def _settings(**overrides: object) -> Settings:
+    values: dict[str, object] = {
+        "llm_enabled": True,
+        "openrouter_api_key": "stub",
+        "openrouter_base_url": "http://llm-stub",
+        "llm_planner_enabled": True,
+        "llm_decision_policy": "classifier_first",
+        "llm_intent_classifier_enabled": True,
+        "llm_circuit_breaker_failure_threshold": 2,
+    }
+    values.update(overrides)
+    return Settings(**values)
+
+
+def test_stub_answers_planner_classifier_and_stream_requests() -> None:
+    app = create_app(StubConfig(stream_chunk_ms=0, responses={"intent": {"checkout": {"intent": "checkout", "confidence": 0.61}}}))
+    client = LLMClient(settings=_settings(), transport=httpx.ASGITransport(app=app))
+
+    async def scenario() -> tuple[object, object, object, str]:
+        plan = await client.aplan_actions(message="show my cart")
+        prediction = await client.aclassify_intent(message="where is my order order_42")
+        canned = await client.aclassify_intent(message="checkout now")
+        chunks = [chunk async for chunk in client.stream_response(user_prompt="hi", system_prompt="be nice")]
+        await client.aclose()
+        return plan, prediction, canned, "".join(chunks)
+
+    plan, prediction, canned, text = asyncio.run(scenario())
+
+    assert plan is not None and [(action.name, action.target_agent) for action in plan.actions] == [("get_cart", "cart")]
+    assert prediction is not None and prediction.intent == "order_status"
+    assert canned is not None and canned.confidence == 0.61
+    assert text == "Happy to help! Here is what I found for you."
+    assert app.state.stats["plan.requests"] == 1
+    assert app.state.stats["stream.requests"] == 1
+
+
+def test_stub_injected_errors_trip_the_circuit_breaker_over_real_http() -> None:
+    with serve_in_thread(StubConfig(error_rate=1.0)) as base_url:
+        client = LLMClient(settings=_settings(openrouter_base_url=base_url))
+        assert client.classify_intent(message="hello there") is None
+        assert client.classify_intent(message="hello again") is None
+
+    assert client.circuit_breaker.snapshot.state == "open"
+
+
+def test_latency_sampler_parses_distributions() -> None:
+    rng = random.Random(3)
+    assert latency_sampler("fixed:25", rng)() == 25
+    assert 10 <= latency_sampler("uniform:10:20", rng)() <= 20
+    assert latency_sampler("lognormal:300:0.4", rng)() > 0
+    with pytest.raises(ValueError):
+        latency_sampler("pareto:1", rng)
@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from dataclasses import replace
+from time import perf_counter
+from types import SimpleNamespace
+from typing import Any
+
+from app.core.config import Settings
+from app.infrastructure.llm_client import LLMActionPlan, LLMPlannedAction
+from app.orchestrator.orchestrator_core import Orchestrator
+from app.orchestrator.types import AgentAction, AgentContext, AgentExecutionResult, IntentResult
+
+
+class _FakePlanner:
+    def __init__(self, *, delay: float, plan: LLMActionPlan | None) -> None:
+        self.settings = Settings(llm_enabled=True, openrouter_api_key="sk-test", llm_planner_enabled=True)
+        self.delay = delay
+        self.plan = plan
+
+    async def aplan_actions(self, **_: Any) -> LLMActionPlan | None:
+        await asyncio.sleep(self.delay)
+        return self.plan
+
+
+class _CartAgent:
+    name = "cart"
+
+    def __init__(self, delay: float = 0.0) -> None:
+        self.delay = delay
+        self.calls: list[str] = []
+
+    def execute(self, action: AgentAction, context: AgentContext) -> AgentExecutionResult:
+        self.calls.append(action.name)
+        time.sleep(self.delay)
+        return AgentExecutionResult(success=True, message="Your cart is empty.")
+
+
+_PLAN = LLMActionPlan(
+    actions=[LLMPlannedAction(name="get_cart", target_agent="cart", params={})],
+    confidence=0.9,
+    needs_clarification=False,
+    clarification_question="",
+)
+
+
+def _race(
+    planner: _FakePlanner, action: AgentAction, *, deadline: float | None, agent_delay: float = 0.0
+) -> tuple[Any, Any, str, float, _CartAgent]:
+    agent = _CartAgent(agent_delay)
+    orchestrator = Orchestrator(
+        intent_classifier=SimpleNamespace(),
+        context_builder=SimpleNamespace(),
+        action_extractor=SimpleNamespace(),
+        router=SimpleNamespace(),
+        formatter=SimpleNamespace(),
+        llm_client=planner,
+        interaction_service=SimpleNamespace(),
+        memory_service=SimpleNamespace(),
+        agents={"cart": agent},
+    )
+    context = AgentContext(session_id="s1", user_id=None, channel="web", session={}, cart=None, preferences=None)
+    started = perf_counter()
+    plan, result, path = asyncio.run(
+        orchestrator._race_planner(
+            message="show my cart",
+            recent=[],
+            intent=IntentResult(name="view_cart", confidence=0.9),
+            actions=[action],
+            route_agent_name="cart",
+            context=context,
+            deadline_seconds=deadline,
+        )
+    )
+    return plan, result, path, perf_counter() - started, agent
+
+
+def test_read_only_rule_action_wins_over_a_slow_planner() -> None:
+    plan, result, path, elapsed, agent = _race(_FakePlanner(delay=1.0, plan=_PLAN), AgentAction(name="get_cart"), deadline=2.0)
+
+    assert path == "speculative"
+    assert plan is None
+    assert result is not None and result.success is True
+    assert agent.calls == ["get_cart"]
+    assert elapsed < 0.5
+
+
+def test_fast_planner_wins_and_declined_plan_reuses_the_rule_result() -> None:
+    plan, result, path, _, _ = _race(
+        _FakePlanner(delay=0.0, plan=_PLAN), AgentAction(name="get_cart"), deadline=2.0, agent_delay=0.2
+    )
+    assert (plan, result, path) == (_PLAN, None, "planner")
+
+    plan, result, path, _, agent = _race(_FakePlanner(delay=0.0, plan=None), AgentAction(name="get_cart"), deadline=2.0)
+    assert (plan, path) == (None, "speculative")
+    assert result is not None and agent.calls == ["get_cart"]
+
+
+def test_write_actions_wait_for_the_planner_until_the_deadline() -> None:
+    slow = _FakePlanner(delay=1.0, plan=_PLAN)
+    plan, result, path, elapsed, agent = _race(slow, AgentAction(name="add_item", params={"query": "hoodie"}), deadline=0.05)
+
+    assert (plan, result, path) == (None, None, "deadline")
+    assert agent.calls == []
+    assert elapsed < 0.5
+
+    slow.settings = replace(slow.settings, llm_planner_speculation_enabled=False)
+    plan, result, path, _, agent = _race(slow, AgentAction(name="get_cart"), deadline=0.05)
+    assert (plan, result, path) == (None, None, "deadline")
+    assert agent.calls == []
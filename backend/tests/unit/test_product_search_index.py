@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+from typing import Any
+
+from app.infrastructure.observability import MetricsCollector
+from app.services.catalog.search_index import ProductSearchIndex
+
+
+def _product(product_id: str, name: str, description: str, **extra: Any) -> dict[str, Any]:
+    return {
+        "id": product_id,
+        "name": name,
+        "description": description,
+        "brand": extra.pop("brand", "Generic"),
+        "tags": extra.pop("tags", []),
+        "features": extra.pop("features", []),
+        "updatedAt": extra.pop("updatedAt", "2026-01-01T00:00:00+00:00"),
+        **extra,
+    }
+
+
+def _catalog() -> list[dict[str, Any]]:
+    return [
+        _product("prod_1", "Running Shoes Pro", "Lightweight running shoes", tags=["running"]),
+        _product("prod_2", "Trail Runner", "Rugged trail shoes for mountains"),
+        _product("prod_3", "Cozy Hoodie", "Warm fleece hoodie"),
+    ]
+
+
+def test_search_index_ranks_by_similarity_without_refitting() -> None:
+    metrics = MetricsCollector()
+    index = ProductSearchIndex(metrics_collector=metrics)
+    catalog = _catalog()
+    index.rebuild(catalog)
+    vectorizer = index._vectorizer
+
+    ranked = index.rank("running shoes", catalog)
+
+    assert ranked is not None
+    assert [item["id"] for item in ranked] == ["prod_1", "prod_2"]
+    assert index._vectorizer is vectorizer
+    rendered = metrics.render_prometheus()
+    assert 'commerce_search_index_duration_ms_count{operation="build"} 1' in rendered
+    assert "commerce_search_index_documents 3" in rendered
+
+
+def test_search_index_refreshes_changed_and_removed_documents() -> None:
+    index = ProductSearchIndex(min_refit_drift=100)
+    catalog = _catalog()
+    index.rebuild(catalog)
+
+    renamed = _product("prod_3", "Fleece Running Hoodie", "Warm hoodie", updatedAt="2026-02-01T00:00:00+00:00")
+    index.upsert(renamed)
+    ranked = index.rank("hoodie", [catalog[0], renamed])
+    assert ranked is not None
+    assert [item["id"] for item in ranked] == ["prod_3"]
+
+    index.remove("prod_3")
+    assert index.size == 2
+    ranked = index.rank("hoodie", catalog[:2])
+    assert ranked == []
+
+
+def test_search_index_picks_up_stale_candidates_on_query() -> None:
+    index = ProductSearchIndex()
+    index.rebuild([])
+
+    ranked = index.rank("trail", _catalog())
+
+    assert ranked is not None
+    assert [item["id"] for item in ranked] == ["prod_2"]
+    assert index.size == 3
+
+
+def test_search_index_refits_vocabulary_after_drift() -> None:
+    index = ProductSearchIndex(min_refit_drift=1)
+    catalog = _catalog()
+    index.rebuild(catalog)
+
+    added = _product("prod_4", "Canvas Backpack", "Durable backpack")
+    index.upsert(added)
+
+    ranked = index.rank("backpack", catalog + [added])
+    assert ranked is not None
+    assert [item["id"] for item in ranked] == ["prod_4"]
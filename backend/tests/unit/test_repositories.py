@@ -1,6 +1,12 @@
+import asyncio
 import json
 from copy import deepcopy
+from types import SimpleNamespace
 from typing import Any
+
+import pytest
+
+from app.core.config import Settings
 from app.infrastructure.persistence_clients import MongoClientManager, RedisClientManager
 from app.repositories.auth_repository import AuthRepository
 from app.repositories.category_repository import CategoryRepository
@@ -15,8 +21,25 @@ from app.repositories.product_repository import ProductRepository
 from app.repositories.session_repository import SessionRepository
 from app.repositories.support_repository import SupportRepository
 from app.store.in_memory import InMemoryStore
+from app.services.cart_service import CartService
+from app.services.memory_service import MemoryService
+from app.services.product_service import ProductService
 from app.services.session_service import SessionService
 
+class _FakeRedisPipeline:
+    def __init__(self, parent: "_FakeRedisClient") -> None:
+        self.parent = parent
+        self.ops: list[tuple[str, str, int | None]] = []
+
+    def set(self, key: str, value: str, ex: int | None = None) -> "_FakeRedisPipeline":
+        self.ops.append((key, value, ex))
+        return self
+
+    def execute(self) -> list[bool]:
+        for key, value, ex in self.ops:
+            self.parent.set(key, value, ex=ex)
+        return [True for _ in self.ops]
+
 class _FakeRedisClient:
     def __init__(self) -> None:
         self.store: dict[str, Any] = {}
@@ -30,6 +53,17 @@ class _FakeRedisClient:
     def delete(self, key: str) -> None:
         self.store.pop(key, None)
 
+    def mget(self, keys: list[str]) -> list[Any]:
+        return [self.store.get(key) for key in keys]
+
+    def pipeline(self) -> "_FakeRedisPipeline":
+        return _FakeRedisPipeline(self)
+
+    def incr(self, key: str) -> int:
+        value = int(self.store.get(key) or 0) + 1
+        self.store[key] = str(value)
+        return value
+
     def scan_iter(self, match: str = "*") -> Any:
         prefix = match.replace("*", "")
         for k in self.store:
@@ -82,6 +116,18 @@ class _FakeMongoCollection:
                     elif isinstance(v, dict) and "$regex" in v:
                         import re
                         if not re.search(str(v["$regex"]), str(actual_val)): return False
+                    elif isinstance(v, dict) and "$elemMatch" in v:
+                        if not isinstance(actual_val, list): return False
+                        if "." in k:
+                            # Dotted paths resolve to a list of values; unwind arrays like Mongo does.
+                            actual_val = [sub for val in actual_val for sub in (val if isinstance(val, list) else [val])]
+                        if not any(isinstance(sub, dict) and match_doc(sub, v["$elemMatch"]) for sub in actual_val): return False
+                    elif isinstance(v, dict) and "$in" in v:
+                        if actual_val not in v["$in"]: return False
+                    elif isinstance(v, dict) and ("$gte" in v or "$lte" in v):
+                        if actual_val is None: return False
+                        if "$gte" in v and actual_val < v["$gte"]: return False
+                        if "$lte" in v and actual_val > v["$lte"]: return False
                     elif "." in k:
                         if v not in actual_val: return False
                     else:
@@ -102,10 +148,15 @@ class _FakeMongoCollection:
                 else:
                     super().sort(**kwargs)
                 return self
+            def skip(self, n: int) -> "FakeCursor":
+                return FakeCursor(self[n:])
             def limit(self, n: int) -> "FakeCursor":
                 return FakeCursor(self[:n])
         return FakeCursor(results)
 
+    def count_documents(self, filter: dict[str, Any]) -> int:
+        return len(self.find(filter))
+
     def find_one(self, filter: dict[str, Any] | None = None, *args: Any, **kwargs: Any) -> dict[str, Any] | None:
         if filter is None:
             filter = {}
@@ -179,6 +230,10 @@ class _FakeMongoCollection:
         class Result: matched_count = 1; upserted_id = None
         return Result()
 
+    def bulk_write(self, requests: list[Any], ordered: bool = True) -> None:
+        for op in requests:
+            self.update_one(op._filter, op._doc, upsert=bool(op._upsert))
+
     def delete_one(self, filter: dict[str, Any]) -> Any:
         doc = self.find_one(filter)
         if doc:
@@ -190,6 +245,16 @@ class _FakeMongoCollection:
         return Result()
 
     def distinct(self, key: str) -> list[Any]:
+        if "." in key:
+            parent, child = key.split(".", 1)
+            return list(
+                set(
+                    sub.get(child)
+                    for d in self.docs
+                    for sub in d.get(parent, [])
+                    if isinstance(sub, dict) and sub.get(child) is not None
+                )
+            )
         return list(set(d.get(key) for d in self.docs if d.get(key) is not None))
 
 class _FakeDatabase:
@@ -213,6 +278,70 @@ class _FakeMongoClient:
             self.databases[name] = _FakeDatabase()
         return self.databases[name]
 
+class _FakeAsyncCursor:
+    def __init__(self, cursor: Any) -> None:
+        self.cursor = cursor
+
+    def sort(self, *args: Any, **kwargs: Any) -> "_FakeAsyncCursor":
+        return _FakeAsyncCursor(self.cursor.sort(*args, **kwargs))
+
+    def skip(self, n: int) -> "_FakeAsyncCursor":
+        return _FakeAsyncCursor(self.cursor.skip(n))
+
+    def limit(self, n: int) -> "_FakeAsyncCursor":
+        return _FakeAsyncCursor(self.cursor.limit(n))
+
+    async def to_list(self, length: int | None = None) -> list[Any]:
+        return list(self.cursor)[:length]
+
+class _FakeAsyncCollection:
+    """Awaitable view over a sync fake collection, so both clients share one store."""
+
+    def __init__(self, collection: _FakeMongoCollection) -> None:
+        self.collection = collection
+
+    def find(self, *args: Any, **kwargs: Any) -> _FakeAsyncCursor:
+        return _FakeAsyncCursor(self.collection.find(*args, **kwargs))
+
+    async def count_documents(self, filter: dict[str, Any]) -> int:
+        return self.collection.count_documents(filter)
+
+    async def find_one(self, *args: Any, **kwargs: Any) -> dict[str, Any] | None:
+        return self.collection.find_one(*args, **kwargs)
+
+    async def update_one(self, *args: Any, **kwargs: Any) -> Any:
+        return self.collection.update_one(*args, **kwargs)
+
+class _FakeAsyncMongoClient:
+    def __init__(self, sync_client: "_FakeMongoClient") -> None:
+        self.sync_client = sync_client
+
+    def get_default_database(self) -> "_FakeAsyncDatabase":
+        return self["commerce"]
+
+    def __getitem__(self, name: str) -> "_FakeAsyncDatabase":
+        return _FakeAsyncDatabase(self.sync_client[name])
+
+class _FakeAsyncDatabase:
+    def __init__(self, database: _FakeDatabase) -> None:
+        self.database = database
+
+    def __getitem__(self, name: str) -> _FakeAsyncCollection:
+        return _FakeAsyncCollection(self.database[name])
+
+class _FakeAsyncRedisClient:
+    def __init__(self, sync_client: _FakeRedisClient) -> None:
+        self.sync_client = sync_client
+        self.calls = 0
+
+    async def get(self, key: str) -> Any:
+        self.calls += 1
+        return self.sync_client.get(key)
+
+    async def set(self, key: str, value: str, ex: int | None = None) -> None:
+        self.calls += 1
+        self.sync_client.set(key, value, ex=ex)
+
 def _disabled_managers() -> tuple[MongoClientManager, RedisClientManager]:
     mongo = MongoClientManager(uri="mongodb://localhost:27017/commerce", enabled=False)
     redis = RedisClientManager(url="redis://localhost:6379/0", enabled=False)
@@ -226,6 +355,13 @@ def _fake_managers() -> tuple[MongoClientManager, RedisClientManager]:
     return mongo, redis
 
 
+def _fake_async_managers() -> tuple[MongoClientManager, RedisClientManager]:
+    mongo, redis = _fake_managers()
+    mongo._async_client = _FakeAsyncMongoClient(mongo._client)
+    redis._async_client = _FakeAsyncRedisClient(redis._client)
+    return mongo, redis
+
+
 def test_cart_repository_roundtrip_in_memory() -> None:
     store = InMemoryStore()
     mongo_manager, redis_manager = _fake_managers()
@@ -387,6 +523,43 @@ def test_interaction_repository_roundtrip_in_memory() -> None:
     assert today[0]["agent"] == "product"
 
 
+def test_interaction_and_memory_batches_are_safe_to_replay() -> None:
+    mongo_manager, redis_manager = _fake_managers()
+    repo = InteractionRepository(mongo_manager=mongo_manager, redis_manager=redis_manager)
+    batch = [
+        {"id": f"msg_{index}", "sessionId": "session_replay", "message": f"m{index}", "timestamp": f"2026-01-0{index + 1}"}
+        for index in range(2)
+    ]
+
+    # The Redis write fails after Mongo took the batch; the write-behind queue replays it.
+    def unavailable() -> Any:
+        raise ConnectionError("redis unavailable")
+
+    redis_manager._client.pipeline = unavailable
+    with pytest.raises(ConnectionError):
+        repo.create_many(batch)
+    del redis_manager._client.pipeline
+    repo.create_many(batch)
+    repo.create_many(batch)
+
+    assert [row["id"] for row in repo.recent(session_id="session_replay")] == ["msg_0", "msg_1"]
+    assert len(repo.list_by_date(date_prefix="2026-01")) == 2
+
+    memory = MemoryService(MemoryRepository(mongo_manager=mongo_manager, redis_manager=redis_manager))
+    entry = {
+        "intent": "search_product",
+        "message": "shoes",
+        "response": {"data": {"products": [{"id": "p1", "brand": "Nike", "category": "Shoes"}]}},
+        "message_id": "msg_0",
+    }
+    memory._write_interaction_batch([("user_replay", entry)])
+    memory._write_interaction_batch([("user_replay", entry)])
+
+    snapshot = memory.get_memory_snapshot("user_replay")
+    assert [item["messageId"] for item in snapshot["interactionHistory"]] == ["msg_0"]
+    assert snapshot["productAffinities"]["brands"] == {"nike": 1}
+
+
 def test_support_repository_roundtrip_open_tickets() -> None:
     store = InMemoryStore()
     mongo_manager, _ = _fake_managers()
@@ -561,6 +734,207 @@ def test_product_and_inventory_repositories_roundtrip() -> None:
     assert product_repo.get("prod_test_100") is None
 
 
+def test_product_repository_catalog_snapshot_tracks_versions_across_workers() -> None:
+    mongo_manager, redis_manager = _fake_managers()
+    worker_a = ProductRepository(
+        mongo_manager=mongo_manager,
+        redis_manager=redis_manager,
+        version_check_interval_seconds=0.0,
+    )
+    worker_b = ProductRepository(
+        mongo_manager=mongo_manager,
+        redis_manager=redis_manager,
+        version_check_interval_seconds=0.0,
+    )
+
+    def product(product_id: str, name: str) -> dict[str, Any]:
+        return {"id": product_id, "name": name, "category": "gear", "price": 10.0, "variants": []}
+
+    worker_a.create(product("prod_snap_2", "Zeta Pack"))
+    first = worker_a.snapshot()
+    assert first.version == 1
+    assert [item["id"] for item in first.products] == ["prod_snap_2"]
+
+    worker_a.create(product("prod_snap_1", "Alpha Pack"))
+    patched = worker_a.snapshot()
+    assert patched.version == 2
+    assert [item["id"] for item in patched.products] == ["prod_snap_1", "prod_snap_2"]
+    assert worker_a.snapshot() is patched
+    assert worker_a.name_map() == {"prod_snap_1": "Alpha Pack", "prod_snap_2": "Zeta Pack"}
+
+    assert worker_b.snapshot().version == 2
+    worker_b.delete("prod_snap_2")
+    assert [item["id"] for item in worker_b.snapshot().products] == ["prod_snap_1"]
+
+    reloaded = worker_a.snapshot()
+    assert reloaded.version == 3
+    assert [item["id"] for item in reloaded.products] == ["prod_snap_1"]
+
+    listed = worker_a.list_all()
+    listed[0]["name"] = "Mutated"
+    assert worker_a.snapshot().products[0]["name"] == "Alpha Pack"
+
+
+def test_product_repository_find_page_filters_and_paginates_in_mongo() -> None:
+    mongo_manager, redis_manager = _fake_managers()
+    repo = ProductRepository(mongo_manager=mongo_manager, redis_manager=redis_manager)
+
+    def product(product_id: str, name: str, brand: str, price: float, status: str = "active") -> dict[str, Any]:
+        return {
+            "id": product_id,
+            "name": name,
+            "category": "footwear",
+            "brand": brand,
+            "price": price,
+            "status": status,
+            "variants": [],
+        }
+
+    repo.create(product("prod_page_1", "Delta Runner", "Nike", 120.0))
+    repo.create(product("prod_page_2", "Alpha Runner", "Nike", 80.0))
+    repo.create(product("prod_page_3", "Bravo Runner", "Nike", 95.0))
+    repo.create(product("prod_page_4", "Charlie Runner", "Adidas", 90.0))
+    repo.create(product("prod_page_5", "Echo Runner", "Nike", 70.0, status="draft"))
+
+    page = repo.find_page(category="Footwear", brand="nike", skip=0, limit=2)
+    assert page is not None
+    products, total = page
+    assert total == 3
+    assert [item["id"] for item in products] == ["prod_page_2", "prod_page_3"]
+    assert all("productId" not in item for item in products)
+
+    second = repo.find_page(category="footwear", brand="NIKE", skip=2, limit=2)
+    assert second is not None
+    assert [item["id"] for item in second[0]] == ["prod_page_1"]
+
+    priced = repo.find_page(min_price=85.0, max_price=100.0, skip=0, limit=10)
+    assert priced is not None
+    assert [item["id"] for item in priced[0]] == ["prod_page_3", "prod_page_4"]
+    assert priced[1] == 2
+
+    repo.create(
+        {
+            **product("prod_page_6", "Foxtrot Runner", "Nike", 110.0),
+            "variants": [{"id": "var_f1", "color": "Blue", "size": "10"}, {"id": "var_f2", "color": "black", "size": "11"}],
+        }
+    )
+    by_color = repo.find_page(color="blue", skip=0, limit=10)
+    assert by_color is not None
+    assert [item["id"] for item in by_color[0]] == ["prod_page_6"]
+    by_variant = repo.find_page(color="blue", size="11", skip=0, limit=10)
+    assert by_variant == ([], 0)
+    assert "facetKeys" not in by_color[0][0]
+    assert "facetKeys" not in (repo.get("prod_page_6") or {})
+
+    # A missing status counts as active; an explicit null or empty one does not.
+    legacy = product("prod_page_7", "Golf Runner", "Puma", 60.0)
+    del legacy["status"]
+    repo.create(legacy)
+    repo.create(product("prod_page_8", "Hotel Runner", "Puma", 60.0, status=None))  # type: ignore[arg-type]
+    repo.create(product("prod_page_9", "India Runner", "Puma", 60.0, status=""))
+    assert repo.find_page(brand="puma", skip=0, limit=10) == ([repo.get("prod_page_7")], 1)
+
+    disabled_mongo, disabled_redis = _disabled_managers()
+    offline = ProductRepository(mongo_manager=disabled_mongo, redis_manager=disabled_redis)
+    assert offline.find_page(skip=0, limit=10) is None
+
+
+def test_product_repository_backfills_facet_keys_for_legacy_products() -> None:
+    mongo_manager, redis_manager = _fake_managers()
+    repo = ProductRepository(mongo_manager=mongo_manager, redis_manager=redis_manager)
+    collection = repo._mongo_collection()
+    collection.docs.append(
+        {
+            "productId": "prod_legacy",
+            "id": "prod_legacy",
+            "name": "Legacy Runner",
+            "category": " Footwear",
+            "brand": "NIKE",
+            "price": 90.0,
+            "variants": [{"id": "var_l1", "color": "Red ", "size": "9"}],
+        }
+    )
+
+    page = repo.find_page(category="footwear", brand="nike", color="red", skip=0, limit=10)
+
+    assert page is not None and [item["id"] for item in page[0]] == ["prod_legacy"]
+    assert collection.docs[0]["facetKeys"] == {
+        "status": "active",
+        "category": "footwear",
+        "brand": "nike",
+        "variants": [{"color": "red", "size": "9"}],
+    }
+
+def test_product_listing_and_cart_reads_have_async_paths() -> None:
+    mongo_manager, redis_manager = _fake_async_managers()
+    products = ProductRepository(mongo_manager=mongo_manager, redis_manager=redis_manager)
+    for index, name in enumerate(["Delta Runner", "Alpha Runner", "Bravo Runner"]):
+        products.create(
+            {"id": f"prod_async_{index}", "name": name, "category": "footwear", "brand": "Nike", "price": 90.0, "variants": []}
+        )
+    service = ProductService(
+        product_repository=products,
+        category_repository=None,  # type: ignore[arg-type]
+        inventory_repository=None,  # type: ignore[arg-type]
+    )
+    products._version_checked_at = 0.0
+    filters = {"query": None, "category": "footwear", "brand": None, "min_price": None, "max_price": None, "page": 1, "limit": 2}
+
+    listed = asyncio.run(service.alist_products(**filters))
+
+    assert listed == service.list_products(**filters)
+    assert [item["id"] for item in listed["products"]] == ["prod_async_1", "prod_async_2"]
+    assert listed["pagination"]["total"] == 3
+    assert redis_manager.async_client.calls == 1  # the catalog version, read once per interval
+
+    carts = CartRepository(mongo_manager=mongo_manager, redis_manager=redis_manager)
+    cart_service = CartService(
+        settings=Settings(),
+        cart_repository=carts,
+        product_repository=products,
+        session_repository=SimpleNamespace(get=lambda session_id: {"anonymousId": "anon_1"}),
+    )
+    created = asyncio.run(cart_service.aget_cart(user_id=None, session_id="session_async"))
+    again = asyncio.run(cart_service.aget_cart(user_id=None, session_id="session_async"))
+
+    assert created["anonymousId"] == "anon_1" and again["id"] == created["id"]
+    assert cart_service.get_cart(user_id=None, session_id="session_async")["id"] == created["id"]
+    assert redis_manager.client.get(f"cart:{created['id']}") is not None
+
+
+def test_product_and_inventory_get_many_batch_reads_and_write_back() -> None:
+    mongo_manager, redis_manager = _fake_managers()
+    product_repo = ProductRepository(mongo_manager=mongo_manager, redis_manager=redis_manager)
+    inventory_repo = InventoryRepository(mongo_manager=mongo_manager, redis_manager=redis_manager)
+    redis_client = redis_manager.client
+
+    for index in range(3):
+        product_repo.create(
+            {"id": f"prod_many_{index}", "name": f"Many {index}", "category": "gear", "price": 5.0, "variants": []}
+        )
+        inventory_repo.upsert(
+            {"variantId": f"var_many_{index}", "productId": f"prod_many_{index}", "availableQuantity": index}
+        )
+    # Drop two cache entries so they must come from the single $in query.
+    redis_client.delete("product:prod_many_1")
+    redis_client.delete("product:prod_many_2")
+    redis_client.delete("inventory:var_many_0")
+
+    products = product_repo.get_many(["prod_many_0", "prod_many_1", "prod_many_2", "prod_missing", "prod_many_0"])
+    stocks = inventory_repo.get_many(["var_many_0", "var_many_2", "var_missing"])
+
+    assert sorted(products) == ["prod_many_0", "prod_many_1", "prod_many_2"]
+    assert all("productId" not in product for product in products.values())
+    assert sorted(stocks) == ["var_many_0", "var_many_2"]
+    assert stocks["var_many_2"]["availableQuantity"] == 2
+    assert "product:prod_many_2" in redis_client.store
+    assert "inventory:var_many_0" in redis_client.store
+
+    mongo_manager.client["commerce"]["products"].docs.clear()
+    assert sorted(product_repo.get_many(["prod_many_1", "prod_many_2"])) == ["prod_many_1", "prod_many_2"]
+    assert product_repo.get_many([]) == {}
+
+
 def test_notification_repository_roundtrip_in_memory() -> None:
     store = InMemoryStore()
     mongo_manager, _ = _fake_managers()
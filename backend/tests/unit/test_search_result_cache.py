@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+from copy import deepcopy
+from types import SimpleNamespace
+from typing import Any
+
+from app.infrastructure.observability import MetricsCollector
+from app.infrastructure.persistence_clients import MongoClientManager, RedisClientManager
+from app.repositories.category_repository import CategoryRepository
+from app.repositories.inventory_repository import InventoryRepository
+from app.repositories.product_repository import CatalogSnapshot, ProductRepository
+from app.services.catalog.result_cache import SearchResultCache
+from app.services.product_service import ProductService
+
+
+class _FakeRedisClient:
+    def __init__(self) -> None:
+        self.store: dict[str, Any] = {}
+
+    def set(self, key: str, value: str, ex: int | None = None) -> None:
+        self.store[key] = value
+
+    def get(self, key: str) -> Any:
+        return self.store.get(key)
+
+
+def _redis_manager() -> RedisClientManager:
+    manager = RedisClientManager(url="redis://localhost:6379/0", enabled=True)
+    manager._client = _FakeRedisClient()
+    return manager
+
+
+def test_search_result_cache_evicts_lru_and_reads_through_redis() -> None:
+    metrics = MetricsCollector()
+    redis_manager = _redis_manager()
+    cache = SearchResultCache(redis_manager=redis_manager, metrics_collector=metrics, max_entries=2)
+
+    first = SearchResultCache.key(version=1, query="running shoes", page=1)
+    second = SearchResultCache.key(version=1, query="hoodie", page=1)
+    third = SearchResultCache.key(version=1, query="socks", page=1)
+    cache.put(first, {"products": [{"id": "prod_1"}]})
+    cache.put(second, {"products": []})
+    assert cache.get(first) is not None
+    cache.put(third, {"products": []})
+    assert len(cache) == 2
+
+    hit = cache.get(first)
+    assert hit == {"products": [{"id": "prod_1"}]}
+    hit["products"].clear()
+    assert cache.get(first) == {"products": [{"id": "prod_1"}]}
+
+    # The evicted entry is still served from Redis, and so is a peer worker's lookup.
+    peer = SearchResultCache(redis_manager=redis_manager, metrics_collector=metrics, max_entries=2)
+    assert cache.get(second) == {"products": []}
+    assert peer.get(third) == {"products": []}
+    assert cache.get(SearchResultCache.key(version=2, query="running shoes", page=1)) is None
+
+    rendered = metrics.render_prometheus()
+    assert 'commerce_search_cache_lookups_total{tier="l1",result="hit"} 3' in rendered
+    assert 'commerce_search_cache_lookups_total{tier="l2",result="hit"} 2' in rendered
+    assert 'commerce_search_cache_lookups_total{tier="l2",result="miss"} 1' in rendered
+
+
+def test_catalog_version_moves_on_local_writes_without_redis() -> None:
+    repo = ProductRepository(
+        mongo_manager=MongoClientManager(uri="mongodb://localhost:27017/commerce", enabled=False),
+        redis_manager=RedisClientManager(url="redis://localhost:6379/0", enabled=False),
+    )
+    before = repo.catalog_version
+
+    repo.create({"id": "prod_cache_1", "name": "Cache Pack", "category": "gear", "price": 5.0})
+
+    assert repo.catalog_version == before + 1
+
+
+def test_product_service_keeps_an_injected_empty_cache() -> None:
+    mongo = MongoClientManager(uri="mongodb://localhost:27017/commerce", enabled=False)
+    redis = RedisClientManager(url="redis://localhost:6379/0", enabled=False)
+    cache = SearchResultCache(max_entries=4)
+    service = ProductService(
+        product_repository=ProductRepository(mongo_manager=mongo, redis_manager=redis),
+        category_repository=CategoryRepository(mongo_manager=mongo, redis_manager=redis),
+        inventory_repository=InventoryRepository(mongo_manager=mongo, redis_manager=redis),
+        result_cache=cache,
+    )
+
+    assert service.result_cache is cache
+
+
+def test_affinity_ranking_covers_every_match_before_paginating() -> None:
+    products = [
+        {
+            "id": f"prod_aff_{index:02d}",
+            "name": f"Affinity Pack {index:02d}",
+            "category": "gear",
+            "brand": "LateBrand" if index == 11 else "EarlyBrand",
+            "status": "active",
+            "price": 10.0 + index,
+            "variants": [],
+        }
+        for index in range(12)
+    ]
+    snapshot = CatalogSnapshot.from_products(version=3, products=products)
+    repository = SimpleNamespace(
+        catalog_version=3,
+        snapshot=lambda: snapshot,
+        find_page=lambda skip, limit, **_: (deepcopy(products[skip : skip + limit]), len(products)),
+    )
+    cache = SearchResultCache(max_entries=4)
+    service = ProductService(
+        product_repository=repository,  # type: ignore[arg-type]
+        category_repository=None,  # type: ignore[arg-type]
+        inventory_repository=None,  # type: ignore[arg-type]
+        result_cache=cache,
+    )
+    filters = {"query": None, "category": "gear", "brand": None, "min_price": None, "max_price": None}
+
+    plain = service.list_products(**filters, page=1, limit=3)
+    personal = service.list_products(
+        **filters,
+        page=1,
+        limit=3,
+        affinities={"products": {"prod_aff_07": 2}, "categories": {}, "brands": {"latebrand": 1}},
+    )
+
+    assert [item["id"] for item in plain["products"]] == ["prod_aff_00", "prod_aff_01", "prod_aff_02"]
+    # Both favourites sit past the first name-ordered page; the rest keep catalog order.
+    assert [item["id"] for item in personal["products"]] == ["prod_aff_07", "prod_aff_11", "prod_aff_00"]
+    assert personal["pagination"]["total"] == plain["pagination"]["total"] == 12
+    assert len(cache) == 1
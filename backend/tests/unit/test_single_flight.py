@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from app.core.config import Settings
+from app.infrastructure.llm_client import LLMClient
+from app.infrastructure.single_flight import SingleFlight
+
+
+def test_single_flight_shares_async_results_and_errors() -> None:
+    flights = SingleFlight()
+    calls = {"ok": 0, "boom": 0}
+
+    async def ok() -> dict[str, int]:
+        calls["ok"] += 1
+        await asyncio.sleep(0.02)
+        return {"value": 7}
+
+    async def boom() -> None:
+        calls["boom"] += 1
+        await asyncio.sleep(0.02)
+        raise RuntimeError("provider down")
+
+    async def scenario() -> tuple[list[dict[str, int]], list[BaseException | None]]:
+        results = await asyncio.gather(*(flights.ado("same", ok) for _ in range(5)))
+        errors = await asyncio.gather(*(flights.ado("bad", boom) for _ in range(3)), return_exceptions=True)
+        return results, errors
+
+    results, errors = asyncio.run(scenario())
+
+    assert calls == {"ok": 1, "boom": 1}
+    assert results == [{"value": 7}] * 5
+    assert all(isinstance(error, RuntimeError) for error in errors)
+    assert flights.in_flight() == 0
+
+
+def test_single_flight_coalesces_threads() -> None:
+    flights = SingleFlight()
+    started = threading.Event()
+    calls: list[int] = []
+
+    def slow() -> int:
+        calls.append(1)
+        started.set()
+        time.sleep(0.05)
+        return 42
+
+    results: list[int] = []
+    leader = threading.Thread(target=lambda: results.append(flights.do("k", slow)))
+    leader.start()
+    started.wait()
+    followers = [threading.Thread(target=lambda: results.append(flights.do("k", slow))) for _ in range(3)]
+    for thread in followers:
+        thread.start()
+    for thread in [leader, *followers]:
+        thread.join()
+
+    assert results == [42] * 4
+    assert len(calls) == 1
+    with pytest.raises(ZeroDivisionError):
+        flights.do("k", lambda: 1 / 0)
+
+
+def test_llm_client_coalesces_concurrent_identical_plans() -> None:
+    settings = Settings(llm_enabled=True, openrouter_api_key="sk-test", llm_planner_enabled=True)
+    client = LLMClient(settings=settings)
+    calls: list[str] = []
+
+    async def fake_acall(*, user_prompt: str, system_prompt: str) -> str:
+        calls.append(user_prompt)
+        await asyncio.sleep(0.02)
+        return '{"actions":[{"name":"get_cart","targetAgent":"cart","params":{}}],"confidence":0.9}'
+
+    client._acall_llm = fake_acall  # type: ignore[method-assign]
+
+    async def scenario() -> list[object]:
+        return await asyncio.gather(*(client.aplan_actions(message="show my cart") for _ in range(6)))
+
+    plans = asyncio.run(scenario())
+
+    assert len(calls) == 1
+    assert all(plan is not None and plan.actions[0].name == "get_cart" for plan in plans)
+    # Every waiter gets its own copy of the shared plan.
+    assert len({id(plan) for plan in plans}) == 6
@@ -0,0 +1,37 @@
+from __future__ import annotations
+
+import asyncio
+
+from app.agents.executor import AgentExecutor
+from app.infrastructure.observability import MetricsCollector, StageTrace
+from app.orchestrator.types import AgentAction, AgentContext, AgentExecutionResult
+
+
+class _Agent:
+    name = "cart"
+
+    def execute(self, action: AgentAction, context: AgentContext) -> AgentExecutionResult:
+        return AgentExecutionResult(success=True, message="ok")
+
+
+def test_stage_trace_collects_spans_and_exports_histograms() -> None:
+    trace = StageTrace()
+    with trace.span("classify"):
+        pass
+    trace.add("format", 7.5)
+    context = AgentContext(session_id="s1", user_id=None, channel="web", session={}, cart=None, preferences=None, trace=trace)
+    asyncio.run(AgentExecutor(max_workers=1).run(_Agent(), AgentAction(name="get_cart"), context))
+
+    assert [(span.stage, span.agent) for span in trace.spans] == [("classify", None), ("format", None), ("agent", "cart")]
+    assert trace.as_metadata()[1] == {"stage": "format", "agent": None, "durationMs": 7.5}
+
+    metrics = MetricsCollector()
+    metrics.record_stage(stage="format", intent="view_cart", agent="cart", duration_ms=7.5)
+    metrics.record_stage(stage="format", intent="view_cart", agent="cart", duration_ms=40.0)
+    rendered = metrics.render_prometheus()
+    labels = 'stage="format",intent="view_cart",agent="cart"'
+    assert f'commerce_orchestrator_stage_duration_ms_bucket{{{labels},le="5"}} 0' in rendered
+    assert f'commerce_orchestrator_stage_duration_ms_bucket{{{labels},le="10"}} 1' in rendered
+    assert f'commerce_orchestrator_stage_duration_ms_bucket{{{labels},le="+Inf"}} 2' in rendered
+    assert f"commerce_orchestrator_stage_duration_ms_sum{{{labels}}} 47.5000" in rendered
+    assert f"commerce_orchestrator_stage_duration_ms_count{{{labels}}} 2" in rendered
@@ -0,0 +1,235 @@
+from __future__ import annotations
+
+import threading
+from types import SimpleNamespace
+from typing import Any
+
+from app.infrastructure.observability import MetricsCollector
+from app.infrastructure.write_behind import WriteBehindQueue
+from app.services.admin_service import AdminService
+from app.services.interaction_service import InteractionService
+from app.services.session_service import SessionService
+
+
+class _SessionRepository:
+    def __init__(self) -> None:
+        self.sessions: dict[str, dict[str, Any]] = {"s1": {"id": "s1"}, "s2": {"id": "s2"}}
+        self.batch_writes = 0
+
+    def get(self, session_id: str) -> dict[str, Any] | None:
+        session = self.sessions.get(session_id)
+        return dict(session) if session else None
+
+    def get_many(self, session_ids: list[str]) -> dict[str, dict[str, Any]]:
+        return {sid: dict(self.sessions[sid]) for sid in session_ids if sid in self.sessions}
+
+    def update(self, session: dict[str, Any]) -> dict[str, Any]:
+        self.sessions[session["id"]] = session
+        return session
+
+    def update_many(self, sessions: list[dict[str, Any]]) -> None:
+        self.batch_writes += 1
+        for session in sessions:
+            self.sessions[session["id"]] = session
+
+    def list_all(self) -> list[dict[str, Any]]:
+        return [dict(session) for session in self.sessions.values()]
+
+    def find_latest_for_user(self, user_id: str) -> dict[str, Any] | None:
+        return next((dict(s) for s in self.sessions.values() if s.get("userId") == user_id), None)
+
+
+class _InteractionRepository:
+    def __init__(self) -> None:
+        self.rows: list[dict[str, Any]] = []
+        self.batches: list[int] = []
+
+    def create(self, payload: dict[str, Any]) -> dict[str, Any]:
+        self.rows.append(payload)
+        return payload
+
+    def create_many(self, payloads: list[dict[str, Any]]) -> None:
+        self.batches.append(len(payloads))
+        self.rows.extend(payloads)
+
+    def recent(self, *, session_id: str, limit: int = 12) -> list[dict[str, Any]]:
+        return [row for row in self.rows if row["sessionId"] == session_id][-limit:]
+
+
+def test_write_behind_batches_coalesces_and_settles_on_read() -> None:
+    metrics = MetricsCollector()
+    queue = WriteBehindQueue(name="test", flush_interval_seconds=60, metrics_collector=metrics)
+    sessions = _SessionRepository()
+    interactions = _InteractionRepository()
+    session_service = SessionService(session_repository=sessions, write_behind=queue)
+    interaction_service = InteractionService(interaction_repository=interactions, write_behind=queue)
+
+    for index in range(3):
+        session_service.update_conversation_later(
+            session_id="s1", last_intent=f"intent_{index}", last_agent="cart", last_message=f"m{index}"
+        )
+        interaction_service.record_later(
+            session_id="s1", user_id=None, message=f"m{index}", intent=f"intent_{index}", agent="cart", response={}
+        )
+    session_service.update_conversation_later(session_id="s2", last_intent="x", last_agent="order", last_message="y")
+
+    assert queue.pending == 7
+    assert "context" not in sessions.sessions["s1"]
+
+    # Reading a session writes only what is pending for it: the newest update wins, in one batch.
+    session = session_service.get_session("s1")
+    assert session["context"]["conversation"]["lastIntent"] == "intent_2"
+    assert sessions.batch_writes == 1 and "context" not in sessions.sessions["s2"]
+    assert [row["message"] for row in interaction_service.recent(session_id="s1")] == ["m0", "m1", "m2"]
+    assert interactions.batches == [3] and queue.pending == 1
+    session_service.get_session("s2")
+    assert sessions.batch_writes == 2 and queue.pending == 0
+
+    rendered = metrics.render_prometheus()
+    assert 'commerce_write_behind_pending{queue="test"} 0' in rendered
+    assert 'commerce_write_behind_records_total{queue="test",result="ok"} 7' in rendered
+    assert 'commerce_write_behind_flush_duration_ms_count{queue="test"} 3' in rendered
+    queue.close()
+
+
+def test_session_read_modify_writes_keep_pending_conversation_updates() -> None:
+    queue = WriteBehindQueue(name="test", flush_interval_seconds=60)
+    sessions = _SessionRepository()
+    service = SessionService(session_repository=sessions, write_behind=queue)
+
+    service.update_conversation_later(session_id="s1", last_intent="search", last_agent="product", last_message="a")
+    service.attach_user("s1", "u1")
+    service.update_conversation_later(session_id="s1", last_intent="cart", last_agent="cart", last_message="b")
+    service.touch("s1")
+    claimed = service.resolve_user_session(user_id="u2", preferred_session_id="s2", channel="web")
+    queue.close()
+
+    # Neither the user attach nor the later touch rolled back a queued conversation update.
+    assert sessions.sessions["s1"]["userId"] == "u1"
+    assert sessions.sessions["s1"]["context"]["conversation"]["lastIntent"] == "cart"
+    assert claimed["id"] == "s2" and sessions.sessions["s2"]["userId"] == "u2"
+
+
+def test_write_behind_falls_back_inline_when_full_and_drains_on_close() -> None:
+    metrics = MetricsCollector()
+    queue = WriteBehindQueue(name="test", max_pending=2, flush_interval_seconds=60, metrics_collector=metrics)
+    interactions = _InteractionRepository()
+    service = InteractionService(interaction_repository=interactions, write_behind=queue)
+
+    for index in range(3):
+        service.record_later(session_id="s1", user_id=None, message=f"m{index}", intent="x", agent="a", response={})
+    # The overflowing record settled the session first, so order is kept.
+    assert [row["message"] for row in interactions.rows] == ["m0", "m1", "m2"]
+    assert 'commerce_write_behind_overflows_total{queue="test"} 1' in metrics.render_prometheus()
+
+    service.record_later(session_id="s2", user_id=None, message="late", intent="x", agent="a", response={})
+    assert queue.pending == 1
+    queue.close()
+    assert queue.pending == 0 and interactions.rows[-1]["message"] == "late"
+
+    # Once closed, records are written inline.
+    service.record_later(session_id="s3", user_id=None, message="after", intent="x", agent="a", response={})
+    assert interactions.rows[-1]["message"] == "after" and queue.pending == 0
+
+
+def test_write_behind_worker_flushes_in_the_background() -> None:
+    written = threading.Event()
+    batches: list[list[Any]] = []
+    queue = WriteBehindQueue(name="test", flush_interval_seconds=0.01)
+
+    def handler(items: list[Any]) -> None:
+        batches.append(items)
+        written.set()
+
+    queue.register("thing", handler)
+    assert queue.submit("thing", "k", 1) and queue.submit("thing", "k", 2)
+    assert written.wait(timeout=2)
+    queue.close()
+    assert [payload for batch in batches for _, payload in batch] == [1, 2]
+
+    disabled = WriteBehindQueue(max_pending=0)
+    disabled.register("thing", handler)
+    assert disabled.submit("thing", "k", 3) is False
+
+
+def test_write_behind_retries_failed_batches_and_counts_what_it_drops() -> None:
+    metrics = MetricsCollector()
+    queue = WriteBehindQueue(name="test", flush_interval_seconds=60, max_attempts=3, metrics_collector=metrics)
+    written: list[Any] = []
+    failures = {"flaky": 2, "broken": 99}
+
+    def handler_for(kind: str) -> Any:
+        def handler(items: list[Any]) -> None:
+            if failures[kind] > 0:
+                failures[kind] -= 1
+                raise ConnectionError("store unavailable")
+            written.extend(payload for _, payload in items)
+
+        return handler
+
+    queue.register("flaky", handler_for("flaky"))
+    queue.register("broken", handler_for("broken"))
+    queue.submit("flaky", "k", 1)
+    queue.submit("broken", "k", 2)
+
+    # A failed record stays visible to readers until it is written or given up on.
+    queue.settle("flaky", "k")
+    assert written == [1]
+    queue.settle("broken", "k")
+    assert queue.pending == 0 and written == [1]
+
+    rendered = metrics.render_prometheus()
+    assert 'commerce_write_behind_dropped_total{queue="test",kind="broken"} 1' in rendered
+    assert "kind=\"flaky\"" not in rendered
+    queue.close()
+
+
+def test_write_behind_drops_retries_that_do_not_fit_in_the_queue() -> None:
+    metrics = MetricsCollector()
+    queue = WriteBehindQueue(name="test", max_pending=2, batch_size=2, flush_interval_seconds=60, metrics_collector=metrics)
+    attempts: list[int] = []
+
+    def handler(items: list[Any]) -> None:
+        attempts.append(len(items))
+        if len(attempts) == 1:
+            queue.submit("thing", "other", 3)
+            raise ConnectionError("store unavailable")
+
+    queue.register("thing", handler)
+    queue.submit("thing", "k", 1)
+    queue.submit("thing", "k", 2)
+    queue.flush()
+
+    # One slot was taken while the batch was being written, so one record is retried.
+    assert queue.pending == 2
+    assert 'commerce_write_behind_dropped_total{queue="test",kind="thing"} 1' in metrics.render_prometheus()
+    queue.close()
+    assert attempts == [2, 2]
+
+
+def test_admin_stats_settle_pending_interactions() -> None:
+    queue = WriteBehindQueue(name="test", flush_interval_seconds=60)
+    interactions = _InteractionRepository()
+    interactions.list_by_date = lambda *, date_prefix: [  # type: ignore[attr-defined]
+        row for row in interactions.rows if row["timestamp"].startswith(date_prefix)
+    ]
+    service = InteractionService(interaction_repository=interactions, write_behind=queue)
+    service.record_later(
+        session_id="s1", user_id=None, message="hi", intent="x", agent="cart", response={"metadata": {"success": True}}
+    )
+    admin = AdminService(
+        session_repository=SimpleNamespace(count=lambda: 1),
+        order_repository=SimpleNamespace(list_all=lambda: []),
+        interaction_repository=interactions,
+        support_repository=SimpleNamespace(list_open=lambda: []),
+        product_repository=SimpleNamespace(name_map=lambda: {}),
+        voice_recovery_service=SimpleNamespace(stats=lambda: {}),
+        write_behind=queue,
+    )
+
+    assert queue.pending == 1
+    stats = admin.stats()
+
+    assert queue.pending == 0 and stats["messagesToday"] == 1
+    assert stats["agentPerformance"] == [{"agent": "cart", "interactions": 1, "successRate": 100.0}]
+    queue.close()